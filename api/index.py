@@ -11,10 +11,8 @@ os.environ['NLTK_DATA'] = '/tmp/nltk_data'
 try:
     import nltk
     nltk.data.path.append('/tmp/nltk_data')
-    nltk.download('punkt', download_dir='/tmp/nltk_data', quiet=True)
     nltk.download('stopwords', download_dir='/tmp/nltk_data', quiet=True)
     nltk.download('rslp', download_dir='/tmp/nltk_data', quiet=True)
-    nltk.download('punkt_tab', download_dir='/tmp/nltk_data', quiet=True)
 except Exception as e:
     print(f"Aviso NLTK: {e}")
     pass
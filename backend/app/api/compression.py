@@ -0,0 +1,424 @@
+"""
+HTTP Compression
+================
+Middleware ASGI de compressão, nos dois sentidos:
+
+    - Respostas: gzip ou brotli conforme o header Accept-Encoding (brotli
+      tem preferência), só acima de COMPRESSION_MIN_SIZE e só para tipos
+      que comprimem bem (JSON, NDJSON, CSV, texto, MessagePack...).
+      Respostas em streaming (ex.: exportação do histórico) são comprimidas
+      por partes, sem acumular o corpo.
+    - Requisições: corpos com Content-Encoding gzip, deflate ou br são
+      aceitos nos endpoints de texto e de lote (COMPRESSED_BODY_PATHS). A
+      descompressão é limitada: o corpo nunca passa de
+      COMPRESSION_MAX_DECOMPRESSED_BYTES depois de descomprimido (413), o
+      que protege contra "zip bombs". O corpo comprimido tem o mesmo limite,
+      verificado enquanto é lido.
+
+Corpos grandes são comprimidos/descomprimidos em thread, sem bloquear o
+event loop.
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import asyncio
+import logging
+import zlib
+
+import brotli
+from fastapi.responses import ORJSONResponse
+
+# Importar configurações
+from backend.app.core.config import settings
+
+# Configurar logger
+logger = logging.getLogger(__name__)
+
+# Endpoints que aceitam corpo comprimido (texto e lote)
+COMPRESSED_BODY_PATHS = ("/api/classify-text", "/api/jobs")
+
+# Content-Encoding aceitos nas requisições
+REQUEST_ENCODINGS = ("gzip", "x-gzip", "deflate", "br")
+
+# Tipos de resposta comprimidos (prefixos do Content-Type)
+COMPRESSIBLE_TYPES = (
+    "application/json", "application/x-ndjson", "application/msgpack", "application/javascript",
+    "application/xml", "image/svg+xml", "text/",
+)
+
+# Acima disso (bytes), compressão e descompressão rodam em thread
+THREAD_THRESHOLD = 256 * 1024
+
+# Tamanho de cada pedaço processado na descompressão limitada
+DECOMPRESS_CHUNK_SIZE = 64 * 1024
+
+# Estatísticas do processo (GET /api/metrics)
+compression_stats: Dict[str, int] = {
+    "responses_compressed": 0,
+    "response_bytes_in": 0,
+    "response_bytes_out": 0,
+    "requests_decompressed": 0,
+    "request_bytes_in": 0,
+    "request_bytes_out": 0,
+    "requests_rejected": 0,
+}
+
+
+class DecompressionError(Exception):
+    """
+    Corpo comprimido inválido ou maior que o limite.
+
+    Attributes:
+        status_code: 400 (dados inválidos) ou 413 (limite excedido)
+    """
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def parse_quality_values(header: str) -> Dict[str, float]:
+    """
+    Lê um header de negociação (Accept, Accept-Encoding) com seus q-values.
+
+    Args:
+        header: Valor do header (ex.: "gzip, deflate, br;q=0.9")
+
+    Returns:
+        Dict[str, float]: Valor (em minúsculas, sem parâmetros) -> q; q
+        ausente vale 1.0 e q inválido vale 0.0
+    """
+    accepted: Dict[str, float] = {}
+    for part in header.lower().split(","):
+        name, *params = part.split(";")
+        name = name.strip()
+        if not name:
+            continue
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    quality = float(value.strip())
+                except ValueError:
+                    quality = 0.0
+        accepted[name] = quality
+    return accepted
+
+
+def choose_encoding(accept_encoding: str, available: Iterable[str] = ("br", "gzip")) -> Optional[str]:
+    """
+    Escolhe a codificação da resposta a partir do header Accept-Encoding.
+
+    Args:
+        accept_encoding: Valor do header (ex.: "gzip, deflate, br;q=0.9")
+        available: Codificações disponíveis, em ordem de preferência
+
+    Returns:
+        Optional[str]: Uma das disponíveis ou None (sem compressão)
+    """
+    accepted = parse_quality_values(accept_encoding)
+    wildcard = accepted.get("*", 0.0)
+    for encoding in available:
+        if accepted.get(encoding, wildcard) > 0:
+            return encoding
+    return None
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """
+    Comprime um corpo inteiro com o nível configurado.
+
+    Args:
+        data: Corpo original
+        encoding: "br" ou "gzip"
+
+    Returns:
+        bytes: Corpo comprimido
+    """
+    if encoding == "br":
+        return brotli.compress(data, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    compressor = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+def decompress(data: bytes, encoding: str, limit: int) -> bytes:
+    """
+    Descomprime um corpo sem ultrapassar `limit` bytes de saída.
+
+    A saída é produzida em pedaços de no máximo DECOMPRESS_CHUNK_SIZE, então
+    um corpo pequeno que expande para gigabytes é recusado depois de
+    `limit` bytes, sem alocar o resto.
+
+    Args:
+        data: Corpo comprimido
+        encoding: "gzip", "x-gzip", "deflate" ou "br"
+        limit: Máximo de bytes descomprimidos
+
+    Returns:
+        bytes: Corpo descomprimido
+
+    Raises:
+        DecompressionError: Dados inválidos (400) ou limite excedido (413)
+    """
+    chunks: List[bytes] = []
+    size = 0
+
+    def append(chunk: bytes) -> None:
+        nonlocal size
+        size += len(chunk)
+        if size > limit:
+            raise DecompressionError(f"Corpo descomprimido excede o limite de {limit} bytes", 413)
+        chunks.append(chunk)
+
+    try:
+        if encoding == "br":
+            decompressor = brotli.Decompressor()
+            chunk = decompressor.process(data, output_buffer_limit=DECOMPRESS_CHUNK_SIZE)
+            append(chunk)
+            # A entrada fica retida no decompressor; a saída vem com b"" até acabar
+            while chunk and not decompressor.is_finished():
+                chunk = decompressor.process(b"", output_buffer_limit=DECOMPRESS_CHUNK_SIZE)
+                append(chunk)
+            finished = decompressor.is_finished()
+        else:
+            # gzip: cabeçalho gzip; deflate: zlib (RFC 1950), com fallback para deflate cru
+            wbits = 16 + zlib.MAX_WBITS if encoding in ("gzip", "x-gzip") else zlib.MAX_WBITS
+            if encoding == "deflate" and (len(data) < 2 or data[0] & 0x0F != 8 or (data[0] * 256 + data[1]) % 31):
+                wbits = -zlib.MAX_WBITS
+            decompressor = zlib.decompressobj(wbits)
+            pending = data
+            while True:
+                chunk = decompressor.decompress(pending, DECOMPRESS_CHUNK_SIZE)
+                append(chunk)
+                pending = decompressor.unconsumed_tail
+                # Saída retida no zlib mesmo sem entrada pendente: continua com b""
+                if decompressor.eof or (not pending and not chunk):
+                    break
+            finished = decompressor.eof
+    except (zlib.error, brotli.error) as e:
+        raise DecompressionError(f"Corpo comprimido inválido ({encoding}): {e}")
+    if not finished:
+        raise DecompressionError(f"Corpo comprimido incompleto ({encoding})")
+    return b"".join(chunks)
+
+
+class _StreamCompressor:
+    """
+    Compressão por partes de uma resposta em streaming.
+
+    Cada parte é enviada assim que chega (flush por parte), para que o
+    cliente receba os dados sem esperar o fim do stream.
+    """
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+        else:
+            self._compressor = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def process(self, chunk: bytes, final: bool) -> bytes:
+        if self.encoding == "br":
+            output = self._compressor.process(chunk)
+            return output + (self._compressor.finish() if final else self._compressor.flush())
+        output = self._compressor.compress(chunk)
+        return output + self._compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+def _header(headers: List[Tuple[bytes, bytes]], name: bytes) -> Optional[str]:
+    for key, value in headers:
+        if key.lower() == name:
+            return value.decode("latin-1")
+    return None
+
+
+def _set_header(headers: List[Tuple[bytes, bytes]], name: bytes, value: Optional[str]) -> List[Tuple[bytes, bytes]]:
+    """Substitui (ou remove, com value=None) um header da lista ASGI."""
+    headers = [(key, val) for key, val in headers if key.lower() != name]
+    if value is not None:
+        headers.append((name, value.encode("latin-1")))
+    return headers
+
+
+class CompressionMiddleware:
+    """
+    Negocia a compressão de respostas e descomprime corpos de requisição.
+
+    Attributes:
+        app: Aplicação ASGI envolvida
+    """
+
+    def __init__(self, app: Callable):
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http" or not settings.COMPRESSION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        headers = scope["headers"]
+        content_encoding = (_header(headers, b"content-encoding") or "identity").strip().lower()
+        if content_encoding != "identity":
+            try:
+                scope, receive = await self._decompress_request(scope, receive, content_encoding)
+            except DecompressionError as e:
+                compression_stats["requests_rejected"] += 1
+                logger.warning("Corpo comprimido recusado em %s: %s", scope["path"], e)
+                extra = {"Accept-Encoding": ", ".join(REQUEST_ENCODINGS)} if e.status_code == 415 else None
+                response = ORJSONResponse({"detail": str(e)}, status_code=e.status_code, headers=extra)
+                await response(scope, receive, send)
+                return
+
+        encoding = choose_encoding(_header(headers, b"accept-encoding") or "")
+        await self.app(scope, receive, _ResponseCompressor(send, encoding) if encoding else _vary_only(send))
+
+    async def _decompress_request(
+        self,
+        scope: Dict[str, Any],
+        receive: Callable,
+        encoding: str
+    ) -> Tuple[Dict[str, Any], Callable]:
+        """
+        Lê e descomprime o corpo; devolve o scope e o receive com o corpo original.
+
+        Raises:
+            DecompressionError: 415 (endpoint ou codificação não suportados),
+                400 (dados inválidos) ou 413 (limite excedido)
+        """
+        if scope["path"] not in COMPRESSED_BODY_PATHS:
+            raise DecompressionError(f"Corpo comprimido não aceito em {scope['path']}", 415)
+        if encoding not in REQUEST_ENCODINGS:
+            raise DecompressionError(f"Content-Encoding não suportado: {encoding}", 415)
+
+        limit = settings.COMPRESSION_MAX_DECOMPRESSED_BYTES
+        chunks = []
+        size = 0
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                raise DecompressionError("Cliente desconectou durante o envio do corpo")
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > limit:
+                raise DecompressionError(f"Corpo comprimido excede o limite de {limit} bytes", 413)
+            chunks.append(chunk)
+            more_body = message.get("more_body", False)
+        data = b"".join(chunks)
+
+        if len(data) > DECOMPRESS_CHUNK_SIZE:
+            # Saída de até `limit` bytes: descompressão em thread
+            body = await asyncio.to_thread(decompress, data, encoding, limit)
+        else:
+            body = decompress(data, encoding, limit)
+        compression_stats["requests_decompressed"] += 1
+        compression_stats["request_bytes_in"] += len(data)
+        compression_stats["request_bytes_out"] += len(body)
+
+        headers = _set_header(scope["headers"], b"content-encoding", None)
+        headers = _set_header(headers, b"content-length", str(len(body)))
+        sent = False
+
+        async def replay() -> Dict[str, Any]:
+            nonlocal sent
+            if sent:
+                return await receive()
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        return {**scope, "headers": headers}, replay
+
+
+def _compressible(headers: List[Tuple[bytes, bytes]]) -> bool:
+    content_type = (_header(headers, b"content-type") or "").lower()
+    return content_type.startswith(COMPRESSIBLE_TYPES) and _header(headers, b"content-encoding") is None
+
+
+def _add_vary(headers: List[Tuple[bytes, bytes]]) -> List[Tuple[bytes, bytes]]:
+    """Acrescenta Accept-Encoding ao Vary existente (ex.: "Accept" das respostas MessagePack)."""
+    vary = _header(headers, b"vary")
+    if vary and "accept-encoding" in vary.lower():
+        return headers
+    return _set_header(headers, b"vary", f"{vary}, Accept-Encoding" if vary else "Accept-Encoding")
+
+
+def _vary_only(send: Callable) -> Callable:
+    """Cliente sem compressão: a resposta segue igual, só com Vary para caches."""
+
+    async def wrapped(message: Dict[str, Any]) -> None:
+        if message["type"] == "http.response.start" and _compressible(message.get("headers", [])):
+            message = {**message, "headers": _add_vary(list(message["headers"]))}
+        await send(message)
+
+    return wrapped
+
+
+class _ResponseCompressor:
+    """
+    `send` que comprime a resposta quando o tipo e o tamanho compensam.
+
+    O início da resposta (status e headers) fica retido até a primeira parte
+    do corpo: só então se sabe se o corpo é pequeno (enviado sem compressão),
+    inteiro (comprimido de uma vez, com Content-Length) ou em streaming.
+    """
+
+    def __init__(self, send: Callable, encoding: str):
+        self.send = send
+        self.encoding = encoding
+        self.start: Optional[Dict[str, Any]] = None
+        self.stream: Optional[_StreamCompressor] = None
+        self.passthrough = False
+
+    async def __call__(self, message: Dict[str, Any]) -> None:
+        if message["type"] == "http.response.start":
+            headers = list(message.get("headers", []))
+            if message["status"] in (204, 304) or not _compressible(headers):
+                self.passthrough = True
+                await self.send(message)
+                return
+            self.start = {**message, "headers": _add_vary(headers)}
+            return
+        if self.passthrough or message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.stream is None and self.start is not None:
+            start, self.start = self.start, None
+            if not more_body and len(body) < settings.COMPRESSION_MIN_SIZE:
+                self.passthrough = True
+                await self.send(start)
+                await self.send(message)
+                return
+            headers = _set_header(start["headers"], b"content-encoding", self.encoding)
+            etag = _header(headers, b"etag")
+            if etag and not etag.startswith("W/"):
+                # Outra representação: o ETag forte do original deixa de valer
+                headers = _set_header(headers, b"etag", f"W/{etag}")
+            if not more_body:
+                compressed = await self._compress(body)
+                headers = _set_header(headers, b"content-length", str(len(compressed)))
+                await self.send({**start, "headers": headers})
+                await self.send({"type": "http.response.body", "body": compressed})
+                return
+            self.stream = _StreamCompressor(self.encoding)
+            compression_stats["responses_compressed"] += 1
+            await self.send({**start, "headers": _set_header(headers, b"content-length", None)})
+
+        compressed = self.stream.process(body, final=not more_body)
+        self._count(len(body), len(compressed))
+        await self.send({"type": "http.response.body", "body": compressed, "more_body": more_body})
+
+    async def _compress(self, body: bytes) -> bytes:
+        if len(body) > THREAD_THRESHOLD:
+            compressed = await asyncio.to_thread(compress, body, self.encoding)
+        else:
+            compressed = compress(body, self.encoding)
+        self._count(len(body), len(compressed))
+        compression_stats["responses_compressed"] += 1
+        return compressed
+
+    def _count(self, original: int, compressed: int) -> None:
+        compression_stats["response_bytes_in"] += original
+        compression_stats["response_bytes_out"] += compressed
@@ -0,0 +1,107 @@
+"""
+Profiling Middleware
+====================
+Middleware ASGI do profiling sob demanda (ver core/profiling.py).
+
+    - `X-Profile: cpu` ou `sample` (com `X-Profile-Token`): perfila a
+      requisição. A resposta leva `X-Profile-Id` e `X-Profile-Artifacts`
+      (arquivos em PROFILING_DIR, gravados logo após a resposta) ou
+      `X-Profile-Status: busy` se outro perfil estiver em andamento.
+    - Sessão aberta por POST /api/admin/profiles: cada requisição
+      concluída (fora de /api/admin) conta para a sessão.
+
+Só é registrado com PROFILING_ENABLED=true; sem header e sem sessão, o
+custo é uma busca nos headers da requisição.
+"""
+
+from typing import Any, Callable, Dict, Optional
+
+from fastapi.responses import ORJSONResponse
+
+# Importar o coordenador de perfis
+from backend.app.core.profiling import REQUEST_PROFILE_KINDS, Profiler, ProfilerBusy
+
+# Headers do profiling por requisição
+PROFILE_HEADER = b"x-profile"
+TOKEN_HEADER = b"x-profile-token"
+
+# Requisições que não contam para as sessões (os próprios endpoints de profiling)
+ADMIN_PREFIX = "/api/admin/"
+
+
+def _header(scope: Dict[str, Any], name: bytes) -> Optional[str]:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+class ProfilingMiddleware:
+    """
+    Liga o perfil pedido no header e conta as requisições das sessões.
+
+    Attributes:
+        app: Aplicação ASGI
+        profiler: Coordenador dos perfis (o mesmo dos endpoints admin)
+    """
+
+    def __init__(self, app: Callable, profiler: Profiler):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        kind = _header(scope, PROFILE_HEADER)
+        if kind is not None:
+            await self._profile_request(kind.strip().lower(), scope, receive, send)
+            return
+
+        if self.profiler.session is None or scope["path"].startswith(ADMIN_PREFIX):
+            await self.app(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.profiler.request_done()
+
+    async def _profile_request(self, kind: str, scope, receive, send) -> None:
+        """Perfila uma requisição pedida pelo header X-Profile."""
+        profiler = self.profiler
+        if not profiler.authorized(_header(scope, TOKEN_HEADER)):
+            response = ORJSONResponse({"detail": "Token de profiling inválido"}, status_code=403)
+            await response(scope, receive, send)
+            return
+        if kind not in REQUEST_PROFILE_KINDS:
+            response = ORJSONResponse(
+                {"detail": f"X-Profile inválido. Use: {', '.join(REQUEST_PROFILE_KINDS)}"}, status_code=400
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            session = profiler.start(kind, from_header=True)
+        except ProfilerBusy:
+            extra = [(b"x-profile-status", b"busy")]
+            session = None
+        else:
+            extra = [
+                (b"x-profile-id", session.id.encode("latin-1")),
+                (b"x-profile-artifacts", ",".join(session.artifacts).encode("latin-1")),
+            ]
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": list(message.get("headers", [])) + extra}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            if session is not None:
+                profiler.finish(session)
+            elif not scope["path"].startswith(ADMIN_PREFIX):
+                # Ocupado por uma sessão admin: a requisição conta para ela
+                profiler.request_done()
@@ -0,0 +1,94 @@
+"""
+API Responses
+=============
+Serialização rápida das respostas da API.
+
+Os resultados são validados uma única vez (no schema Pydantic) e
+codificados diretamente com orjson, sem a segunda validação + encoder
+padrão que o FastAPI aplica a dicts retornados com `response_model`.
+Clientes de alto volume podem pedir MessagePack via header `Accept`.
+"""
+
+from fastapi import Request
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import BaseModel
+from typing import Any, Dict, Optional, Type
+import msgpack
+
+from backend.app.api.compression import parse_quality_values
+
+# Tipos MIME aceitos para MessagePack
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack", "application/vnd.msgpack")
+
+
+class MsgPackResponse(Response):
+    """
+    Resposta codificada em MessagePack.
+    """
+    media_type = "application/msgpack"
+
+    def render(self, content: Any) -> bytes:
+        return msgpack.packb(content, use_bin_type=True)
+
+
+def wants_msgpack(request: Request) -> bool:
+    """
+    Verifica se o cliente pediu MessagePack no header Accept.
+
+    Só tipos MessagePack explícitos contam (curingas ficam com JSON); com
+    q-values, MessagePack precisa de q > 0 e de q pelo menos igual ao do JSON.
+
+    Args:
+        request: Requisição HTTP
+
+    Returns:
+        bool: True se MessagePack é a representação preferida
+    """
+    accept = request.headers.get("accept")
+    if not accept:
+        return False
+    accepted = parse_quality_values(accept)
+    msgpack_quality = max(accepted.get(media_type, 0.0) for media_type in MSGPACK_MEDIA_TYPES)
+    if msgpack_quality <= 0:
+        return False
+    json_quality = accepted.get("application/json", accepted.get("application/*", accepted.get("*/*", 0.0)))
+    return msgpack_quality >= json_quality
+
+
+def validate_once(schema: Type[BaseModel], data: Dict[str, Any], **dump_options: Any) -> Dict[str, Any]:
+    """
+    Valida um resultado contra o schema e devolve o dict pronto para codificar.
+
+    Args:
+        schema: Schema Pydantic da resposta
+        data: Dict produzido pelos serviços
+        **dump_options: Opções do model_dump (ex.: exclude_none=True)
+
+    Returns:
+        Dict[str, Any]: Dados validados (campos fora do schema são descartados)
+    """
+    return schema.model_validate(data).model_dump(**dump_options)
+
+
+def encode_response(
+    request: Request,
+    content: Any,
+    status_code: int = 200,
+    headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """
+    Codifica o conteúdo já validado conforme o header Accept.
+
+    Args:
+        request: Requisição HTTP (para negociação de conteúdo)
+        content: Dados já validados
+        status_code: Status HTTP
+        headers: Headers adicionais (ex.: Server-Timing)
+
+    Returns:
+        Response: JSON (orjson) ou MessagePack
+    """
+    response_class = MsgPackResponse if wants_msgpack(request) else ORJSONResponse
+    response = response_class(content=content, status_code=status_code, headers=headers)
+    response.headers["Vary"] = "Accept"
+    return response
@@ -4,14 +4,44 @@ API Routes
 Define todos os endpoints da API de classificação de emails.
 """
 
-from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Query, Request, Response, WebSocket
+from fastapi.responses import FileResponse, StreamingResponse
+from pydantic import ValidationError
+from starlette.requests import HTTPConnection
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+import asyncio
 import logging
 import time
 
 # Importar serviços e models
+from backend.app.api.compression import compression_stats
+from backend.app.api.responses import encode_response, validate_once
+from backend.app.api.websocket import ENCODINGS, POLICY_VIOLATION, ClassificationSession, ws_stats
+from backend.app.core.admission import AdmissionController, AdmissionRejected
+from backend.app.core.config import settings, PIPELINE_MODES
+from backend.app.core.deadline import Deadline
+from backend.app.core.metrics import latency_by_language
+from backend.app.core.profiling import Profiler, ProfilerBusy
+from backend.app.core.tracing import start_trace, end_trace, span, Trace
 from backend.app.services.classifier import EmailClassifier
-from backend.app.services.file_processor import FileProcessor
-from backend.app.models.schemas import EmailTextRequest, ClassificationResponse
+from backend.app.services.file_processor import FileProcessor, ALLOWED_EXTENSIONS
+from backend.app.services.history_manager import HistoryManager
+from backend.app.services.job_manager import JobManager, JobQueueFullError
+from backend.app.services.llm_scheduler import DEFAULT_TENANT
+from backend.app.services.response_manager import ResponseManager
+from backend.app.services.stats_manager import StatsManager
+from backend.app.models.schemas import (
+    EmailTextRequest,
+    ClassificationResponse,
+    HistoryPage,
+    JobCreateRequest,
+    JobCreatedResponse,
+    JobStatusResponse,
+    ProfileSessionInfo,
+    ProfileSessionRequest,
+    SuggestedResponseResult
+)
 
 # Configurar logger
 logger = logging.getLogger(__name__)
@@ -19,9 +49,122 @@ logger = logging.getLogger(__name__)
 # Criar router
 router = APIRouter()
 
+# Tipos MIME da exportação do histórico
+EXPORT_MEDIA_TYPES = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+
+# Classes que o cliente pode declarar em X-Priority (urgent é detectada pelo conteúdo)
+CLIENT_PRIORITIES = ("interactive", "batch")
+
+# Tamanho máximo do identificador de tenant
+MAX_TENANT_LENGTH = 64
+
 # Instanciar serviços
 classifier = EmailClassifier()
 file_processor = FileProcessor()
+history = HistoryManager()
+job_manager = JobManager(classifier, file_processor, history=history)
+response_manager = ResponseManager(classifier)
+stats_manager = StatsManager()
+admission = AdmissionController()
+profiler = Profiler()
+
+
+def _classification_response(
+    request: Request, result: dict, trace: Trace, email_text: str, source: str
+) -> Response:
+    """
+    Monta a resposta de classificação: adiciona o detalhamento de tempo,
+    enfileira o resultado no histórico, valida uma única vez contra
+    ClassificationResponse e codifica com orjson (ou MessagePack, se
+    pedido no header Accept).
+    
+    Args:
+        request: Requisição HTTP (negociação de conteúdo)
+        result: Resultado da classificação
+        trace: Trace da requisição
+        email_text: Texto classificado (o histórico grava apenas o hash)
+        source: Origem para o histórico (text ou file)
+        
+    Returns:
+        Response: Resposta codificada, com header Server-Timing
+    """
+    result["timings"] = trace.timings()
+    history.record(email_text, result, source)
+    headers = {"Server-Timing": trace.server_timing()} if settings.SERVER_TIMING_ENABLED else None
+    return encode_response(request, validate_once(ClassificationResponse, result), headers=headers)
+
+
+def _rejected(e: AdmissionRejected) -> HTTPException:
+    """Recusa do controle de admissão como resposta HTTP (429/503 com Retry-After)."""
+    return HTTPException(status_code=e.status_code, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+
+def _epoch(value: Optional[datetime]) -> Optional[float]:
+    """Converte uma data da query string em timestamp (sem fuso = UTC)."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _request_deadline(request: Request) -> Deadline:
+    """
+    Prazo da requisição: REQUEST_DEADLINE_SECONDS, ou menos se o cliente
+    enviar o header X-Request-Timeout (segundos).
+    
+    Args:
+        request: Requisição HTTP
+        
+    Returns:
+        Deadline: Prazo iniciado agora
+    """
+    seconds = settings.REQUEST_DEADLINE_SECONDS
+    header = request.headers.get("x-request-timeout")
+    if header is not None:
+        try:
+            requested = float(header)
+        except ValueError:
+            requested = 0.0
+        if not requested > 0:
+            raise HTTPException(
+                status_code=400,
+                detail="X-Request-Timeout deve ser um número de segundos maior que zero"
+            )
+        seconds = min(seconds, requested)
+    return Deadline(seconds)
+
+
+def _tenant(request: HTTPConnection) -> str:
+    """
+    Cliente da API para o fair queueing: header SCHEDULER_TENANT_HEADER
+    (ex.: X-Tenant-ID) ou, sem ele, o IP de origem.
+    """
+    tenant = request.headers.get(settings.SCHEDULER_TENANT_HEADER, "").strip()[:MAX_TENANT_LENGTH]
+    if tenant:
+        return tenant
+    return request.client.host if request.client else DEFAULT_TENANT
+
+
+def _flow(request: HTTPConnection) -> Tuple[str, str]:
+    """
+    Classe de prioridade e tenant de uma classificação síncrona. Clientes de
+    carga em lote podem se declarar com X-Priority: batch.
+    
+    Args:
+        request: Requisição HTTP ou conexão WebSocket
+        
+    Returns:
+        Tuple[str, str]: (classe, tenant)
+    """
+    priority = request.headers.get("x-priority", "interactive").strip().lower()
+    if priority not in CLIENT_PRIORITIES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"X-Priority inválido. Use: {', '.join(CLIENT_PRIORITIES)}"
+        )
+    return priority, _tenant(request)
+
 
 # ==================== ENDPOINTS ====================
 
@@ -41,19 +184,22 @@ async def health_check():
 
 
 @router.post("/classify-text", response_model=ClassificationResponse)
-async def classify_text(request: EmailTextRequest):
+async def classify_text(request: EmailTextRequest, http_request: Request):
     """
     Classifica um email enviado como texto direto
     
     Args:
         request: Objeto com o texto do email
+        http_request: Requisição HTTP (negociação de conteúdo)
         
     Returns:
         ClassificationResponse: Resultado da classificação
     """
+    trace = start_trace("POST /api/classify-text")
     try:
-        start_time = time.time()
-        logger.info("Recebida requisição de classificação de texto")
+        logger.debug("Recebida requisição de classificação de texto")
+        deadline = _request_deadline(http_request)
+        priority, tenant = _flow(http_request)
         
         # Validar texto
         if not request.email_text or len(request.email_text.strip()) == 0:
@@ -69,76 +215,541 @@ async def classify_text(request: EmailTextRequest):
                 detail="O texto deve ter pelo menos 10 caracteres"
             )
         
-        # Classificar email
-        result = await classifier.classify_email(request.email_text)
-        
-        # Calcular tempo de processamento
-        processing_time = int((time.time() - start_time) * 1000)
-        result["processing_time_ms"] = processing_time
+        # Classificar email (processing_time_ms vem do classificador)
+        async with admission.slot("text", deadline):
+            result = await classifier.classify_email(
+                request.email_text, deadline, request.mode, request.generate_response,
+                priority=priority, tenant=tenant
+            )
+        if result.get("success") and not request.generate_response:
+            with span("responses.defer"):
+                result["response_id"] = await response_manager.defer(
+                    request.email_text, result["classification"]
+                )
         
-        logger.info(f"Classificação concluída em {processing_time}ms")
-        return result
+        response = _classification_response(http_request, result, trace, request.email_text, "text")
+        logger.debug("Requisição concluída em %.1fms", result["timings"]["total"])
+        return response
         
     except HTTPException:
         raise
+    except AdmissionRejected as e:
+        raise _rejected(e)
     except Exception as e:
-        logger.error(f"Erro ao classificar texto: {str(e)}")
+        logger.error("Erro ao classificar texto: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Erro ao processar classificação: {str(e)}"
         )
+    finally:
+        end_trace(trace)
 
 
 @router.post("/classify-file", response_model=ClassificationResponse)
-async def classify_file(file: UploadFile = File(...)):
+async def classify_file(
+    http_request: Request,
+    file: UploadFile = File(...),
+    mode: Optional[str] = Form(None),
+    generate_response: bool = Form(True)
+):
     """
-    Classifica um email enviado como arquivo (.txt ou .pdf)
+    Classifica um email enviado como arquivo (.txt, .pdf, .html/.htm ou .eml)
     
     Args:
-        file: Arquivo de email (.txt ou .pdf)
+        http_request: Requisição HTTP (negociação de conteúdo)
+        file: Arquivo de email (.txt, .pdf, .html/.htm ou .eml)
+        mode: Modo do pipeline, two_call ou combined (padrão: AI_PIPELINE_MODE)
+        generate_response: False para gerar a resposta depois (retorna response_id)
         
     Returns:
         ClassificationResponse: Resultado da classificação
     """
+    trace = start_trace("POST /api/classify-file")
     try:
-        start_time = time.time()
-        logger.info(f"Recebido arquivo: {file.filename}")
+        logger.debug("Recebido arquivo: %s", file.filename)
+        deadline = _request_deadline(http_request)
+        priority, tenant = _flow(http_request)
         
-        # Validar tipo de arquivo
-        if not file.filename.endswith(('.txt', '.pdf')):
+        if mode is not None and mode not in PIPELINE_MODES:
             raise HTTPException(
                 status_code=400,
-                detail="Apenas arquivos .txt e .pdf são permitidos"
+                detail=f"Modo inválido. Use: {', '.join(PIPELINE_MODES)}"
             )
         
-        # Processar arquivo e extrair texto
-        email_text = await file_processor.process_file(file)
-        
-        if not email_text or len(email_text.strip()) == 0:
+        # Validar tipo de arquivo
+        if not file.filename.lower().endswith(ALLOWED_EXTENSIONS):
             raise HTTPException(
                 status_code=400,
-                detail="Não foi possível extrair texto do arquivo"
+                detail="Apenas arquivos .txt, .pdf, .html e .eml são permitidos"
             )
         
-        # Classificar email
-        result = await classifier.classify_email(email_text)
-        
-        # Calcular tempo de processamento
-        processing_time = int((time.time() - start_time) * 1000)
-        result["processing_time_ms"] = processing_time
+        # Extração + classificação: vaga no pool de arquivos (mais pesado que texto)
+        async with admission.slot("file", deadline):
+            # Processar arquivo e extrair texto
+            with span("file"):
+                email_text = await file_processor.process_file(file)
+            
+            if not email_text or len(email_text.strip()) == 0:
+                raise HTTPException(
+                    status_code=400,
+                    detail="Não foi possível extrair texto do arquivo"
+                )
+            
+            # Classificar email
+            result = await classifier.classify_email(
+                email_text, deadline, mode, generate_response, priority=priority, tenant=tenant
+            )
         result["filename"] = file.filename
+        if result.get("success") and not generate_response:
+            with span("responses.defer"):
+                result["response_id"] = await response_manager.defer(email_text, result["classification"])
         
-        logger.info(f"Arquivo processado em {processing_time}ms")
-        return result
+        response = _classification_response(http_request, result, trace, email_text, "file")
+        logger.debug("Arquivo processado em %.1fms", result["timings"]["total"])
+        return response
         
     except HTTPException:
         raise
+    except AdmissionRejected as e:
+        raise _rejected(e)
     except Exception as e:
-        logger.error(f"Erro ao processar arquivo: {str(e)}")
+        logger.error("Erro ao processar arquivo: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Erro ao processar arquivo: {str(e)}"
         )
+    finally:
+        end_trace(trace)
+
+
+@router.websocket("/ws/classify")
+async def classify_stream(websocket: WebSocket, encoding: str = "json"):
+    """
+    Classificação por WebSocket para clientes de alta frequência: uma
+    conexão, mensagens com correlation id, resultados fora de ordem e
+    controle de fluxo por créditos (protocolo em api/websocket.py).
+    
+    Cada mensagem passa pelo mesmo pipeline do classify-text: vaga no pool
+    de admissão de texto, EmailClassifier, histórico e resposta adiada.
+    
+    Args:
+        websocket: Conexão (headers X-Tenant-ID e X-Priority valem para todas as mensagens)
+        encoding: json ou msgpack (mensagens do servidor)
+    """
+    try:
+        if not settings.WS_ENABLED:
+            raise HTTPException(status_code=404, detail="WebSocket de classificação desativado")
+        if encoding not in ENCODINGS:
+            raise HTTPException(status_code=400, detail=f"Codificação inválida. Use: {', '.join(ENCODINGS)}")
+        priority, tenant = _flow(websocket)
+    except HTTPException as e:
+        await websocket.close(code=POLICY_VIOLATION, reason=e.detail)
+        return
+    
+    async def classify_message(message: Dict[str, Any]) -> Dict[str, Any]:
+        trace = start_trace("WS /api/ws/classify")
+        try:
+            seconds = settings.REQUEST_DEADLINE_SECONDS
+            if message["timeout"] is not None:
+                seconds = min(seconds, message["timeout"])
+            deadline = Deadline(seconds)
+            email_text = message["email_text"]
+            
+            async with admission.slot("text", deadline):
+                result = await classifier.classify_email(
+                    email_text, deadline, message["mode"], message["generate_response"],
+                    priority=priority, tenant=tenant
+                )
+            if result.get("success") and not message["generate_response"]:
+                with span("responses.defer"):
+                    result["response_id"] = await response_manager.defer(email_text, result["classification"])
+            
+            result["timings"] = trace.timings()
+            history.record(email_text, result, "websocket")
+            return validate_once(ClassificationResponse, result)
+        finally:
+            end_trace(trace)
+    
+    logger.debug("Conexão WebSocket aberta (tenant %s)", tenant)
+    await ClassificationSession(websocket, classify_message, settings.WS_MAX_IN_FLIGHT, encoding).run()
+    logger.debug("Conexão WebSocket encerrada (tenant %s)", tenant)
+
+
+@router.post("/jobs", response_model=JobCreatedResponse, status_code=202)
+async def create_job(request: Request):
+    """
+    Cria um job assíncrono e retorna seu ID imediatamente.
+    
+    Aceita:
+        - JSON com `email_text` (um email) ou `emails` (lote)
+        - multipart/form-data com um ou mais arquivos no campo `files` (ou `file`)
+    
+    Args:
+        request: Requisição HTTP (JSON ou multipart)
+        
+    Returns:
+        JobCreatedResponse: ID e URL de acompanhamento do job
+    """
+    content_type = request.headers.get("content-type", "")
+    
+    if content_type.startswith("multipart/form-data"):
+        form = await request.form()
+        uploads = [f for f in form.getlist("files") + form.getlist("file") if hasattr(f, "filename")]
+        if not uploads:
+            raise HTTPException(status_code=400, detail="Nenhum arquivo enviado no campo 'files'")
+        
+        items = []
+        for upload in uploads:
+            if not upload.filename.lower().endswith(ALLOWED_EXTENSIONS):
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Apenas arquivos .txt, .pdf, .html e .eml são permitidos ({upload.filename})"
+                )
+            content = await upload.read()
+            if len(content) > file_processor.max_size_bytes:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Arquivo muito grande ({upload.filename}). Máximo: {settings.MAX_FILE_SIZE_MB}MB"
+                )
+            items.append({"filename": upload.filename, "content": content})
+    else:
+        try:
+            payload = JobCreateRequest.model_validate(await request.json())
+        except ValidationError as e:
+            raise HTTPException(status_code=422, detail=e.errors(include_url=False, include_context=False))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Corpo da requisição deve ser JSON válido")
+        
+        if payload.email_text and payload.emails:
+            raise HTTPException(status_code=400, detail="Informe apenas 'email_text' ou 'emails'")
+        texts = payload.emails or ([payload.email_text.strip()] if payload.email_text else [])
+        if not texts:
+            raise HTTPException(status_code=400, detail="Informe 'email_text' ou 'emails'")
+        items = [{"text": text} for text in texts]
+    
+    if len(items) > settings.JOBS_MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Máximo de {settings.JOBS_MAX_BATCH_SIZE} itens por job"
+        )
+    
+    try:
+        job_id = await job_manager.submit(items, _tenant(request))
+    except JobQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "30"})
+    
+    return {
+        "job_id": job_id,
+        "status": "queued",
+        "total": len(items),
+        "status_url": f"/api/jobs/{job_id}"
+    }
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatusResponse)
+async def get_job(job_id: str, request: Request, include_results: bool = True):
+    """
+    Retorna status, progresso e resultados de um job.
+    
+    Os resultados de cada item já foram validados ao serem gravados, então
+    a resposta (que pode ter milhares de itens) é codificada diretamente,
+    sem revalidar contra JobStatusResponse.
+    
+    Args:
+        job_id: ID retornado por POST /jobs
+        request: Requisição HTTP (negociação de conteúdo)
+        include_results: Se False, retorna apenas status e progresso
+        
+    Returns:
+        JobStatusResponse: Estado atual do job
+    """
+    job = await job_manager.get_job(job_id, include_results)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job não encontrado ou expirado")
+    
+    job["job_id"] = job.pop("id")
+    return encode_response(request, job)
+
+
+@router.get("/responses/{response_id}", response_model=SuggestedResponseResult)
+async def get_suggested_response(response_id: str, request: Request):
+    """
+    Retorna a resposta sugerida de uma classificação feita com
+    generate_response=false, gerando-a na primeira consulta. As consultas
+    seguintes usam a resposta gravada, sem nova chamada ao LLM.
+    
+    Args:
+        response_id: Handle retornado na classificação
+        request: Requisição HTTP (prazo e negociação de conteúdo)
+        
+    Returns:
+        SuggestedResponseResult: Resposta sugerida
+    """
+    deadline = _request_deadline(request)
+    result = await response_manager.get_or_generate(response_id, deadline, _tenant(request))
+    if result is None:
+        raise HTTPException(status_code=404, detail="Resposta não encontrada ou expirada")
+    
+    return encode_response(request, result)
+
+
+def _history_filters(
+    start: Optional[datetime],
+    end: Optional[datetime],
+    classification: Optional[str],
+    min_confidence: Optional[float],
+    max_confidence: Optional[float],
+    content_hash: Optional[str]
+) -> Dict[str, Any]:
+    """
+    Valida os filtros do histórico e converte para os parâmetros do store.
+    
+    Datas sem fuso horário são interpretadas como UTC.
+    
+    Returns:
+        dict: Filtros para HistoryManager.query/export
+    """
+    if not history.enabled:
+        raise HTTPException(status_code=503, detail="Histórico de classificações desativado")
+    if classification is not None:
+        classification = classification.strip().upper()
+        if classification not in ("PRODUTIVO", "IMPRODUTIVO"):
+            raise HTTPException(status_code=400, detail="Categoria inválida. Use: PRODUTIVO, IMPRODUTIVO")
+    if min_confidence is not None and max_confidence is not None and min_confidence > max_confidence:
+        raise HTTPException(status_code=400, detail="min_confidence maior que max_confidence")
+    
+    return {
+        "start": _epoch(start),
+        "end": _epoch(end),
+        "classification": classification,
+        "min_confidence": min_confidence,
+        "max_confidence": max_confidence,
+        "content_hash": content_hash.lower() if content_hash else None,
+    }
+
+
+@router.get("/history", response_model=HistoryPage)
+async def get_history(
+    request: Request,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    classification: Optional[str] = None,
+    min_confidence: Optional[float] = Query(None, ge=0.0, le=1.0),
+    max_confidence: Optional[float] = Query(None, ge=0.0, le=1.0),
+    content_hash: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None
+):
+    """
+    Consulta o histórico de classificações, da mais recente para a mais
+    antiga, com paginação por cursor (passe o next_cursor recebido).
+    
+    Args:
+        request: Requisição HTTP (negociação de conteúdo)
+        start: Início do período (ISO 8601, inclusivo)
+        end: Fim do período (ISO 8601, exclusivo)
+        classification: PRODUTIVO ou IMPRODUTIVO
+        min_confidence: Confiança mínima
+        max_confidence: Confiança máxima
+        content_hash: SHA-256 do texto do email
+        limit: Itens por página (1 a 500)
+        cursor: next_cursor da página anterior
+        
+    Returns:
+        HistoryPage: Itens e cursor da próxima página
+    """
+    filters = _history_filters(start, end, classification, min_confidence, max_confidence, content_hash)
+    try:
+        page = await history.query(cursor, limit, **filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    # Linhas gravadas a partir de resultados já validados
+    return encode_response(request, page)
+
+
+@router.get("/history/export")
+async def export_history(
+    format: str = "ndjson",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    classification: Optional[str] = None,
+    min_confidence: Optional[float] = Query(None, ge=0.0, le=1.0),
+    max_confidence: Optional[float] = Query(None, ge=0.0, le=1.0),
+    content_hash: Optional[str] = None
+):
+    """
+    Exporta o histórico filtrado em streaming (CSV ou NDJSON), lendo o
+    banco uma página por vez: a memória usada não depende do tamanho da
+    exportação.
+    
+    Args:
+        format: csv ou ndjson
+        start, end, classification, min_confidence, max_confidence,
+        content_hash: Mesmos filtros de GET /history
+        
+    Returns:
+        StreamingResponse: Arquivo CSV ou NDJSON
+    """
+    if format not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail="Formato inválido. Use: csv, ndjson")
+    filters = _history_filters(start, end, classification, min_confidence, max_confidence, content_hash)
+    return StreamingResponse(
+        history.export(format, **filters),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="history.{format}"'}
+    )
+
+
+@router.get("/stats")
+async def get_stats(
+    request: Request,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    granularity: Optional[str] = None
+):
+    """
+    Estatísticas de classificação de uma janela: proporção de categorias,
+    distribuição de confiança, percentis de latência e taxas de falha e de
+    fallback, calculadas a partir dos rollups por hora/dia de todos os
+    workers (tempo constante em relação à quantidade de classificações).
+    
+    Args:
+        request: Requisição HTTP (negociação de conteúdo)
+        start: Início da janela (ISO 8601; padrão: 24h antes de end)
+        end: Fim da janela (ISO 8601; padrão: agora)
+        granularity: hour ou day para incluir a série (padrão: só o total)
+        
+    Returns:
+        dict: Janela alinhada a horas (UTC), indicadores e série
+    """
+    if granularity is not None and granularity not in ("hour", "day"):
+        raise HTTPException(status_code=400, detail="Granularidade inválida. Use: hour, day")
+    end_ts = _epoch(end) if end is not None else time.time()
+    start_ts = _epoch(start) if start is not None else end_ts - 86400
+    if start_ts >= end_ts:
+        raise HTTPException(status_code=400, detail="start deve ser anterior a end")
+    
+    try:
+        stats = await asyncio.to_thread(stats_manager.query, start_ts, end_ts, granularity)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return encode_response(request, stats)
+
+
+@router.get("/metrics")
+async def get_metrics():
+    """
+    Latência de classificação por idioma detectado, estado do roteamento
+    de modelos (decisões, fallbacks e latência por modelo), do hedging
+    (janela recente), do parsing das classificações do LLM, do índice
+    few-shot, da gravação do histórico, da compressão HTTP, do controle
+    de admissão, do escalonamento das chamadas ao LLM, do WebSocket de
+    classificação e do profiling sob demanda.
+    
+    Returns:
+        dict: Idioma -> contagem e percentis (ms); roteamento; hedging;
+        taxas de falha e de recuperação do parsing; few-shot; histórico;
+        bytes antes/depois da compressão; fila e recusas por pool; fila e
+        espera por classe de prioridade; conexões e mensagens WebSocket;
+        perfil ativo e contadores do profiling
+    """
+    return {
+        "latency_by_language": latency_by_language.snapshot(),
+        "model_routing": classifier.router.snapshot(),
+        "hedging": classifier.hedger.snapshot() if classifier.hedger else None,
+        "llm_parsing": classifier.result_parser.snapshot(),
+        "fewshot": classifier.fewshot_snapshot(),
+        "history": history.snapshot(),
+        "compression": dict(compression_stats),
+        "admission": admission.snapshot(),
+        "scheduler": classifier.scheduler.snapshot() if classifier.scheduler else None,
+        "websocket": dict(ws_stats),
+        "profiling": profiler.snapshot()
+    }
+
+
+def _profiling_access(request: Request) -> None:
+    """Exige profiling ativo (404) e o token em X-Profile-Token (403)."""
+    if not profiler.enabled:
+        raise HTTPException(status_code=404, detail="Profiling desativado")
+    if not profiler.authorized(request.headers.get("X-Profile-Token")):
+        raise HTTPException(status_code=403, detail="Token de profiling inválido")
+
+
+@router.post("/admin/profiles", response_model=ProfileSessionInfo, status_code=202)
+async def start_profile(payload: ProfileSessionRequest, request: Request):
+    """
+    Inicia uma sessão de profiling das próximas requisições do processo.
+    
+    A sessão termina após `requests` requisições concluídas (fora de
+    /api/admin) ou PROFILING_MAX_SECONDS; os artefatos vão para
+    PROFILING_DIR. Cada worker tem seus próprios perfis.
+    
+    Args:
+        payload: Tipo de perfil e quantidade de requisições
+        request: Requisição HTTP (header X-Profile-Token)
+        
+    Returns:
+        ProfileSessionInfo: Sessão iniciada
+    """
+    _profiling_access(request)
+    if payload.requests > settings.PROFILING_MAX_REQUESTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Máximo de {settings.PROFILING_MAX_REQUESTS} requisições por sessão"
+        )
+    try:
+        session = profiler.start(payload.kind, payload.requests)
+    except ProfilerBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return session.info()
+
+
+@router.get("/admin/profiles")
+async def list_profiles(request: Request):
+    """
+    Perfil em andamento e artefatos gravados.
+    
+    Returns:
+        dict: `active` (sessão ou null) e `artifacts` (nome, tamanho e
+        data, do mais recente ao mais antigo)
+    """
+    _profiling_access(request)
+    return {
+        "active": profiler.session.info() if profiler.session else None,
+        "artifacts": await asyncio.to_thread(profiler.artifacts)
+    }
+
+
+@router.delete("/admin/profiles/active", response_model=ProfileSessionInfo)
+async def stop_profile(request: Request):
+    """
+    Encerra a sessão ativa antes do fim e grava os artefatos.
+    
+    Returns:
+        ProfileSessionInfo: Sessão encerrada
+    """
+    _profiling_access(request)
+    session = profiler.finish()
+    if session is None:
+        raise HTTPException(status_code=404, detail="Nenhum perfil em andamento")
+    return session.info()
+
+
+@router.get("/admin/profiles/{name}")
+async def download_profile(name: str, request: Request):
+    """
+    Baixa um artefato de profiling (para análise fora do servidor).
+    
+    Args:
+        name: Nome do arquivo (GET /admin/profiles)
+    """
+    _profiling_access(request)
+    path = profiler.artifact_path(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Artefato não encontrado")
+    return FileResponse(path, media_type="application/octet-stream", filename=name)
 
 
 @router.get("/test")
@@ -155,6 +766,15 @@ async def test_endpoint():
             "/api/health",
             "/api/classify-text",
             "/api/classify-file",
+            "/api/ws/classify",
+            "/api/jobs",
+            "/api/jobs/{job_id}",
+            "/api/responses/{response_id}",
+            "/api/history",
+            "/api/history/export",
+            "/api/stats",
+            "/api/metrics",
+            "/api/admin/profiles",
             "/api/test"
         ]
     }
\ No newline at end of file
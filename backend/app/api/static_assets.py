@@ -0,0 +1,306 @@
+"""
+Static Assets
+=============
+Entrega do frontend a partir da memória, com cache HTTP.
+
+Os arquivos de frontend/css, frontend/js e frontend/assets recebem um nome
+com o hash do conteúdo (ex.: css/styles.3f2a9c1e0b7d.css) e são
+pré-comprimidos uma única vez (gzip 9 e brotli 11, níveis caros demais para
+comprimir a cada requisição). O index.html é reescrito para apontar para os
+nomes com hash e fica em memória como os demais.
+
+    - Assets com hash: Cache-Control immutable por STATIC_CACHE_MAX_AGE. Um
+      deploy com conteúdo novo gera nomes novos, então o navegador nunca
+      precisa revalidar.
+    - index.html e nomes originais (sem hash): Cache-Control no-cache, com
+      ETag forte por codificação; a revalidação (If-None-Match) responde 304
+      sem corpo.
+
+O build (python -m backend.build_frontend) grava o resultado em
+frontend/dist. Sem o build, ou com o build desatualizado em relação aos
+fontes, o mesmo processamento é feito em memória na inicialização.
+"""
+
+from typing import Dict, Optional, Tuple
+import gzip
+import hashlib
+import logging
+import mimetypes
+import os
+import re
+import shutil
+
+import brotli
+import orjson
+from fastapi import Request
+from fastapi.responses import Response
+
+# Importar configurações e compressão
+from backend.app.api.compression import COMPRESSIBLE_TYPES, choose_encoding
+from backend.app.core.config import settings
+
+# Configurar logger
+logger = logging.getLogger(__name__)
+
+# Diretórios do frontend com assets versionados pelo hash
+ASSET_DIRECTORIES = ("css", "js", "assets")
+
+# Diretório do build, dentro do frontend
+DIST_DIRECTORY = "dist"
+MANIFEST_FILE = "manifest.json"
+
+# Caracteres do hash SHA-256 no nome dos arquivos
+HASH_LENGTH = 12
+
+# Níveis da pré-compressão (feita uma vez por build)
+BUILD_GZIP_LEVEL = 9
+BUILD_BROTLI_QUALITY = 11
+
+# Extensão dos arquivos pré-comprimidos no build, por codificação
+ENCODING_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+# Referências do index.html aos assets (href="css/styles.css", src="js/app.js")
+_ASSET_REFERENCE = re.compile(r'(\b(?:href|src)=["\'])/?((?:%s)/[^"\'?#]+)' % "|".join(ASSET_DIRECTORIES))
+
+
+class StaticAsset:
+    """
+    Um arquivo do frontend em memória, com as versões pré-comprimidas.
+
+    Attributes:
+        media_type: Content-Type
+        body: Conteúdo original
+        encoded: Codificação ("br", "gzip") -> conteúdo comprimido (só as menores que o original)
+        digest: Hash do conteúdo original (base dos ETags)
+        cache_control: Header Cache-Control
+    """
+
+    __slots__ = ("media_type", "body", "encoded", "digest", "cache_control")
+
+    def __init__(self, media_type: str, body: bytes, encoded: Dict[str, bytes], digest: str, cache_control: str):
+        self.media_type = media_type
+        self.body = body
+        self.encoded = encoded
+        self.digest = digest
+        self.cache_control = cache_control
+
+    def etag(self, encoding: Optional[str]) -> str:
+        """ETag forte da representação (cada codificação tem o seu)."""
+        return f'"{self.digest[:16]}-{encoding}"' if encoding else f'"{self.digest[:16]}"'
+
+
+def _media_type(path: str) -> str:
+    media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    if media_type.startswith("text/") or media_type == "application/javascript":
+        media_type += "; charset=utf-8"
+    return media_type
+
+
+def precompress(path: str, data: bytes) -> Dict[str, bytes]:
+    """
+    Versões gzip e brotli de um arquivo, mantendo só as menores que o original.
+
+    Args:
+        path: Caminho do arquivo (para o tipo)
+        data: Conteúdo original
+
+    Returns:
+        Dict[str, bytes]: Codificação -> conteúdo comprimido
+    """
+    if not _media_type(path).startswith(COMPRESSIBLE_TYPES):
+        return {}
+    encoded = {
+        "br": brotli.compress(data, quality=BUILD_BROTLI_QUALITY),
+        "gzip": gzip.compress(data, compresslevel=BUILD_GZIP_LEVEL, mtime=0),
+    }
+    return {encoding: body for encoding, body in encoded.items() if len(body) < len(data)}
+
+
+def fingerprint(path: str, digest: str) -> str:
+    """Nome com hash: css/styles.css -> css/styles.3f2a9c1e0b7d.css."""
+    stem, extension = os.path.splitext(path)
+    return f"{stem}.{digest[:HASH_LENGTH]}{extension}"
+
+
+def _sources(frontend_path: str) -> Dict[str, bytes]:
+    """Arquivos dos ASSET_DIRECTORIES (caminho relativo ao frontend -> conteúdo)."""
+    sources = {}
+    for directory in ASSET_DIRECTORIES:
+        for root, _, names in os.walk(os.path.join(frontend_path, directory)):
+            for name in sorted(names):
+                full_path = os.path.join(root, name)
+                with open(full_path, "rb") as f:
+                    sources[os.path.relpath(full_path, frontend_path).replace(os.sep, "/")] = f.read()
+    return sources
+
+
+def rewrite_index(html: bytes, manifest: Dict[str, str]) -> bytes:
+    """
+    Troca as referências do index.html aos assets pelos nomes com hash.
+
+    Args:
+        html: index.html original
+        manifest: Caminho original -> caminho com hash
+
+    Returns:
+        bytes: index.html reescrito (referências sem asset correspondente ficam iguais)
+    """
+    def replace(match: re.Match) -> str:
+        return match.group(1) + manifest.get(match.group(2), match.group(2))
+
+    return _ASSET_REFERENCE.sub(replace, html.decode("utf-8")).encode("utf-8")
+
+
+def build(frontend_path: str) -> Tuple[Dict[str, bytes], Dict[str, str], bytes, str]:
+    """
+    Processa o frontend: hash dos assets e index.html reescrito.
+
+    Args:
+        frontend_path: Diretório do frontend
+
+    Returns:
+        Tuple: (caminho original -> conteúdo, manifesto original -> com hash,
+        index.html reescrito, hash do index.html original)
+    """
+    sources = _sources(frontend_path)
+    manifest = {path: fingerprint(path, hashlib.sha256(data).hexdigest()) for path, data in sources.items()}
+    with open(os.path.join(frontend_path, "index.html"), "rb") as f:
+        index_source = f.read()
+    return sources, manifest, rewrite_index(index_source, manifest), hashlib.sha256(index_source).hexdigest()
+
+
+def write_dist(frontend_path: str) -> Dict[str, Dict[str, int]]:
+    """
+    Grava o build em frontend/dist: assets com hash, versões .gz/.br,
+    index.html reescrito e o manifesto.
+
+    Args:
+        frontend_path: Diretório do frontend
+
+    Returns:
+        Dict: Arquivo gravado -> tamanho original e de cada codificação (bytes)
+    """
+    dist_path = os.path.join(frontend_path, DIST_DIRECTORY)
+    sources, manifest, index, index_digest = build(frontend_path)
+    # Build limpo: sem os nomes com hash de builds anteriores
+    shutil.rmtree(dist_path, ignore_errors=True)
+    outputs = {manifest[path]: data for path, data in sources.items()}
+    outputs["index.html"] = index
+
+    sizes = {}
+    for path, data in outputs.items():
+        target = os.path.join(dist_path, path)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        encoded = precompress(path, data)
+        for suffix_path, content in ((target, data), *((target + ENCODING_SUFFIXES[e], body) for e, body in encoded.items())):
+            with open(suffix_path, "wb") as f:
+                f.write(content)
+        sizes[path] = {"original": len(data), **{encoding: len(body) for encoding, body in encoded.items()}}
+
+    with open(os.path.join(dist_path, MANIFEST_FILE), "wb") as f:
+        f.write(orjson.dumps({"assets": manifest, "index": index_digest}, option=orjson.OPT_INDENT_2))
+    return sizes
+
+
+class StaticAssets:
+    """
+    Frontend servido da memória, com negociação de codificação e 304.
+
+    Attributes:
+        frontend_path: Diretório do frontend
+        files: Caminho da URL (sem "/" inicial) -> asset
+        manifest: Caminho original -> caminho com hash
+    """
+
+    def __init__(self, frontend_path: str):
+        self.frontend_path = frontend_path
+        self.files: Dict[str, StaticAsset] = {}
+        self.manifest: Dict[str, str] = {}
+        if os.path.exists(os.path.join(frontend_path, "index.html")):
+            self.load()
+
+    def load(self) -> None:
+        """Carrega o build de frontend/dist, ou processa os fontes se ele faltar ou estiver desatualizado."""
+        sources, manifest, index, index_digest = build(self.frontend_path)
+        dist_path = os.path.join(self.frontend_path, DIST_DIRECTORY)
+        encoded = self._load_dist(dist_path, manifest, index_digest)
+        if encoded is None:
+            encoded = {path: precompress(path, data) for path, data in sources.items()}
+            encoded["index.html"] = precompress("index.html", index)
+            logger.info("Frontend processado em memória (rode python -m backend.build_frontend para pré-comprimir no build)")
+
+        immutable = f"public, max-age={settings.STATIC_CACHE_MAX_AGE}, immutable"
+        for path, data in sources.items():
+            digest = hashlib.sha256(data).hexdigest()
+            media_type = _media_type(path)
+            self.files[manifest[path]] = StaticAsset(media_type, data, encoded[path], digest, immutable)
+            # Nome original (referências antigas ou externas): revalidado a cada uso
+            self.files[path] = StaticAsset(media_type, data, encoded[path], digest, "no-cache")
+        self.files["index.html"] = StaticAsset(
+            "text/html; charset=utf-8", index, encoded["index.html"], hashlib.sha256(index).hexdigest(), "no-cache"
+        )
+        self.manifest = manifest
+        logger.info("Frontend carregado: %d asset(s) com hash", len(sources))
+
+    @staticmethod
+    def _load_dist(dist_path: str, manifest: Dict[str, str], index_digest: str) -> Optional[Dict[str, Dict[str, bytes]]]:
+        """
+        Versões pré-comprimidas do build, se ele corresponde aos fontes atuais.
+
+        Returns:
+            Optional[Dict]: Caminho original -> codificação -> conteúdo, ou None
+        """
+        manifest_path = os.path.join(dist_path, MANIFEST_FILE)
+        if not os.path.exists(manifest_path):
+            return None
+        with open(manifest_path, "rb") as f:
+            built = orjson.loads(f.read())
+        if built.get("assets") != manifest or built.get("index") != index_digest:
+            logger.warning("Build do frontend desatualizado em %s; processando os fontes em memória", dist_path)
+            return None
+
+        encoded: Dict[str, Dict[str, bytes]] = {}
+        for path, target in (*manifest.items(), ("index.html", "index.html")):
+            encoded[path] = {}
+            for encoding, suffix in ENCODING_SUFFIXES.items():
+                file_path = os.path.join(dist_path, target + suffix)
+                if os.path.exists(file_path):
+                    with open(file_path, "rb") as f:
+                        encoded[path][encoding] = f.read()
+        return encoded
+
+    @property
+    def has_index(self) -> bool:
+        return "index.html" in self.files
+
+    def response(self, request: Request, path: str) -> Optional[Response]:
+        """
+        Resposta de um arquivo: 200 com a melhor codificação aceita, ou 304.
+
+        Args:
+            request: Requisição HTTP (Accept-Encoding, If-None-Match)
+            path: Caminho da URL sem "/" inicial
+
+        Returns:
+            Optional[Response]: Resposta, ou None se o arquivo não existe
+        """
+        asset = self.files.get(path)
+        if asset is None:
+            return None
+        encoding = choose_encoding(request.headers.get("accept-encoding", ""), available=tuple(asset.encoded))
+        etag = asset.etag(encoding)
+        headers = {"ETag": etag, "Cache-Control": asset.cache_control, "Vary": "Accept-Encoding"}
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        return Response(asset.encoded[encoding] if encoding else asset.body, media_type=asset.media_type, headers=headers)
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Comparação fraca do If-None-Match (RFC 9110): ignora o prefixo W/."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
@@ -0,0 +1,257 @@
+"""
+WebSocket Classification
+========================
+Protocolo do endpoint WebSocket de classificação (/api/ws/classify), para
+clientes de alta frequência (ex.: gateways de email): uma conexão aberta,
+sem o custo de uma requisição HTTP por mensagem.
+
+    cliente -> {"id": "m-1", "email_text": "...", "mode": "combined",
+                "generate_response": false, "timeout": 5}
+    servidor -> {"type": "result", "id": "m-1", "result": {...}}
+                {"type": "error", "id": "m-1", "status": 429, "code": "queue_full",
+                 "detail": "...", "retry_after": 2}
+
+Os resultados chegam fora de ordem, conforme ficam prontos; o `id`
+(correlation id escolhido pelo cliente) liga cada resposta à mensagem.
+
+Controle de fluxo por créditos: a mensagem "ready", enviada ao abrir a
+conexão, informa quantos créditos o cliente tem (mensagens em andamento ao
+mesmo tempo). Cada mensagem enviada consome um crédito e cada resposta
+("result" ou "error") devolve um. Mensagens além dos créditos recebem erro
+"credit_exceeded" sem serem processadas.
+
+Frames de texto são JSON; frames binários, MessagePack. As respostas usam
+a codificação escolhida na conexão (?encoding=json ou msgpack).
+"""
+
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+import asyncio
+import logging
+
+import msgpack
+import orjson
+from fastapi import WebSocket
+
+# Importar configurações
+from backend.app.core.admission import AdmissionRejected
+from backend.app.core.config import settings, PIPELINE_MODES
+
+# Configurar logger
+logger = logging.getLogger(__name__)
+
+# Codificações das mensagens do servidor
+ENCODINGS = ("json", "msgpack")
+
+# Tamanho máximo do correlation id (caracteres)
+MAX_ID_LENGTH = 128
+
+# Código de fechamento para violação de protocolo (RFC 6455)
+POLICY_VIOLATION = 1008
+
+# Contadores acumulados (GET /api/metrics)
+ws_stats: Dict[str, int] = {
+    "connections": 0,
+    "open": 0,
+    "messages": 0,
+    "results": 0,
+    "errors": 0,
+    "credit_exceeded": 0,
+}
+
+
+class MessageError(Exception):
+    """
+    Mensagem recusada: vira um frame "error" com o id da mensagem.
+
+    Attributes:
+        status: Status no estilo HTTP (400, 429, 503, 500)
+        code: Código curto do erro
+        retry_after: Segundos sugeridos para nova tentativa (recusas de admissão)
+    """
+
+    def __init__(self, detail: str, status: int = 400, code: str = "invalid_message",
+                 retry_after: Optional[int] = None):
+        super().__init__(detail)
+        self.status = status
+        self.code = code
+        self.retry_after = retry_after
+
+
+def decode_frame(frame: Dict[str, Any]) -> Any:
+    """
+    Decodifica um frame recebido: texto como JSON, binário como MessagePack.
+
+    Raises:
+        MessageError: Frame grande demais ou mal formado
+    """
+    data = frame.get("text")
+    binary = data is None
+    if binary:
+        data = frame.get("bytes") or b""
+    if len(data) > settings.WS_MAX_MESSAGE_BYTES:
+        raise MessageError(f"Mensagem maior que {settings.WS_MAX_MESSAGE_BYTES} bytes", 413, "message_too_large")
+    try:
+        return msgpack.unpackb(data, raw=False) if binary else orjson.loads(data)
+    except Exception:
+        raise MessageError("Mensagem deve ser JSON (frame de texto) ou MessagePack (frame binário)")
+
+
+def correlation_id(message: Any) -> Any:
+    """Correlation id da mensagem (str ou int), ou None se ausente ou inválido."""
+    if not isinstance(message, dict):
+        return None
+    message_id = message.get("id")
+    if isinstance(message_id, bool) or not isinstance(message_id, (str, int)):
+        return None
+    if isinstance(message_id, str) and not 0 < len(message_id) <= MAX_ID_LENGTH:
+        return None
+    return message_id
+
+
+def parse_message(message: Any) -> Dict[str, Any]:
+    """
+    Valida uma mensagem de classificação (as mesmas regras de
+    EmailTextRequest, sem o custo do modelo Pydantic por mensagem).
+
+    Returns:
+        Dict: id, email_text, mode, generate_response e timeout
+
+    Raises:
+        MessageError: Mensagem inválida
+    """
+    message_id = correlation_id(message)
+    if message_id is None:
+        raise MessageError(f"Campo 'id' obrigatório (string de até {MAX_ID_LENGTH} caracteres ou inteiro)")
+
+    email_text = message.get("email_text")
+    if not isinstance(email_text, str) or not email_text.strip():
+        raise MessageError("O texto do email não pode estar vazio")
+    email_text = email_text.strip()
+    if len(email_text) < 10:
+        raise MessageError("O texto deve ter pelo menos 10 caracteres")
+    if len(email_text) > settings.MAX_TEXT_LENGTH:
+        raise MessageError(f"O texto excede o limite de {settings.MAX_TEXT_LENGTH} caracteres")
+
+    mode = message.get("mode")
+    if mode is not None and mode not in PIPELINE_MODES:
+        raise MessageError(f"Modo inválido. Use: {', '.join(PIPELINE_MODES)}")
+    generate_response = message.get("generate_response", True)
+    if not isinstance(generate_response, bool):
+        raise MessageError("'generate_response' deve ser booleano")
+    timeout = message.get("timeout")
+    if timeout is not None and (isinstance(timeout, bool) or not isinstance(timeout, (int, float)) or not timeout > 0):
+        raise MessageError("'timeout' deve ser um número de segundos maior que zero")
+
+    return {
+        "id": message_id,
+        "email_text": email_text,
+        "mode": mode,
+        "generate_response": generate_response,
+        "timeout": timeout,
+    }
+
+
+class ClassificationSession:
+    """
+    Uma conexão WebSocket: lê mensagens, classifica em paralelo (até os
+    créditos) e envia cada resultado assim que fica pronto.
+
+    Attributes:
+        websocket: Conexão (já aceita por `run`)
+        handler: Classifica uma mensagem validada e devolve o resultado
+        credits: Mensagens em andamento permitidas
+        encoding: "json" ou "msgpack" (mensagens do servidor)
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        handler: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]],
+        credits: int,
+        encoding: str = "json"
+    ):
+        self.websocket = websocket
+        self.handler = handler
+        self.credits = max(1, credits)
+        self.encoding = encoding
+        self._tasks: Set[asyncio.Task] = set()
+        # Um envio por vez: as tarefas terminam em paralelo
+        self._send_lock = asyncio.Lock()
+
+    async def send(self, payload: Dict[str, Any]) -> None:
+        """Envia uma mensagem na codificação da conexão."""
+        async with self._send_lock:
+            if self.encoding == "msgpack":
+                await self.websocket.send_bytes(msgpack.packb(payload, use_bin_type=True))
+            else:
+                await self.websocket.send_text(orjson.dumps(payload).decode("utf-8"))
+
+    @staticmethod
+    def error_payload(message_id: Any, error: MessageError) -> Dict[str, Any]:
+        """Mensagem "error" de uma mensagem recusada."""
+        ws_stats["errors"] += 1
+        payload = {"type": "error", "id": message_id, "status": error.status, "code": error.code, "detail": str(error)}
+        if error.retry_after is not None:
+            payload["retry_after"] = error.retry_after
+        return payload
+
+    async def run(self) -> None:
+        """Aceita a conexão e atende mensagens até o cliente desconectar."""
+        await self.websocket.accept()
+        ws_stats["connections"] += 1
+        ws_stats["open"] += 1
+        try:
+            await self.send({
+                "type": "ready",
+                "credits": self.credits,
+                "encoding": self.encoding,
+                "max_message_bytes": settings.WS_MAX_MESSAGE_BYTES,
+            })
+            while True:
+                frame = await self.websocket.receive()
+                if frame["type"] == "websocket.disconnect":
+                    break
+                ws_stats["messages"] += 1
+                try:
+                    message = decode_frame(frame)
+                except MessageError as e:
+                    await self.send(self.error_payload(None, e))
+                    continue
+                if len(self._tasks) >= self.credits:
+                    ws_stats["credit_exceeded"] += 1
+                    await self.send(self.error_payload(correlation_id(message), MessageError(
+                        f"Sem créditos: {self.credits} mensagem(ns) em andamento", 429, "credit_exceeded"
+                    )))
+                    continue
+                task = asyncio.create_task(self._process(message))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+        finally:
+            ws_stats["open"] -= 1
+            # Cliente desconectou: as classificações pendentes liberam suas vagas
+            for task in self._tasks:
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _process(self, message: Any) -> None:
+        """Valida, classifica e responde uma mensagem (resultado ou erro)."""
+        message_id = correlation_id(message)
+        try:
+            parsed = parse_message(message)
+            result = await self.handler(parsed)
+            ws_stats["results"] += 1
+            payload = {"type": "result", "id": message_id, "result": result}
+        except MessageError as e:
+            payload = self.error_payload(message_id, e)
+        except AdmissionRejected as e:
+            payload = self.error_payload(message_id, MessageError(str(e), e.status_code, e.reason, e.retry_after))
+        except Exception as e:
+            logger.error("Erro ao classificar mensagem WebSocket %r: %s", message_id, e)
+            payload = self.error_payload(
+                message_id, MessageError(f"Erro ao processar classificação: {str(e)}", 500, "internal_error")
+            )
+        try:
+            await self.send(payload)
+        except Exception as e:
+            # Conexão fechada durante a classificação: o loop de leitura encerra a sessão
+            logger.debug("Resposta WebSocket %r não enviada: %s", message_id, e)
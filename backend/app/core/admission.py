@@ -0,0 +1,271 @@
+"""
+Admission Control
+=================
+Controle de admissão na frente do classificador: limita as classificações
+simultâneas e recusa rápido o excesso, em vez de aceitar tudo e deixar as
+requisições acumularem atrás das chamadas ao LLM até o cliente desistir.
+
+Cada pool (texto, arquivo) tem:
+
+    - max_in_flight: classificações em andamento ao mesmo tempo
+    - max_queue: requisições esperando vaga (FIFO); com a fila cheia, a
+      requisição é recusada na hora (429)
+    - max_wait: espera máxima na fila, limitada também pelo prazo da
+      requisição; passou disso, a requisição é recusada (503)
+
+As recusas levam Retry-After estimado pela fila e pelo tempo médio de
+serviço. Profundidade da fila, ocupação e recusas aparecem em
+GET /api/metrics como sinais para autoscaling.
+"""
+
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+import asyncio
+import logging
+import math
+import time
+
+# Importar configurações
+from backend.app.core.config import settings
+from backend.app.core.deadline import MIN_ATTEMPT_SECONDS, Deadline
+from backend.app.core.metrics import LatencyTracker
+from backend.app.core.tracing import span
+
+# Configurar logger
+logger = logging.getLogger(__name__)
+
+# Limites do Retry-After (segundos)
+MIN_RETRY_AFTER = 1
+MAX_RETRY_AFTER = 60
+
+# Peso da amostra nova na média móvel do tempo de serviço
+SERVICE_TIME_EWMA = 0.1
+
+
+class AdmissionRejected(Exception):
+    """
+    Requisição recusada pelo controle de admissão.
+
+    Attributes:
+        status_code: 429 (fila cheia) ou 503 (tempo de fila esgotado)
+        retry_after: Segundos sugeridos ao cliente (header Retry-After)
+        reason: "queue_full" ou "queue_timeout"
+    """
+
+    def __init__(self, message: str, status_code: int, retry_after: int, reason: str):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+class AdmissionPool:
+    """
+    Vagas de classificação com fila de espera limitada.
+
+    Roda no event loop (sem locks): a vaga liberada passa direto para o
+    primeiro da fila, sem disputa com quem acabou de chegar.
+
+    Attributes:
+        name: Nome do pool (métricas e logs)
+        max_in_flight: Classificações simultâneas
+        max_queue: Tamanho máximo da fila de espera
+        max_wait: Espera máxima na fila (segundos)
+        in_flight: Vagas ocupadas
+        stats: Contadores acumulados (admitidas, enfileiradas, recusas)
+        queue_wait: Tempo de espera na fila das admitidas (ms)
+    """
+
+    def __init__(self, name: str, max_in_flight: int, max_queue: int, max_wait: float):
+        self.name = name
+        # Ao menos uma vaga (0 recusaria tudo e zeraria as estimativas)
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_queue = max(0, max_queue)
+        self.max_wait = max_wait
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._service_time: Optional[float] = None
+        self.stats = {"admitted": 0, "enqueued": 0, "shed_queue_full": 0, "shed_queue_timeout": 0}
+        self.queue_wait = LatencyTracker()
+
+    @property
+    def queued(self) -> int:
+        """Requisições esperando vaga."""
+        return len(self._waiters)
+
+    def retry_after(self) -> int:
+        """
+        Segundos até uma nova tentativa ter vaga, estimados pela fila atual
+        e pelo tempo médio de serviço.
+        """
+        service_time = self._service_time if self._service_time is not None else self.max_wait
+        estimate = (self.queued + 1) * service_time / self.max_in_flight
+        return max(MIN_RETRY_AFTER, min(MAX_RETRY_AFTER, math.ceil(estimate)))
+
+    async def acquire(self, deadline: Optional[Deadline] = None) -> None:
+        """
+        Ocupa uma vaga, esperando na fila se preciso.
+
+        Args:
+            deadline: Prazo da requisição (a espera não passa do que sobra dele)
+
+        Raises:
+            AdmissionRejected: Fila cheia (429) ou espera esgotada (503)
+        """
+        if self.in_flight < self.max_in_flight and not self._waiters:
+            self.in_flight += 1
+            self.stats["admitted"] += 1
+            self.queue_wait.record(self.name, 0.0)
+            return
+
+        wait = self.max_wait
+        if deadline is not None:
+            # Reserva tempo para ao menos uma tentativa de chamada ao LLM
+            wait = min(wait, deadline.remaining() - MIN_ATTEMPT_SECONDS)
+        if len(self._waiters) >= self.max_queue:
+            self.stats["shed_queue_full"] += 1
+            logger.debug("Requisição recusada em %s: fila cheia (%d)", self.name, self.queued)
+            raise AdmissionRejected(
+                f"Servidor ocupado: {self.queued} requisição(ões) na fila de {self.name}",
+                429, self.retry_after(), "queue_full"
+            )
+        if wait <= 0:
+            # O prazo da requisição não comporta espera
+            self.stats["shed_queue_timeout"] += 1
+            raise AdmissionRejected(
+                f"Sem vaga em {self.name} dentro do prazo da requisição", 503, self.retry_after(), "queue_timeout"
+            )
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.stats["enqueued"] += 1
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), wait)
+        except asyncio.TimeoutError:
+            if not self._abandon(waiter):
+                self.stats["shed_queue_timeout"] += 1
+                logger.debug("Requisição recusada em %s após %.1fs na fila", self.name, wait)
+                raise AdmissionRejected(
+                    f"Tempo de espera na fila de {self.name} esgotado ({wait:.1f}s)",
+                    503, self.retry_after(), "queue_timeout"
+                )
+        except asyncio.CancelledError:
+            # Cliente desconectou: devolve a vaga se ela já tinha sido repassada
+            if self._abandon(waiter):
+                self.release()
+            raise
+        self.stats["admitted"] += 1
+        self.queue_wait.record(self.name, (time.perf_counter() - start) * 1000)
+
+    def _abandon(self, waiter: asyncio.Future) -> bool:
+        """
+        Tira um waiter da fila.
+
+        Returns:
+            bool: True se a vaga já tinha sido repassada a ele (corrida com release)
+        """
+        if waiter.done():
+            return True
+        waiter.cancel()
+        self._waiters.remove(waiter)
+        return False
+
+    def release(self, service_time: Optional[float] = None) -> None:
+        """
+        Libera uma vaga, repassando-a ao primeiro da fila.
+
+        Args:
+            service_time: Duração da classificação (segundos), para o Retry-After
+        """
+        if service_time is not None:
+            self._service_time = service_time if self._service_time is None else (
+                SERVICE_TIME_EWMA * service_time + (1 - SERVICE_TIME_EWMA) * self._service_time
+            )
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    @asynccontextmanager
+    async def slot(self, deadline: Optional[Deadline] = None) -> AsyncIterator[None]:
+        """
+        Contexto com uma vaga ocupada (ver `acquire`).
+
+        Uso:
+            async with pool.slot(deadline):
+                result = await classifier.classify_email(...)
+        """
+        with span("admission"):
+            await self.acquire(deadline)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.release(time.perf_counter() - start)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Estado do pool para GET /api/metrics (sinais de autoscaling).
+
+        Returns:
+            Dict: Ocupação, fila, saturação ((em andamento + fila) / vagas),
+            contadores acumulados e espera na fila
+        """
+        return {
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "queued": self.queued,
+            "max_queue": self.max_queue,
+            "saturation": round((self.in_flight + self.queued) / self.max_in_flight, 3),
+            "service_time_ms": round(self._service_time * 1000, 1) if self._service_time is not None else None,
+            **self.stats,
+            "queue_wait": self.queue_wait.snapshot().get(self.name),
+        }
+
+
+class AdmissionController:
+    """
+    Pools de admissão por tipo de requisição.
+
+    Attributes:
+        enabled: False deixa passar tudo (slot sem espera nem limite)
+        pools: Nome -> pool ("text" e "file")
+    """
+
+    def __init__(self):
+        self.enabled = settings.ADMISSION_ENABLED
+        self.pools = {
+            "text": AdmissionPool(
+                "text", settings.ADMISSION_MAX_IN_FLIGHT,
+                settings.ADMISSION_MAX_QUEUE, settings.ADMISSION_MAX_QUEUE_SECONDS
+            ),
+            # Arquivos: extração de texto (PDF) + classificação, limites próprios
+            "file": AdmissionPool(
+                "file", settings.ADMISSION_FILE_MAX_IN_FLIGHT,
+                settings.ADMISSION_FILE_MAX_QUEUE, settings.ADMISSION_FILE_MAX_QUEUE_SECONDS
+            ),
+        }
+
+    @asynccontextmanager
+    async def slot(self, pool: str, deadline: Optional[Deadline] = None) -> AsyncIterator[None]:
+        """
+        Vaga no pool `pool` durante o bloco.
+
+        Raises:
+            AdmissionRejected: Requisição recusada (429/503)
+        """
+        if not self.enabled:
+            yield
+            return
+        async with self.pools[pool].slot(deadline):
+            yield
+
+    def snapshot(self) -> Optional[Dict[str, Any]]:
+        """Estado de cada pool (None se desativado)."""
+        if not self.enabled:
+            return None
+        return {name: pool.snapshot() for name, pool in self.pools.items()}
@@ -6,7 +6,13 @@ Gerencia todas as configurações e variáveis de ambiente da aplicação.
 
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Dict, List
 import os
+import tempfile
+
+# Modos do pipeline de LLM: duas chamadas (classificação, depois resposta) ou
+# uma chamada que retorna classificação e resposta no mesmo JSON
+PIPELINE_MODES = ("two_call", "combined")
 
 class Settings(BaseSettings):
     """
@@ -23,6 +29,23 @@ class Settings(BaseSettings):
     GROQ_API_KEY: str = ""
     GROQ_MODEL: str = "llama-3.1-8b-instant"  # Modelo padrão
     GROQ_API_BASE: str = "https://api.groq.com/openai/v1"
+    # Modelos disponíveis para roteamento, do mais rápido ao maior (vazio = só GROQ_MODEL)
+    GROQ_MODELS: List[str] = []
+    
+    # Roteamento de modelos (latência observada, SLO e fallback)
+    ROUTING_LONG_EMAIL_CHARS: int = 2000  # Emails maiores vão primeiro para o maior modelo
+    ROUTING_ESCALATION_CONFIDENCE: float = 0.6  # Abaixo disso, reclassifica com o maior modelo
+    # p95 alvo por tipo de chamada (ms); modelos acima do SLO vão para o fim da fila
+    ROUTING_LATENCY_SLO_MS: Dict[str, float] = {"classify": 2000.0, "response": 4000.0}
+    ROUTING_FALLBACK_TIMEOUT: float = 10.0  # Timeout por modelo quando há fallback (segundos)
+    ROUTING_COOLDOWN_SECONDS: float = 30.0  # Tempo fora da fila após rate limit (sem Retry-After)
+    ROUTING_SAMPLE_MAX_AGE_SECONDS: float = 300.0  # Amostras de latência expiram (modelo rebaixado volta a ser tentado)
+    
+    # Hedging: cópia da chamada ao LLM quando ela passa do percentil observado
+    HEDGING_ENABLED: bool = False
+    HEDGING_QUANTILE: float = 0.95  # Limiar dinâmico (p95 do tipo de chamada)
+    HEDGING_MIN_SAMPLES: int = 20  # Amostras antes de ativar
+    HEDGING_BUDGET_RATIO: float = 0.05  # Máximo de chamadas extras (fração das chamadas)
     
     # Configurações de processamento
     MAX_FILE_SIZE_MB: int = 5  # Tamanho máximo de arquivo em MB
@@ -32,6 +55,104 @@ class Settings(BaseSettings):
     AI_TEMPERATURE: float = 0.3  # Temperatura para respostas mais consistentes
     AI_MAX_TOKENS: int = 500  # Máximo de tokens na resposta
     AI_TIMEOUT: int = 30  # Timeout em segundos
+    AI_JSON_MODE: bool = True  # Pede JSON estruturado ao provedor (response_format) nas classificações
+    AI_PIPELINE_MODE: str = "two_call"  # "two_call" ou "combined" (pode ser trocado por requisição)
+    # Prazo total de uma classificação (todas as chamadas, retries e backoffs), em segundos.
+    # O cliente pode encurtar com o header X-Request-Timeout.
+    REQUEST_DEADLINE_SECONDS: float = 20.0
+    
+    # Few-shot dinâmico: exemplos rotulados semelhantes no lugar do bloco de critérios
+    FEWSHOT_ENABLED: bool = False  # Usa o prompt curto com exemplos recuperados do índice
+    FEWSHOT_EXAMPLES_PATH: str = ""  # JSONL com {"email", "categoria", "justificativa"} (vazio = exemplos padrão)
+    FEWSHOT_K: int = 4  # Exemplos por prompt
+    FEWSHOT_MIN_EXAMPLES: int = 50  # Índice menor que isso: prompt completo
+    FEWSHOT_MIN_SIMILARITY: float = 0.2  # Exemplo mais próximo abaixo disso: prompt completo (ruído de hashing ~0.15)
+    FEWSHOT_INDEX_DIM: int = 512  # Dimensão dos vetores (potência de 2; ~2KB por exemplo)
+    
+    # NLP
+    NLP_LANGUAGE_DETECTION: bool = True  # Detecta o idioma antes do pré-processamento
+    NLP_DEFAULT_LANGUAGE: str = "pt"  # Usado sem detecção (textos curtos/ambíguos ficam "und")
+    
+    # Cadeias de resposta (histórico citado e encaminhamentos)
+    REPLY_CHAIN_STRIPPING: bool = True  # Envia ao LLM apenas a mensagem mais recente
+    REPLY_QUOTED_SUMMARY_CHARS: int = 200  # Resumo do histórico citado (0 = sem resumo)
+    
+    # Logging (fila em thread de fundo, saída JSON)
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"  # "json" ou "text"
+    # Amostragem de mensagens abaixo de WARNING por logger (1.0 = todas)
+    LOG_SAMPLING: Dict[str, float] = {"httpx": 0.1, "uvicorn.access": 0.1}
+    
+    # Tracing (detalhamento de tempo por etapa)
+    SERVER_TIMING_ENABLED: bool = True  # Envia header Server-Timing
+    TRACE_EXPORT_PATH: str = ""  # Arquivo JSONL (OTLP/JSON); vazio = desativado
+    TRACE_SAMPLE_RATE: float = 0.1  # Fração de traces exportados (0.0 a 1.0)
+    
+    # Jobs assíncronos (arquivos grandes e lotes)
+    JOBS_DB_PATH: str = os.path.join(tempfile.gettempdir(), "email_classifier_jobs.db")
+    JOBS_WORKERS: int = 4  # Itens processados em paralelo
+    JOBS_MAX_BATCH_SIZE: int = 500  # Máximo de emails/arquivos por job
+    JOBS_MAX_PENDING_ITEMS: int = 5000  # Itens na fila antes de recusar novos jobs
+    JOBS_RETENTION_HOURS: float = 24.0  # Tempo que resultados finalizados ficam disponíveis
+    JOBS_PURGE_INTERVAL_SECONDS: int = 300  # Intervalo da limpeza de jobs expirados
+    
+    # Respostas sugeridas sob demanda (generate_response=false; mesmo banco dos jobs)
+    RESPONSES_RETENTION_HOURS: float = 24.0  # Tempo que o response_id permanece válido
+    
+    # Histórico de classificações (SQLite WAL, escrita em lote em segundo plano)
+    HISTORY_ENABLED: bool = True  # Grava cada classificação bem-sucedida (hash do texto, não o texto)
+    HISTORY_DB_PATH: str = os.path.join(tempfile.gettempdir(), "email_classifier_history.db")
+    HISTORY_BATCH_SIZE: int = 200  # Máximo de linhas por transação
+    HISTORY_FLUSH_INTERVAL_SECONDS: float = 1.0  # Espera máxima para completar um lote
+    HISTORY_QUEUE_SIZE: int = 10000  # Linhas pendentes antes de descartar (disco lento)
+    HISTORY_RETENTION_DAYS: float = 90.0  # Idade máxima das linhas (0 = sem limpeza)
+    
+    # Estatísticas (rollups por hora/dia para GET /api/stats)
+    STATS_DB_PATH: str = os.path.join(tempfile.gettempdir(), "email_classifier_stats.db")  # Compartilhado entre workers
+    STATS_FLUSH_INTERVAL_SECONDS: float = 30.0  # Intervalo de gravação dos rollups em memória
+    STATS_RETENTION_DAYS: float = 90.0  # Idade máxima dos rollups (0 = sem limpeza)
+    
+    # Compressão HTTP (respostas gzip/brotli; corpos comprimidos em /classify-text e /jobs)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024  # Respostas menores vão sem compressão (bytes)
+    COMPRESSION_GZIP_LEVEL: int = 6  # 1 (rápido) a 9 (menor)
+    COMPRESSION_BROTLI_QUALITY: int = 4  # 0 (rápido) a 11 (menor); acima de ~6 o custo de CPU cresce rápido
+    COMPRESSION_MAX_DECOMPRESSED_BYTES: int = 10 * 1024 * 1024  # Limite do corpo descomprimido (413 acima disso)
+    
+    # Controle de admissão (classificações simultâneas e fila por tipo de requisição)
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_MAX_IN_FLIGHT: int = 16  # Classificações de texto simultâneas
+    ADMISSION_MAX_QUEUE: int = 64  # Requisições de texto esperando vaga; acima disso, 429
+    ADMISSION_MAX_QUEUE_SECONDS: float = 5.0  # Espera máxima na fila; depois disso, 503
+    ADMISSION_FILE_MAX_IN_FLIGHT: int = 4  # Arquivos (extração + classificação) simultâneos
+    ADMISSION_FILE_MAX_QUEUE: int = 16
+    ADMISSION_FILE_MAX_QUEUE_SECONDS: float = 10.0
+    
+    # Escalonamento das chamadas ao LLM (classes de prioridade e fair queueing por tenant)
+    SCHEDULER_ENABLED: bool = True
+    SCHEDULER_MAX_CONCURRENT_CALLS: int = 12  # Chamadas simultâneas ao upstream (limite de taxa do provedor)
+    # Fatia de cada classe quando há fila (urgent e interactive furam a fila do batch sem pará-lo)
+    SCHEDULER_WEIGHTS: Dict[str, float] = {"urgent": 8.0, "interactive": 4.0, "batch": 1.0}
+    SCHEDULER_URGENT_KEYWORDS: List[str] = ["urgente", "urgência", "urgencia", "prazo", "imediatamente"]
+    SCHEDULER_TENANT_HEADER: str = "X-Tenant-ID"  # Identifica o cliente; sem o header, o IP
+    
+    # WebSocket de classificação (/api/ws/classify; mesmas vagas de admissão do classify-text)
+    WS_ENABLED: bool = True
+    WS_MAX_IN_FLIGHT: int = 32  # Créditos por conexão (mensagens em andamento)
+    WS_MAX_MESSAGE_BYTES: int = 64 * 1024  # Mensagens maiores são recusadas
+    
+    # Profiling sob demanda (header X-Profile ou /api/admin/profiles; desativado = middleware não registrado)
+    PROFILING_ENABLED: bool = False
+    PROFILING_TOKEN: str = ""  # Exigido no header X-Profile-Token (vazio = profiling recusado)
+    PROFILING_DIR: str = os.path.join(tempfile.gettempdir(), "email_classifier_profiles")  # Artefatos (.prof, .folded, .txt, .snapshot)
+    PROFILING_SAMPLE_INTERVAL_MS: float = 5.0  # Intervalo entre amostras do perfil "sample"
+    PROFILING_MAX_REQUESTS: int = 1000  # Requisições por sessão de profiling
+    PROFILING_MAX_SECONDS: float = 300.0  # Sessões terminam após esse tempo, mesmo sem completar as requisições
+    PROFILING_MAX_ARTIFACTS: int = 50  # Arquivos mantidos em PROFILING_DIR (os mais antigos são apagados)
+    PROFILING_TRACEMALLOC_FRAMES: int = 10  # Frames guardados por alocação no perfil "memory"
+    
+    # Frontend estático (assets com hash no nome; ver backend/build_frontend.py)
+    STATIC_CACHE_MAX_AGE: int = 31536000  # Cache immutable dos assets com hash (segundos)
     
     # CORS
     ALLOWED_ORIGINS: list = ["*"]  # Em produção, especificar domínios
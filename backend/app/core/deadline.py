@@ -0,0 +1,65 @@
+"""
+Request Deadline
+================
+Orçamento de tempo de uma requisição, repassado a cada chamada ao LLM.
+
+O timeout de cada tentativa sai do tempo restante, e novas tentativas (ou
+backoffs) só acontecem se ainda couberem no prazo.
+"""
+
+from typing import Optional
+import time
+
+# Tempo mínimo que vale a pena dar a uma tentativa de chamada ao LLM (segundos)
+MIN_ATTEMPT_SECONDS = 0.5
+
+
+class DeadlineExceeded(Exception):
+    """O prazo da requisição não comporta mais uma tentativa."""
+
+
+class Deadline:
+    """
+    Prazo absoluto de uma requisição (relógio monotônico).
+
+    Attributes:
+        seconds: Orçamento total em segundos
+        expires_at: Instante (time.monotonic) em que o prazo termina
+    """
+
+    __slots__ = ("seconds", "expires_at")
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        """Segundos restantes (nunca negativo)."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def allows(self, seconds: float = 0.0) -> bool:
+        """
+        Verifica se ainda cabe uma tentativa após esperar `seconds`.
+
+        Args:
+            seconds: Espera antes da tentativa (ex.: backoff)
+        """
+        return self.remaining() - seconds >= MIN_ATTEMPT_SECONDS
+
+    def timeout(self, limit: Optional[float] = None) -> float:
+        """
+        Timeout da próxima tentativa: o tempo restante, limitado a `limit`.
+
+        Args:
+            limit: Timeout máximo da tentativa (ex.: AI_TIMEOUT)
+
+        Returns:
+            float: Timeout em segundos
+
+        Raises:
+            DeadlineExceeded: Se o tempo restante não comporta uma tentativa
+        """
+        remaining = self.remaining()
+        if remaining < MIN_ATTEMPT_SECONDS:
+            raise DeadlineExceeded(f"Prazo de {self.seconds:.1f}s esgotado")
+        return remaining if limit is None else min(limit, remaining)
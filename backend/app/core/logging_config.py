@@ -0,0 +1,149 @@
+"""
+Logging Configuration
+=====================
+Pipeline de logging não bloqueante.
+
+O caminho da requisição apenas enfileira o LogRecord (QueueHandler); a
+formatação em JSON e a escrita acontecem em uma thread de fundo
+(QueueListener). Mensagens de alto volume podem ser amostradas por logger
+(LOG_SAMPLING) antes mesmo de entrar na fila.
+"""
+
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+import atexit
+import logging
+import queue
+import random
+import sys
+
+from pythonjsonlogger.jsonlogger import JsonFormatter
+
+# Importar configurações
+from backend.app.core.config import settings
+
+# Formato texto (LOG_FORMAT=text), o mesmo usado antes do pipeline JSON
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# Campos incluídos em cada linha JSON
+JSON_FORMAT = "%(asctime)s %(name)s %(levelname)s %(message)s"
+
+# Loggers de terceiros redirecionados para a fila
+THIRD_PARTY_LOGGERS = ("uvicorn", "uvicorn.error", "uvicorn.access")
+
+_listener: Optional[QueueListener] = None
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Amostragem por logger para mensagens abaixo de WARNING.
+
+    A taxa de cada logger é a da entrada mais específica (maior prefixo) em
+    `rates`; avisos e erros nunca são descartados.
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self._cache: Dict[str, float] = {}
+
+    def _rate_for(self, name: str) -> float:
+        rate = self._cache.get(name)
+        if rate is None:
+            rate = 1.0
+            best = -1
+            for prefix, value in self.rates.items():
+                if (name == prefix or name.startswith(prefix + ".")) and len(prefix) > best:
+                    rate, best = value, len(prefix)
+            self._cache[name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._rate_for(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+
+class InProcessQueueHandler(QueueHandler):
+    """
+    QueueHandler que não formata o registro no caminho da requisição.
+
+    O QueueHandler padrão formata a mensagem antes de enfileirar (necessário
+    apenas quando a fila atravessa processos). Aqui a fila é local, então a
+    interpolação de `msg % args` fica inteira para a thread do listener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def _build_formatter(log_format: str) -> logging.Formatter:
+    """Cria o formatter de saída (json ou text)."""
+    if log_format == "text":
+        return logging.Formatter(TEXT_FORMAT)
+    return JsonFormatter(
+        JSON_FORMAT,
+        rename_fields={"asctime": "timestamp", "levelname": "level", "name": "logger"},
+        json_ensure_ascii=False
+    )
+
+
+def setup_logging(
+    level: str = settings.LOG_LEVEL,
+    log_format: str = settings.LOG_FORMAT,
+    sampling: Optional[Dict[str, float]] = None,
+    stream=None
+) -> QueueListener:
+    """
+    Configura o logging da aplicação com fila e thread de escrita.
+
+    Pode ser chamada novamente (ex.: benchmarks); a configuração anterior
+    é desfeita e o listener anterior é encerrado.
+
+    Args:
+        level: Nível mínimo do logger raiz
+        log_format: "json" ou "text"
+        sampling: Taxas de amostragem por logger (padrão: LOG_SAMPLING)
+        stream: Destino das linhas (padrão: stdout)
+
+    Returns:
+        QueueListener: Listener em execução
+    """
+    global _listener
+    shutdown_logging()
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(_build_formatter(log_format))
+
+    queue_handler = InProcessQueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter(settings.LOG_SAMPLING if sampling is None else sampling))
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    # Uvicorn registra handlers próprios (síncronos); redirecionar para a fila
+    for name in THIRD_PARTY_LOGGERS:
+        third_party = logging.getLogger(name)
+        third_party.handlers.clear()
+        third_party.propagate = True
+
+    _listener = QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def shutdown_logging() -> None:
+    """Esvazia a fila e encerra a thread de escrita."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
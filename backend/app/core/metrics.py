@@ -0,0 +1,134 @@
+"""
+Metrics
+=======
+Métricas de latência em memória, agrupadas por rótulo (ex.: idioma).
+
+Cada rótulo mantém uma janela com as últimas N amostras; os percentis são
+calculados apenas quando consultados (GET /api/metrics), então registrar
+uma amostra custa um append. Consultas frequentes (roteamento de modelos)
+usam `percentile`, que reaproveita o valor calculado por algumas amostras.
+
+Com `max_age_seconds`, amostras mais antigas que isso saem da janela (um
+rótulo sem tráfego volta a não ter amostras).
+"""
+
+from collections import deque
+from typing import Deque, Dict, Any, Optional, Tuple
+import threading
+import time
+
+
+def _percentile(ordered: list, fraction: float) -> float:
+    """Percentil por vizinho mais próximo de uma lista já ordenada."""
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class LatencyTracker:
+    """
+    Janela de latências por rótulo.
+
+    Attributes:
+        window: Quantidade de amostras mantidas por rótulo
+        max_age_seconds: Idade máxima de uma amostra (None = sem expiração)
+    """
+
+    def __init__(self, window: int = 1000, recompute_every: int = 20, max_age_seconds: Optional[float] = None):
+        self.window = window
+        self.recompute_every = recompute_every
+        self.max_age_seconds = max_age_seconds
+        self._samples: Dict[str, Deque[float]] = {}
+        self._times: Dict[str, Deque[float]] = {}
+        self._counts: Dict[str, int] = {}
+        self._cache: Dict[Tuple[str, float], Tuple[int, float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, label: str, latency_ms: float) -> None:
+        """
+        Registra uma amostra.
+
+        Args:
+            label: Rótulo da amostra
+            latency_ms: Latência em milissegundos
+        """
+        with self._lock:
+            samples = self._samples.get(label)
+            if samples is None:
+                samples = self._samples[label] = deque(maxlen=self.window)
+                self._times[label] = deque(maxlen=self.window)
+                self._counts[label] = 0
+            samples.append(latency_ms)
+            if self.max_age_seconds is not None:
+                self._times[label].append(time.monotonic())
+            self._counts[label] += 1
+
+    def _expire(self, label: str, samples: Deque[float]) -> None:
+        """Remove as amostras expiradas de um rótulo (com o lock adquirido)."""
+        if self.max_age_seconds is None:
+            return
+        times = self._times[label]
+        cutoff = time.monotonic() - self.max_age_seconds
+        if not times or times[0] >= cutoff:
+            return
+        while times and times[0] < cutoff:
+            times.popleft()
+            samples.popleft()
+        for key in [key for key in self._cache if key[0] == label]:
+            del self._cache[key]
+
+    def percentile(self, label: str, fraction: float, min_samples: int = 1) -> Optional[float]:
+        """
+        Percentil da janela de um rótulo, recalculado a cada
+        `recompute_every` amostras novas.
+
+        Args:
+            label: Rótulo
+            fraction: Percentil (0.95 = p95)
+            min_samples: Amostras mínimas para retornar um valor
+
+        Returns:
+            Optional[float]: Latência em ms, ou None sem amostras suficientes
+        """
+        with self._lock:
+            samples = self._samples.get(label)
+            if samples is None:
+                return None
+            self._expire(label, samples)
+            if len(samples) < min_samples:
+                return None
+            count = self._counts[label]
+            cached = self._cache.get((label, fraction))
+            if cached is not None and count - cached[0] < self.recompute_every:
+                return cached[1]
+            value = _percentile(sorted(samples), fraction)
+            self._cache[(label, fraction)] = (count, value)
+            return value
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Resumo por rótulo: total de amostras e p50/p95/p99 da janela.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Rótulo -> estatísticas (ms)
+        """
+        with self._lock:
+            for label, samples in self._samples.items():
+                self._expire(label, samples)
+            copies = {
+                label: (sorted(samples), self._counts[label])
+                for label, samples in self._samples.items() if samples
+            }
+        return {
+            label: {
+                "count": count,
+                "p50_ms": round(_percentile(ordered, 0.50), 2),
+                "p95_ms": round(_percentile(ordered, 0.95), 2),
+                "p99_ms": round(_percentile(ordered, 0.99), 2),
+                "max_ms": round(ordered[-1], 2),
+            }
+            for label, (ordered, count) in copies.items()
+        }
+
+
+# Latência de classificação por idioma detectado
+latency_by_language = LatencyTracker()
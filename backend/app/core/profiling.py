@@ -0,0 +1,399 @@
+"""
+On-demand Profiling
+===================
+Profiling de requisições em produção, sob demanda e só para quem tem o
+token (PROFILING_TOKEN):
+
+    - header `X-Profile: cpu` ou `sample`: perfila aquela requisição
+    - POST /api/admin/profiles: perfila as próximas N requisições (cpu,
+      sample ou memory)
+
+Tipos de perfil:
+    - cpu: cProfile (determinístico) da thread do event loop → .prof
+      (pstats, snakeviz)
+    - sample: amostragem das pilhas de todas as threads (inclusive as do
+      asyncio.to_thread) a cada PROFILING_SAMPLE_INTERVAL_MS → .folded
+      (flamegraph.pl, speedscope)
+    - memory: diferença de snapshots do tracemalloc entre o início e o fim
+      da sessão → relatório .txt e snapshot .snapshot (tracemalloc.Snapshot.load)
+
+O event loop intercala as requisições: um perfil cobre tudo o que a thread
+(ou o processo) fez no intervalo, inclusive requisições concorrentes. Os
+artefatos vão para PROFILING_DIR; um perfil por vez por processo.
+
+Com PROFILING_ENABLED=false o middleware nem é registrado (custo zero).
+"""
+
+from collections import Counter
+from typing import Any, Dict, List, Optional
+import asyncio
+import cProfile
+import gc
+import hmac
+import logging
+import os
+import re
+import sys
+import threading
+import time
+import tracemalloc
+
+# Importar configurações
+from backend.app.core.config import settings
+
+# Configurar logger
+logger = logging.getLogger(__name__)
+
+# Tipos de perfil por sessão (admin) e por requisição (header)
+PROFILE_KINDS = ("cpu", "sample", "memory")
+REQUEST_PROFILE_KINDS = ("cpu", "sample")
+
+# Arquivos gravados por tipo de perfil
+ARTIFACT_EXTENSIONS = {"cpu": (".prof",), "sample": (".folded",), "memory": (".txt", ".snapshot")}
+
+# Nome de um artefato (ProfileSession.base_name + extensão do tipo); outros
+# arquivos de PROFILING_DIR não são listados, baixados nem apagados
+ARTIFACT_NAME_RE = re.compile(
+    r"\d{8}-\d{6}-[0-9a-f]{12}-(?:%s)\Z" % "|".join(
+        re.escape(kind + extension) for kind, extensions in ARTIFACT_EXTENSIONS.items() for extension in extensions
+    )
+)
+
+# Linhas do relatório de memória
+MEMORY_REPORT_TOP = 50
+
+# Alocações do próprio tracemalloc e do import system ficam fora do relatório
+MEMORY_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+class ProfilerBusy(Exception):
+    """Já existe um perfil em andamento neste processo."""
+
+
+class CpuCollector:
+    """cProfile da thread atual (a do event loop)."""
+
+    kind = "cpu"
+
+    def __init__(self):
+        self._profile = cProfile.Profile()
+
+    def start(self) -> None:
+        self._profile.enable()
+
+    def stop(self) -> None:
+        self._profile.disable()
+
+    def write(self, base: str) -> List[str]:
+        path = f"{base}.prof"
+        self._profile.dump_stats(path)
+        return [path]
+
+
+class SampleCollector:
+    """
+    Amostragem das pilhas de todas as threads em uma thread própria.
+
+    Cada amostra vira uma linha "thread;função (arquivo:linha);..." no
+    formato collapsed stacks, agregada por contagem.
+    """
+
+    kind = "sample"
+
+    def __init__(self, interval_ms: float):
+        self.interval = max(interval_ms, 0.5) / 1000
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                if thread_id not in names:
+                    names = {thread.ident: thread.name for thread in threading.enumerate()}
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                self.samples[";".join(reversed(stack))] += 1
+
+    def write(self, base: str) -> List[str]:
+        path = f"{base}.folded"
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+        return [path]
+
+
+class MemoryCollector:
+    """
+    Diferença de alocações vivas (tracemalloc) entre o início e o fim.
+
+    Se o tracemalloc não estava ativo, ele é ligado no início e desligado
+    no fim; o relatório lista então tudo o que foi alocado na sessão e
+    continua vivo.
+    """
+
+    kind = "memory"
+
+    def __init__(self, frames: int):
+        self.frames = max(1, frames)
+        self._started = False
+        self._before: Optional[tracemalloc.Snapshot] = None
+        self._started_at = 0.0
+
+    def start(self) -> None:
+        self._started_at = time.time()
+        if tracemalloc.is_tracing():
+            self._before = tracemalloc.take_snapshot()
+        else:
+            tracemalloc.start(self.frames)
+            self._started = True
+
+    def stop(self) -> None:
+        # O snapshot final é tirado em `write`, fora do event loop
+        pass
+
+    def write(self, base: str) -> List[str]:
+        gc.collect()
+        after = tracemalloc.take_snapshot()
+        traced, peak = tracemalloc.get_traced_memory()
+        if self._started:
+            tracemalloc.stop()
+        after = after.filter_traces(MEMORY_FILTERS)
+        if self._before is not None:
+            stats = after.compare_to(self._before.filter_traces(MEMORY_FILTERS), "lineno")
+            growth = sum(stat.size_diff for stat in stats)
+        else:
+            stats = after.statistics("lineno")
+            growth = sum(stat.size for stat in stats)
+
+        report = f"{base}.txt"
+        with open(report, "w", encoding="utf-8") as f:
+            f.write(f"Sessão de memória: {time.time() - self._started_at:.1f}s, "
+                    f"crescimento {growth / 1024:.1f} KiB, "
+                    f"rastreado {traced / 1024:.1f} KiB (pico {peak / 1024:.1f} KiB)\n")
+            f.write("Baseline: snapshot anterior\n" if self._before is not None
+                    else "Baseline: vazia (tracemalloc ligado no início da sessão)\n")
+            f.write("\n")
+            for stat in stats[:MEMORY_REPORT_TOP]:
+                f.write(f"{stat}\n")
+        snapshot = f"{base}.snapshot"
+        after.dump(snapshot)
+        return [report, snapshot]
+
+
+class ProfileSession:
+    """
+    Perfil em andamento: de uma requisição (header) ou das próximas N (admin).
+
+    Attributes:
+        id: Identificador (também no nome dos artefatos)
+        kind: cpu, sample ou memory
+        requests: Requisições cobertas
+        completed: Requisições já concluídas
+        started_at: Início (timestamp)
+        from_header: Perfil de uma requisição (X-Profile), que não conta as demais
+        artifacts: Nomes dos arquivos gravados ao terminar (em PROFILING_DIR)
+    """
+
+    def __init__(self, kind: str, requests: int, collector, from_header: bool = False):
+        self.id = os.urandom(6).hex()
+        self.kind = kind
+        self.requests = requests
+        self.from_header = from_header
+        self.completed = 0
+        self.started_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.artifacts = [self.base_name + extension for extension in ARTIFACT_EXTENSIONS[kind]]
+        self.collector = collector
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def base_name(self) -> str:
+        """Prefixo dos artefatos (data, id e tipo)."""
+        return f"{time.strftime('%Y%m%d-%H%M%S', time.localtime(self.started_at))}-{self.id}-{self.kind}"
+
+    def info(self) -> Dict[str, Any]:
+        """Estado da sessão para a API."""
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "requests": self.requests,
+            "completed": self.completed,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "artifacts": self.artifacts,
+        }
+
+
+class Profiler:
+    """
+    Coordena os perfis do processo (um por vez) e grava os artefatos.
+
+    Roda no event loop (sem locks), como o controle de admissão.
+
+    Attributes:
+        enabled: PROFILING_ENABLED com PROFILING_TOKEN configurado
+        directory: Onde os artefatos são gravados
+        session: Perfil em andamento (None se nenhum)
+        stats: Contadores acumulados (GET /api/metrics)
+    """
+
+    def __init__(self):
+        # Sem token configurado, ninguém é autorizado
+        self.enabled = settings.PROFILING_ENABLED and bool(settings.PROFILING_TOKEN)
+        self.directory = settings.PROFILING_DIR
+        self._token = settings.PROFILING_TOKEN.encode("utf-8")
+        self.sample_interval_ms = settings.PROFILING_SAMPLE_INTERVAL_MS
+        self.max_seconds = settings.PROFILING_MAX_SECONDS
+        self.max_artifacts = settings.PROFILING_MAX_ARTIFACTS
+        self.tracemalloc_frames = settings.PROFILING_TRACEMALLOC_FRAMES
+        self.session: Optional[ProfileSession] = None
+        self._writes: set = set()
+        self.stats = {"sessions": 0, "request_profiles": 0, "busy": 0, "unauthorized": 0, "artifacts_written": 0}
+
+    def authorized(self, token: Optional[str]) -> bool:
+        """Token do header confere com PROFILING_TOKEN (comparação em tempo constante)."""
+        if not self.enabled or not token:
+            self.stats["unauthorized"] += 1
+            return False
+        if hmac.compare_digest(token.encode("utf-8"), self._token):
+            return True
+        self.stats["unauthorized"] += 1
+        return False
+
+    def _collector(self, kind: str):
+        if kind == "cpu":
+            return CpuCollector()
+        if kind == "sample":
+            return SampleCollector(self.sample_interval_ms)
+        return MemoryCollector(self.tracemalloc_frames)
+
+    def start(self, kind: str, requests: int = 1, from_header: bool = False) -> ProfileSession:
+        """
+        Inicia um perfil que termina após `requests` requisições (ou
+        PROFILING_MAX_SECONDS).
+
+        Args:
+            kind: cpu, sample ou memory
+            requests: Requisições cobertas
+            from_header: Perfil de uma requisição (X-Profile) em vez de sessão admin
+
+        Raises:
+            ProfilerBusy: Já existe um perfil em andamento (ou sendo gravado)
+        """
+        if self.session is not None or self._writes:
+            self.stats["busy"] += 1
+            raise ProfilerBusy("Já existe um perfil em andamento neste processo")
+        session = ProfileSession(kind, requests, self._collector(kind), from_header)
+        self.stats["request_profiles" if from_header else "sessions"] += 1
+        session.collector.start()
+        session.timer = asyncio.get_running_loop().call_later(self.max_seconds, self.finish, session)
+        self.session = session
+        logger.info("Profiling iniciado: %s (%s, %d requisição(ões))", session.id, kind, requests)
+        return session
+
+    def request_done(self) -> None:
+        """Conta uma requisição concluída na sessão admin ativa."""
+        session = self.session
+        if session is None or session.from_header:
+            return
+        session.completed += 1
+        if session.completed >= session.requests:
+            self.finish(session)
+
+    def finish(self, session: Optional[ProfileSession] = None) -> Optional[ProfileSession]:
+        """
+        Encerra o perfil e grava os artefatos em segundo plano.
+
+        Returns:
+            ProfileSession: Sessão encerrada (None se não havia)
+        """
+        session = session or self.session
+        if session is None or session is not self.session:
+            return None
+        self.session = None
+        session.timer.cancel()
+        session.collector.stop()
+        session.finished_at = time.time()
+        # A gravação (e o snapshot final de memória) vai para uma thread
+        base = os.path.join(self.directory, session.base_name)
+        task = asyncio.get_running_loop().create_task(asyncio.to_thread(self._write, session, base))
+        self._writes.add(task)
+        task.add_done_callback(self._writes.discard)
+        return session
+
+    def _write(self, session: ProfileSession, base: str) -> None:
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            written = session.collector.write(base)
+            self.stats["artifacts_written"] += len(written)
+            logger.info("Profiling %s gravado: %s", session.id, ", ".join(written))
+        except Exception as e:
+            logger.warning("Falha ao gravar o profiling %s: %s", session.id, e)
+        finally:
+            session.collector = None
+            self._prune()
+
+    async def drain(self) -> None:
+        """Espera as gravações pendentes (testes e encerramento)."""
+        if self._writes:
+            await asyncio.gather(*self._writes, return_exceptions=True)
+
+    def _prune(self) -> None:
+        """Mantém no diretório só os PROFILING_MAX_ARTIFACTS artefatos mais recentes."""
+        artifacts = self.artifacts()
+        for artifact in artifacts[self.max_artifacts:]:
+            try:
+                os.remove(os.path.join(self.directory, artifact["name"]))
+            except OSError:
+                pass
+
+    def artifacts(self) -> List[Dict[str, Any]]:
+        """Artefatos gravados, do mais recente ao mais antigo (só os de profiling)."""
+        try:
+            entries = [
+                entry for entry in os.scandir(self.directory)
+                if ARTIFACT_NAME_RE.match(entry.name) and entry.is_file()
+            ]
+        except FileNotFoundError:
+            return []
+        entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+        return [
+            {"name": entry.name, "size": entry.stat().st_size, "created_at": entry.stat().st_mtime}
+            for entry in entries
+        ]
+
+    def artifact_path(self, name: str) -> Optional[str]:
+        """Caminho de um artefato pelo nome (None se não existe ou não é um artefato)."""
+        if not ARTIFACT_NAME_RE.match(name):
+            return None
+        path = os.path.join(self.directory, name)
+        return path if os.path.isfile(path) else None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Estado do profiling para GET /api/metrics."""
+        return {
+            "enabled": self.enabled,
+            "active": self.session.info() if self.session else None,
+            **self.stats,
+        }
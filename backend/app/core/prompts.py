@@ -4,6 +4,8 @@ AI Prompts - Enhanced Version
 Prompts otimizados e system prompts dedicados para classificação e geração de respostas.
 """
 
+import hashlib
+
 # ==================== SYSTEM PROMPTS ====================
 
 CLASSIFICATION_SYSTEM_PROMPT = """Você é um assistente especializado em análise e classificação de emails corporativos do setor financeiro brasileiro.
@@ -136,6 +138,29 @@ EXEMPLO DE RESPOSTA:
 }}"""
 
 
+# Prompt curto com exemplos recuperados do índice (substitui o bloco de critérios)
+FEWSHOT_CLASSIFICATION_PROMPT_TEMPLATE = """Classifique o email corporativo abaixo em uma das duas categorias:
+
+PRODUTIVO: requer ação ou resposta (solicitações, dúvidas, problemas, status,
+reclamações, prazos, pedidos de suporte).
+IMPRODUTIVO: não requer ação imediata (felicitações, agradecimentos,
+mensagens motivacionais, correntes, comunicados gerais).
+
+EMAILS SEMELHANTES JÁ CLASSIFICADOS:
+
+{examples}
+
+EMAIL A CLASSIFICAR:
+
+{email_text}
+
+Responda APENAS com um objeto JSON válido (sem markdown, sem texto adicional):
+{{"categoria": "PRODUTIVO" ou "IMPRODUTIVO", "confianca": número entre 0.0 e 1.0, "justificativa": "explicação concisa em uma frase"}}"""
+
+# Tamanho máximo do texto de cada exemplo no prompt few-shot
+FEWSHOT_EXAMPLE_MAX_CHARS = 200
+
+
 # ==================== RESPONSE GENERATION PROMPTS ====================
 
 RESPONSE_GENERATION_PROMPT_PRODUTIVO = """Gere uma resposta profissional e adequada para o email PRODUTIVO abaixo.
@@ -248,6 +273,82 @@ RESPOSTA (apenas o texto):
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"""
 
 
+# ==================== COMBINED PROMPTS ====================
+# Modo "combined": classificação e resposta sugerida em uma única chamada
+
+COMBINED_SYSTEM_PROMPT = """Você é um assistente especializado em análise de emails corporativos do setor financeiro brasileiro: classifica cada email e redige a resposta adequada.
+
+DIRETRIZES:
+- Seja objetivo e preciso; baseie-se em evidências do texto
+- Calibre a confiança da classificação (0.0 a 1.0)
+- Redija a resposta em português brasileiro formal, cordial e concisa
+- Retorne SEMPRE no formato JSON especificado
+- Não adicione texto extra fora do JSON"""
+
+
+COMBINED_PROMPT_TEMPLATE = """Analise o email corporativo abaixo: classifique-o e redija uma resposta.
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+CATEGORIAS:
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+PRODUTIVO (requer ação ou resposta): solicitações de informações ou
+documentos, dúvidas, problemas técnicos, status de requisições,
+reclamações, urgências e prazos, pedidos de suporte.
+
+IMPRODUTIVO (não requer ação imediata): felicitações, agradecimentos
+genéricos, mensagens motivacionais, correntes, comunicados gerais,
+encaminhamentos sem contexto.
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+EMAIL:
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+{email_text}
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+RESPOSTA SUGERIDA:
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+- PRODUTIVO: abertura cordial ("Prezado(a)"), reconheça a solicitação,
+  informe que está em análise e os próximos passos, sem promessas
+  específicas (máx. 8-10 linhas)
+- IMPRODUTIVO: breve e cordial, agradeça ou retribua (máx. 3-5 linhas)
+- Feche com "Atenciosamente," e "Equipe de Atendimento"; sem assunto
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+FORMATO DE RESPOSTA (JSON):
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+Responda APENAS com um objeto JSON válido (sem markdown, sem texto adicional):
+
+{{
+  "categoria": "PRODUTIVO" ou "IMPRODUTIVO",
+  "confianca": número entre 0.0 e 1.0,
+  "justificativa": "explicação concisa em uma frase",
+  "resposta": "texto da resposta sugerida (use \\n para quebras de linha)"
+}}"""
+
+
+# ==================== VERSÕES DOS PROMPTS ====================
+
+def _version(name: str, *templates: str) -> str:
+    """Identificador da versão: nome + 8 primeiros hex do SHA-256 dos textos."""
+    return f"{name}-{hashlib.sha256(''.join(templates).encode('utf-8')).hexdigest()[:8]}"
+
+
+# Gravadas no histórico: mudou o texto do prompt, mudou a versão
+PROMPT_VERSIONS = {
+    "classification": _version("classification", CLASSIFICATION_SYSTEM_PROMPT, CLASSIFICATION_PROMPT_TEMPLATE),
+    "fewshot": _version("fewshot", CLASSIFICATION_SYSTEM_PROMPT, FEWSHOT_CLASSIFICATION_PROMPT_TEMPLATE),
+    "combined": _version("combined", COMBINED_SYSTEM_PROMPT, COMBINED_PROMPT_TEMPLATE),
+    "response": _version(
+        "response", RESPONSE_SYSTEM_PROMPT,
+        RESPONSE_GENERATION_PROMPT_PRODUTIVO, RESPONSE_GENERATION_PROMPT_IMPRODUTIVO
+    ),
+}
+
+
 # ==================== HELPER FUNCTIONS ====================
 
 def get_classification_prompt(email_text: str) -> str:
@@ -293,10 +394,60 @@ def get_response_generation_prompt(email_text: str, categoria: str) -> str:
     return template.format(email_text=email_text)
 
 
+def get_combined_prompt(email_text: str) -> str:
+    """
+    Retorna o prompt formatado do modo combinado (classificação + resposta).
+    
+    Args:
+        email_text: Texto do email (sem o histórico citado)
+        
+    Returns:
+        str: Prompt formatado e pronto para uso
+    """
+    # Truncar email se muito longo (mesmo limite da classificação)
+    max_length = 3000
+    if len(email_text) > max_length:
+        email_text = email_text[:max_length] + "\n\n[... texto truncado ...]"
+    
+    return COMBINED_PROMPT_TEMPLATE.format(email_text=email_text)
+
+
+def get_fewshot_classification_prompt(email_text: str, examples: list) -> str:
+    """
+    Retorna o prompt curto de classificação com exemplos semelhantes.
+    
+    Args:
+        email_text: Texto do email a ser classificado
+        examples: Exemplos rotulados (dicts com email, categoria e justificativa)
+        
+    Returns:
+        str: Prompt formatado e pronto para uso
+    """
+    # Truncar email se muito longo (mesmo limite do prompt completo)
+    max_length = 3000
+    if len(email_text) > max_length:
+        email_text = email_text[:max_length] + "\n\n[... texto truncado ...]"
+    
+    blocks = []
+    for number, example in enumerate(examples, 1):
+        text = " ".join(example["email"].split())
+        if len(text) > FEWSHOT_EXAMPLE_MAX_CHARS:
+            text = text[:FEWSHOT_EXAMPLE_MAX_CHARS] + "..."
+        block = f"Exemplo {number}: {text}\n→ {example['categoria']}"
+        if example.get("justificativa"):
+            block += f" ({example['justificativa']})"
+        blocks.append(block)
+    
+    return FEWSHOT_CLASSIFICATION_PROMPT_TEMPLATE.format(
+        examples="\n\n".join(blocks),
+        email_text=email_text
+    )
+
+
 def get_few_shot_examples() -> list:
     """
     Retorna exemplos few-shot para melhorar classificação.
-    Pode ser usado para fine-tuning ou prompt engineering avançado.
+    Sementes do índice de exemplos quando FEWSHOT_EXAMPLES_PATH não é informado.
     
     Returns:
         list: Lista de exemplos formatados
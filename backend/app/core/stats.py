@@ -0,0 +1,291 @@
+"""
+Classification Stats
+====================
+Agregados de classificação por hora e por dia, mantidos em memória a cada
+resultado do classificador (sem reprocessar resultados brutos).
+
+Cada período (rollup) guarda contadores (total, falhas, categorias,
+fallbacks, respostas padrão), o histograma de confiança e um sketch de
+latência. Tudo é somável: rollups de vários períodos, ou de vários workers,
+se combinam com `merge`, e os percentis saem do sketch combinado.
+
+O sketch de latência usa buckets logarítmicos (estilo DDSketch): qualquer
+percentil tem erro relativo de no máximo RELATIVE_ACCURACY, com memória
+proporcional ao log do intervalo de valores (algumas centenas de buckets
+entre 1 ms e 1 min), e dois sketches se combinam somando os buckets.
+"""
+
+from collections import Counter
+from typing import Any, Dict, List, Optional, Set, Tuple
+import math
+import threading
+import time
+
+# Erro relativo máximo dos percentis de latência
+RELATIVE_ACCURACY = 0.01
+_GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+_LOG_GAMMA = math.log(_GAMMA)
+
+# Faixas do histograma de confiança: [0.0, 0.1), [0.1, 0.2), ..., [0.9, 1.0]
+CONFIDENCE_BINS = 10
+
+# Duração dos períodos (segundos; dias em UTC)
+HOUR = 3600
+DAY = 86400
+
+# Percentis de latência reportados
+LATENCY_QUANTILES = (0.5, 0.9, 0.95, 0.99)
+
+
+class LatencySketch:
+    """
+    Sketch de latência combinável, com erro relativo limitado.
+
+    Attributes:
+        buckets: Índice do bucket logarítmico -> contagem
+        zeros: Amostras <= 0 (ex.: modo simulação)
+        count: Total de amostras
+        total: Soma das amostras (para a média)
+        max: Maior amostra
+    """
+
+    __slots__ = ("buckets", "zeros", "count", "total", "max")
+
+    def __init__(self):
+        self.buckets: Dict[int, int] = {}
+        self.zeros = 0
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value: float) -> None:
+        """Registra uma amostra (ms)."""
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+        if value <= 0:
+            self.zeros += 1
+            return
+        index = math.ceil(math.log(value) / _LOG_GAMMA)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def merge(self, other: "LatencySketch") -> None:
+        """Soma as amostras de outro sketch."""
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.zeros += other.zeros
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def quantile(self, fraction: float) -> Optional[float]:
+        """
+        Percentil aproximado (erro relativo <= RELATIVE_ACCURACY).
+
+        Args:
+            fraction: Percentil (0.95 = p95)
+
+        Returns:
+            Optional[float]: Latência em ms, ou None sem amostras
+        """
+        if not self.count:
+            return None
+        rank = fraction * (self.count - 1)
+        seen = self.zeros
+        if seen > rank:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen > rank:
+                # Ponto do bucket (γ^(i-1), γ^i] com o menor erro relativo
+                return min(2 * _GAMMA ** index / (_GAMMA + 1), self.max)
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "buckets": [[index, count] for index, count in self.buckets.items()],
+            "zeros": self.zeros, "count": self.count, "total": self.total, "max": self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LatencySketch":
+        sketch = cls()
+        sketch.buckets = {index: count for index, count in data["buckets"]}
+        sketch.zeros, sketch.count = data["zeros"], data["count"]
+        sketch.total, sketch.max = data["total"], data["max"]
+        return sketch
+
+
+class Rollup:
+    """
+    Agregado de um período: contadores, histograma de confiança e latência.
+    """
+
+    __slots__ = ("total", "failed", "categories", "confidence", "fallbacks", "default_responses", "latency")
+
+    def __init__(self):
+        self.total = 0
+        self.failed = 0
+        self.categories: Counter = Counter()
+        self.confidence: List[int] = [0] * CONFIDENCE_BINS
+        self.fallbacks = 0
+        self.default_responses = 0
+        self.latency = LatencySketch()
+
+    def record(self, result: Dict[str, Any], fallbacks: int = 0) -> None:
+        """
+        Soma um resultado de classify_email.
+
+        Args:
+            result: Resultado da classificação
+            fallbacks: Trocas de modelo do LLM durante a classificação
+        """
+        self.total += 1
+        if fallbacks:
+            self.fallbacks += 1
+        if not result.get("success"):
+            self.failed += 1
+            return
+        self.categories[result["classification"]] += 1
+        self.confidence[min(int(result["confidence"] * CONFIDENCE_BINS), CONFIDENCE_BINS - 1)] += 1
+        if (result.get("models") or {}).get("response") == "default":
+            self.default_responses += 1
+        if result.get("processing_time_ms") is not None:
+            self.latency.add(result["processing_time_ms"])
+
+    def merge(self, other: "Rollup") -> None:
+        """Soma outro rollup (outro período ou outro worker)."""
+        self.total += other.total
+        self.failed += other.failed
+        self.categories.update(other.categories)
+        self.confidence = [a + b for a, b in zip(self.confidence, other.confidence)]
+        self.fallbacks += other.fallbacks
+        self.default_responses += other.default_responses
+        self.latency.merge(other.latency)
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Indicadores do período para GET /api/stats.
+
+        Returns:
+            Dict[str, Any]: Contagens, proporção de categorias, distribuição
+            de confiança, percentis de latência e taxas de falha/fallback
+        """
+        succeeded = self.total - self.failed
+        latency = self.latency
+        return {
+            "total": self.total,
+            "failed": self.failed,
+            "error_rate": round(self.failed / self.total, 4) if self.total else 0.0,
+            "categories": dict(self.categories),
+            "category_mix": {
+                category: round(count / succeeded, 4) for category, count in self.categories.items()
+            } if succeeded else {},
+            "confidence_histogram": list(self.confidence),
+            "latency_ms": {
+                **{f"p{int(q * 100)}": _round(latency.quantile(q)) for q in LATENCY_QUANTILES},
+                "mean": round(latency.total / latency.count, 1) if latency.count else None,
+                "max": latency.max if latency.count else None,
+            },
+            "fallback_rate": round(self.fallbacks / self.total, 4) if self.total else 0.0,
+            "default_response_rate": round(self.default_responses / succeeded, 4) if succeeded else 0.0,
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total": self.total, "failed": self.failed, "categories": dict(self.categories),
+            "confidence": self.confidence, "fallbacks": self.fallbacks,
+            "default_responses": self.default_responses, "latency": self.latency.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Rollup":
+        rollup = cls()
+        rollup.total, rollup.failed = data["total"], data["failed"]
+        rollup.categories = Counter(data["categories"])
+        rollup.confidence = list(data["confidence"])
+        rollup.fallbacks, rollup.default_responses = data["fallbacks"], data["default_responses"]
+        rollup.latency = LatencySketch.from_dict(data["latency"])
+        return rollup
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(value, 1)
+
+
+class StatsRollups:
+    """
+    Rollups por hora e por dia deste processo, atualizados a cada resultado.
+
+    Os períodos já gravados (flush) e encerrados saem da memória; só ficam
+    a hora e o dia correntes, mais os ainda não gravados.
+    """
+
+    def __init__(self):
+        self._rollups: Dict[Tuple[str, int], Rollup] = {}
+        self._dirty: Set[Tuple[str, int]] = set()
+        self._lock = threading.Lock()
+
+    def record(self, result: Dict[str, Any], fallbacks: int = 0, now: Optional[float] = None) -> None:
+        """
+        Soma um resultado à hora e ao dia correntes.
+
+        Args:
+            result: Resultado de classify_email
+            fallbacks: Trocas de modelo do LLM durante a classificação
+            now: Momento do resultado (padrão: agora)
+        """
+        now = time.time() if now is None else now
+        keys = (("hour", int(now // HOUR) * HOUR), ("day", int(now // DAY) * DAY))
+        with self._lock:
+            for key in keys:
+                rollup = self._rollups.get(key)
+                if rollup is None:
+                    rollup = self._rollups[key] = Rollup()
+                rollup.record(result, fallbacks)
+                self._dirty.add(key)
+
+    def pending(self) -> List[Tuple[str, int, Dict[str, Any]]]:
+        """
+        Períodos alterados desde o último flush, serializados.
+
+        Returns:
+            List: (granularidade, início do período, rollup como dict)
+        """
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+            return [(granularity, bucket, self._rollups[(granularity, bucket)].to_dict())
+                    for granularity, bucket in dirty]
+
+    def flushed(self, entries: List[Tuple[str, int, Dict[str, Any]]], failed: bool = False) -> None:
+        """
+        Conclui um flush: descarta da memória os períodos gravados que já
+        terminaram, ou marca de novo como pendentes se a gravação falhou.
+        """
+        now = time.time()
+        with self._lock:
+            for granularity, bucket, _ in entries:
+                key = (granularity, bucket)
+                if failed:
+                    self._dirty.add(key)
+                elif key not in self._dirty and bucket + (HOUR if granularity == "hour" else DAY) <= now:
+                    self._rollups.pop(key, None)
+
+    def local(self, granularity: str, start: int, end: int) -> Dict[int, Rollup]:
+        """
+        Cópia dos rollups em memória de uma granularidade no intervalo.
+
+        Returns:
+            Dict[int, Rollup]: Início do período -> rollup
+        """
+        with self._lock:
+            return {
+                bucket: Rollup.from_dict(rollup.to_dict())
+                for (kind, bucket), rollup in self._rollups.items()
+                if kind == granularity and start <= bucket < end
+            }
+
+
+# Rollups deste processo (atualizados pelo classificador)
+classification_stats = StatsRollups()
@@ -0,0 +1,278 @@
+"""
+Request Tracing
+===============
+Rastreamento leve por requisição.
+
+Cada requisição abre um trace e cada etapa do pipeline (extração de arquivo,
+NLP, tentativas de LLM, geração de resposta) registra um span. O detalhamento
+vai para o campo `timings` da resposta, para o header `Server-Timing` e,
+opcionalmente, para um arquivo JSONL no formato OTLP/JSON do OpenTelemetry.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+
+# Importar configurações
+from backend.app.core.config import settings
+
+# Configurar logger
+logger = logging.getLogger(__name__)
+
+# Trace e span ativos no contexto da requisição atual
+_current_trace: ContextVar[Optional["Trace"]] = ContextVar("current_trace", default=None)
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+class Span:
+    """
+    Intervalo de tempo nomeado dentro de um trace.
+    """
+
+    __slots__ = (
+        "name", "span_id", "parent_id", "start_ns", "end_ns",
+        "_start_perf", "attributes", "error"
+    )
+
+    def __init__(self, name: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.name = name
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self._start_perf = time.perf_counter_ns()
+        self.attributes = attributes
+        self.error: Optional[str] = None
+
+    def end(self) -> None:
+        """Encerra o span (idempotente)."""
+        if self.end_ns is None:
+            self.end_ns = self.start_ns + (time.perf_counter_ns() - self._start_perf)
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Adiciona um atributo ao span."""
+        self.attributes[key] = value
+
+    @property
+    def duration_ms(self) -> float:
+        """Duração em milissegundos (até agora, se ainda aberto)."""
+        if self.end_ns is None:
+            return (time.perf_counter_ns() - self._start_perf) / 1e6
+        return (self.end_ns - self.start_ns) / 1e6
+
+
+class Trace:
+    """
+    Conjunto de spans de uma requisição.
+
+    Attributes:
+        trace_id: Identificador do trace (32 hex, compatível com OpenTelemetry)
+        sampled: Se o trace será exportado ao final
+        root: Span raiz (duração total da requisição)
+        spans: Spans filhos, na ordem em que foram abertos
+    """
+
+    def __init__(self, name: str, sampled: bool):
+        self.trace_id = os.urandom(16).hex()
+        self.sampled = sampled
+        self.root = Span(name, None, {})
+        self.spans: List[Span] = []
+        self._tokens = None
+
+    def timings(self) -> Dict[str, float]:
+        """
+        Retorna a duração de cada etapa em milissegundos.
+
+        Spans com o mesmo nome (ex.: tentativas de LLM) recebem sufixo
+        numérico na ordem em que ocorreram.
+        """
+        counts: Dict[str, int] = {}
+        for span in self.spans:
+            counts[span.name] = counts.get(span.name, 0) + 1
+
+        seen: Dict[str, int] = {}
+        timings: Dict[str, float] = {}
+        for span in self.spans:
+            key = span.name
+            if counts[key] > 1:
+                seen[key] = seen.get(key, 0) + 1
+                key = f"{key}_{seen[key]}"
+            timings[key] = round(span.duration_ms, 2)
+
+        timings["total"] = round(self.root.duration_ms, 2)
+        return timings
+
+    def server_timing(self) -> str:
+        """
+        Monta o valor do header `Server-Timing` (exibido no devtools do navegador).
+        """
+        return ", ".join(
+            f"{name};dur={duration:.1f}" for name, duration in self.timings().items()
+        )
+
+
+class JsonlSpanExporter:
+    """
+    Exporta traces para um arquivo JSONL (uma linha OTLP/JSON por trace).
+
+    A escrita acontece em uma thread de fundo para não bloquear a requisição.
+    """
+
+    def __init__(self, path: str, service_name: str):
+        self.path = path
+        self.service_name = service_name
+        self._queue: "queue.SimpleQueue[Trace]" = queue.SimpleQueue()
+        self._thread = threading.Thread(
+            target=self._run, name="trace-exporter", daemon=True
+        )
+        self._thread.start()
+
+    def export(self, trace: Trace) -> None:
+        """Enfileira um trace finalizado para exportação."""
+        self._queue.put(trace)
+
+    def _run(self) -> None:
+        while True:
+            trace = self._queue.get()
+            try:
+                line = json.dumps(self._to_otlp(trace), ensure_ascii=False)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+            except Exception as e:
+                logger.warning("Falha ao exportar trace: %s", e)
+
+    def _to_otlp(self, trace: Trace) -> Dict[str, Any]:
+        """Converte um trace para o formato OTLP/JSON (resourceSpans)."""
+        spans = [self._span_to_otlp(trace, trace.root, "SPAN_KIND_SERVER")]
+        spans.extend(
+            self._span_to_otlp(trace, span, "SPAN_KIND_INTERNAL")
+            for span in trace.spans
+        )
+        return {
+            "resourceSpans": [{
+                "resource": {
+                    "attributes": [_otlp_attribute("service.name", self.service_name)]
+                },
+                "scopeSpans": [{
+                    "scope": {"name": "backend.app.core.tracing"},
+                    "spans": spans
+                }]
+            }]
+        }
+
+    @staticmethod
+    def _span_to_otlp(trace: Trace, span: Span, kind: str) -> Dict[str, Any]:
+        data = {
+            "traceId": trace.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": kind,
+            "startTimeUnixNano": str(span.start_ns),
+            "endTimeUnixNano": str(span.end_ns or span.start_ns),
+            "attributes": [_otlp_attribute(k, v) for k, v in span.attributes.items()],
+            "status": (
+                {"code": "STATUS_CODE_ERROR", "message": span.error}
+                if span.error else {"code": "STATUS_CODE_OK"}
+            )
+        }
+        if span.parent_id:
+            data["parentSpanId"] = span.parent_id
+        return data
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    """Converte um atributo para o formato tipado do OTLP."""
+    if isinstance(value, bool):
+        typed = {"boolValue": value}
+    elif isinstance(value, int):
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(value)}
+    return {"key": key, "value": typed}
+
+
+# Exportador global (criado apenas se TRACE_EXPORT_PATH estiver configurado)
+_exporter: Optional[JsonlSpanExporter] = (
+    JsonlSpanExporter(settings.TRACE_EXPORT_PATH, settings.APP_NAME)
+    if settings.TRACE_EXPORT_PATH else None
+)
+
+
+# ==================== API PÚBLICA ====================
+
+def start_trace(name: str) -> Trace:
+    """
+    Abre um trace para a requisição atual.
+
+    A amostragem (TRACE_SAMPLE_RATE) decide apenas a exportação; os
+    timings da resposta são sempre calculados.
+
+    Args:
+        name: Nome do span raiz (ex.: "POST /api/classify-text")
+
+    Returns:
+        Trace: Trace ativo
+    """
+    sampled = _exporter is not None and random.random() < settings.TRACE_SAMPLE_RATE
+    trace = Trace(name, sampled)
+    trace._tokens = (_current_trace.set(trace), _current_span.set(trace.root))
+    return trace
+
+
+def end_trace(trace: Trace) -> None:
+    """
+    Encerra o trace, exporta se amostrado e limpa o contexto.
+
+    Args:
+        trace: Trace retornado por start_trace
+    """
+    trace.root.end()
+    if trace._tokens:
+        trace_token, span_token = trace._tokens
+        _current_span.reset(span_token)
+        _current_trace.reset(trace_token)
+        trace._tokens = None
+    if trace.sampled and _exporter is not None:
+        _exporter.export(trace)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    """
+    Registra um span para o bloco de código.
+
+    Sem trace ativo (ex.: scripts e benchmarks) não registra nada.
+
+    Args:
+        name: Nome da etapa (ex.: "nlp.stem")
+        **attributes: Atributos adicionais do span
+
+    Yields:
+        Span ativo ou None
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+
+    parent = _current_span.get()
+    current = Span(name, parent.span_id if parent else None, attributes)
+    trace.spans.append(current)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.error = str(e) or type(e).__name__
+        raise
+    finally:
+        current.end()
+        _current_span.reset(token)
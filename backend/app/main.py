@@ -4,32 +4,41 @@ FastAPI Main Application
 Aplicação principal que gerencia rotas, CORS e inicialização do servidor.
 """
 
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse, HTMLResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import JSONResponse, HTMLResponse, ORJSONResponse
+import asyncio
 import logging
 import os
 
-# Importar rotas
-from backend.app.api.routes import router
+from backend.app.core.logging_config import setup_logging, shutdown_logging
 
-# Configuração de logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Configuração de logging (fila + thread de escrita, saída JSON).
+# Feita antes de importar as rotas, que já instanciam os serviços.
+setup_logging()
 logger = logging.getLogger(__name__)
 
+# Importar rotas
+from backend.app.api.compression import CompressionMiddleware
+from backend.app.api.profiling import ProfilingMiddleware
+from backend.app.api.static_assets import ASSET_DIRECTORIES, StaticAssets
+from backend.app.api.routes import router, classifier, history, job_manager, profiler, response_manager, stats_manager
+from backend.app.core.config import settings
+
 # Inicializar aplicação FastAPI
 app = FastAPI(
     title="Email Classifier API",
     description="API para classificação automática de emails usando IA",
     version="1.0.0",
     docs_url="/api/docs",  # Swagger UI
-    redoc_url="/api/redoc"  # ReDoc
+    redoc_url="/api/redoc",  # ReDoc
+    default_response_class=ORJSONResponse  # Serialização com orjson
 )
 
+# Compressão HTTP (respostas gzip/brotli e corpos comprimidos). Registrada antes
+# do CORS para ficar por dentro dele: os erros 400/413/415 também levam os headers CORS.
+app.add_middleware(CompressionMiddleware)
+
 # Configurar CORS (permitir requisições do frontend)
 app.add_middleware(
     CORSMiddleware,
@@ -39,35 +48,41 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Profiling sob demanda (header X-Profile e sessões de /api/admin/profiles). Por fora
+# de tudo, para o perfil cobrir a requisição inteira; desativado, nem é registrado.
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware, profiler=profiler)
+
 # Incluir rotas da API
 app.include_router(router, prefix="/api")
 
-# Servir arquivos estáticos do frontend
+# Servir arquivos estáticos do frontend (em memória, com hash no nome e pré-comprimidos)
 frontend_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "frontend")
+static_assets = StaticAssets(frontend_path)
+
+
+async def static_file(request: Request):
+    """
+    Assets do frontend (css, js, assets): nome com hash (cache immutable)
+    ou nome original (revalidado por ETag)
+    """
+    response = static_assets.response(request, request.scope["path"].lstrip("/"))
+    if response is None:
+        raise HTTPException(status_code=404, detail="Arquivo não encontrado")
+    return response
+
 
-# Montar diretórios estáticos apenas se existirem
-if os.path.exists(frontend_path):
-    assets_path = os.path.join(frontend_path, "assets")
-    css_path = os.path.join(frontend_path, "css")
-    js_path = os.path.join(frontend_path, "js")
-    
-    if os.path.exists(assets_path):
-        app.mount("/assets", StaticFiles(directory=assets_path), name="assets")
-    if os.path.exists(css_path):
-        app.mount("/css", StaticFiles(directory=css_path), name="css")
-    if os.path.exists(js_path):
-        app.mount("/js", StaticFiles(directory=js_path), name="js")
+for directory in ASSET_DIRECTORIES:
+    app.add_api_route(f"/{directory}/{{path:path}}", static_file, methods=["GET", "HEAD"], include_in_schema=False)
 
 # Rota raiz - servir o HTML do frontend
-@app.get("/")
-async def root():
+@app.api_route("/", methods=["GET", "HEAD"])
+async def root(request: Request):
     """
-    Endpoint raiz - Retorna o arquivo HTML do frontend
+    Endpoint raiz - Retorna o HTML do frontend (em memória, revalidado por ETag)
     """
-    html_file = os.path.join(frontend_path, "index.html") if os.path.exists(frontend_path) else None
-    
-    if html_file and os.path.exists(html_file):
-        return FileResponse(html_file, media_type="text/html")
+    if static_assets.has_index:
+        return static_assets.response(request, "index.html")
     else:
         # Fallback se o arquivo não existir
         return HTMLResponse("""
@@ -89,7 +104,7 @@ async def global_exception_handler(request, exc):
     """
     Captura erros não tratados e retorna resposta padronizada
     """
-    logger.error(f"Erro não tratado: {str(exc)}", exc_info=True)
+    logger.error("Erro não tratado: %s", exc, exc_info=True)
     return JSONResponse(
         status_code=500,
         content={
@@ -106,6 +121,13 @@ async def startup_event():
     Executado quando a aplicação inicia
     """
     logger.info("Iniciando Email Classifier API...")
+    await history.start()
+    await stats_manager.start()
+    await job_manager.start()
+    await response_manager.start()
+    if classifier.example_index is not None:
+        # Índice few-shot construído em segundo plano; até ficar pronto, prompt completo
+        app.state.example_index_task = asyncio.create_task(asyncio.to_thread(classifier.load_examples))
     logger.info("Sistema de classificação pronto!")
 
 # Evento de encerramento
@@ -114,4 +136,13 @@ async def shutdown_event():
     """
     Executado quando a aplicação é encerrada
     """
-    logger.info("Encerrando Email Classifier API...")
\ No newline at end of file
+    logger.info("Encerrando Email Classifier API...")
+    await job_manager.stop()
+    await response_manager.stop()
+    # Perfil em andamento: grava o que foi coletado
+    profiler.finish()
+    await profiler.drain()
+    # Por último: grava as classificações e estatísticas pendentes
+    await history.stop()
+    await stats_manager.stop()
+    shutdown_logging()
\ No newline at end of file
@@ -5,7 +5,10 @@ Define modelos de dados para validação de requests e responses.
 """
 
 from pydantic import BaseModel, Field, validator
-from typing import Optional
+from typing import Any, Dict, List, Optional
+
+from backend.app.core.config import PIPELINE_MODES
+from backend.app.core.profiling import PROFILE_KINDS
 
 # ==================== REQUEST MODELS ====================
 
@@ -21,6 +24,18 @@ class EmailTextRequest(BaseModel):
         example="Prezados, gostaria de solicitar o status da minha requisição #12345."
     )
     
+    mode: Optional[str] = Field(
+        None,
+        description="Modo do pipeline: two_call ou combined (padrão: AI_PIPELINE_MODE)",
+        example="combined"
+    )
+    
+    generate_response: bool = Field(
+        True,
+        description="Gerar a resposta sugerida agora; false retorna um response_id para gerar depois",
+        example=True
+    )
+    
     @validator('email_text')
     def validate_text(cls, v):
         """
@@ -29,6 +44,74 @@ class EmailTextRequest(BaseModel):
         if not v or not v.strip():
             raise ValueError("O texto do email não pode estar vazio")
         return v.strip()
+    
+    @validator('mode')
+    def validate_mode(cls, v):
+        """
+        Valida o modo do pipeline.
+        """
+        if v is not None and v not in PIPELINE_MODES:
+            raise ValueError(f"Modo inválido. Use: {', '.join(PIPELINE_MODES)}")
+        return v
+
+
+class JobCreateRequest(BaseModel):
+    """
+    Schema para criação de job assíncrono via JSON.
+    Informe `email_text` (um email) ou `emails` (lote).
+    """
+    email_text: Optional[str] = Field(
+        None,
+        min_length=10,
+        max_length=10000,
+        description="Texto de um único email",
+        example="Prezados, gostaria de solicitar o status da minha requisição #12345."
+    )
+    
+    emails: Optional[List[str]] = Field(
+        None,
+        description="Lote de emails a classificar",
+        example=["Prezados, o sistema está com erro no login.", "Feliz Natal a todos da equipe!"]
+    )
+    
+    @validator('emails', each_item=True)
+    def validate_emails(cls, v):
+        """
+        Valida cada email do lote.
+        """
+        v = v.strip()
+        if len(v) < 10:
+            raise ValueError("Cada email deve ter pelo menos 10 caracteres")
+        if len(v) > 10000:
+            raise ValueError("Cada email deve ter no máximo 10.000 caracteres")
+        return v
+
+
+class ProfileSessionRequest(BaseModel):
+    """
+    Schema para iniciar uma sessão de profiling das próximas requisições.
+    """
+    kind: str = Field(
+        ...,
+        description="cpu (cProfile), sample (amostragem de pilhas) ou memory (diferença do tracemalloc)",
+        example="memory"
+    )
+    
+    requests: int = Field(
+        1,
+        ge=1,
+        description="Requisições cobertas pela sessão",
+        example=200
+    )
+    
+    @validator('kind')
+    def validate_kind(cls, v):
+        """
+        Valida o tipo de perfil.
+        """
+        if v not in PROFILE_KINDS:
+            raise ValueError(f"Tipo de perfil inválido. Use: {', '.join(PROFILE_KINDS)}")
+        return v
 
 
 # ==================== RESPONSE MODELS ====================
@@ -74,6 +157,48 @@ class ClassificationResponse(BaseModel):
         example=1234
     )
     
+    language: Optional[str] = Field(
+        None,
+        description="Idioma detectado do email (ISO 639-1; \"und\" se indeterminado)",
+        example="pt"
+    )
+    
+    quoted_chars_removed: Optional[int] = Field(
+        None,
+        description="Caracteres de histórico citado/encaminhado removidos antes do LLM",
+        example=0
+    )
+    
+    mode: Optional[str] = Field(
+        None,
+        description="Modo do pipeline usado (two_call ou combined)",
+        example="two_call"
+    )
+    
+    response_id: Optional[str] = Field(
+        None,
+        description="Handle da resposta sugerida adiada (GET /api/responses/{response_id})",
+        example="9b1d4e..."
+    )
+    
+    models: Optional[Dict[str, str]] = Field(
+        None,
+        description="Modelo do LLM usado em cada chamada (classificação e resposta)",
+        example={"classify": "llama-3.1-8b-instant", "response": "llama-3.1-8b-instant"}
+    )
+    
+    prompt_version: Optional[str] = Field(
+        None,
+        description="Versão dos prompts usados (nome + hash do texto do prompt)",
+        example="classification-1a2b3c4d+response-5e6f7a8b"
+    )
+    
+    timings: Optional[Dict[str, float]] = Field(
+        None,
+        description="Tempo de cada etapa do processamento em milissegundos",
+        example={"nlp": 12.4, "llm.classify": 850.2, "llm.response": 640.7, "total": 1510.3}
+    )
+    
     filename: Optional[str] = Field(
         None,
         description="Nome do arquivo processado (se aplicável)",
@@ -98,11 +223,108 @@ class ClassificationResponse(BaseModel):
                 "justification": "Email contém solicitação de suporte técnico",
                 "suggested_response": "Prezado(a),\n\nRecebemos sua mensagem e estamos analisando sua solicitação. Retornaremos em breve.\n\nAtenciosamente,\nEquipe de Atendimento",
                 "processing_time_ms": 1234,
+                "language": "pt",
                 "filename": "email.txt"
             }
         }
 
 
+class JobCreatedResponse(BaseModel):
+    """
+    Schema para resposta de criação de job.
+    """
+    job_id: str = Field(..., description="Identificador do job", example="3f2c9a...")
+    status: str = Field(..., description="Status inicial do job", example="queued")
+    total: int = Field(..., description="Quantidade de itens do job", example=2)
+    status_url: str = Field(..., description="URL para acompanhar o job", example="/api/jobs/3f2c9a...")
+
+
+class JobItemResult(BaseModel):
+    """
+    Schema do resultado de um item do job.
+    """
+    index: int = Field(..., description="Posição do item no job")
+    filename: Optional[str] = Field(None, description="Nome do arquivo (se aplicável)")
+    status: str = Field(..., description="queued, running, completed ou failed")
+    result: Optional[Dict[str, Any]] = Field(
+        None,
+        description="Resultado da classificação (mesmo formato de /classify-text)"
+    )
+
+
+class JobStatusResponse(BaseModel):
+    """
+    Schema para consulta de status de job.
+    """
+    job_id: str = Field(..., description="Identificador do job")
+    status: str = Field(..., description="queued, running, completed ou failed", example="running")
+    total: int = Field(..., description="Quantidade de itens", example=10)
+    completed: int = Field(..., description="Itens classificados com sucesso", example=6)
+    failed: int = Field(..., description="Itens com erro", example=0)
+    progress: float = Field(..., ge=0.0, le=1.0, description="Fração processada", example=0.6)
+    created_at: float = Field(..., description="Criação (timestamp)")
+    updated_at: float = Field(..., description="Última atualização (timestamp)")
+    finished_at: Optional[float] = Field(None, description="Finalização (timestamp)")
+    expires_at: Optional[float] = Field(None, description="Quando o resultado deixa de estar disponível")
+    results: Optional[List[JobItemResult]] = Field(None, description="Resultados por item")
+
+
+class SuggestedResponseResult(BaseModel):
+    """
+    Schema da resposta sugerida gerada sob demanda.
+    """
+    response_id: str = Field(..., description="Handle retornado na classificação")
+    classification: str = Field(..., description="Categoria classificada", example="PRODUTIVO")
+    suggested_response: str = Field(..., description="Resposta sugerida")
+    model: str = Field(..., description="Modelo que gerou a resposta (\"default\" = resposta padrão)")
+    cached: bool = Field(..., description="Resposta já gerada anteriormente (sem nova chamada ao LLM)")
+    generated_at: Optional[float] = Field(None, description="Geração (timestamp); vazio para a resposta padrão")
+
+
+class HistoryItem(BaseModel):
+    """
+    Schema de uma classificação gravada no histórico.
+    """
+    id: int = Field(..., description="Identificador da linha no histórico")
+    created_at: float = Field(..., description="Classificação (timestamp)")
+    content_hash: str = Field(..., description="SHA-256 do texto do email (o texto não é gravado)")
+    source: str = Field(..., description="Origem: text, file, job ou websocket", example="text")
+    classification: str = Field(..., description="Categoria classificada", example="PRODUTIVO")
+    confidence: float = Field(..., ge=0.0, le=1.0, description="Confiança da classificação")
+    justification: Optional[str] = Field(None, description="Justificativa da classificação")
+    suggested_response: Optional[str] = Field(None, description="Resposta sugerida (vazia se adiada)")
+    language: Optional[str] = Field(None, description="Idioma detectado (ISO 639-1; \"und\" se indeterminado)")
+    mode: Optional[str] = Field(None, description="Modo do pipeline usado")
+    models: Dict[str, Optional[str]] = Field(..., description="Modelo usado em cada chamada")
+    prompt_version: Optional[str] = Field(None, description="Versão dos prompts usados")
+    processing_time_ms: Optional[int] = Field(None, description="Tempo de processamento em milissegundos")
+    timings: Optional[Dict[str, float]] = Field(None, description="Tempo de cada etapa em milissegundos")
+
+
+class HistoryPage(BaseModel):
+    """
+    Schema de uma página do histórico (paginação por cursor).
+    """
+    items: List[HistoryItem] = Field(..., description="Classificações, da mais recente para a mais antiga")
+    next_cursor: Optional[str] = Field(
+        None,
+        description="Cursor da próxima página (parâmetro cursor); vazio na última página"
+    )
+
+
+class ProfileSessionInfo(BaseModel):
+    """
+    Schema de uma sessão de profiling.
+    """
+    id: str = Field(..., description="Identificador da sessão (também no nome dos artefatos)")
+    kind: str = Field(..., description="cpu, sample ou memory", example="memory")
+    requests: int = Field(..., description="Requisições cobertas", example=200)
+    completed: int = Field(..., description="Requisições já concluídas", example=0)
+    started_at: float = Field(..., description="Início (timestamp)")
+    finished_at: Optional[float] = Field(None, description="Fim (timestamp); vazio enquanto ativa")
+    artifacts: List[str] = Field(..., description="Arquivos gravados em PROFILING_DIR ao terminar")
+
+
 class HealthCheckResponse(BaseModel):
     """
     Schema para resposta de health check.
@@ -5,34 +5,68 @@ Serviço simplificado para classificação de emails usando Groq API.
 Remove código não utilizado: métricas, cache, validações complexas.
 """
 
-from groq import Groq
-from typing import Dict, Any
-import json
+from groq import AsyncGroq, BadRequestError
+from contextvars import ContextVar
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import AsyncIterator, Dict, Any, List, Optional, Set, Tuple
+import asyncio
 import logging
 import time
 from datetime import datetime
 
+import orjson
+
 # Importar configurações e utilitários
 from backend.app.core.config import settings
+from backend.app.core.deadline import Deadline, DeadlineExceeded
+from backend.app.core.metrics import latency_by_language
+from backend.app.core.stats import classification_stats
+from backend.app.core.tracing import span
 from backend.app.core.prompts import (
     get_classification_prompt,
+    get_combined_prompt,
+    get_few_shot_examples,
+    get_fewshot_classification_prompt,
     get_response_generation_prompt,
     CLASSIFICATION_SYSTEM_PROMPT,
-    RESPONSE_SYSTEM_PROMPT
+    COMBINED_SYSTEM_PROMPT,
+    RESPONSE_SYSTEM_PROMPT,
+    PROMPT_VERSIONS
 )
+from backend.app.services.example_index import ExampleIndex
+from backend.app.services.hedging import RequestHedger
+from backend.app.services.llm_scheduler import DEFAULT_TENANT, LLMScheduler
+from backend.app.services.model_router import ModelRouter, fallback_reason, retry_after_seconds
+from backend.app.utils.reply_parser import ReplyChainParser
+from backend.app.utils.result_parser import ClassificationResultParser, ResultParseError
 from backend.app.utils.text_cleaner import TextCleaner
 
 # Configurar logger
 logger = logging.getLogger(__name__)
 
+# Formato JSON estruturado do provedor (API compatível com OpenAI)
+JSON_RESPONSE_FORMAT = {"type": "json_object"}
+
+# Trocas de modelo (fallback) na classificação em andamento, para as estatísticas
+_llm_fallbacks: ContextVar[Optional[List[int]]] = ContextVar("llm_fallbacks", default=None)
+
+# Classe de prioridade e tenant da classificação em andamento, para o escalonador
+_llm_flow: ContextVar[Tuple[str, str]] = ContextVar("llm_flow", default=("interactive", DEFAULT_TENANT))
+
 
 class EmailClassifier:
     """
     Classificador simplificado de emails.
     
     Attributes:
-        client: Cliente Groq API
+        client: Cliente Groq API (assíncrono, não bloqueia o event loop)
+        router: Roteador de modelos (ordem de tentativa e fallback)
+        hedger: Cópias de chamadas lentas (None com HEDGING_ENABLED=false)
+        scheduler: Fila justa das chamadas ao LLM (None com SCHEDULER_ENABLED=false)
+        example_index: Exemplos rotulados para o few-shot (None com FEWSHOT_ENABLED=false)
         text_cleaner: Utilitário de limpeza de texto
+        result_parser: Parser tolerante do JSON de classificação (com métricas)
         retry_attempts: Número de tentativas em caso de falha
     """
     
@@ -51,22 +85,84 @@ class EmailClassifier:
             )
             self.client = None
         else:
-            self.client = Groq(api_key=settings.GROQ_API_KEY)
+            # Sem retries do SDK: as tentativas são feitas aqui, dentro do prazo da requisição
+            self.client = AsyncGroq(
+                api_key=settings.GROQ_API_KEY,
+                base_url=self._groq_base_url(settings.GROQ_API_BASE),
+                max_retries=0
+            )
             logger.info("Cliente Groq inicializado com sucesso")
         
+        self.router = ModelRouter(
+            models=settings.GROQ_MODELS or [settings.GROQ_MODEL],
+            long_email_chars=settings.ROUTING_LONG_EMAIL_CHARS,
+            latency_slo_ms=settings.ROUTING_LATENCY_SLO_MS,
+            cooldown_seconds=settings.ROUTING_COOLDOWN_SECONDS,
+            sample_max_age=settings.ROUTING_SAMPLE_MAX_AGE_SECONDS
+        )
+        self.hedger = RequestHedger(
+            quantile=settings.HEDGING_QUANTILE,
+            min_samples=settings.HEDGING_MIN_SAMPLES,
+            budget_ratio=settings.HEDGING_BUDGET_RATIO
+        ) if settings.HEDGING_ENABLED else None
+        self.scheduler = LLMScheduler(
+            max_concurrent=settings.SCHEDULER_MAX_CONCURRENT_CALLS,
+            weights=settings.SCHEDULER_WEIGHTS,
+            urgent_keywords=settings.SCHEDULER_URGENT_KEYWORDS
+        ) if settings.SCHEDULER_ENABLED else None
+        # Construído por load_examples (no startup, em thread)
+        self.example_index = ExampleIndex(dim=settings.FEWSHOT_INDEX_DIM) if settings.FEWSHOT_ENABLED else None
+        self._fewshot_prompts = {"fewshot": 0, "full": 0}
+        
         # Inicializar componentes
         self.text_cleaner = TextCleaner()
+        self.reply_parser = ReplyChainParser(summary_chars=settings.REPLY_QUOTED_SUMMARY_CHARS)
+        self.result_parser = ClassificationResultParser()
+        # Modelos que recusaram o response_format (passam a receber só o prompt)
+        self._json_mode_unsupported: Set[str] = set()
         self.retry_attempts = retry_attempts
         
         logger.info(f"EmailClassifier inicializado (retries={retry_attempts})")
     
     
-    async def classify_email(self, email_text: str) -> Dict[str, Any]:
+    @staticmethod
+    def _groq_base_url(api_base: str) -> str:
+        """
+        Converte GROQ_API_BASE (estilo OpenAI, com /openai/v1) para a base
+        esperada pelo SDK do Groq, que já acrescenta /openai/v1 nas rotas.
+        Permite apontar para servidores compatíveis (ex.: backend/loadtest).
+        """
+        api_base = api_base.rstrip("/")
+        suffix = "/openai/v1"
+        if api_base.endswith(suffix):
+            api_base = api_base[:-len(suffix)]
+        return api_base
+    
+    
+    async def classify_email(
+        self,
+        email_text: str,
+        deadline: Optional[Deadline] = None,
+        mode: Optional[str] = None,
+        generate_response: bool = True,
+        priority: str = "interactive",
+        tenant: str = DEFAULT_TENANT
+    ) -> Dict[str, Any]:
         """
         Classifica um email e gera resposta automática.
         
+        Se o prazo acabar durante a geração da resposta, a classificação é
+        retornada com a resposta padrão.
+        
         Args:
             email_text: Texto do email a ser classificado
+            deadline: Prazo da requisição (padrão: REQUEST_DEADLINE_SECONDS)
+            mode: "two_call" ou "combined" (padrão: AI_PIPELINE_MODE)
+            generate_response: False para só classificar (resposta sob demanda
+                via generate_suggested_response); o modo combinado não se aplica
+            priority: "interactive" ou "batch" no escalonador das chamadas ao LLM
+                (emails interativos com palavras-chave de urgência passam a "urgent")
+            tenant: Cliente da API (fair queueing entre clientes)
             
         Returns:
             Dict contendo:
@@ -78,7 +174,32 @@ class EmailClassifier:
                 - processing_time_ms: int
                 - error: str (se houver erro)
         """
+        # Cada resultado (sucesso ou falha) entra nos rollups de estatísticas
+        fallbacks = [0]
+        token = _llm_fallbacks.set(fallbacks)
+        flow_token = _llm_flow.set((priority, tenant))
+        try:
+            result = await self._classify_email(email_text, deadline, mode, generate_response)
+        finally:
+            _llm_flow.reset(flow_token)
+            _llm_fallbacks.reset(token)
+        classification_stats.record(result, fallbacks[0])
+        return result
+    
+    
+    async def _classify_email(
+        self,
+        email_text: str,
+        deadline: Optional[Deadline],
+        mode: Optional[str],
+        generate_response: bool
+    ) -> Dict[str, Any]:
+        """Pipeline de classify_email: NLP, LLM e montagem do resultado."""
         start_time = time.time()
+        if deadline is None:
+            deadline = Deadline(settings.REQUEST_DEADLINE_SECONDS)
+        mode = mode or settings.AI_PIPELINE_MODE
+        combined = mode == "combined" and generate_response
         
         try:
             # 1. Validação básica
@@ -95,31 +216,103 @@ class EmailClassifier:
                 }
             
             # 2. Aplicar processamento NLP completo
-            # Extrai conteúdo principal primeiro (remove assinatura)
-            cleaned_text = self.text_cleaner.extract_main_content(email_text)
+            # Separa a mensagem mais recente do histórico citado (respostas e encaminhamentos)
+            message_text, thread_text, quoted_removed = email_text, email_text, 0
+            if settings.REPLY_CHAIN_STRIPPING:
+                with span("nlp.strip_reply_chain"):
+                    parsed = self.reply_parser.parse(email_text)
+                if parsed.text:
+                    message_text, thread_text = parsed.text, parsed.with_summary()
+                    quoted_removed = parsed.removed_chars
+            # Extrai conteúdo principal (remove assinatura) e anexa o resumo do histórico
+            with span("nlp.extract_main_content"):
+                cleaned_text = self.text_cleaner.extract_main_content(message_text)
+                if quoted_removed:
+                    cleaned_text = parsed.with_summary(cleaned_text)
+            # Urgência pela mensagem mais recente: a classificação interativa passa à frente na fila do LLM
+            priority, tenant = _llm_flow.get()
+            if priority == "interactive" and self.scheduler is not None and self.scheduler.is_urgent(message_text):
+                _llm_flow.set(("urgent", tenant))
+            # Detecta o idioma (define stop words e stemmer do pré-processamento)
+            with span("nlp.detect_language"):
+                language, language_confidence = self.text_cleaner.detect_language(cleaned_text)
             # Aplica NLP: tokenização, remoção de stop words, stemming
-            nlp_text = self.text_cleaner.apply_nlp_preprocessing(cleaned_text)
+            with span("nlp", language=language):
+                nlp_text = self.text_cleaner.apply_nlp_preprocessing(cleaned_text, language)
             
-            logger.info(f"Texto processado com NLP: {len(nlp_text)} caracteres")
+            logger.debug(
+                "Texto processado com NLP: %d caracteres (idioma: %s, confiança: %.2f)",
+                len(nlp_text), language, language_confidence
+            )
             
             # 3. Se não há cliente configurado, simular
             if not self.client:
-                result = self._simulate_classification(nlp_text)
+                with span("llm.simulate"):
+                    result = self._simulate_classification(nlp_text)
                 processing_time = time.time() - start_time
                 result["processing_time_ms"] = int(processing_time * 1000)
+                result["language"] = language
+                result["quoted_chars_removed"] = quoted_removed
+                result["mode"] = mode
+                if not generate_response:
+                    result["suggested_response"] = None
+                latency_by_language.record(language, processing_time * 1000)
                 return result
             
-            # 4. Classificar com a API (usando texto processado com NLP)
-            classification_result = await self._classify_with_retry(nlp_text)
+            # 4. Classificar com a API: texto processado com NLP; no modo combinado,
+            #    o texto sem o histórico citado (a mesma chamada redige a resposta).
+            #    Com few-shot, exemplos semelhantes substituem o bloco de critérios
+            llm_text = thread_text if combined else nlp_text
+            examples = None if combined else self._select_examples(cleaned_text)
+            with span("llm.combined" if combined else "llm.classify"):
+                classification_result, classify_model = await self._classify_with_retry(
+                    llm_text, len(cleaned_text), deadline, combined=combined, examples=examples
+                )
             
-            # 5. Gerar resposta automática (usando texto original, não NLP)
-            suggested_response = await self._generate_response_with_retry(
-                email_text,
-                classification_result["categoria"]
-            )
+            # 4.1 Email ambíguo: reclassificar com o maior modelo
+            if (
+                classification_result["confianca"] < settings.ROUTING_ESCALATION_CONFIDENCE
+                and classify_model != self.router.largest_model
+                and deadline.allows()
+            ):
+                with span("llm.classify.escalate", model=self.router.largest_model):
+                    try:
+                        classification_result, classify_model = await self._classify_with_retry(
+                            llm_text, len(cleaned_text), deadline, escalate=True, combined=combined,
+                            examples=examples
+                        )
+                        self.router.record_escalation()
+                    except Exception as e:
+                        logger.warning("Reclassificação com o maior modelo falhou: %s", e)
+            
+            # 5. Gerar resposta automática (usando texto original, não NLP, sem o histórico citado)
+            if not generate_response:
+                suggested_response, response_model = None, None
+            elif combined:
+                suggested_response, response_model = classification_result.get("resposta"), classify_model
+                if len(suggested_response or "") < 20:
+                    logger.warning("Resposta do modo combinado ausente ou muito curta; usando resposta padrão")
+                    suggested_response = self._get_default_response(classification_result["categoria"])
+                    response_model = "default"
+            else:
+                with span("llm.response"):
+                    suggested_response, response_model = await self._generate_response_with_retry(
+                        thread_text,
+                        classification_result["categoria"],
+                        deadline
+                    )
             
             # 6. Montar resultado final
             processing_time = time.time() - start_time
+            models = {"classify": classify_model}
+            if response_model:
+                models["response"] = response_model
+            # Versão dos prompts usados (gravada no histórico)
+            prompt_version = PROMPT_VERSIONS[
+                "combined" if combined else "fewshot" if examples else "classification"
+            ]
+            if response_model and response_model != "default" and not combined:
+                prompt_version += "+" + PROMPT_VERSIONS["response"]
             
             result = {
                 "success": True,
@@ -128,18 +321,35 @@ class EmailClassifier:
                 "justification": classification_result["justificativa"],
                 "suggested_response": suggested_response,
                 "processing_time_ms": int(processing_time * 1000),
+                "language": language,
+                "quoted_chars_removed": quoted_removed,
+                "mode": mode,
+                "models": models,
+                "prompt_version": prompt_version,
                 "timestamp": datetime.utcnow().isoformat()
             }
+            latency_by_language.record(language, processing_time * 1000)
             
             logger.info(
-                f"Classificação concluída: {result['classification']} "
-                f"({result['confidence']:.2%}) em {result['processing_time_ms']}ms"
+                "Classificação concluída: %s (%.2f%%) em %dms [%s]",
+                result["classification"],
+                result["confidence"] * 100,
+                result["processing_time_ms"],
+                language
             )
             
             return result
             
+        except DeadlineExceeded as e:
+            logger.warning("Classificação interrompida: %s", e)
+            return {
+                "success": False,
+                "error": f"Tempo limite da requisição excedido ({deadline.seconds:.1f}s)",
+                "processing_time_ms": int((time.time() - start_time) * 1000)
+            }
+            
         except Exception as e:
-            logger.error(f"Erro na classificação: {str(e)}", exc_info=True)
+            logger.error("Erro na classificação: %s", e, exc_info=True)
             return {
                 "success": False,
                 "error": f"Erro ao processar email: {str(e)}",
@@ -147,76 +357,360 @@ class EmailClassifier:
             }
     
     
-    async def _classify_with_retry(self, email_text: str) -> Dict[str, Any]:
+    async def generate_suggested_response(
+        self,
+        email_text: str,
+        categoria: str,
+        deadline: Optional[Deadline] = None,
+        tenant: str = DEFAULT_TENANT
+    ) -> Tuple[str, str]:
+        """
+        Gera a resposta sugerida de um email já classificado (geração adiada).
+        
+        Args:
+            email_text: Texto original do email
+            categoria: Categoria classificada
+            deadline: Prazo da requisição (padrão: REQUEST_DEADLINE_SECONDS)
+            tenant: Cliente da API (escalonador, classe interactive)
+            
+        Returns:
+            Tuple[str, str]: (resposta sugerida, modelo usado; "default" no fallback)
+        """
+        if deadline is None:
+            deadline = Deadline(settings.REQUEST_DEADLINE_SECONDS)
+        if not self.client:
+            return self._get_default_response(categoria), "default"
+        
+        # Mesmo texto da geração imediata: mensagem mais recente + resumo do histórico
+        thread_text = email_text
+        if settings.REPLY_CHAIN_STRIPPING:
+            with span("nlp.strip_reply_chain"):
+                parsed = self.reply_parser.parse(email_text)
+            if parsed.text:
+                thread_text = parsed.with_summary()
+        
+        token = _llm_flow.set(("interactive", tenant))
+        try:
+            with span("llm.response"):
+                return await self._generate_response_with_retry(thread_text, categoria, deadline)
+        finally:
+            _llm_flow.reset(token)
+    
+    
+    def load_examples(self) -> int:
+        """
+        Constrói o índice few-shot a partir de FEWSHOT_EXAMPLES_PATH (JSONL
+        com email, categoria e justificativa) ou dos exemplos padrão.
+        Bloqueante: o startup chama em thread.
+        
+        Returns:
+            int: Exemplos indexados
+        """
+        if self.example_index is None:
+            return 0
+        if settings.FEWSHOT_EXAMPLES_PATH:
+            try:
+                with open(settings.FEWSHOT_EXAMPLES_PATH, "rb") as f:
+                    examples = [orjson.loads(line) for line in f if line.strip()]
+            except (OSError, orjson.JSONDecodeError) as e:
+                logger.error("Falha ao carregar exemplos few-shot de %s: %s", settings.FEWSHOT_EXAMPLES_PATH, e)
+                return 0
+        else:
+            examples = [
+                {"email": e["email"], "categoria": e["classification"], "justificativa": e["justification"]}
+                for e in get_few_shot_examples()
+            ]
+        for example in examples:
+            example["categoria"] = str(example.get("categoria", "")).strip().upper()
+        self.example_index.build(
+            example for example in examples if example["categoria"] in ("PRODUTIVO", "IMPRODUTIVO")
+        )
+        return len(self.example_index)
+    
+    
+    def _select_examples(self, text: str) -> Optional[list]:
+        """
+        Busca os exemplos rotulados mais semelhantes ao email.
+        
+        Returns:
+            Optional[list]: Exemplos para o prompt few-shot, ou None para usar
+            o prompt completo (few-shot desligado, índice pequeno ou nenhum
+            exemplo parecido)
+        """
+        if self.example_index is None:
+            return None
+        results = []
+        if len(self.example_index) >= settings.FEWSHOT_MIN_EXAMPLES:
+            with span("fewshot.retrieve"):
+                results = self.example_index.search(text, settings.FEWSHOT_K)
+        if not results or results[0][1] < settings.FEWSHOT_MIN_SIMILARITY:
+            self._fewshot_prompts["full"] += 1
+            return None
+        self._fewshot_prompts["fewshot"] += 1
+        return [example for example, _ in results]
+    
+    
+    def fewshot_snapshot(self) -> Optional[Dict[str, Any]]:
+        """
+        Estado do índice few-shot e prompts montados com e sem exemplos.
+        
+        Returns:
+            Optional[Dict[str, Any]]: Estatísticas para GET /api/metrics
+            (None com FEWSHOT_ENABLED=false)
+        """
+        if self.example_index is None:
+            return None
+        return {**self.example_index.snapshot(), "prompts": dict(self._fewshot_prompts)}
+    
+    
+    async def _call_llm(
+        self,
+        call_type: str,
+        system_prompt: str,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        attempt: int,
+        email_length: int,
+        deadline: Deadline,
+        escalate: bool = False,
+        json_mode: bool = False
+    ) -> Tuple[str, str]:
+        """
+        Chama o LLM seguindo a ordem de modelos do roteador.
+        
+        Em timeout, rate limit ou erro do servidor tenta o próximo modelo da
+        lista; outros erros (ex.: requisição inválida) são propagados. Com
+        hedging ativo, uma chamada lenta ganha uma cópia no mesmo modelo. O
+        timeout de cada chamada sai do tempo restante do prazo. Com o
+        escalonador ativo, a chamada espera a vez da sua classe e do seu
+        tenant antes de ir ao upstream.
+        
+        Args:
+            call_type: "classify" ou "response"
+            system_prompt: Prompt de sistema
+            prompt: Prompt do usuário
+            temperature: Temperatura da geração
+            max_tokens: Máximo de tokens na resposta
+            attempt: Tentativa atual (para o trace)
+            email_length: Tamanho do email (critério de roteamento)
+            deadline: Prazo da requisição
+            escalate: Preferir o maior modelo
+            json_mode: Pedir JSON estruturado ao provedor (se o modelo suporta)
+            
+        Returns:
+            Tuple[str, str]: (texto da resposta, modelo que respondeu)
+            
+        Raises:
+            DeadlineExceeded: Se o prazo não comporta mais uma chamada
+        """
+        models = self.router.route(call_type, email_length, escalate)
+        priority, tenant = _llm_flow.get()
+        
+        # Vaga no escalonador (prioridade e tenant) para todos os modelos da
+        # tentativa; a espera na fila sai do prazo, mas não da latência do modelo
+        async with self._scheduler_slot(priority, tenant, deadline):
+            for index, model in enumerate(models):
+                has_fallback = index + 1 < len(models)
+                # Com fallback: timeout menor por modelo; sempre limitado ao prazo restante
+                limit = min(settings.AI_TIMEOUT, settings.ROUTING_FALLBACK_TIMEOUT) if has_fallback else settings.AI_TIMEOUT
+                # Sem tempo para uma tentativa: DeadlineExceeded antes de chamar o modelo
+                deadline.timeout(limit)
+                started = time.perf_counter()
+            
+                async def request(model=model, limit=limit):
+                    # Calculado a cada cópia: a do hedging sai do que resta do prazo
+                    timeout = deadline.timeout(limit)
+                    kwargs = dict(
+                        model=model,
+                        messages=[
+                            {
+                                "role": "system",
+                                "content": system_prompt
+                            },
+                            {
+                                "role": "user",
+                                "content": prompt
+                            }
+                        ],
+                        temperature=temperature,
+                        max_tokens=max_tokens,
+                        timeout=timeout
+                    )
+                    if json_mode and model not in self._json_mode_unsupported:
+                        try:
+                            return await self.client.chat.completions.create(
+                                **kwargs, response_format=JSON_RESPONSE_FORMAT
+                            )
+                        except BadRequestError as e:
+                            failed_generation = self._json_mode_failure(model, e)
+                            if failed_generation is not None:
+                                return failed_generation
+                            # Modelo sem suporte ao formato JSON: repete só com o prompt
+                    return await self.client.chat.completions.create(**kwargs)
+            
+                try:
+                    with span(f"llm.{call_type}.attempt", attempt=attempt, model=model) as attempt_span:
+                        if self.hedger is None:
+                            response = await request()
+                        else:
+                            # A cópia é mais uma chamada ao upstream: ocupa uma vaga própria
+                            # no escalonador, sem esperar (sem vaga livre, não há cópia)
+                            response, hedge_winner = await self.hedger.run(
+                                call_type, request, deadline,
+                                acquire_slot=None if self.scheduler is None else partial(
+                                    self.scheduler.try_acquire, priority
+                                ),
+                                release_slot=None if self.scheduler is None else self.scheduler.release
+                            )
+                            if hedge_winner and attempt_span is not None:
+                                attempt_span.set_attribute("hedge_winner", hedge_winner)
+                except Exception as e:
+                    elapsed_ms = (time.perf_counter() - started) * 1000
+                    reason = fallback_reason(e)
+                    self.router.record_failure(
+                        model, call_type, reason, elapsed_ms,
+                        retry_after_seconds(e) if reason == "rate_limit" else None
+                    )
+                    if reason is None or not has_fallback:
+                        raise
+                    self.router.record_fallback(model, models[index + 1], reason)
+                    counter = _llm_fallbacks.get()
+                    if counter is not None:
+                        counter[0] += 1
+                    logger.warning(
+                        "Modelo %s falhou (%s) em %s; tentando %s",
+                        model, reason, call_type, models[index + 1]
+                    )
+                    continue
+            
+                self.router.record_success(model, call_type, (time.perf_counter() - started) * 1000)
+                if isinstance(response, str):
+                    return response.strip(), model
+                return response.choices[0].message.content.strip(), model
+    
+    
+    @asynccontextmanager
+    async def _scheduler_slot(self, priority: str, tenant: str, deadline: Deadline) -> AsyncIterator[None]:
+        """Vaga no escalonador (sem escalonador, passa direto)."""
+        if self.scheduler is None:
+            yield
+            return
+        async with self.scheduler.slot(priority, tenant, deadline):
+            yield
+    
+    
+    def _json_mode_failure(self, model: str, error: BadRequestError) -> Optional[str]:
+        """
+        Trata a recusa do provedor a uma chamada com response_format.
+        
+        Se o modelo gerou um JSON que o provedor não validou
+        (json_validate_failed), devolve o texto gerado para o parser
+        tolerante, sem nova chamada. Qualquer outro erro 400 marca o modelo
+        como sem suporte ao formato JSON (as próximas chamadas não o pedem).
+        
+        Returns:
+            Optional[str]: Texto gerado pelo modelo, ou None para repetir sem o formato
+        """
+        body = error.body if isinstance(error.body, dict) else {}
+        details = body.get("error", body)
+        if isinstance(details, dict) and details.get("code") == "json_validate_failed":
+            failed_generation = details.get("failed_generation")
+            if isinstance(failed_generation, str) and failed_generation.strip():
+                return failed_generation
+            return None
+        self._json_mode_unsupported.add(model)
+        logger.warning("Modelo %s recusou o formato JSON (%s); usando apenas o prompt", model, error)
+        return None
+    
+    
+    async def _classify_with_retry(
+        self,
+        email_text: str,
+        email_length: int,
+        deadline: Deadline,
+        escalate: bool = False,
+        combined: bool = False,
+        examples: Optional[list] = None
+    ) -> Tuple[Dict[str, Any], str]:
         """
         Classifica email com retry logic.
         
         Args:
             email_text: Texto limpo do email
+            email_length: Tamanho do email antes do NLP (critério de roteamento)
+            deadline: Prazo da requisição
+            escalate: Preferir o maior modelo (email ambíguo)
+            combined: Pedir também a resposta sugerida (campo "resposta")
+            examples: Exemplos semelhantes (prompt few-shot); None = prompt completo
             
         Returns:
-            Dict com categoria, confiança e justificativa
+            Tuple: (dict com categoria, confiança e justificativa, e resposta no
+            modo combinado; modelo usado)
+            
+        Raises:
+            DeadlineExceeded: Se o prazo acabar antes de uma classificação válida
         """
         last_error = None
         
         for attempt in range(1, self.retry_attempts + 1):
             try:
-                logger.info(f"Tentativa de classificação {attempt}/{self.retry_attempts}")
+                logger.debug("Tentativa de classificação %d/%d", attempt, self.retry_attempts)
                 
                 # Montar prompt
-                prompt = get_classification_prompt(email_text)
+                if combined:
+                    prompt = get_combined_prompt(email_text)
+                elif examples:
+                    prompt = get_fewshot_classification_prompt(email_text, examples)
+                else:
+                    prompt = get_classification_prompt(email_text)
                 
-                # Chamar API Groq
-                response = self.client.chat.completions.create(
-                    model=settings.GROQ_MODEL,
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": CLASSIFICATION_SYSTEM_PROMPT
-                        },
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
+                # Chamar API Groq (modelo escolhido pelo roteador, com fallback)
+                result_text, model = await self._call_llm(
+                    "combined" if combined else "classify",
+                    COMBINED_SYSTEM_PROMPT if combined else CLASSIFICATION_SYSTEM_PROMPT,
+                    prompt,
                     temperature=settings.AI_TEMPERATURE,
-                    max_tokens=settings.AI_MAX_TOKENS,
-                    timeout=settings.AI_TIMEOUT
+                    # No modo combinado, soma o limite da geração de resposta (300)
+                    max_tokens=settings.AI_MAX_TOKENS + (300 if combined else 0),
+                    attempt=attempt,
+                    email_length=email_length,
+                    deadline=deadline,
+                    escalate=escalate,
+                    json_mode=settings.AI_JSON_MODE
                 )
                 
                 # Extrair e parsear resposta
-                result_text = response.choices[0].message.content.strip()
-                logger.debug(f"Resposta da IA: {result_text[:200]}...")
-                
-                # Limpar e parsear JSON
-                result_text = self._clean_json_response(result_text)
-                result = json.loads(result_text)
+                logger.debug("Resposta da IA: %.200s...", result_text)
                 
-                # Validar resultado
-                if not self._validate_classification_result(result):
-                    raise ValueError("Resposta da IA em formato inválido")
+                # Parsear e validar (corrige defeitos comuns sem nova chamada)
+                with span("llm.classify.parse"):
+                    result = self.result_parser.parse(result_text)
                 
-                # Normalizar categoria
-                result["categoria"] = result["categoria"].upper()
+                logger.debug("Classificação bem-sucedida na tentativa %d (%s)", attempt, model)
+                return result, model
                 
-                logger.info(f"Classificação bem-sucedida na tentativa {attempt}")
-                return result
+            except DeadlineExceeded:
+                raise
                 
-            except json.JSONDecodeError as e:
-                last_error = f"Erro ao parsear JSON: {str(e)}"
-                logger.warning(f"{last_error}")
+            except ResultParseError as e:
+                # Saída irrecuperável do modelo: nova tentativa imediata (sem backoff)
+                last_error = f"Erro ao parsear resposta: {str(e)}"
+                logger.warning("%s", last_error)
+                backoff = 0
                 
-                if attempt < self.retry_attempts:
-                    time.sleep(1 * attempt)
-                    continue
-                    
             except Exception as e:
                 last_error = str(e)
-                logger.warning(f"Tentativa {attempt} falhou: {last_error}")
-                
-                if attempt < self.retry_attempts:
-                    time.sleep(1 * attempt)
-                    continue
+                logger.warning("Tentativa %d falhou: %s", attempt, last_error)
+                backoff = 1 * attempt
+            
+            if attempt < self.retry_attempts:
+                # Só tenta de novo se o backoff e a nova tentativa couberem no prazo
+                if not deadline.allows(backoff):
+                    raise DeadlineExceeded(f"Prazo insuficiente para nova tentativa ({last_error})")
+                if backoff:
+                    with span("llm.classify.backoff"):
+                        await asyncio.sleep(backoff)
         
         raise Exception(f"Falha após {self.retry_attempts} tentativas: {last_error}")
     
@@ -224,94 +718,62 @@ class EmailClassifier:
     async def _generate_response_with_retry(
         self,
         email_text: str,
-        categoria: str
-    ) -> str:
+        categoria: str,
+        deadline: Deadline
+    ) -> Tuple[str, str]:
         """
         Gera resposta automática com retry logic.
         
         Args:
             email_text: Texto original do email
             categoria: Categoria classificada
+            deadline: Prazo da requisição (esgotado: resposta padrão)
             
         Returns:
-            str: Resposta sugerida
+            Tuple[str, str]: (resposta sugerida, modelo usado; "default" no fallback)
         """
         for attempt in range(1, self.retry_attempts + 1):
             try:
                 # Montar prompt
                 prompt = get_response_generation_prompt(email_text, categoria)
                 
-                # Chamar API Groq
-                response = self.client.chat.completions.create(
-                    model=settings.GROQ_MODEL,
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": RESPONSE_SYSTEM_PROMPT
-                        },
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
+                # Chamar API Groq (modelo escolhido pelo roteador, com fallback)
+                suggested_response, model = await self._call_llm(
+                    "response",
+                    RESPONSE_SYSTEM_PROMPT,
+                    prompt,
                     temperature=0.5,
                     max_tokens=300,
-                    timeout=settings.AI_TIMEOUT
+                    attempt=attempt,
+                    email_length=len(email_text),
+                    deadline=deadline
                 )
                 
-                # Extrair resposta
-                suggested_response = response.choices[0].message.content.strip()
-                
                 # Validar que não está vazia
                 if len(suggested_response) < 20:
                     raise ValueError("Resposta muito curta")
                 
-                logger.info("Resposta gerada com sucesso")
-                return suggested_response
+                logger.debug("Resposta gerada com sucesso (%s)", model)
+                return suggested_response, model
+                
+            except DeadlineExceeded as e:
+                logger.warning("Geração de resposta interrompida: %s", e)
+                break
                 
             except Exception as e:
-                logger.warning(
-                    f"Tentativa {attempt} de gerar resposta falhou: {str(e)}"
-                )
+                logger.warning("Tentativa %d de gerar resposta falhou: %s", attempt, e)
                 
                 if attempt < self.retry_attempts:
-                    time.sleep(0.5 * attempt)
+                    if not deadline.allows(0.5 * attempt):
+                        logger.warning("Prazo insuficiente para nova tentativa de resposta")
+                        break
+                    with span("llm.response.backoff"):
+                        await asyncio.sleep(0.5 * attempt)
                     continue
         
         # Fallback: retornar resposta padrão
         logger.warning("Usando resposta padrão como fallback")
-        return self._get_default_response(categoria)
-    
-    
-    def _clean_json_response(self, text: str) -> str:
-        """Limpa resposta da IA para extrair JSON válido."""
-        text = text.replace("```json", "").replace("```", "")
-        start_idx = text.find("{")
-        end_idx = text.rfind("}") + 1
-        
-        if start_idx != -1 and end_idx != 0:
-            text = text[start_idx:end_idx]
-        
-        return text.strip()
-    
-    
-    def _validate_classification_result(self, result: Dict) -> bool:
-        """Valida resultado da classificação."""
-        required_keys = ["categoria", "confianca", "justificativa"]
-        
-        if not all(key in result for key in required_keys):
-            return False
-        
-        if result["categoria"] not in ["PRODUTIVO", "IMPRODUTIVO", "produtivo", "improdutivo"]:
-            return False
-        
-        if not isinstance(result["confianca"], (int, float)):
-            return False
-        
-        if not (0 <= result["confianca"] <= 1):
-            return False
-        
-        return True
+        return self._get_default_response(categoria), "default"
     
     
     def _get_default_response(self, categoria: str) -> str:
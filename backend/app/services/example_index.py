@@ -0,0 +1,219 @@
+"""
+Example Index
+=============
+Índice vetorial local de emails rotulados, usado para escolher os exemplos
+few-shot mais parecidos com o email a classificar.
+
+Cada email vira um vetor TF-IDF com hashing (unigramas e bigramas projetados
+em `dim` posições, com sinal, sem vocabulário) normalizado; a similaridade é
+o cosseno, calculado como produto da matriz NumPy pelo vetor da consulta.
+
+Até `exact_limit` exemplos a busca é exata. Acima disso o índice agrupa os
+vetores em listas (k-means, ~√N centroides) e cada consulta compara apenas
+com as `nprobe` listas mais próximas, mantendo a busca em poucos
+milissegundos com 100 mil exemplos.
+
+O índice só muda em `build`, que calcula o IDF, a matriz e as listas e
+troca tudo de uma vez.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import logging
+import math
+import re
+import threading
+import time
+import zlib
+
+import numpy as np
+
+from backend.app.core.metrics import LatencyTracker
+
+# Configurar logger
+logger = logging.getLogger(__name__)
+
+# Palavras (letras com acento e dígitos), em minúsculas
+TOKEN_RE = re.compile(r"[^\W_]{2,}")
+
+# Iterações do k-means na construção das listas
+KMEANS_ITERATIONS = 8
+
+
+def _token_hashes(text: str) -> List[int]:
+    """Hashes estáveis (crc32) dos unigramas e bigramas do texto."""
+    words = TOKEN_RE.findall(text.lower())
+    hashes = [zlib.crc32(word.encode("utf-8")) for word in words]
+    hashes.extend(zlib.crc32(f"{a} {b}".encode("utf-8")) for a, b in zip(words, words[1:]))
+    return hashes
+
+
+class ExampleIndex:
+    """
+    Busca dos k exemplos rotulados mais similares.
+
+    Attributes:
+        dim: Dimensão dos vetores (potência de 2)
+        exact_limit: Tamanho máximo do índice com busca exata
+        nprobe: Listas comparadas por consulta na busca aproximada
+        examples: Exemplos indexados (email, categoria, justificativa)
+        latency: Latência das buscas (ms)
+    """
+
+    def __init__(self, dim: int = 512, exact_limit: int = 20000, nprobe: int = 24):
+        if dim & (dim - 1):
+            raise ValueError("dim deve ser potência de 2")
+        self.dim = dim
+        self.exact_limit = exact_limit
+        self.nprobe = nprobe
+        self.examples: List[Dict[str, Any]] = []
+        self.latency = LatencyTracker(window=1000)
+        self._matrix = np.zeros((0, dim), dtype=np.float32)
+        self._idf = np.ones(dim, dtype=np.float32)
+        # Busca aproximada: centroides e, por lista, o intervalo de linhas na matriz
+        self._centroids: Optional[np.ndarray] = None
+        self._offsets: Optional[np.ndarray] = None
+        self._lock = threading.Lock()
+        self._queries = 0
+
+    def __len__(self) -> int:
+        return len(self.examples)
+
+    def _vectorize(self, hashes: List[int], idf: Optional[np.ndarray] = None) -> np.ndarray:
+        """Vetor TF-IDF (tf sublinear, com sinal) normalizado."""
+        vector = np.zeros(self.dim, dtype=np.float32)
+        if not hashes:
+            return vector
+        codes = np.asarray(hashes, dtype=np.uint32)
+        buckets = (codes & (self.dim - 1)).astype(np.intp)
+        signs = np.where(codes & 0x80000000, -1.0, 1.0).astype(np.float32)
+        np.add.at(vector, buckets, signs)
+        # tf sublinear preservando o sinal da soma
+        np.copysign(np.log1p(np.abs(vector)), vector, out=vector)
+        vector *= self._idf if idf is None else idf
+        norm = np.linalg.norm(vector)
+        if norm:
+            vector /= norm
+        return vector
+
+    def build(self, examples: Iterable[Dict[str, Any]]) -> None:
+        """
+        Reconstrói o índice (IDF, matriz e listas) a partir dos exemplos.
+
+        Consultas feitas durante a construção usam o índice anterior.
+
+        Args:
+            examples: Dicts com "email", "categoria" e, opcionalmente,
+                "justificativa"
+        """
+        started = time.perf_counter()
+        examples = [example for example in examples if example.get("email")]
+        token_hashes = [_token_hashes(example["email"]) for example in examples]
+
+        # Frequência de documento por posição do vetor
+        df = np.zeros(self.dim, dtype=np.float64)
+        for hashes in token_hashes:
+            buckets = np.unique(np.asarray(hashes, dtype=np.uint32) & (self.dim - 1))
+            df[buckets] += 1
+        idf = (np.log((1 + len(examples)) / (1 + df)) + 1).astype(np.float32)
+
+        matrix = np.empty((len(examples), self.dim), dtype=np.float32)
+        for row, hashes in enumerate(token_hashes):
+            matrix[row] = self._vectorize(hashes, idf)
+        matrix, examples, centroids, offsets = self._cluster(matrix, examples)
+
+        with self._lock:
+            self.examples, self._matrix, self._idf = examples, matrix, idf
+            self._centroids, self._offsets = centroids, offsets
+        logger.info(
+            "Índice de exemplos: %d exemplos em %.1fs (%s)",
+            len(examples), time.perf_counter() - started,
+            "busca exata" if centroids is None else f"{len(centroids)} listas"
+        )
+
+    def _cluster(self, matrix: np.ndarray, examples: List[Dict[str, Any]]):
+        """
+        Agrupa as linhas em listas (k-means esférico) se o índice é grande.
+
+        Returns:
+            Tuple: (matriz e exemplos reordenados por lista, centroides,
+            offsets), ou os originais com centroides/offsets None
+        """
+        count = len(examples)
+        if count <= self.exact_limit:
+            return matrix, examples, None, None
+
+        lists = int(math.sqrt(count))
+        rng = np.random.default_rng(0)
+        # Treina os centroides em uma amostra; atribui todas as linhas no fim
+        sample = matrix[rng.choice(count, size=min(count, lists * 64), replace=False)]
+        centroids = sample[rng.choice(len(sample), size=lists, replace=False)].copy()
+        for _ in range(KMEANS_ITERATIONS):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            for cluster in range(lists):
+                members = sample[assignment == cluster]
+                if len(members):
+                    centroid = members.sum(axis=0)
+                    norm = np.linalg.norm(centroid)
+                    if norm:
+                        centroids[cluster] = centroid / norm
+
+        assignment = np.concatenate([
+            np.argmax(matrix[start:start + 8192] @ centroids.T, axis=1)
+            for start in range(0, count, 8192)
+        ])
+        order = np.argsort(assignment, kind="stable")
+        offsets = np.zeros(lists + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(np.bincount(assignment, minlength=lists))
+        return matrix[order], [examples[row] for row in order], centroids, offsets
+
+    def search(self, text: str, k: int = 4) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Retorna os k exemplos mais similares ao texto.
+
+        Args:
+            text: Email a classificar
+            k: Quantidade de exemplos
+
+        Returns:
+            List[Tuple[Dict, float]]: (exemplo, similaridade), do mais similar
+            ao menos similar
+        """
+        started = time.perf_counter()
+        query = self._vectorize(_token_hashes(text))
+        with self._lock:
+            self._queries += 1
+            size = len(self.examples)
+            if not size or not query.any():
+                return []
+            if self._centroids is None:
+                ranges = [(0, size)]
+            else:
+                nearest = np.argpartition(-(self._centroids @ query), self.nprobe - 1)[:self.nprobe]
+                ranges = [(int(self._offsets[c]), int(self._offsets[c + 1])) for c in nearest]
+            rows = np.concatenate([np.arange(start, end) for start, end in ranges])
+            scores = np.concatenate([self._matrix[start:end] @ query for start, end in ranges])
+            k = min(k, len(scores))
+            if not k:
+                return []
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            results = [(self.examples[rows[i]], float(scores[i])) for i in top]
+        self.latency.record("search", (time.perf_counter() - started) * 1000)
+        return results
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Tamanho, modo de busca e latência das consultas.
+
+        Returns:
+            Dict[str, Any]: Estatísticas para GET /api/metrics
+        """
+        with self._lock:
+            size, centroids, queries = len(self.examples), self._centroids, self._queries
+        return {
+            "examples": size,
+            "dim": self.dim,
+            "search": "exact" if centroids is None else f"ivf:{len(centroids)}/{self.nprobe}",
+            "queries": queries,
+            "latency": self.latency.snapshot().get("search"),
+        }
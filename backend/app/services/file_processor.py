@@ -1,9 +1,12 @@
 """
 File Processor Service
 ======================
-Serviço responsável por processar e extrair texto de arquivos (.txt e .pdf).
+Serviço responsável por processar e extrair texto de arquivos
+(.txt, .pdf, .html/.htm e .eml).
 """
 
+from email import message_from_bytes, policy
+import asyncio
 from fastapi import UploadFile, HTTPException
 import PyPDF2
 import io
@@ -12,11 +15,17 @@ from typing import Optional
 
 # Importar configurações
 from backend.app.core.config import settings
+from backend.app.core.tracing import span
+from backend.app.utils.html_extractor import html_to_text, looks_like_html
 
 # Configurar logger
 logger = logging.getLogger(__name__)
 
 
+# Extensões aceitas nos uploads
+ALLOWED_EXTENSIONS = ('.txt', '.pdf', '.html', '.htm', '.eml')
+
+
 class FileProcessor:
     """
     Classe responsável por processar uploads de arquivos e extrair texto.
@@ -42,10 +51,31 @@ class FileProcessor:
         Raises:
             HTTPException: Se houver erro no processamento
         """
-        try:
-            # Ler conteúdo do arquivo
+        # Ler conteúdo do arquivo
+        with span("file.read"):
             content = await file.read()
+        
+        return await self.extract_text(file.filename, content)
+    
+    
+    async def extract_text(self, filename: str, content: bytes) -> str:
+        """
+        Extrai o texto de um arquivo já lido em memória.
+        
+        Usado pelo upload direto e pelos jobs assíncronos, que guardam o
+        conteúdo do arquivo até o processamento.
+        
+        Args:
+            filename: Nome do arquivo (define o formato pela extensão)
+            content: Conteúdo binário do arquivo
             
+        Returns:
+            str: Texto extraído do arquivo
+            
+        Raises:
+            HTTPException: Se houver erro no processamento
+        """
+        try:
             # Validar tamanho
             if len(content) > self.max_size_bytes:
                 raise HTTPException(
@@ -53,31 +83,45 @@ class FileProcessor:
                     detail=f"Arquivo muito grande. Máximo: {settings.MAX_FILE_SIZE_MB}MB"
                 )
             
-            # Processar baseado na extensão
-            if file.filename.endswith('.txt'):
-                text = await self._process_txt(content)
-            elif file.filename.endswith('.pdf'):
-                text = await self._process_pdf(content)
+            # Processar baseado na extensão. A extração de PDF, HTML e EML
+            # roda em uma thread para não travar o event loop
+            extension = filename.lower()
+            if extension.endswith('.txt'):
+                with span("file.decode_txt", bytes=len(content)):
+                    text = self._process_txt(content)
+                # Exportações HTML salvas como .txt
+                if looks_like_html(text):
+                    with span("file.extract_html", bytes=len(content)):
+                        text = await asyncio.to_thread(html_to_text, text)
+            elif extension.endswith('.pdf'):
+                with span("file.extract_pdf", bytes=len(content)):
+                    text = await asyncio.to_thread(self._process_pdf, content)
+            elif extension.endswith(('.html', '.htm')):
+                with span("file.extract_html", bytes=len(content)):
+                    text = await asyncio.to_thread(self._process_html, content)
+            elif extension.endswith('.eml'):
+                with span("file.extract_eml", bytes=len(content)):
+                    text = await asyncio.to_thread(self._process_eml, content)
             else:
                 raise HTTPException(
                     status_code=400,
-                    detail="Formato não suportado. Use .txt ou .pdf"
+                    detail="Formato não suportado. Use .txt, .pdf, .html ou .eml"
                 )
             
-            logger.info(f"Arquivo processado: {len(text)} caracteres extraídos")
+            logger.debug("Arquivo processado: %d caracteres extraídos", len(text))
             return text
             
         except HTTPException:
             raise
         except Exception as e:
-            logger.error(f"Erro ao processar arquivo: {str(e)}")
+            logger.error("Erro ao processar arquivo: %s", e)
             raise HTTPException(
                 status_code=500,
                 detail=f"Erro ao processar arquivo: {str(e)}"
             )
     
     
-    async def _process_txt(self, content: bytes) -> str:
+    def _process_txt(self, content: bytes) -> str:
         """
         Processa arquivo .txt e extrai texto.
         
@@ -90,21 +134,63 @@ class FileProcessor:
         try:
             # Tentar decodificar com UTF-8
             text = content.decode('utf-8')
-            logger.info("Arquivo .txt decodificado com UTF-8")
+            logger.debug("Arquivo .txt decodificado com UTF-8")
             return text.strip()
             
         except UnicodeDecodeError:
             try:
                 # Tentar com latin-1 se UTF-8 falhar
                 text = content.decode('latin-1')
-                logger.info("Arquivo .txt decodificado com Latin-1")
+                logger.debug("Arquivo .txt decodificado com Latin-1")
                 return text.strip()
             except Exception as e:
                 logger.error(f"Erro ao decodificar .txt: {str(e)}")
                 raise ValueError("Não foi possível decodificar o arquivo .txt")
     
     
-    async def _process_pdf(self, content: bytes) -> str:
+    def _process_html(self, content: bytes) -> str:
+        """
+        Processa arquivo .html/.htm e extrai o texto visível.
+        
+        Args:
+            content: Conteúdo binário do arquivo
+            
+        Returns:
+            str: Texto extraído
+        """
+        return html_to_text(self._process_txt(content))
+    
+    
+    def _process_eml(self, content: bytes) -> str:
+        """
+        Processa arquivo .eml (MIME) e extrai o corpo.
+        
+        Usa a parte text/plain quando existe; caso contrário, converte a
+        parte text/html. O assunto é mantido na primeira linha.
+        
+        Args:
+            content: Conteúdo binário do arquivo
+            
+        Returns:
+            str: Texto extraído
+        """
+        message = message_from_bytes(content, policy=policy.default)
+        body = message.get_body(preferencelist=('plain', 'html'))
+        if body is None:
+            raise ValueError("O email não contém corpo de texto ou HTML")
+        
+        text = body.get_content()
+        if body.get_content_subtype() == 'html':
+            text = html_to_text(text)
+            logger.debug("Parte HTML convertida: %d caracteres", len(text))
+        
+        subject = message.get('subject')
+        if subject:
+            text = f"Assunto: {subject}\n\n{text}"
+        return text.strip()
+    
+    
+    def _process_pdf(self, content: bytes) -> str:
         """
         Processa arquivo .pdf e extrai texto.
         
@@ -126,7 +212,7 @@ class FileProcessor:
             if num_pages == 0:
                 raise ValueError("PDF não contém páginas")
             
-            logger.info(f"PDF com {num_pages} página(s)")
+            logger.debug("PDF com %d página(s)", num_pages)
             
             # Extrair texto de todas as páginas
             text_parts = []
@@ -142,7 +228,7 @@ class FileProcessor:
             if not full_text:
                 raise ValueError("Não foi possível extrair texto do PDF")
             
-            logger.info(f"Texto extraído do PDF: {len(full_text)} caracteres")
+            logger.debug("Texto extraído do PDF: %d caracteres", len(full_text))
             return full_text
             
         except Exception as e:
@@ -0,0 +1,181 @@
+"""
+Request Hedging
+===============
+Requisições duplicadas ("hedged requests") para reduzir a cauda de latência
+das chamadas ao LLM.
+
+Se a chamada não responde até o limiar dinâmico (p95 observado do tipo de
+chamada), uma cópia é disparada e vale a primeira que responder com sucesso;
+a outra é cancelada. As cópias consomem um orçamento que cresce a cada
+chamada (ex.: 0.05 = no máximo ~5% de chamadas extras), então uma
+degradação geral do upstream não dobra a carga. Com prazo, a cópia só sai
+se ainda couber uma tentativa nele; com escalonador, só se houver uma vaga
+livre para ela (a cópia é mais uma chamada ao upstream).
+"""
+
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+import asyncio
+import logging
+import threading
+
+from backend.app.core.deadline import Deadline
+from backend.app.core.metrics import LatencyTracker
+
+# Configurar logger
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class RequestHedger:
+    """
+    Dispara uma cópia da chamada quando ela passa do limiar de latência.
+
+    Attributes:
+        quantile: Percentil usado como limiar (0.95 = p95)
+        min_samples: Amostras por tipo de chamada antes de ativar o hedging
+        budget_ratio: Fração de chamadas extras permitida
+        budget_burst: Cópias acumuláveis no orçamento
+        latency: Latência observada por tipo de chamada
+    """
+
+    def __init__(
+        self,
+        quantile: float = 0.95,
+        min_samples: int = 20,
+        budget_ratio: float = 0.05,
+        budget_burst: float = 10.0
+    ):
+        self.quantile = quantile
+        self.min_samples = min_samples
+        self.budget_ratio = budget_ratio
+        self.budget_burst = budget_burst
+        self.latency = LatencyTracker(window=1000)
+        self._tokens = budget_burst
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def threshold_ms(self, call_type: str) -> Optional[float]:
+        """Limiar atual do tipo de chamada (None enquanto há poucas amostras)."""
+        return self.latency.percentile(call_type, self.quantile, self.min_samples)
+
+    def _count(self, call_type: str, key: str) -> None:
+        stats = self._stats.setdefault(
+            call_type,
+            {"calls": 0, "hedged": 0, "hedge_wins": 0, "budget_exhausted": 0, "deadline_skipped": 0, "no_slot": 0}
+        )
+        stats[key] += 1
+
+    def _start_call(self, call_type: str) -> None:
+        """Conta a chamada e credita o orçamento."""
+        with self._lock:
+            self._count(call_type, "calls")
+            self._tokens = min(self.budget_burst, self._tokens + self.budget_ratio)
+
+    def _try_spend(self, call_type: str, acquire_slot: Optional[Callable[[], bool]]) -> bool:
+        """Consome uma cópia do orçamento e ocupa a vaga dela, se houver os dois."""
+        with self._lock:
+            if self._tokens < 1.0:
+                self._count(call_type, "budget_exhausted")
+                return False
+            if acquire_slot is not None and not acquire_slot():
+                self._count(call_type, "no_slot")
+                return False
+            self._tokens -= 1.0
+            self._count(call_type, "hedged")
+            return True
+
+    def _deadline_allows(self, call_type: str, deadline: Optional[Deadline]) -> bool:
+        """Verifica se o prazo ainda comporta a cópia."""
+        if deadline is None or deadline.allows():
+            return True
+        with self._lock:
+            self._count(call_type, "deadline_skipped")
+        return False
+
+    async def run(
+        self,
+        call_type: str,
+        call: Callable[[], Awaitable[T]],
+        deadline: Optional[Deadline] = None,
+        acquire_slot: Optional[Callable[[], bool]] = None,
+        release_slot: Optional[Callable[[], None]] = None
+    ) -> Tuple[T, Optional[str]]:
+        """
+        Executa a chamada com hedging.
+
+        Args:
+            call_type: Tipo de chamada ("classify" ou "response")
+            call: Fábrica da chamada (invocada uma vez por cópia; cada
+                invocação calcula o próprio timeout)
+            deadline: Prazo da requisição (sem tempo para uma tentativa, não
+                há cópia)
+            acquire_slot: Ocupa uma vaga para a cópia sem esperar (False: sem
+                cópia); a vaga é devolvida com `release_slot` quando a cópia termina
+            release_slot: Devolve a vaga da cópia
+
+        Returns:
+            Tuple: (resultado, vencedor) — vencedor é None sem cópia,
+            "primary" ou "hedge" quando houve cópia
+        """
+        self._start_call(call_type)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        primary = asyncio.ensure_future(call())
+        tasks = {primary}
+
+        try:
+            threshold = self.threshold_ms(call_type)
+            if threshold is not None:
+                done, _ = await asyncio.wait(tasks, timeout=threshold / 1000)
+                if not done and self._deadline_allows(call_type, deadline) and self._try_spend(call_type, acquire_slot):
+                    logger.debug("Chamada %s passou de %.0fms; disparando cópia", call_type, threshold)
+                    hedge = asyncio.ensure_future(call())
+                    if release_slot is not None:
+                        hedge.add_done_callback(lambda _: release_slot())
+                    tasks.add(hedge)
+
+            # Primeira cópia bem-sucedida vence; erro só se todas falharem
+            pending = set(tasks)
+            winner = None
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winner = next((task for task in done if task.exception() is None), None)
+
+            if winner is None:
+                # Propaga o erro da chamada original
+                return primary.result(), None
+
+            self.latency.record(call_type, (loop.time() - started) * 1000)
+            if len(tasks) == 1:
+                return winner.result(), None
+            if winner is not primary:
+                with self._lock:
+                    self._count(call_type, "hedge_wins")
+                return winner.result(), "hedge"
+            return winner.result(), "primary"
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            # Recolhe exceções das cópias descartadas (evita avisos do asyncio)
+            for task in tasks:
+                if task.done() and not task.cancelled():
+                    task.exception()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Taxa de hedging e de vitória da cópia por tipo de chamada.
+
+        Returns:
+            Dict[str, Any]: Estatísticas para GET /api/metrics
+        """
+        with self._lock:
+            stats = {call_type: dict(values) for call_type, values in self._stats.items()}
+            tokens = self._tokens
+        for call_type, values in stats.items():
+            threshold = self.threshold_ms(call_type)
+            values["hedge_rate"] = round(values["hedged"] / values["calls"], 4) if values["calls"] else 0.0
+            values["win_rate"] = round(values["hedge_wins"] / values["hedged"], 4) if values["hedged"] else 0.0
+            values["threshold_ms"] = round(threshold, 2) if threshold is not None else None
+        return {"budget_tokens": round(tokens, 2), "calls": stats}
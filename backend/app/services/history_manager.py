@@ -0,0 +1,260 @@
+"""
+History Manager
+===============
+Grava no HistoryStore cada classificação bem-sucedida, sem que a
+requisição espere pelo disco.
+
+`record` apenas enfileira a linha (não bloqueia); uma thread de escrita
+junta até HISTORY_BATCH_SIZE linhas ou espera HISTORY_FLUSH_INTERVAL_SECONDS
+e grava o lote em uma única transação. Com a fila cheia (disco lento), a
+linha é descartada e contabilizada em vez de atrasar a requisição.
+
+As consultas e a exportação (CSV/NDJSON) leem o banco página a página
+(keyset), com memória constante mesmo para exportações grandes.
+"""
+
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+import asyncio
+import csv
+import hashlib
+import io
+import logging
+import queue
+import threading
+import time
+
+import orjson
+
+# Importar configurações e serviços
+from backend.app.core.config import settings
+from backend.app.core.metrics import LatencyTracker
+from backend.app.services.history_store import HistoryStore, decode_cursor, encode_cursor
+
+# Configurar logger
+logger = logging.getLogger(__name__)
+
+# Linhas lidas por página na exportação
+EXPORT_PAGE_SIZE = 1000
+
+# Colunas do CSV exportado
+CSV_FIELDS = (
+    "id", "created_at", "content_hash", "source", "classification", "confidence", "justification",
+    "suggested_response", "language", "mode", "model_classify", "model_response", "prompt_version",
+    "processing_time_ms", "timings",
+)
+
+# Sinal de parada da thread de escrita
+_STOP = object()
+
+
+class HistoryManager:
+    """
+    Histórico de classificações com escrita em lote em segundo plano.
+
+    Attributes:
+        store: Persistência do histórico
+        stats: Contadores de linhas enfileiradas, gravadas e descartadas
+        latency: Duração da gravação dos lotes (ms)
+    """
+
+    def __init__(self, store: Optional[HistoryStore] = None):
+        self.store = store
+        self.stats = {"queued": 0, "written": 0, "dropped": 0, "batches": 0, "write_errors": 0}
+        self.latency = LatencyTracker(window=1000)
+        self._queue: "queue.Queue" = queue.Queue(maxsize=settings.HISTORY_QUEUE_SIZE)
+        self._writer: Optional[threading.Thread] = None
+        self._purge_task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        """Histórico ativo (banco aberto)."""
+        return self.store is not None
+
+    async def start(self) -> None:
+        """
+        Abre o banco e inicia a thread de escrita e a limpeza periódica.
+        Chamado no startup.
+        """
+        if not settings.HISTORY_ENABLED:
+            logger.info("Histórico de classificações desativado")
+            return
+        if self.store is None:
+            self.store = await asyncio.to_thread(HistoryStore, settings.HISTORY_DB_PATH)
+        self._writer = threading.Thread(target=self._write_loop, name="history-writer", daemon=True)
+        self._writer.start()
+        if settings.HISTORY_RETENTION_DAYS > 0:
+            self._purge_task = asyncio.create_task(self._purge_loop(), name="history-purge")
+
+    async def stop(self) -> None:
+        """Grava as linhas pendentes, encerra a thread e fecha o banco."""
+        if self._purge_task:
+            self._purge_task.cancel()
+            await asyncio.gather(self._purge_task, return_exceptions=True)
+            self._purge_task = None
+        if self._writer:
+            await asyncio.to_thread(self._queue.put, _STOP)
+            await asyncio.to_thread(self._writer.join)
+            self._writer = None
+        if self.store:
+            await asyncio.to_thread(self.store.close)
+            self.store = None
+
+    def record(self, email_text: str, result: Dict[str, Any], source: str) -> None:
+        """
+        Enfileira uma classificação para gravação (não bloqueia).
+
+        Args:
+            email_text: Texto do email (apenas o hash é gravado)
+            result: Resultado bem-sucedido da classificação
+            source: Origem (text, file, job ou websocket)
+        """
+        if self._writer is None or not result.get("success"):
+            return
+        row = self.build_row(email_text, result, source)
+        try:
+            self._queue.put_nowait(row)
+            self.stats["queued"] += 1
+        except queue.Full:
+            self.stats["dropped"] += 1
+            if self.stats["dropped"] % 1000 == 1:
+                logger.warning("Fila do histórico cheia: %d classificação(ões) descartada(s)", self.stats["dropped"])
+
+    @staticmethod
+    def build_row(email_text: str, result: Dict[str, Any], source: str, created_at: Optional[float] = None) -> tuple:
+        """Linha do HistoryStore (ordem de COLUMNS) para um resultado."""
+        models = result.get("models") or {}
+        timings = result.get("timings")
+        return (
+            time.time() if created_at is None else created_at,
+            hashlib.sha256(email_text.encode("utf-8")).hexdigest(),
+            source,
+            result["classification"],
+            result["confidence"],
+            result.get("justification"),
+            result.get("suggested_response"),
+            result.get("language"),
+            result.get("mode"),
+            models.get("classify"),
+            models.get("response"),
+            result.get("prompt_version"),
+            result.get("processing_time_ms"),
+            orjson.dumps(timings).decode("utf-8") if timings else None,
+        )
+
+    def _write_loop(self) -> None:
+        """Thread de escrita: grava lotes até receber o sinal de parada."""
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            flush_at = time.monotonic() + settings.HISTORY_FLUSH_INTERVAL_SECONDS
+            while len(batch) < settings.HISTORY_BATCH_SIZE:
+                try:
+                    item = self._queue.get(timeout=max(0.0, flush_at - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._write(batch)
+
+    def _write(self, batch: list) -> None:
+        started = time.perf_counter()
+        try:
+            self.store.insert_many(batch)
+        except Exception as e:
+            self.stats["write_errors"] += 1
+            logger.error("Falha ao gravar %d classificação(ões) no histórico: %s", len(batch), e)
+            return
+        self.latency.record("batch", (time.perf_counter() - started) * 1000)
+        self.stats["written"] += len(batch)
+        self.stats["batches"] += 1
+
+    async def query(self, cursor: Optional[str] = None, limit: int = 50, **filters) -> Dict[str, Any]:
+        """
+        Uma página do histórico.
+
+        Args:
+            cursor: next_cursor da página anterior
+            limit: Linhas por página
+            **filters: start, end, classification, min_confidence,
+                max_confidence, content_hash (ver HistoryStore.query)
+
+        Returns:
+            Dict: items e next_cursor
+
+        Raises:
+            ValueError: Se o cursor é inválido
+        """
+        after = decode_cursor(cursor) if cursor else None
+        rows, following = await asyncio.to_thread(self.store.query, after=after, limit=limit, **filters)
+        return {"items": rows, "next_cursor": encode_cursor(*following) if following else None}
+
+    async def export(self, fmt: str, **filters) -> AsyncIterator[bytes]:
+        """
+        Exporta o histórico filtrado em CSV ou NDJSON, uma página por vez.
+
+        Args:
+            fmt: "csv" ou "ndjson"
+            **filters: Mesmos filtros de query
+
+        Yields:
+            bytes: Trecho do arquivo (uma página de linhas)
+        """
+        after: Optional[Tuple[float, int]] = None
+        if fmt == "csv":
+            yield (",".join(CSV_FIELDS) + "\r\n").encode("utf-8")
+        while True:
+            rows, after = await asyncio.to_thread(
+                self.store.query, after=after, limit=EXPORT_PAGE_SIZE, **filters
+            )
+            if rows:
+                yield self._encode_csv(rows) if fmt == "csv" else b"".join(
+                    orjson.dumps(row) + b"\n" for row in rows
+                )
+            if after is None:
+                return
+
+    @staticmethod
+    def _encode_csv(rows: list) -> bytes:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            models, timings = row["models"], row["timings"]
+            writer.writerow([
+                row["id"], row["created_at"], row["content_hash"], row["source"], row["classification"],
+                row["confidence"], row["justification"], row["suggested_response"], row["language"],
+                row["mode"], models.get("classify"), models.get("response"), row["prompt_version"],
+                row["processing_time_ms"], orjson.dumps(timings).decode("utf-8") if timings else "",
+            ])
+        return buffer.getvalue().encode("utf-8")
+
+    async def _purge_loop(self) -> None:
+        """Remove periodicamente as classificações mais antigas que a retenção."""
+        while True:
+            try:
+                removed = await asyncio.to_thread(
+                    self.store.purge_older_than, settings.HISTORY_RETENTION_DAYS * 86400
+                )
+                if removed:
+                    logger.info("%d classificação(ões) antiga(s) removida(s) do histórico", removed)
+            except Exception as e:
+                logger.warning("Falha ao limpar o histórico: %s", e)
+            await asyncio.sleep(settings.JOBS_PURGE_INTERVAL_SECONDS)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Linhas enfileiradas, gravadas e descartadas, e duração dos lotes.
+
+        Returns:
+            Dict[str, Any]: Estatísticas para GET /api/metrics
+        """
+        return {
+            "enabled": self.enabled,
+            **self.stats,
+            "pending": self._queue.qsize(),
+            "batch_latency": self.latency.snapshot().get("batch"),
+        }
@@ -0,0 +1,214 @@
+"""
+History Store
+=============
+Histórico persistente das classificações, em SQLite local (modo WAL).
+
+Cada classificação bem-sucedida vira uma linha com o hash do conteúdo (o
+texto do email não é gravado), categoria, confiança, justificativa,
+resposta sugerida, tempos, modelos e versão do prompt.
+
+As consultas filtram por período, categoria, faixa de confiança ou hash do
+conteúdo, sempre em ordem decrescente de data, com paginação por cursor
+(keyset: a próxima página começa depois da última linha lida, sem OFFSET).
+
+As operações são síncronas e protegidas por lock; as inserções chegam em
+lotes do HistoryManager (thread de escrita) e as consultas rodam em thread.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import base64
+import logging
+import sqlite3
+import threading
+import time
+
+import orjson
+
+# Configurar logger
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS classification_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at REAL NOT NULL,
+    content_hash TEXT NOT NULL,
+    source TEXT NOT NULL,
+    classification TEXT NOT NULL,
+    confidence REAL NOT NULL,
+    justification TEXT,
+    suggested_response TEXT,
+    language TEXT,
+    mode TEXT,
+    model_classify TEXT,
+    model_response TEXT,
+    prompt_version TEXT,
+    processing_time_ms INTEGER,
+    timings TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_history_created_at ON classification_history (created_at);
+CREATE INDEX IF NOT EXISTS idx_history_classification ON classification_history (classification, created_at);
+CREATE INDEX IF NOT EXISTS idx_history_confidence ON classification_history (confidence);
+CREATE INDEX IF NOT EXISTS idx_history_content_hash ON classification_history (content_hash);
+"""
+
+# Colunas gravadas por insert_many (na ordem das tuplas)
+COLUMNS = (
+    "created_at", "content_hash", "source", "classification", "confidence", "justification",
+    "suggested_response", "language", "mode", "model_classify", "model_response",
+    "prompt_version", "processing_time_ms", "timings",
+)
+
+# Linhas removidas por comando na limpeza (evita segurar o banco por muito tempo)
+PURGE_BATCH = 5000
+
+
+def encode_cursor(created_at: float, row_id: int) -> str:
+    """Cursor opaco da paginação: posição (data, id) da última linha lida."""
+    return base64.urlsafe_b64encode(f"{created_at!r}:{row_id}".encode("ascii")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[float, int]:
+    """
+    Decodifica um cursor de encode_cursor.
+
+    Raises:
+        ValueError: Se o cursor é inválido
+    """
+    try:
+        created_at, row_id = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("ascii").split(":")
+        return float(created_at), int(row_id)
+    except (ValueError, UnicodeError) as e:
+        raise ValueError("Cursor inválido") from e
+
+
+class HistoryStore:
+    """
+    Armazena o histórico de classificações.
+
+    Attributes:
+        path: Caminho do arquivo do banco
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        logger.info("HistoryStore inicializado (%s)", path)
+
+    def insert_many(self, rows: Sequence[Tuple]) -> None:
+        """
+        Grava um lote de classificações em uma única transação.
+
+        Args:
+            rows: Tuplas na ordem de COLUMNS
+        """
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                f"INSERT INTO classification_history ({', '.join(COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(COLUMNS))})",
+                rows
+            )
+
+    def query(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        classification: Optional[str] = None,
+        min_confidence: Optional[float] = None,
+        max_confidence: Optional[float] = None,
+        content_hash: Optional[str] = None,
+        after: Optional[Tuple[float, int]] = None,
+        limit: int = 50
+    ) -> Tuple[List[Dict[str, Any]], Optional[Tuple[float, int]]]:
+        """
+        Uma página do histórico, da classificação mais recente para a mais antiga.
+
+        Args:
+            start: Início do período (epoch, inclusivo)
+            end: Fim do período (epoch, exclusivo)
+            classification: PRODUTIVO ou IMPRODUTIVO
+            min_confidence: Confiança mínima (inclusiva)
+            max_confidence: Confiança máxima (inclusiva)
+            content_hash: Hash SHA-256 do conteúdo
+            after: Posição (data, id) da última linha da página anterior
+            limit: Linhas por página
+
+        Returns:
+            Tuple: (linhas, posição para a próxima página ou None se acabou)
+        """
+        conditions, params = [], []
+        if start is not None:
+            conditions.append("created_at >= ?")
+            params.append(start)
+        if end is not None:
+            conditions.append("created_at < ?")
+            params.append(end)
+        if classification is not None:
+            conditions.append("classification = ?")
+            params.append(classification)
+        if min_confidence is not None:
+            conditions.append("confidence >= ?")
+            params.append(min_confidence)
+        if max_confidence is not None:
+            conditions.append("confidence <= ?")
+            params.append(max_confidence)
+        if content_hash is not None:
+            conditions.append("content_hash = ?")
+            params.append(content_hash)
+        if after is not None:
+            conditions.append("(created_at, id) < (?, ?)")
+            params.extend(after)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT * FROM classification_history {where} "
+                "ORDER BY created_at DESC, id DESC LIMIT ?",
+                (*params, limit + 1)
+            ).fetchall()
+
+        more = len(rows) > limit
+        rows = rows[:limit]
+        following = (rows[-1]["created_at"], rows[-1]["id"]) if more else None
+        return [self._row_to_dict(row) for row in rows], following
+
+    @staticmethod
+    def _row_to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        data = dict(row)
+        models = {"classify": data.pop("model_classify")}
+        model_response = data.pop("model_response")
+        if model_response:
+            models["response"] = model_response
+        data["models"] = models
+        data["timings"] = orjson.loads(data["timings"]) if data["timings"] else None
+        return data
+
+    def purge_older_than(self, seconds: float) -> int:
+        """
+        Remove as classificações mais antigas que `seconds`, em lotes.
+
+        Returns:
+            int: Quantidade de linhas removidas
+        """
+        cutoff = time.time() - seconds
+        removed = 0
+        while True:
+            with self._lock, self._conn:
+                cursor = self._conn.execute(
+                    "DELETE FROM classification_history WHERE id IN ("
+                    "SELECT id FROM classification_history WHERE created_at < ? LIMIT ?)",
+                    (cutoff, PURGE_BATCH)
+                )
+            removed += cursor.rowcount
+            if cursor.rowcount < PURGE_BATCH:
+                return removed
+
+    def close(self) -> None:
+        """Fecha a conexão com o banco."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,194 @@
+"""
+Job Manager
+===========
+Processa jobs assíncronos (arquivos grandes e lotes) com um pool limitado
+de workers, reaproveitando o EmailClassifier e o FileProcessor da API.
+
+A fila em memória contém apenas referências (job_id, índice); o conteúdo e
+o estado ficam no JobStore (SQLite), de modo que jobs pendentes são
+retomados após um restart.
+"""
+
+from fastapi import HTTPException
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import logging
+
+# Importar configurações e serviços
+from backend.app.core.config import settings
+from backend.app.models.schemas import ClassificationResponse
+from backend.app.services.classifier import EmailClassifier
+from backend.app.services.file_processor import FileProcessor
+from backend.app.services.history_manager import HistoryManager
+from backend.app.services.job_store import JobStore
+from backend.app.services.llm_scheduler import DEFAULT_TENANT
+
+# Configurar logger
+logger = logging.getLogger(__name__)
+
+
+class JobQueueFullError(Exception):
+    """Fila de jobs cheia: o cliente deve tentar novamente mais tarde."""
+
+
+class JobManager:
+    """
+    Pool de workers para jobs de classificação.
+
+    Attributes:
+        classifier: Classificador compartilhado com a API
+        file_processor: Processador de arquivos compartilhado com a API
+        store: Persistência dos jobs
+        history: Histórico de classificações (opcional)
+        workers: Quantidade de itens processados em paralelo
+    """
+
+    def __init__(
+        self,
+        classifier: EmailClassifier,
+        file_processor: FileProcessor,
+        store: Optional[JobStore] = None,
+        workers: int = settings.JOBS_WORKERS,
+        history: Optional[HistoryManager] = None
+    ):
+        self.classifier = classifier
+        self.file_processor = file_processor
+        self.store = store
+        self.history = history
+        self.workers = workers
+        self._queue: Optional["asyncio.Queue[Tuple[str, int]]"] = None
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        """
+        Abre o banco, retoma itens pendentes e inicia os workers.
+        Chamado no startup da aplicação.
+        """
+        if self.store is None:
+            self.store = await asyncio.to_thread(
+                JobStore, settings.JOBS_DB_PATH, settings.JOBS_RETENTION_HOURS * 3600
+            )
+
+        self._queue = asyncio.Queue()
+        pending = await asyncio.to_thread(self.store.recover_pending)
+        for item in pending:
+            self._queue.put_nowait(item)
+        if pending:
+            logger.info("%d item(ns) de jobs retomado(s) após reinício", len(pending))
+
+        self._tasks = [
+            asyncio.create_task(self._worker(n), name=f"job-worker-{n}")
+            for n in range(self.workers)
+        ]
+        self._tasks.append(asyncio.create_task(self._purge_loop(), name="job-purge"))
+        logger.info("JobManager iniciado (%d workers)", self.workers)
+
+    async def stop(self) -> None:
+        """
+        Interrompe os workers. Itens em execução voltam para a fila no
+        próximo start (recover_pending).
+        """
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self.store:
+            await asyncio.to_thread(self.store.close)
+            self.store = None
+
+    async def submit(self, items: List[Dict[str, Any]], tenant: Optional[str] = None) -> str:
+        """
+        Cria um job e enfileira seus itens.
+
+        Args:
+            items: Lista de dicts com "text" ou "filename" + "content"
+            tenant: Cliente que criou o job (fair queueing das chamadas ao LLM)
+
+        Returns:
+            str: ID do job
+
+        Raises:
+            JobQueueFullError: Se a fila excederia JOBS_MAX_PENDING_ITEMS
+        """
+        if self.pending + len(items) > settings.JOBS_MAX_PENDING_ITEMS:
+            raise JobQueueFullError(
+                f"Fila de jobs cheia ({self.pending} itens pendentes)"
+            )
+
+        job_id = await asyncio.to_thread(self.store.create_job, items, tenant)
+        for idx in range(len(items)):
+            self._queue.put_nowait((job_id, idx))
+
+        logger.info("Job %s criado com %d item(ns)", job_id, len(items))
+        return job_id
+
+    async def get_job(self, job_id: str, include_results: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Retorna o estado de um job (None se não existe ou expirou).
+        """
+        job = await asyncio.to_thread(self.store.get_job, job_id, include_results)
+        if job is not None:
+            done = job["completed"] + job["failed"]
+            job["progress"] = round(done / job["total"], 4) if job["total"] else 1.0
+        return job
+
+    @property
+    def pending(self) -> int:
+        """Itens aguardando na fila."""
+        return self._queue.qsize() if self._queue else 0
+
+    async def _worker(self, number: int) -> None:
+        """Loop de um worker: consome itens da fila até ser cancelado."""
+        while True:
+            job_id, idx = await self._queue.get()
+            try:
+                await self._process_item(job_id, idx)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Worker %d: erro inesperado no job %s[%d]: %s", number, job_id, idx, e, exc_info=True)
+            finally:
+                self._queue.task_done()
+
+    async def _process_item(self, job_id: str, idx: int) -> None:
+        """Extrai o texto (se arquivo), classifica e grava o resultado."""
+        item = await asyncio.to_thread(self.store.start_item, job_id, idx)
+        if item is None:
+            # Job removido (expirado) ou item já processado
+            return
+
+        try:
+            text = item["text"]
+            if item["filename"]:
+                text = await self.file_processor.extract_text(item["filename"], item["content"])
+            # Classe batch: cede a vez às classificações interativas de todos os tenants
+            result = await self.classifier.classify_email(
+                text, priority="batch", tenant=item["tenant"] or DEFAULT_TENANT
+            )
+            if self.history is not None:
+                self.history.record(text, result, "job")
+        except HTTPException as e:
+            result = {"success": False, "error": e.detail}
+        except Exception as e:
+            result = {"success": False, "error": f"Erro ao processar item: {str(e)}"}
+
+        if item["filename"]:
+            result["filename"] = item["filename"]
+
+        # Validar uma única vez ao gravar; a leitura devolve o resultado sem revalidar
+        result = ClassificationResponse.model_validate(result).model_dump(exclude_none=True)
+
+        await asyncio.to_thread(
+            self.store.finish_item, job_id, idx, result, bool(result.get("success"))
+        )
+
+    async def _purge_loop(self) -> None:
+        """Remove periodicamente os jobs expirados."""
+        while True:
+            try:
+                removed = await asyncio.to_thread(self.store.purge_expired)
+                if removed:
+                    logger.info("%d job(s) expirado(s) removido(s)", removed)
+            except Exception as e:
+                logger.warning("Falha ao remover jobs expirados: %s", e)
+            await asyncio.sleep(settings.JOBS_PURGE_INTERVAL_SECONDS)
@@ -0,0 +1,238 @@
+"""
+Job Store
+=========
+Persistência dos jobs assíncronos em SQLite local.
+
+Cada job tem N itens (um email ou arquivo cada). O estado fica em disco para
+que jobs interrompidos por um restart sejam retomados, e os resultados
+finalizados expiram após o período de retenção.
+
+As operações são síncronas e protegidas por lock; o JobManager as executa
+em thread (asyncio.to_thread) para não bloquear o event loop.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+
+import orjson
+
+# Configurar logger
+logger = logging.getLogger(__name__)
+
+# Status possíveis de jobs e itens
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_COMPLETED = "completed"
+STATUS_FAILED = "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    completed INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    finished_at REAL,
+    expires_at REAL,
+    tenant TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_expires_at ON jobs (expires_at);
+
+CREATE TABLE IF NOT EXISTS job_items (
+    job_id TEXT NOT NULL REFERENCES jobs (id) ON DELETE CASCADE,
+    idx INTEGER NOT NULL,
+    filename TEXT,
+    text TEXT,
+    content BLOB,
+    status TEXT NOT NULL,
+    result TEXT,
+    PRIMARY KEY (job_id, idx)
+);
+CREATE INDEX IF NOT EXISTS idx_job_items_status ON job_items (status);
+"""
+
+
+class JobStore:
+    """
+    Armazena jobs e seus itens em SQLite.
+
+    Attributes:
+        path: Caminho do arquivo do banco
+        retention_seconds: Tempo de vida dos jobs após finalizados
+    """
+
+    def __init__(self, path: str, retention_seconds: float):
+        self.path = path
+        self.retention_seconds = retention_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(SCHEMA)
+        if "tenant" not in {row["name"] for row in self._conn.execute("PRAGMA table_info(jobs)")}:
+            # Banco criado antes do escalonamento por tenant
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN tenant TEXT")
+        logger.info("JobStore inicializado (%s)", path)
+
+    def create_job(self, items: List[Dict[str, Any]], tenant: Optional[str] = None) -> str:
+        """
+        Cria um job com seus itens.
+
+        Args:
+            items: Lista de dicts com "text" ou "filename" + "content"
+            tenant: Cliente que criou o job (escalonamento das chamadas ao LLM)
+
+        Returns:
+            str: ID do job
+        """
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        rows = [
+            (job_id, idx, item.get("filename"), item.get("text"), item.get("content"), STATUS_QUEUED)
+            for idx, item in enumerate(items)
+        ]
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.execute(
+                "INSERT INTO jobs (id, status, total, created_at, updated_at, tenant) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, STATUS_QUEUED, len(items), now, now, tenant)
+            )
+            self._conn.executemany(
+                "INSERT INTO job_items (job_id, idx, filename, text, content, status) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+        return job_id
+
+    def recover_pending(self) -> List[Tuple[str, int]]:
+        """
+        Recoloca na fila itens interrompidos (running) e lista os pendentes,
+        na ordem de criação dos jobs. Chamado na inicialização.
+
+        Returns:
+            List[Tuple[str, int]]: Pares (job_id, idx) a processar
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE job_items SET status = ? WHERE status = ?",
+                (STATUS_QUEUED, STATUS_RUNNING)
+            )
+            rows = self._conn.execute(
+                "SELECT i.job_id, i.idx FROM job_items i JOIN jobs j ON j.id = i.job_id "
+                "WHERE i.status = ? ORDER BY j.created_at, i.idx",
+                (STATUS_QUEUED,)
+            ).fetchall()
+        return [(row["job_id"], row["idx"]) for row in rows]
+
+    def start_item(self, job_id: str, idx: int) -> Optional[Dict[str, Any]]:
+        """
+        Marca um item como em execução e retorna sua entrada.
+
+        Returns:
+            Dict com filename, text, content e o tenant do job, ou None se o job não existe mais
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT i.filename, i.text, i.content, j.tenant FROM job_items i JOIN jobs j ON j.id = i.job_id "
+                "WHERE i.job_id = ? AND i.idx = ? AND i.status = ?",
+                (job_id, idx, STATUS_QUEUED)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE job_items SET status = ? WHERE job_id = ? AND idx = ?",
+                (STATUS_RUNNING, job_id, idx)
+            )
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, updated_at = ? WHERE id = ? AND status = ?",
+                (STATUS_RUNNING, now, job_id, STATUS_QUEUED)
+            )
+        return dict(row)
+
+    def finish_item(self, job_id: str, idx: int, result: Dict[str, Any], success: bool) -> None:
+        """
+        Grava o resultado de um item e finaliza o job quando for o último.
+
+        O conteúdo do item (texto/arquivo) é descartado após o processamento.
+        """
+        now = time.time()
+        status = STATUS_COMPLETED if success else STATUS_FAILED
+        counter = "completed" if success else "failed"
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.execute(
+                "UPDATE job_items SET status = ?, result = ?, text = NULL, content = NULL "
+                "WHERE job_id = ? AND idx = ?",
+                (status, orjson.dumps(result).decode("utf-8"), job_id, idx)
+            )
+            self._conn.execute(
+                f"UPDATE jobs SET {counter} = {counter} + 1, updated_at = ? WHERE id = ?",
+                (now, job_id)
+            )
+            job = self._conn.execute(
+                "SELECT total, completed, failed FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+            if job and job["completed"] + job["failed"] >= job["total"]:
+                final = STATUS_FAILED if job["completed"] == 0 else STATUS_COMPLETED
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, finished_at = ?, expires_at = ? WHERE id = ?",
+                    (final, now, now + self.retention_seconds, job_id)
+                )
+
+    def get_job(self, job_id: str, include_results: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Retorna status, progresso e (opcionalmente) resultados de um job.
+
+        Jobs expirados são tratados como inexistentes.
+        """
+        with self._lock:
+            job = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if job is None or (job["expires_at"] and job["expires_at"] < time.time()):
+                return None
+            items = []
+            if include_results:
+                items = self._conn.execute(
+                    "SELECT idx, filename, status, result FROM job_items WHERE job_id = ? ORDER BY idx",
+                    (job_id,)
+                ).fetchall()
+
+        data = dict(job)
+        del data["tenant"]
+        data["results"] = [
+            {
+                "index": item["idx"],
+                "filename": item["filename"],
+                "status": item["status"],
+                "result": orjson.loads(item["result"]) if item["result"] else None,
+            }
+            for item in items
+        ] if include_results else None
+        return data
+
+    def purge_expired(self) -> int:
+        """
+        Remove jobs cujo período de retenção terminou.
+
+        Returns:
+            int: Quantidade de jobs removidos
+        """
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM jobs WHERE expires_at IS NOT NULL AND expires_at < ?",
+                (time.time(),)
+            )
+        return cursor.rowcount
+
+    def close(self) -> None:
+        """Fecha a conexão com o banco."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,272 @@
+"""
+LLM Scheduler
+=============
+Escalonamento das chamadas ao LLM por classe de prioridade e por tenant.
+
+Até `max_concurrent` chamadas vão ao upstream ao mesmo tempo; as demais
+esperam na fila em dois níveis:
+
+    - entre classes, weighted fair queueing (self-clocked): cada classe com
+      fila recebe uma fatia da capacidade proporcional ao seu peso
+    - dentro da classe, rodízio entre os tenants com fila: eles dividem a
+      fatia da classe igualmente, e mais tenants não aumentam essa fatia
+
+    - urgent: emails com palavras-chave como "urgente" ou "prazo"
+      (detectadas por regex, sem custo relevante)
+    - interactive: triagem pelo frontend e chamadas síncronas da API
+    - batch: jobs assíncronos e clientes que se declaram em lote
+
+Um cliente com milhares de itens na fila avança no próprio ritmo, sem
+empurrar para trás as requisições de outros tenants ou de classes mais
+prioritárias; ainda assim, nenhuma classe fica parada (os pesos definem
+fatias, não prioridade estrita). Sem fila, a chamada passa direto.
+
+Cópias de hedging (services/hedging.py) ocupam uma vaga própria com
+`try_acquire`: só saem se houver vaga livre e ninguém na fila, então não
+passam do limite de chamadas simultâneas nem à frente de outros tenants.
+
+O tenant vem do cliente (SCHEDULER_TENANT_HEADER, ou o IP): não é
+autenticação. Um cliente que troca de tenant a cada chamada ganha espaço
+sobre os outros tenants da mesma classe, mas não sobre as outras classes.
+"""
+
+from collections import Counter, OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Iterable, Optional, Tuple
+import asyncio
+import logging
+import re
+import time
+
+from backend.app.core.deadline import MIN_ATTEMPT_SECONDS, Deadline, DeadlineExceeded
+from backend.app.core.metrics import LatencyTracker
+from backend.app.core.tracing import span
+
+# Configurar logger
+logger = logging.getLogger(__name__)
+
+# Classes de prioridade, da mais para a menos prioritária
+PRIORITIES = ("urgent", "interactive", "batch")
+
+# Tenant das chamadas sem identificação
+DEFAULT_TENANT = "anonymous"
+
+
+class LLMScheduler:
+    """
+    Vagas de chamada ao LLM com fila justa por prioridade e tenant.
+
+    Roda no event loop (sem locks), como o controle de admissão: a vaga
+    liberada vai direto para o próximo da fila.
+
+    Attributes:
+        max_concurrent: Chamadas simultâneas ao upstream
+        weights: Classe -> peso (fatia da capacidade quando há fila)
+        in_flight: Vagas ocupadas
+        stats: Classe -> contadores acumulados (despachadas, enfileiradas, prazo esgotado)
+        queue_wait: Espera na fila por classe (ms)
+    """
+
+    def __init__(self, max_concurrent: int, weights: Dict[str, float], urgent_keywords: Iterable[str]):
+        self.max_concurrent = max(1, max_concurrent)
+        self.weights = {priority: float(weights.get(priority, 1.0)) for priority in PRIORITIES}
+        if any(weight <= 0 for weight in self.weights.values()):
+            raise ValueError(f"Pesos do escalonador devem ser positivos: {self.weights}")
+        keywords = [re.escape(keyword.strip()) for keyword in urgent_keywords if keyword.strip()]
+        self._urgent = re.compile(r"\b(?:%s)\b" % "|".join(keywords), re.IGNORECASE) if keywords else None
+        self.in_flight = 0
+        # Classe -> tenant -> waiters, tenants na ordem do rodízio
+        self._waiting: Dict[str, "OrderedDict[str, Deque[asyncio.Future]]"] = {
+            priority: OrderedDict() for priority in PRIORITIES
+        }
+        # Tag de término da próxima vaga de cada classe com fila, e da última vaga dada
+        self._next_tags: Dict[str, float] = {}
+        self._last_tags: Dict[str, float] = {}
+        self._virtual_time = 0.0
+        self._queued: Counter = Counter()
+        self._queued_tenants: Counter = Counter()
+        self.stats = {priority: {"dispatched": 0, "enqueued": 0, "expired": 0} for priority in PRIORITIES}
+        self.queue_wait = LatencyTracker()
+
+    def is_urgent(self, text: str) -> bool:
+        """Texto com alguma das palavras-chave de urgência."""
+        return self._urgent is not None and self._urgent.search(text) is not None
+
+    @property
+    def queued(self) -> int:
+        """Chamadas esperando vaga."""
+        return sum(self._queued.values())
+
+    def _dispatched(self, priority: str, wait_ms: float) -> None:
+        self.stats[priority]["dispatched"] += 1
+        self.queue_wait.record(priority, wait_ms)
+
+    async def acquire(self, priority: str, tenant: str, deadline: Optional[Deadline] = None) -> None:
+        """
+        Ocupa uma vaga, esperando a vez da classe e do tenant se preciso.
+
+        Args:
+            priority: Classe de prioridade (PRIORITIES)
+            tenant: Cliente da API
+            deadline: Prazo da requisição (a espera não passa do que sobra dele)
+
+        Raises:
+            DeadlineExceeded: O prazo acabou antes da vaga
+        """
+        if self.in_flight < self.max_concurrent and not self._queued:
+            self.in_flight += 1
+            self._dispatched(priority, 0.0)
+            return
+
+        wait = None
+        if deadline is not None:
+            # Reserva tempo para ao menos uma tentativa de chamada
+            wait = deadline.remaining() - MIN_ATTEMPT_SECONDS
+            if wait <= 0:
+                self.stats[priority]["expired"] += 1
+                raise DeadlineExceeded(f"Prazo de {deadline.seconds:.1f}s esgotado antes da vaga no LLM")
+
+        if priority not in self._next_tags:
+            # Classe entrando na fila: começa no tempo virtual (classe ociosa não acumula crédito)
+            start_tag = max(self._virtual_time, self._last_tags.get(priority, 0.0))
+            self._next_tags[priority] = start_tag + 1.0 / self.weights[priority]
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiting[priority].setdefault(tenant, deque()).append(waiter)
+        self._queued[priority] += 1
+        self._queued_tenants[tenant] += 1
+        self.stats[priority]["enqueued"] += 1
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), wait)
+        except asyncio.TimeoutError:
+            if not self._abandon(waiter, priority, tenant):
+                self.stats[priority]["expired"] += 1
+                raise DeadlineExceeded(
+                    f"Prazo de {deadline.seconds:.1f}s esgotado na fila do LLM ({priority}, {tenant})"
+                )
+        except asyncio.CancelledError:
+            # Cliente desconectou: devolve a vaga se ela já tinha sido repassada
+            if self._abandon(waiter, priority, tenant):
+                self.release()
+            raise
+        self._dispatched(priority, (time.perf_counter() - start) * 1000)
+
+    def try_acquire(self, priority: str) -> bool:
+        """
+        Ocupa uma vaga só se ela estiver livre agora e não houver fila (sem
+        esperar). Usado pelas cópias de hedging; a vaga volta com `release`.
+
+        Args:
+            priority: Classe de prioridade (PRIORITIES)
+
+        Returns:
+            bool: True se a vaga foi ocupada
+        """
+        if self.in_flight < self.max_concurrent and not self._queued:
+            self.in_flight += 1
+            self._dispatched(priority, 0.0)
+            return True
+        return False
+
+    def _unqueue(self, priority: str, tenant: str) -> None:
+        self._queued[priority] -= 1
+        if not self._queued[priority]:
+            del self._queued[priority]
+        self._queued_tenants[tenant] -= 1
+        if not self._queued_tenants[tenant]:
+            del self._queued_tenants[tenant]
+
+    def _abandon(self, waiter: asyncio.Future, priority: str, tenant: str) -> bool:
+        """
+        Tira um waiter da fila (a entrada é descartada quando chega a vez dele).
+
+        Returns:
+            bool: True se a vaga já tinha sido repassada a ele (corrida com release)
+        """
+        if waiter.done():
+            return True
+        waiter.cancel()
+        self._unqueue(priority, tenant)
+        if not self._queued.get(priority):
+            self._leave(priority)
+        return False
+
+    def _leave(self, priority: str) -> None:
+        """Classe sem fila: descarta os waiters cancelados e a tag da próxima vaga."""
+        self._waiting[priority].clear()
+        self._next_tags.pop(priority, None)
+
+    def _next_waiter(self, priority: str) -> Tuple[asyncio.Future, str]:
+        """Próximo waiter da classe no rodízio de tenants (a classe tem fila)."""
+        tenants = self._waiting[priority]
+        while True:
+            tenant, waiters = next(iter(tenants.items()))
+            waiter = waiters.popleft()
+            if not waiters:
+                del tenants[tenant]
+            if waiter.done():
+                continue
+            if waiters:
+                # Próxima vaga da classe vai para o tenant seguinte
+                tenants.move_to_end(tenant)
+            return waiter, tenant
+
+    def release(self) -> None:
+        """Libera uma vaga, repassando-a à classe com a menor tag de término."""
+        if self._next_tags:
+            priority = min(self._next_tags, key=lambda name: (self._next_tags[name], PRIORITIES.index(name)))
+            waiter, tenant = self._next_waiter(priority)
+            finish = self._next_tags[priority]
+            self._virtual_time = finish
+            self._last_tags[priority] = finish
+            self._unqueue(priority, tenant)
+            if self._queued.get(priority):
+                self._next_tags[priority] = finish + 1.0 / self.weights[priority]
+            else:
+                self._leave(priority)
+            waiter.set_result(None)
+            return
+        self.in_flight -= 1
+        # Sem fila, todas as classes recomeçam do tempo virtual atual
+        self._last_tags.clear()
+
+    @asynccontextmanager
+    async def slot(self, priority: str, tenant: str, deadline: Optional[Deadline] = None) -> AsyncIterator[None]:
+        """
+        Contexto com uma vaga de chamada ao LLM (ver `acquire`).
+
+        Uso:
+            async with scheduler.slot("interactive", tenant, deadline):
+                response = await client.chat.completions.create(...)
+        """
+        with span("llm.queue", priority=priority):
+            await self.acquire(priority, tenant, deadline)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Estado do escalonador para GET /api/metrics.
+
+        Returns:
+            Dict: Vagas ocupadas, fila por classe, tenants com fila e, por
+            classe, peso, contadores acumulados e espera na fila
+        """
+        waits = self.queue_wait.snapshot()
+        return {
+            "in_flight": self.in_flight,
+            "max_concurrent": self.max_concurrent,
+            "queued": self.queued,
+            "queued_tenants": len(self._queued_tenants),
+            "classes": {
+                priority: {
+                    "weight": self.weights[priority],
+                    "queued": self._queued.get(priority, 0),
+                    **self.stats[priority],
+                    "queue_wait": waits.get(priority),
+                }
+                for priority in PRIORITIES
+            },
+        }
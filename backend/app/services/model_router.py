@@ -0,0 +1,230 @@
+"""
+Model Router
+============
+Escolha do modelo do LLM por chamada, com fallback.
+
+A lista de modelos (GROQ_MODELS) vai do mais rápido ao maior. Para cada
+chamada o roteador devolve a ordem de tentativa:
+
+    - emails curtos: os modelos com amostras suficientes ordenados pela
+      latência observada para o tipo de chamada (classificação ou
+      resposta); os demais mantêm a posição configurada
+    - emails longos ou ambíguos (escalonados): o maior modelo primeiro
+    - modelos cujo p95 observado excede o SLO do tipo de chamada, ou que
+      receberam rate limit recentemente, vão para o fim da fila
+
+As amostras expiram após ROUTING_SAMPLE_MAX_AGE_SECONDS: um modelo rebaixado
+quase não recebe tráfego, então sem amostras recentes ele deixa de ser
+considerado degradado e volta a ser tentado (e é rebaixado de novo se
+continuar lento).
+
+Os demais modelos da lista servem de fallback em timeout, rate limit ou
+erro do servidor.
+"""
+
+from collections import Counter
+from typing import Any, Dict, List, Optional
+import logging
+import threading
+import time
+
+from groq import APIConnectionError, APITimeoutError, InternalServerError, RateLimitError
+
+from backend.app.core.metrics import LatencyTracker
+
+# Configurar logger
+logger = logging.getLogger(__name__)
+
+
+def fallback_reason(error: Exception) -> Optional[str]:
+    """
+    Classifica um erro da API que justifica tentar o próximo modelo.
+
+    Returns:
+        Optional[str]: "timeout", "rate_limit", "connection" ou "server_error";
+        None para erros que outro modelo não resolveria
+    """
+    if isinstance(error, APITimeoutError):
+        return "timeout"
+    if isinstance(error, RateLimitError):
+        return "rate_limit"
+    if isinstance(error, APIConnectionError):
+        return "connection"
+    if isinstance(error, InternalServerError):
+        return "server_error"
+    return None
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Lê o header Retry-After de um erro de rate limit, se houver."""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    try:
+        return float(response.headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class ModelRouter:
+    """
+    Roteador de modelos com latência observada, SLO e cooldown.
+
+    Attributes:
+        models: Modelos do mais rápido ao maior
+        long_email_chars: Tamanho a partir do qual o maior modelo é preferido
+        latency_slo_ms: p95 alvo por tipo de chamada
+        cooldown_seconds: Espera padrão de um modelo após rate limit
+        min_samples: Amostras por modelo antes de ordenar pela latência observada
+        sample_max_age: Idade máxima (segundos) das amostras de latência
+    """
+
+    def __init__(
+        self,
+        models: List[str],
+        long_email_chars: int,
+        latency_slo_ms: Dict[str, float],
+        cooldown_seconds: float,
+        min_samples: int = 20,
+        sample_max_age: Optional[float] = None
+    ):
+        self.models = list(dict.fromkeys(models))
+        self.long_email_chars = long_email_chars
+        self.latency_slo_ms = latency_slo_ms
+        self.cooldown_seconds = cooldown_seconds
+        self.min_samples = min_samples
+        self.latency = LatencyTracker(window=500, max_age_seconds=sample_max_age)
+        self._cooldown_until: Dict[str, float] = {}
+        self._decisions: Counter = Counter()
+        self._fallbacks: Counter = Counter()
+        self._failures: Counter = Counter()
+        self._escalations = 0
+        self._lock = threading.Lock()
+        logger.info("ModelRouter inicializado (modelos: %s)", ", ".join(self.models))
+
+    @property
+    def largest_model(self) -> str:
+        """Maior modelo da lista (último)."""
+        return self.models[-1]
+
+    @staticmethod
+    def _label(call_type: str, model: str) -> str:
+        return f"{call_type}/{model}"
+
+    def _by_latency(self, call_type: str) -> List[str]:
+        """
+        Modelos com amostras suficientes ordenados pelo p50 observado, nas
+        posições que ocupam na lista configurada; os demais ficam onde estão.
+        """
+        p50 = {
+            model: self.latency.percentile(self._label(call_type, model), 0.50, self.min_samples)
+            for model in self.models
+        }
+        ranked = iter(sorted((model for model in self.models if p50[model] is not None), key=p50.get))
+        return [next(ranked) if p50[model] is not None else model for model in self.models]
+
+    def _is_degraded(self, call_type: str, model: str, now: float) -> bool:
+        """Modelo em cooldown ou com p95 acima do SLO do tipo de chamada."""
+        if self._cooldown_until.get(model, 0.0) > now:
+            return True
+        slo = self.latency_slo_ms.get(call_type)
+        if slo is None:
+            return False
+        p95 = self.latency.percentile(self._label(call_type, model), 0.95, self.min_samples)
+        return p95 is not None and p95 > slo
+
+    def route(self, call_type: str, email_length: int, escalate: bool = False) -> List[str]:
+        """
+        Ordem de tentativa dos modelos para uma chamada.
+
+        Args:
+            call_type: "classify" ou "response"
+            email_length: Tamanho do texto enviado (caracteres)
+            escalate: Preferir o maior modelo (email ambíguo)
+
+        Returns:
+            List[str]: Modelo principal seguido dos fallbacks
+        """
+        if len(self.models) == 1:
+            ordered = list(self.models)
+        else:
+            if escalate or email_length > self.long_email_chars:
+                preferred = list(reversed(self.models))
+            else:
+                preferred = self._by_latency(call_type)
+            now = time.monotonic()
+            healthy = [model for model in preferred if not self._is_degraded(call_type, model, now)]
+            # Se todos estão degradados, mantém a preferência original
+            ordered = healthy + [model for model in preferred if model not in healthy] if healthy else preferred
+
+        with self._lock:
+            self._decisions[(call_type, ordered[0])] += 1
+        return ordered
+
+    def record_success(self, model: str, call_type: str, latency_ms: float) -> None:
+        """Registra a latência de uma chamada bem-sucedida."""
+        self.latency.record(self._label(call_type, model), latency_ms)
+
+    def record_failure(
+        self,
+        model: str,
+        call_type: str,
+        reason: Optional[str],
+        latency_ms: float,
+        retry_after: Optional[float] = None
+    ) -> None:
+        """
+        Registra uma falha. Timeouts contam como amostra de latência (elevam o
+        p95 do modelo); rate limit coloca o modelo em cooldown.
+        """
+        with self._lock:
+            self._failures[(call_type, model, reason or "error")] += 1
+            if reason == "rate_limit":
+                self._cooldown_until[model] = time.monotonic() + (retry_after or self.cooldown_seconds)
+        if reason == "timeout":
+            self.latency.record(self._label(call_type, model), latency_ms)
+
+    def record_fallback(self, source: str, target: str, reason: str) -> None:
+        """Registra a troca de modelo após uma falha."""
+        with self._lock:
+            self._fallbacks[(source, target, reason)] += 1
+
+    def record_escalation(self) -> None:
+        """Registra uma reclassificação com o maior modelo."""
+        with self._lock:
+            self._escalations += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Decisões de roteamento, fallbacks e latência por modelo.
+
+        Returns:
+            Dict[str, Any]: Estado do roteador para GET /api/metrics
+        """
+        now = time.monotonic()
+        with self._lock:
+            decisions: Dict[str, Dict[str, int]] = {}
+            for (call_type, model), count in self._decisions.items():
+                decisions.setdefault(call_type, {})[model] = count
+            fallbacks = [
+                {"from": source, "to": target, "reason": reason, "count": count}
+                for (source, target, reason), count in self._fallbacks.items()
+            ]
+            failures = [
+                {"call_type": call_type, "model": model, "reason": reason, "count": count}
+                for (call_type, model, reason), count in self._failures.items()
+            ]
+            cooldown = {
+                model: round(until - now, 1)
+                for model, until in self._cooldown_until.items() if until > now
+            }
+            escalations = self._escalations
+        return {
+            "models": self.models,
+            "decisions": decisions,
+            "escalations": escalations,
+            "fallbacks": fallbacks,
+            "failures": failures,
+            "cooldown_seconds": cooldown,
+            "latency": self.latency.snapshot(),
+        }
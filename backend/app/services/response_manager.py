@@ -0,0 +1,132 @@
+"""
+Response Manager
+================
+Geração sob demanda das respostas sugeridas.
+
+Classificações feitas com generate_response=false recebem um handle; a
+resposta é gerada na primeira consulta ao handle (GET /api/responses/{id})
+e fica gravada no ResponseStore. Consultas simultâneas ao mesmo handle
+compartilham a mesma chamada ao LLM.
+"""
+
+from typing import Any, Dict, Optional
+import asyncio
+import logging
+
+# Importar configurações e serviços
+from backend.app.core.config import settings
+from backend.app.core.deadline import Deadline
+from backend.app.services.classifier import EmailClassifier
+from backend.app.services.llm_scheduler import DEFAULT_TENANT
+from backend.app.services.response_store import ResponseStore
+
+# Configurar logger
+logger = logging.getLogger(__name__)
+
+
+class ResponseManager:
+    """
+    Respostas sugeridas adiadas, com cache persistente.
+
+    Attributes:
+        classifier: Classificador compartilhado com a API
+        store: Persistência das respostas
+    """
+
+    def __init__(self, classifier: EmailClassifier, store: Optional[ResponseStore] = None):
+        self.classifier = classifier
+        self.store = store
+        self._inflight: Dict[str, "asyncio.Future"] = {}
+        self._purge_task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """
+        Abre o banco e inicia a limpeza periódica. Chamado no startup.
+        """
+        if self.store is None:
+            self.store = await asyncio.to_thread(
+                ResponseStore, settings.JOBS_DB_PATH, settings.RESPONSES_RETENTION_HOURS * 3600
+            )
+        self._purge_task = asyncio.create_task(self._purge_loop(), name="responses-purge")
+
+    async def stop(self) -> None:
+        """Interrompe a limpeza e fecha o banco."""
+        if self._purge_task:
+            self._purge_task.cancel()
+            await asyncio.gather(self._purge_task, return_exceptions=True)
+            self._purge_task = None
+        if self.store:
+            await asyncio.to_thread(self.store.close)
+            self.store = None
+
+    async def defer(self, email_text: str, categoria: str) -> str:
+        """
+        Guarda um email classificado para gerar a resposta depois.
+
+        Args:
+            email_text: Texto original do email
+            categoria: Categoria classificada
+
+        Returns:
+            str: Handle da resposta
+        """
+        return await asyncio.to_thread(self.store.create, email_text, categoria)
+
+    async def get_or_generate(
+        self, response_id: str, deadline: Deadline, tenant: str = DEFAULT_TENANT
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Retorna a resposta do handle, gerando-a na primeira consulta.
+
+        Args:
+            response_id: Handle retornado na classificação
+            deadline: Prazo da requisição
+            tenant: Cliente da API (escalonamento da chamada ao LLM)
+
+        Returns:
+            Dict com a resposta, ou None se o handle não existe ou expirou
+        """
+        entry = await asyncio.to_thread(self.store.get, response_id)
+        if entry is None:
+            return None
+
+        cached = entry["response"] is not None
+        if not cached:
+            task = self._inflight.get(response_id)
+            if task is None:
+                task = asyncio.ensure_future(self._generate(entry, deadline, tenant))
+                self._inflight[response_id] = task
+                task.add_done_callback(lambda _: self._inflight.pop(response_id, None))
+            # shield: a desconexão de um cliente não cancela a geração dos demais
+            entry["response"], entry["model"], entry["generated_at"] = await asyncio.shield(task)
+
+        return {
+            "response_id": response_id,
+            "classification": entry["categoria"],
+            "suggested_response": entry["response"],
+            "model": entry["model"],
+            "cached": cached,
+            "generated_at": entry["generated_at"],
+        }
+
+    async def _generate(self, entry: Dict[str, Any], deadline: Deadline, tenant: str):
+        """Gera a resposta e grava no banco (exceto a resposta padrão)."""
+        response, model = await self.classifier.generate_suggested_response(
+            entry["email_text"], entry["categoria"], deadline, tenant
+        )
+        generated_at = None
+        if model != "default":
+            # A resposta padrão não é gravada: a próxima consulta tenta o LLM de novo
+            generated_at = await asyncio.to_thread(self.store.save_response, entry["id"], response, model)
+        return response, model, generated_at
+
+    async def _purge_loop(self) -> None:
+        """Remove periodicamente as respostas expiradas."""
+        while True:
+            try:
+                removed = await asyncio.to_thread(self.store.purge_expired)
+                if removed:
+                    logger.info("%d resposta(s) expirada(s) removida(s)", removed)
+            except Exception as e:
+                logger.warning("Falha ao remover respostas expiradas: %s", e)
+            await asyncio.sleep(settings.JOBS_PURGE_INTERVAL_SECONDS)
@@ -0,0 +1,122 @@
+"""
+Response Store
+==============
+Respostas sugeridas sob demanda, em SQLite local.
+
+Quando a classificação é feita sem gerar a resposta, o email e a categoria
+ficam guardados sob um identificador (handle). A resposta é gerada na
+primeira consulta e gravada no lugar do email, de modo que consultas
+seguintes não chamam o LLM de novo. As entradas expiram após o período de
+retenção.
+
+Usa o mesmo arquivo de banco dos jobs (tabela própria). As operações são
+síncronas e protegidas por lock; o ResponseManager as executa em thread.
+"""
+
+from typing import Any, Dict, Optional
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+
+# Configurar logger
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS suggested_responses (
+    id TEXT PRIMARY KEY,
+    email_text TEXT,
+    categoria TEXT NOT NULL,
+    response TEXT,
+    model TEXT,
+    created_at REAL NOT NULL,
+    generated_at REAL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_suggested_responses_expires_at ON suggested_responses (expires_at);
+"""
+
+
+class ResponseStore:
+    """
+    Armazena emails classificados aguardando a resposta sugerida.
+
+    Attributes:
+        path: Caminho do arquivo do banco
+        retention_seconds: Tempo de vida de cada entrada
+    """
+
+    def __init__(self, path: str, retention_seconds: float):
+        self.path = path
+        self.retention_seconds = retention_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        logger.info("ResponseStore inicializado (%s)", path)
+
+    def create(self, email_text: str, categoria: str) -> str:
+        """
+        Guarda um email classificado para gerar a resposta depois.
+
+        Returns:
+            str: Identificador (handle) da resposta
+        """
+        response_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO suggested_responses (id, email_text, categoria, created_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (response_id, email_text, categoria, now, now + self.retention_seconds)
+            )
+        return response_id
+
+    def get(self, response_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Retorna a entrada (None se não existe ou expirou).
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM suggested_responses WHERE id = ?", (response_id,)
+            ).fetchone()
+        if row is None or row["expires_at"] < time.time():
+            return None
+        return dict(row)
+
+    def save_response(self, response_id: str, response: str, model: str) -> float:
+        """
+        Grava a resposta gerada. O texto do email é descartado.
+
+        Returns:
+            float: Instante da geração (epoch)
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE suggested_responses SET response = ?, model = ?, generated_at = ?, email_text = NULL "
+                "WHERE id = ?",
+                (response, model, now, response_id)
+            )
+        return now
+
+    def purge_expired(self) -> int:
+        """
+        Remove as entradas expiradas.
+
+        Returns:
+            int: Quantidade de entradas removidas
+        """
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM suggested_responses WHERE expires_at < ?", (time.time(),)
+            )
+        return cursor.rowcount
+
+    def close(self) -> None:
+        """Fecha a conexão com o banco."""
+        with self._lock:
+            self._conn.close()
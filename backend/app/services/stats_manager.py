@@ -0,0 +1,171 @@
+"""
+Stats Manager
+=============
+Grava periodicamente os rollups de estatísticas deste processo no
+StatsStore e responde às consultas de GET /api/stats.
+
+Uma janela qualquer é respondida só com rollups: os dias inteiros da janela
+vêm dos rollups diários e as pontas, dos horários. O custo depende do
+tamanho da janela em horas/dias (no máximo 2 × 23 horas + os dias) e da
+quantidade de workers, nunca da quantidade de classificações.
+"""
+
+from typing import Any, Dict, Optional
+import asyncio
+import logging
+import math
+import os
+import socket
+import time
+
+# Importar configurações e serviços
+from backend.app.core.config import settings
+from backend.app.core.stats import DAY, HOUR, Rollup, StatsRollups, classification_stats
+from backend.app.services.stats_store import StatsStore
+
+# Configurar logger
+logger = logging.getLogger(__name__)
+
+# Pontos máximos da série de uma consulta
+MAX_SERIES_POINTS = 1000
+
+# Intervalo da limpeza de rollups antigos (segundos)
+PURGE_INTERVAL_SECONDS = 3600
+
+
+class StatsManager:
+    """
+    Persistência e consulta dos rollups de estatísticas.
+
+    Attributes:
+        rollups: Rollups em memória deste processo
+        store: Persistência compartilhada entre workers
+        worker_id: Identificador deste processo nas linhas gravadas
+    """
+
+    def __init__(self, rollups: StatsRollups = classification_stats, store: Optional[StatsStore] = None):
+        self.rollups = rollups
+        self.store = store
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}-{os.urandom(3).hex()}"
+        self._flush_task: Optional[asyncio.Task] = None
+        self._last_purge = 0.0
+
+    async def start(self) -> None:
+        """Abre o banco e inicia o flush periódico. Chamado no startup."""
+        if self.store is None:
+            self.store = await asyncio.to_thread(StatsStore, settings.STATS_DB_PATH)
+        self._flush_task = asyncio.create_task(self._flush_loop(), name="stats-flush")
+
+    async def stop(self) -> None:
+        """Interrompe o flush periódico, grava os pendentes e fecha o banco."""
+        if self._flush_task:
+            self._flush_task.cancel()
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+            self._flush_task = None
+        if self.store:
+            await self.flush()
+            await asyncio.to_thread(self.store.close)
+            self.store = None
+
+    async def flush(self) -> int:
+        """
+        Grava os rollups alterados desde o último flush.
+
+        Returns:
+            int: Quantidade de rollups gravados
+        """
+        entries = self.rollups.pending()
+        if not entries:
+            return 0
+        try:
+            await asyncio.to_thread(self.store.save, self.worker_id, entries)
+        except Exception:
+            self.rollups.flushed(entries, failed=True)
+            raise
+        self.rollups.flushed(entries)
+        return len(entries)
+
+    async def _flush_loop(self) -> None:
+        """Grava os rollups a cada STATS_FLUSH_INTERVAL_SECONDS e limpa os antigos."""
+        while True:
+            await asyncio.sleep(settings.STATS_FLUSH_INTERVAL_SECONDS)
+            try:
+                await self.flush()
+                if settings.STATS_RETENTION_DAYS > 0 and time.time() - self._last_purge > PURGE_INTERVAL_SECONDS:
+                    self._last_purge = time.time()
+                    removed = await asyncio.to_thread(
+                        self.store.purge_older_than, settings.STATS_RETENTION_DAYS * DAY
+                    )
+                    if removed:
+                        logger.info("%d rollup(s) de estatísticas antigo(s) removido(s)", removed)
+            except Exception as e:
+                logger.warning("Falha ao gravar estatísticas: %s", e)
+
+    def _collect(self, granularity: str, start: int, end: int) -> Dict[int, Rollup]:
+        """
+        Rollups de todos os workers por período, somados.
+
+        Para este worker, os períodos ainda em memória substituem as linhas
+        gravadas (a memória tem tudo o que foi gravado e mais).
+        """
+        if start >= end:
+            return {}
+        local = self.rollups.local(granularity, start, end)
+        merged: Dict[int, Rollup] = {}
+        for bucket, worker, data in self.store.load(granularity, start, end):
+            if worker == self.worker_id and bucket in local:
+                continue
+            merged.setdefault(bucket, Rollup()).merge(Rollup.from_dict(data))
+        for bucket, rollup in local.items():
+            merged.setdefault(bucket, Rollup()).merge(rollup)
+        return merged
+
+    def query(self, start: float, end: float, granularity: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Estatísticas de uma janela, com série opcional por hora ou por dia.
+
+        A janela é alinhada a horas inteiras (UTC): início arredondado para
+        baixo, fim para cima.
+
+        Args:
+            start: Início da janela (epoch)
+            end: Fim da janela (epoch)
+            granularity: None (só o total), "hour" ou "day"
+
+        Returns:
+            Dict: Janela alinhada, total e série
+
+        Raises:
+            ValueError: Se a série passaria de MAX_SERIES_POINTS pontos
+        """
+        start_h = int(start // HOUR) * HOUR
+        end_h = int(math.ceil(end / HOUR)) * HOUR
+        step = DAY if granularity == "day" else HOUR
+        if granularity and (end_h - start_h) / step > MAX_SERIES_POINTS:
+            raise ValueError(f"Janela grande demais para granularity={granularity} (máximo {MAX_SERIES_POINTS} pontos)")
+
+        first_day = int(math.ceil(start_h / DAY)) * DAY
+        last_day = int(end_h // DAY) * DAY
+        if granularity == "hour" or first_day >= last_day:
+            # Janela sem dia inteiro (ou série por hora): só rollups horários
+            hours = self._collect("hour", start_h, end_h)
+            days: Dict[int, Rollup] = {}
+        else:
+            hours = {**self._collect("hour", start_h, first_day), **self._collect("hour", last_day, end_h)}
+            days = self._collect("day", first_day, last_day)
+
+        total = Rollup()
+        for rollup in (*hours.values(), *days.values()):
+            total.merge(rollup)
+
+        result: Dict[str, Any] = {"start": start_h, "end": end_h, "granularity": granularity, **total.summary()}
+        if granularity:
+            points: Dict[int, Rollup] = {}
+            for bucket, rollup in (*hours.items(), *days.items()):
+                points.setdefault(bucket - bucket % step, Rollup()).merge(rollup)
+            first = start_h - start_h % step
+            result["series"] = [
+                {"start": bucket, **points.get(bucket, Rollup()).summary()}
+                for bucket in range(first, end_h, step)
+            ]
+        return result
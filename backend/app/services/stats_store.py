@@ -0,0 +1,105 @@
+"""
+Stats Store
+===========
+Rollups de estatísticas gravados em SQLite local (modo WAL).
+
+Cada worker grava o próprio rollup de cada hora e de cada dia (uma linha
+por período e worker, substituída a cada flush). A leitura soma as linhas
+de todos os workers, então vários processos (ex.: uvicorn --workers N)
+compartilham o mesmo arquivo sem coordenação.
+"""
+
+from typing import Any, Dict, List, Sequence, Tuple
+import logging
+import sqlite3
+import threading
+import time
+
+import msgpack
+
+# Configurar logger
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS stats_rollups (
+    granularity TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    worker TEXT NOT NULL,
+    data BLOB NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (granularity, bucket, worker)
+);
+"""
+
+
+class StatsStore:
+    """
+    Armazena os rollups por período e worker.
+
+    Attributes:
+        path: Caminho do arquivo do banco
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        # Outros workers gravando ao mesmo tempo: espera em vez de falhar
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(SCHEMA)
+        logger.info("StatsStore inicializado (%s)", path)
+
+    def save(self, worker: str, entries: Sequence[Tuple[str, int, Dict[str, Any]]]) -> None:
+        """
+        Grava (substitui) os rollups de um worker em uma única transação.
+
+        Args:
+            worker: Identificador do worker
+            entries: (granularidade, início do período, rollup como dict)
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO stats_rollups (granularity, bucket, worker, data, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(granularity, bucket, worker, msgpack.packb(data), now) for granularity, bucket, data in entries]
+            )
+
+    def load(self, granularity: str, start: int, end: int) -> List[Tuple[int, str, Dict[str, Any]]]:
+        """
+        Rollups de todos os workers de uma granularidade no intervalo.
+
+        Args:
+            granularity: "hour" ou "day"
+            start: Início do primeiro período (inclusivo)
+            end: Fim do intervalo (exclusivo)
+
+        Returns:
+            List: (início do período, worker, rollup como dict)
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT bucket, worker, data FROM stats_rollups "
+                "WHERE granularity = ? AND bucket >= ? AND bucket < ?",
+                (granularity, start, end)
+            ).fetchall()
+        return [(bucket, worker, msgpack.unpackb(data, strict_map_key=False)) for bucket, worker, data in rows]
+
+    def purge_older_than(self, seconds: float) -> int:
+        """
+        Remove os rollups de períodos mais antigos que `seconds`.
+
+        Returns:
+            int: Quantidade de linhas removidas
+        """
+        with self._lock, self._conn:
+            cursor = self._conn.execute("DELETE FROM stats_rollups WHERE bucket < ?", (time.time() - seconds,))
+        return cursor.rowcount
+
+    def close(self) -> None:
+        """Fecha a conexão com o banco."""
+        with self._lock:
+            self._conn.close()
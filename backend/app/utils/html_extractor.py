@@ -0,0 +1,178 @@
+"""
+HTML Extractor
+==============
+Conversão de emails HTML em texto antes do pré-processamento.
+
+O HTML é lido em uma única passada (html.parser, aceita o conteúdo em
+partes): tags são descartadas, entidades decodificadas, o conteúdo de
+script/style/head e de elementos ocultos (display:none, hidden, pixels de
+rastreamento) é ignorado e quebras de parágrafo são preservadas.
+"""
+
+from html.parser import HTMLParser
+from typing import List, Optional, Tuple
+import re
+
+# Elementos cujo conteúdo nunca é texto do email
+SKIPPED_TAGS = frozenset({"script", "style", "head", "title", "noscript", "template", "svg", "object", "iframe"})
+
+# Elementos sem tag de fechamento
+VOID_TAGS = frozenset({
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr",
+})
+
+# Elementos de bloco: separados por parágrafo (\n\n) ou linha (\n)
+PARAGRAPH_TAGS = frozenset({
+    "p", "h1", "h2", "h3", "h4", "h5", "h6", "blockquote", "pre",
+    "table", "ul", "ol", "section", "article", "header", "footer", "hr",
+})
+LINE_TAGS = frozenset({"br", "div", "li", "tr", "dt", "dd", "center", "address"})
+
+# Estilos inline que escondem o elemento
+HIDDEN_STYLE_RE = re.compile(
+    r"display\s*:\s*none|visibility\s*:\s*hidden|max-height\s*:\s*0(?![.\d])|font-size\s*:\s*0(?![.\d])",
+    re.IGNORECASE
+)
+
+# Espaços, nbsp e caracteres invisíveis (zero-width) usados em preheaders
+_SPACES_RE = re.compile(r"[ \t\r\f\v\n\xa0\u200b\u200c\u200d\ufeff]+")
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+_LINE_EDGES_RE = re.compile(r"[ \t]*\n[ \t]*")
+
+# Trecho inicial inspecionado para decidir se um texto é HTML
+SNIFF_BYTES = 1024
+_HTML_SNIFF_RE = re.compile(r"<!doctype\s+html|<html[\s>]|<body[\s>]|<head[\s>]", re.IGNORECASE)
+
+
+def _is_hidden(attrs: List[Tuple[str, Optional[str]]]) -> bool:
+    """Verifica se os atributos escondem o elemento."""
+    for name, value in attrs:
+        if name == "hidden":
+            return True
+        if name == "style" and value and HIDDEN_STYLE_RE.search(value):
+            return True
+        if name == "aria-hidden" and value == "true":
+            return True
+    return False
+
+
+class HtmlTextExtractor(HTMLParser):
+    """
+    Extrator de texto incremental.
+
+    Uso:
+        extractor = HtmlTextExtractor()
+        extractor.feed(parte1); extractor.feed(parte2)
+        texto = extractor.get_text()
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self._parts: List[str] = []
+        self._skip_tag: Optional[str] = None
+        self._skip_depth = 0
+        self._pre_depth = 0
+        self._pending_break = ""
+
+    def _break(self, separator: str) -> None:
+        """Registra uma quebra (a maior pendente prevalece)."""
+        if len(separator) > len(self._pending_break):
+            self._pending_break = separator
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        if self._skip_tag is not None:
+            if tag == self._skip_tag:
+                self._skip_depth += 1
+            return
+
+        if tag not in VOID_TAGS and (tag in SKIPPED_TAGS or _is_hidden(attrs)):
+            self._skip_tag, self._skip_depth = tag, 1
+            return
+
+        if tag == "pre":
+            self._pre_depth += 1
+        if tag in PARAGRAPH_TAGS:
+            self._break("\n\n")
+        elif tag in LINE_TAGS:
+            self._break("\n")
+        if tag == "li":
+            self._emit("- ")
+
+    def handle_startendtag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        # <br/>, <img/>: sem conteúdo; apenas quebras
+        if self._skip_tag is None:
+            if tag in PARAGRAPH_TAGS:
+                self._break("\n\n")
+            elif tag in LINE_TAGS:
+                self._break("\n")
+
+    def handle_endtag(self, tag: str) -> None:
+        if self._skip_tag is not None:
+            if tag == self._skip_tag:
+                self._skip_depth -= 1
+                if self._skip_depth == 0:
+                    self._skip_tag = None
+            return
+
+        if tag == "pre" and self._pre_depth:
+            self._pre_depth -= 1
+        if tag in PARAGRAPH_TAGS:
+            self._break("\n\n")
+        elif tag in LINE_TAGS:
+            self._break("\n")
+
+    def handle_data(self, data: str) -> None:
+        if self._skip_tag is not None:
+            return
+        if not self._pre_depth:
+            data = _SPACES_RE.sub(" ", data)
+            if data == " ":
+                # Espaço entre tags: só importa no meio de uma linha
+                if self._parts and not self._pending_break and not self._parts[-1].endswith((" ", "\n")):
+                    self._parts.append(" ")
+                return
+        self._emit(data)
+
+    def _emit(self, text: str) -> None:
+        """Adiciona texto, aplicando a quebra pendente."""
+        if self._pending_break:
+            if self._parts:
+                self._parts.append(self._pending_break)
+            self._pending_break = ""
+        self._parts.append(text)
+
+    def get_text(self) -> str:
+        """
+        Finaliza a leitura e retorna o texto extraído.
+
+        Returns:
+            str: Texto com parágrafos separados por linha em branco
+        """
+        self.close()
+        text = "".join(self._parts)
+        text = _LINE_EDGES_RE.sub("\n", text)
+        text = _BLANK_LINES_RE.sub("\n\n", text)
+        return text.strip()
+
+
+def html_to_text(html: str, chunk_size: int = 64 * 1024) -> str:
+    """
+    Converte um documento HTML em texto.
+
+    Args:
+        html: Documento HTML
+        chunk_size: Tamanho das partes entregues ao parser
+
+    Returns:
+        str: Texto extraído
+    """
+    extractor = HtmlTextExtractor()
+    for start in range(0, len(html), chunk_size):
+        extractor.feed(html[start:start + chunk_size])
+    return extractor.get_text()
+
+
+def looks_like_html(text: str) -> bool:
+    """Verifica (pelo início do texto) se o conteúdo é um documento HTML."""
+    return bool(_HTML_SNIFF_RE.search(text[:SNIFF_BYTES]))
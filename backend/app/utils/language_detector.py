@@ -0,0 +1,215 @@
+"""
+Language Detector
+=================
+Identificação de idioma local por n-gramas de caracteres.
+
+Cada idioma tem um perfil de trigramas (log-probabilidades) construído uma
+única vez, na importação, a partir de um texto de referência embutido. A
+detecção pontua os trigramas do email contra cada perfil (Naive Bayes com
+suavização) e não depende de rede nem de dados do NLTK. Texto curto ou sem
+idioma claro volta como indeterminado ("und"), sem stop words nem stemming.
+Como a confiança é relativa aos idiomas conhecidos, um idioma de fora (ex.:
+holandês) ainda pode sair com confiança alta no vizinho mais próximo; por
+isso o texto também precisa ter a maior parte dos trigramas no perfil do
+idioma escolhido.
+"""
+
+from collections import Counter
+from typing import Dict, Optional, Tuple
+import math
+import re
+
+# Textos de referência: vocabulário típico de emails corporativos
+REFERENCE_TEXTS: Dict[str, str] = {
+    "pt": """
+        Olá, bom dia. Gostaria de saber qual é o status da minha solicitação, pois ainda não
+        recebi nenhuma resposta da equipe. Preciso de ajuda com o acesso ao sistema, que está
+        apresentando um erro quando tento entrar na minha conta. Segue em anexo o comprovante
+        e o relatório do mês passado. Por favor, verifiquem se o pagamento foi registrado e me
+        informem o prazo para a resolução do problema. Obrigado pela atenção e fico no aguardo
+        de um retorno. Atenciosamente, a equipe de atendimento. Não conseguimos concluir a
+        operação porque o cartão não foi aceito. Vocês podem atualizar o cadastro e enviar uma
+        nova fatura? Feliz natal e um ótimo ano novo para todos! Parabéns pelo excelente
+        trabalho, estamos muito satisfeitos com o resultado do projeto. A reunião foi
+        remarcada para amanhã às três horas da tarde, na sala de conferências. Quando vocês
+        vão liberar a nova versão da aplicação? Também precisamos de uma cópia do contrato
+        assinado e das informações sobre a cobrança. Não há urgência, mas agradeço se puderem
+        responder até sexta-feira. Estão todos convidados para a confraternização da empresa.
+    """,
+    "en": """
+        Hello, good morning. I would like to know the status of my request, because I have not
+        received any answer from the team yet. I need help with access to the system, which is
+        showing an error when I try to log in to my account. Please find attached the receipt
+        and the report from last month. Could you please check whether the payment was
+        registered and let me know the deadline for solving the problem? Thank you for your
+        attention and I look forward to hearing from you. Best regards, the support team. We
+        could not complete the operation because the card was not accepted. Can you update
+        the registration and send a new invoice? Merry Christmas and a happy new year to
+        everyone! Congratulations on the excellent work, we are very satisfied with the result
+        of the project. The meeting was rescheduled to tomorrow at three in the afternoon, in
+        the conference room. When will you release the new version of the application? We also
+        need a copy of the signed contract and the billing information. There is no rush, but
+        I would appreciate it if you could answer by Friday. Everyone is invited to the party.
+    """,
+    "es": """
+        Hola, buenos días. Me gustaría saber cuál es el estado de mi solicitud, porque todavía
+        no he recibido ninguna respuesta del equipo. Necesito ayuda con el acceso al sistema,
+        que está mostrando un error cuando intento entrar en mi cuenta. Adjunto el comprobante
+        y el informe del mes pasado. Por favor, verifiquen si el pago fue registrado y
+        infórmenme el plazo para la resolución del problema. Gracias por su atención y quedo a
+        la espera de una respuesta. Saludos cordiales, el equipo de atención. No pudimos
+        completar la operación porque la tarjeta no fue aceptada. ¿Pueden actualizar el
+        registro y enviar una nueva factura? ¡Feliz navidad y próspero año nuevo para todos!
+        Felicitaciones por el excelente trabajo, estamos muy satisfechos con el resultado del
+        proyecto. La reunión fue cambiada para mañana a las tres de la tarde, en la sala de
+        conferencias. ¿Cuándo van a publicar la nueva versión de la aplicación? También
+        necesitamos una copia del contrato firmado y la información de facturación. No hay
+        prisa, pero agradezco si pueden responder antes del viernes. Todos están invitados.
+    """,
+    "fr": """
+        Bonjour, je voudrais savoir où en est ma demande, car je n'ai encore reçu aucune
+        réponse de l'équipe. J'ai besoin d'aide pour accéder au système, qui affiche une erreur
+        quand j'essaie de me connecter à mon compte. Vous trouverez ci-joint le justificatif et
+        le rapport du mois dernier. Merci de vérifier si le paiement a bien été enregistré et
+        de m'indiquer le délai de résolution du problème. Merci pour votre attention, dans
+        l'attente de votre retour. Cordialement, l'équipe du support. Nous n'avons pas pu
+        terminer l'opération parce que la carte n'a pas été acceptée. Pouvez-vous mettre à
+        jour l'inscription et envoyer une nouvelle facture? Joyeux noël et bonne année à tous!
+        Félicitations pour cet excellent travail, nous sommes très satisfaits du résultat.
+        La réunion a été reportée à demain à trois heures de l'après-midi.
+    """,
+    "it": """
+        Buongiorno, vorrei sapere qual è lo stato della mia richiesta, perché non ho ancora
+        ricevuto nessuna risposta dal gruppo. Ho bisogno di aiuto con l'accesso al sistema, che
+        mostra un errore quando provo ad entrare nel mio account. In allegato la ricevuta e il
+        rapporto del mese scorso. Per favore, verificate se il pagamento è stato registrato e
+        comunicatemi i tempi per la risoluzione del problema. Grazie per l'attenzione, resto in
+        attesa di una risposta. Cordiali saluti, il servizio clienti. Non siamo riusciti a
+        completare l'operazione perché la carta non è stata accettata. Potete aggiornare la
+        registrazione e inviare una nuova fattura? Buon natale e felice anno nuovo a tutti!
+        Complimenti per l'ottimo lavoro, siamo molto soddisfatti del risultato del progetto.
+        La riunione è stata spostata a domani alle tre del pomeriggio.
+    """,
+    "de": """
+        Guten Morgen, ich möchte wissen, wie der Stand meiner Anfrage ist, weil ich noch keine
+        Antwort vom Team erhalten habe. Ich brauche Hilfe beim Zugang zum System, das einen
+        Fehler anzeigt, wenn ich mich in meinem Konto anmelden will. Im Anhang finden Sie den
+        Beleg und den Bericht vom letzten Monat. Bitte prüfen Sie, ob die Zahlung eingegangen
+        ist, und teilen Sie mir die Frist für die Lösung des Problems mit. Vielen Dank für Ihre
+        Aufmerksamkeit, ich freue mich auf Ihre Rückmeldung. Mit freundlichen Grüßen, das
+        Support-Team. Wir konnten den Vorgang nicht abschließen, weil die Karte nicht
+        akzeptiert wurde. Können Sie die Daten aktualisieren und eine neue Rechnung schicken?
+        Frohe Weihnachten und ein gutes neues Jahr an alle! Herzlichen Glückwunsch zu der
+        ausgezeichneten Arbeit. Das Treffen wurde auf morgen um drei Uhr verschoben.
+    """,
+}
+
+# Código do idioma indeterminado (ISO 639-2): texto curto ou ambíguo
+UNDETERMINED = "und"
+
+# Apenas letras (inclui acentuadas); números e pontuação não ajudam a separar idiomas
+_WORD_RE = re.compile(r"[^\W\d_]+")
+
+
+def _trigrams(text: str, max_chars: Optional[int] = None) -> Counter:
+    """
+    Conta os trigramas de caracteres das palavras do texto.
+
+    As palavras são unidas por dois espaços, então nenhum trigrama atravessa
+    duas palavras (além dos de borda, como " ab" e "ab ").
+
+    Args:
+        text: Texto de entrada
+        max_chars: Considera apenas os primeiros N caracteres
+
+    Returns:
+        Counter: Frequência de cada trigrama (tupla de 3 caracteres)
+    """
+    if max_chars is not None:
+        text = text[:max_chars]
+    padded = " %s " % "  ".join(_WORD_RE.findall(text.lower()))
+    return Counter(zip(padded, padded[1:], padded[2:]))
+
+
+class LanguageDetector:
+    """
+    Detector de idioma por perfis de trigramas.
+
+    Attributes:
+        min_confidence: Confiança mínima para aceitar o idioma detectado
+        min_coverage: Fração mínima dos trigramas do texto presentes no
+            perfil do idioma detectado
+        max_chars: Caracteres analisados (o início do email basta)
+    """
+
+    def __init__(
+        self,
+        min_confidence: float = 0.5,
+        min_coverage: float = 0.6,
+        max_chars: int = 500,
+        min_letters: int = 20
+    ):
+        self.min_confidence = min_confidence
+        self.min_coverage = min_coverage
+        self.max_chars = max_chars
+        self.min_letters = min_letters
+        self._profiles: Dict[str, Dict[Tuple[str, str, str], float]] = {}
+        self._unseen: Dict[str, float] = {}
+        for language, text in REFERENCE_TEXTS.items():
+            counts = _trigrams(text)
+            # Suavização de Laplace: trigramas ausentes recebem massa 1
+            total = sum(counts.values()) + len(counts) + 1
+            self._profiles[language] = {
+                gram: math.log((count + 1) / total) for gram, count in counts.items()
+            }
+            self._unseen[language] = math.log(1 / total)
+
+    def _scores(self, grams: Counter) -> Dict[str, float]:
+        """
+        Probabilidade de cada idioma para os trigramas do texto.
+
+        Returns:
+            Dict[str, float]: Idioma -> probabilidade (soma 1), vazio se não
+            houver letras suficientes
+        """
+        if sum(grams.values()) < self.min_letters:
+            return {}
+
+        log_likelihood = {}
+        for language, profile in self._profiles.items():
+            unseen = self._unseen[language]
+            log_likelihood[language] = sum(
+                profile.get(gram, unseen) * count for gram, count in grams.items()
+            )
+
+        # Softmax normalizado pela quantidade de trigramas (evita saturar em textos longos)
+        n = sum(grams.values())
+        best = max(log_likelihood.values())
+        exp = {lang: math.exp((value - best) / math.sqrt(n)) for lang, value in log_likelihood.items()}
+        total = sum(exp.values())
+        return {lang: value / total for lang, value in exp.items()}
+
+    def detect(self, text: str) -> Tuple[str, float]:
+        """
+        Detecta o idioma do texto.
+
+        Args:
+            text: Texto do email
+
+        Returns:
+            Tuple[str, float]: (código ISO 639-1, confiança). Retorna
+            UNDETERMINED quando o texto é curto demais, a confiança é baixa ou
+            o texto não se parece com o perfil do idioma (idioma não suportado).
+        """
+        grams = _trigrams(text, self.max_chars)
+        scores = self._scores(grams)
+        if not scores:
+            return UNDETERMINED, 0.0
+        language, confidence = max(scores.items(), key=lambda item: item[1])
+        if confidence < self.min_confidence:
+            return UNDETERMINED, confidence
+        profile = self._profiles[language]
+        covered = sum(count for gram, count in grams.items() if gram in profile)
+        if covered < self.min_coverage * sum(grams.values()):
+            return UNDETERMINED, confidence
+        return language, confidence
@@ -0,0 +1,262 @@
+"""
+Reply Chain Parser
+==================
+Separa a mensagem mais recente de um email do histórico citado.
+
+Remove linhas citadas com ">", cabeçalhos de resposta ("Em ... escreveu:",
+"On ... wrote:"), blocos "-----Mensagem original-----" / "Forwarded message"
+e cabeçalhos do Outlook (De:/Enviado:/Para:). Em encaminhamentos sem texto
+próprio, a mensagem encaminhada passa a ser o conteúdo principal.
+
+A análise percorre as linhas uma única vez, com verificações ancoradas de
+tamanho limitado, então o custo é linear no tamanho do email.
+"""
+
+from typing import List, Optional, Tuple
+import re
+
+# Início e fim da linha de cabeçalho de resposta (pode quebrar em duas linhas)
+REPLY_INTRO_PREFIXES = ("em ", "on ", "el ", "le ", "am ", "il ")
+REPLY_INTRO_SUFFIXES = ("escreveu:", "wrote:", "escribió:", "a écrit :", "a écrit:", "schrieb:", "ha scritto:")
+
+# Separadores de mensagem original / encaminhada
+SEPARATOR_RE = re.compile(
+    r"-{2,}\s*(?:mensagem original|original message|mensaje original|"
+    r"forwarded message|mensagem encaminhada|mensaje reenviado)\s*-{0,}$"
+    r"|(?:begin forwarded message|in[ií]cio da mensagem encaminhada):?$",
+    re.IGNORECASE
+)
+
+# Separadores de encaminhamento (a mensagem encaminhada pode ser o conteúdo principal)
+FORWARD_RE = re.compile(
+    r"-{2,}\s*(?:forwarded message|mensagem encaminhada|mensaje reenviado)"
+    r"|(?:begin forwarded message|in[ií]cio da mensagem encaminhada)",
+    re.IGNORECASE
+)
+
+# Cabeçalhos de mensagem (Outlook e encaminhamentos)
+FROM_HEADER_RE = re.compile(r"(?:de|from|von)\s*:\s", re.IGNORECASE)
+HEADER_RE = re.compile(
+    r"(?:de|from|von|para|to|an|cc|cco|bcc|assunto|subject|betreff|data|date|datum|"
+    r"enviado|enviada em|enviado em|sent|gesendet)\s*:",
+    re.IGNORECASE
+)
+
+# Linhas de cabeçalho consideradas na verificação do bloco do Outlook
+HEADER_LOOKAHEAD = 3
+
+# Tamanho mínimo (caracteres não brancos) para a mensagem própria de um encaminhamento
+MIN_OWN_TEXT = 15
+
+# Máximo de encaminhamentos sem texto próprio "abertos" em sequência
+MAX_FORWARD_DEPTH = 3
+
+
+def _dequote(line: str, depth: int) -> str:
+    """Remove até `depth` níveis de citação (">") do início da linha."""
+    for _ in range(depth):
+        stripped = line.lstrip()
+        if not stripped.startswith(">"):
+            break
+        line = stripped[1:]
+        if line.startswith(" "):
+            line = line[1:]
+    return line
+
+
+class ParsedReply:
+    """
+    Resultado da separação da cadeia de respostas.
+
+    Attributes:
+        text: Mensagem mais recente
+        quoted_summary: Início do histórico citado (vazio se não houver)
+        removed_chars: Caracteres do email original fora de `text`
+    """
+
+    def __init__(self, text: str, quoted_summary: str, removed_chars: int):
+        self.text = text
+        self.quoted_summary = quoted_summary
+        self.removed_chars = removed_chars
+
+    def with_summary(self, text: Optional[str] = None) -> str:
+        """
+        Mensagem seguida do resumo do histórico, se houver.
+
+        Args:
+            text: Texto a usar no lugar de `text` (ex.: sem assinatura)
+        """
+        text = self.text if text is None else text
+        if not self.quoted_summary:
+            return text
+        return f"{text}\n\n[Mensagem anterior citada: {self.quoted_summary}]"
+
+
+class ReplyChainParser:
+    """
+    Extrai a mensagem mais recente de emails com respostas e encaminhamentos.
+
+    Attributes:
+        summary_chars: Tamanho máximo do resumo do histórico (0 = sem resumo)
+    """
+
+    def __init__(self, summary_chars: int = 200):
+        self.summary_chars = summary_chars
+
+    def parse(self, text: str) -> ParsedReply:
+        """
+        Separa a mensagem mais recente do histórico citado.
+
+        Args:
+            text: Email completo
+
+        Returns:
+            ParsedReply: Mensagem, resumo do histórico e caracteres removidos
+        """
+        if not text:
+            return ParsedReply("", "", 0)
+
+        lines = text.splitlines()
+        start, depth = 0, 0
+        while True:
+            kept, quoted_start, boundary = self._scan(lines, start, depth)
+            own_text = sum(len(line.strip()) for line in kept)
+            # Encaminhamento sem texto próprio: abrir a mensagem encaminhada
+            if (
+                boundary is not None
+                and own_text < MIN_OWN_TEXT
+                and depth < MAX_FORWARD_DEPTH
+                and FORWARD_RE.match(_dequote(lines[boundary], depth).strip())
+            ):
+                start = self._skip_headers(lines, boundary, depth)
+                depth = self._quote_depth(lines, start, depth)
+                continue
+            break
+
+        main = "\n".join(kept).strip()
+        summary = ""
+        if quoted_start is not None and self.summary_chars > 0:
+            summary = self._summarize(lines, quoted_start, boundary, depth)
+
+        removed = max(0, len(text) - len(main))
+        return ParsedReply(main, summary, removed)
+
+    def _scan(self, lines: List[str], start: int, depth: int) -> Tuple[List[str], Optional[int], Optional[int]]:
+        """
+        Percorre as linhas a partir de `start` até o primeiro cabeçalho de
+        mensagem anterior.
+
+        Returns:
+            Tuple: (linhas mantidas, início do histórico citado,
+            índice do cabeçalho que encerrou a mensagem ou None)
+        """
+        kept: List[str] = []
+        quoted_start: Optional[int] = None
+        total = len(lines)
+        for index in range(start, total):
+            line = _dequote(lines[index], depth)
+            stripped = line.strip()
+
+            boundary = self._boundary_at(lines, index, depth, stripped, kept)
+            if boundary is not None:
+                if boundary < index and kept:
+                    kept.pop()  # Cabeçalho "Em ... escreveu:" quebrado em duas linhas
+                return kept, boundary if quoted_start is None else quoted_start, boundary
+
+            if stripped.startswith(">"):
+                if quoted_start is None:
+                    quoted_start = index
+                continue
+            kept.append(line)
+        return kept, quoted_start, None
+
+    def _boundary_at(
+        self,
+        lines: List[str],
+        index: int,
+        depth: int,
+        stripped: str,
+        kept: List[str]
+    ) -> Optional[int]:
+        """
+        Verifica se a linha inicia uma mensagem anterior.
+
+        Returns:
+            Optional[int]: Índice da primeira linha do cabeçalho, ou None
+        """
+        if not stripped:
+            return None
+        lowered = stripped.lower()
+
+        if lowered.endswith(REPLY_INTRO_SUFFIXES):
+            if lowered.startswith(REPLY_INTRO_PREFIXES):
+                return index
+            previous = kept[-1].strip().lower() if kept else ""
+            if previous.startswith(REPLY_INTRO_PREFIXES):
+                return index - 1
+
+        if SEPARATOR_RE.match(stripped):
+            return index
+
+        # Linha de sublinhados do Outlook seguida de "De:"
+        if len(stripped) >= 10 and stripped.strip("_") == "" and index + 1 < len(lines):
+            if FROM_HEADER_RE.match(_dequote(lines[index + 1], depth).strip()):
+                return index
+
+        # Bloco de cabeçalho "De: ... / Enviado: ... / Para: ..."
+        if FROM_HEADER_RE.match(stripped):
+            end = min(len(lines), index + 1 + HEADER_LOOKAHEAD)
+            for following in range(index + 1, end):
+                if HEADER_RE.match(_dequote(lines[following], depth).strip()):
+                    return index
+        return None
+
+    @staticmethod
+    def _skip_headers(lines: List[str], index: int, depth: int) -> int:
+        """Avança sobre separador, linhas de cabeçalho e linhas em branco."""
+        index += 1
+        while index < len(lines):
+            stripped = _dequote(lines[index], depth).strip().lstrip(">").strip()
+            if stripped and not HEADER_RE.match(stripped) and not SEPARATOR_RE.match(stripped):
+                break
+            index += 1
+        return index
+
+    @staticmethod
+    def _quote_depth(lines: List[str], index: int, depth: int) -> int:
+        """Nível de citação da mensagem encaminhada (pela primeira linha)."""
+        if index < len(lines) and _dequote(lines[index], depth).lstrip().startswith(">"):
+            return depth + 1
+        return depth
+
+    def _summarize(self, lines: List[str], start: int, boundary: Optional[int], depth: int) -> str:
+        """
+        Primeiros caracteres do histórico citado, sem cabeçalhos e marcas de
+        citação. Antes do cabeçalho (respostas intercaladas) só entram as
+        linhas citadas; depois dele, todas.
+        """
+        parts: List[str] = []
+        length = 0
+        for index in range(start, len(lines)):
+            if index == boundary:
+                continue
+            stripped = _dequote(lines[index], depth).strip()
+            if (boundary is None or index < boundary) and not stripped.startswith(">"):
+                continue
+            stripped = stripped.lstrip("> ").strip()
+            if (
+                not stripped
+                or HEADER_RE.match(stripped)
+                or SEPARATOR_RE.match(stripped)
+                or stripped.lower().endswith(REPLY_INTRO_SUFFIXES)
+                or stripped.strip("_-") == ""
+            ):
+                continue
+            parts.append(stripped)
+            length += len(stripped) + 1
+            if length >= self.summary_chars:
+                break
+        summary = " ".join(parts)
+        if len(summary) > self.summary_chars:
+            summary = summary[:self.summary_chars].rsplit(" ", 1)[0] + "..."
+        return summary
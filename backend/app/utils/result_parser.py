@@ -0,0 +1,260 @@
+"""
+Classification Result Parser
+============================
+Interpreta o JSON de classificação retornado pelo LLM.
+
+O caminho rápido é um único `orjson.loads` (o normal com o formato JSON do
+provedor). Se falhar, corrige os defeitos comuns sem nova chamada ao LLM:
+
+    - texto antes/depois do objeto (inclusive blocos ```json)
+    - strings com aspas simples
+    - confiança com vírgula decimal ("0,95" ou 0,95)
+    - categoria em minúsculas ou com espaços
+
+Cada defeito corrigido é contabilizado, assim como as falhas, para expor as
+taxas de falha e de recuperação em GET /api/metrics.
+"""
+
+from typing import Any, Dict, List
+import re
+import threading
+
+import orjson
+
+# Categorias aceitas (após normalização)
+CATEGORIES = ("PRODUTIVO", "IMPRODUTIVO")
+
+# Campos obrigatórios do resultado
+REQUIRED_KEYS = ("categoria", "confianca", "justificativa")
+
+# Confiança com vírgula decimal fora de string: "confianca": 0,95
+DECIMAL_COMMA_RE = re.compile(r'("confian[cç]a"\s*:\s*-?\d+),(\d+)')
+
+# Defeitos recuperáveis (chaves das métricas)
+DEFECTS = ("extra_text", "single_quotes", "decimal_comma", "numeric_string", "category_case")
+
+
+class ResultParseError(ValueError):
+    """A resposta do LLM não contém uma classificação válida."""
+
+
+def _closes_single_quote(text: str, index: int) -> bool:
+    """
+    Verifica se a aspa simples em `index` fecha a string: apóstrofos
+    (ex.: "d'água") são seguidos de texto, não de separador JSON.
+    """
+    rest = text[index + 1:index + 40].lstrip()
+    return not rest or rest[0] in ",:}]"
+
+
+def _extract_object(text: str) -> str:
+    """
+    Recorta o primeiro objeto JSON do texto, acompanhando strings (aspas
+    simples ou duplas) para não parar em chaves dentro de valores.
+
+    Raises:
+        ResultParseError: Se não há um objeto completo
+    """
+    start = text.find("{")
+    if start == -1:
+        raise ResultParseError("Resposta sem objeto JSON")
+
+    depth = 0
+    quote = None
+    escaped = False
+    for index in range(start, len(text)):
+        char = text[index]
+        if quote:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == quote and (quote == '"' or _closes_single_quote(text, index)):
+                quote = None
+        elif char == '"' or char == "'":
+            # Apóstrofo no meio de palavra não abre string (ex.: d'água)
+            if char == '"' or not text[index - 1].isalnum():
+                quote = char
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start:index + 1]
+
+    raise ResultParseError("Objeto JSON incompleto")
+
+
+def _single_to_double_quotes(text: str) -> str:
+    """
+    Converte strings com aspas simples em strings JSON, preservando as
+    strings que já usam aspas duplas (e os apóstrofos dentro delas).
+    """
+    out: List[str] = []
+    quote = None
+    escaped = False
+    for index, char in enumerate(text):
+        if quote is None:
+            if char == "'" and not text[index - 1].isalnum():
+                quote = "'"
+                out.append('"')
+                continue
+            if char == '"':
+                quote = '"'
+        elif escaped:
+            escaped = False
+            if quote == "'" and char == "'":
+                # \' não é um escape válido em JSON
+                out[-1] = "'"
+                continue
+        elif char == "\\":
+            escaped = True
+        elif char == quote and (quote == '"' or _closes_single_quote(text, index)):
+            quote = None
+            if char == "'":
+                out.append('"')
+                continue
+        elif quote == "'" and char == '"':
+            out.append('\\"')
+            continue
+        out.append(char)
+    return "".join(out)
+
+
+class ClassificationResultParser:
+    """
+    Parser tolerante do resultado de classificação, com métricas.
+
+    Attributes:
+        stats: Contadores de respostas limpas, recuperadas, falhas e defeitos
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {}
+        self.reset()
+
+    def parse(self, text: str) -> Dict[str, Any]:
+        """
+        Interpreta a resposta do LLM.
+
+        Args:
+            text: Conteúdo retornado pelo LLM
+
+        Returns:
+            Dict: Resultado com categoria (maiúsculas), confiança (float) e
+            justificativa; demais campos são preservados, e "resposta" só
+            se for texto
+
+        Raises:
+            ResultParseError: Se a resposta não pode ser recuperada
+        """
+        defects: List[str] = []
+        try:
+            try:
+                result = orjson.loads(text)
+            except orjson.JSONDecodeError:
+                result = self._recover(text, defects)
+            self._normalize(result, defects)
+        except ResultParseError:
+            self._record("failed", defects)
+            raise
+        self._record("recovered" if defects else "clean", defects)
+        return result
+
+    def _recover(self, text: str, defects: List[str]) -> Any:
+        """Corrige os defeitos de sintaxe e tenta de novo."""
+        candidate = _extract_object(text)
+        if len(candidate) != len(text.strip()):
+            defects.append("extra_text")
+
+        if "'" in candidate:
+            converted = _single_to_double_quotes(candidate)
+            if converted != candidate:
+                defects.append("single_quotes")
+                candidate = converted
+
+        converted = DECIMAL_COMMA_RE.sub(r"\1.\2", candidate)
+        if converted != candidate:
+            defects.append("decimal_comma")
+            candidate = converted
+
+        try:
+            return orjson.loads(candidate)
+        except orjson.JSONDecodeError as e:
+            raise ResultParseError(f"JSON inválido: {e}") from e
+
+    @staticmethod
+    def _normalize(result: Any, defects: List[str]) -> None:
+        """Valida os campos e normaliza categoria, confiança e resposta."""
+        if not isinstance(result, dict):
+            raise ResultParseError("Resposta da IA não é um objeto JSON")
+        if "confiança" in result and "confianca" not in result:
+            result["confianca"] = result.pop("confiança")
+        missing = [key for key in REQUIRED_KEYS if key not in result]
+        if missing:
+            raise ResultParseError(f"Campos ausentes: {', '.join(missing)}")
+
+        categoria = result["categoria"]
+        if not isinstance(categoria, str):
+            raise ResultParseError("Categoria inválida")
+        normalized = categoria.strip().upper()
+        if normalized not in CATEGORIES:
+            raise ResultParseError(f"Categoria inválida: {categoria[:30]}")
+        if normalized != categoria:
+            defects.append("category_case")
+            result["categoria"] = normalized
+
+        confianca = result["confianca"]
+        if isinstance(confianca, str):
+            value = confianca.strip()
+            if "," in value:
+                defects.append("decimal_comma")
+                value = value.replace(",", ".")
+            else:
+                defects.append("numeric_string")
+            try:
+                confianca = float(value)
+            except ValueError:
+                raise ResultParseError(f"Confiança inválida: {result['confianca'][:30]}") from None
+        elif isinstance(confianca, bool) or not isinstance(confianca, (int, float)):
+            raise ResultParseError("Confiança inválida")
+        if not 0 <= confianca <= 1:
+            raise ResultParseError(f"Confiança fora do intervalo: {confianca}")
+        result["confianca"] = float(confianca)
+
+        # Resposta do modo combinado: outro tipo (número, lista...) é descartado e vale a resposta padrão
+        if "resposta" in result and not isinstance(result["resposta"], str):
+            del result["resposta"]
+
+    def _record(self, outcome: str, defects: List[str]) -> None:
+        with self._lock:
+            self.stats["total"] += 1
+            self.stats[outcome] += 1
+            for defect in defects:
+                self.stats[defect] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Taxas de falha e de recuperação, e contagem por defeito.
+
+        Returns:
+            Dict[str, Any]: Estatísticas para GET /api/metrics
+        """
+        with self._lock:
+            stats = dict(self.stats)
+        total = stats["total"]
+        return {
+            "total": total,
+            "clean": stats["clean"],
+            "recovered": stats["recovered"],
+            "failed": stats["failed"],
+            "failure_rate": round(stats["failed"] / total, 4) if total else 0.0,
+            "recovery_rate": round(stats["recovered"] / total, 4) if total else 0.0,
+            "defects": {defect: stats[defect] for defect in DEFECTS},
+        }
+
+    def reset(self) -> None:
+        """Zera os contadores."""
+        with self._lock:
+            self.stats = dict.fromkeys(("total", "clean", "recovered", "failed") + DEFECTS, 0)
@@ -2,30 +2,144 @@
 Text Cleaner Utility with NLP
 ==============================
 Utilitário para limpeza e normalização de texto de emails com NLP.
-Inclui: remoção de stop words, stemming e tokenização.
+Inclui: detecção de idioma, remoção de stop words, stemming e tokenização.
+
+A tokenização é local (regex, ver utils/tokenizer.py) e já descarta as stop
+words na mesma passada; do NLTK vêm apenas as stop words e os stemmers.
+
+Os recursos de cada idioma (stop words e stemmer) são carregados sob demanda
+no primeiro uso e compartilhados entre requisições e instâncias.
 """
 
 import re
 import logging
-from typing import List
+import threading
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple
+
+from backend.app.core.config import settings
+from backend.app.core.tracing import span
+from backend.app.utils.language_detector import LanguageDetector
+from backend.app.utils.tokenizer import tokenize
 
 # Configurar logger
 logger = logging.getLogger(__name__)
 
 # Não baixar aqui - já foi baixado no api/index.py
 from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
-from nltk.stem import RSLPStemmer
+from nltk.stem import RSLPStemmer, SnowballStemmer
+
+# Nome NLTK de cada idioma reconhecido pelo detector (lista de stop words)
+NLTK_LANGUAGE_NAMES: Dict[str, str] = {
+    "pt": "portuguese",
+    "en": "english",
+    "es": "spanish",
+    "fr": "french",
+    "it": "italian",
+    "de": "german",
+}
+
+# Idiomas com stop words e stemming; os demais (e o indeterminado) são apenas tokenizados
+STEMMER_FACTORIES: Dict[str, Callable[[], object]] = {
+    "pt": RSLPStemmer,
+    "en": lambda: SnowballStemmer("english"),
+    "es": lambda: SnowballStemmer("spanish"),
+    "fr": lambda: SnowballStemmer("french"),
+    "it": lambda: SnowballStemmer("italian"),
+    "de": lambda: SnowballStemmer("german"),
+}
+
+
+class LanguageResources:
+    """
+    Recursos de NLP de um idioma.
+    
+    Attributes:
+        language: Código do idioma (ISO 639-1)
+        nltk_name: Nome do idioma no NLTK (stop words)
+        stop_words: Stop words (vazio se o idioma não é suportado)
+        stemmer: Stemmer, ou None para pular o stemming
+    """
+    
+    def __init__(self, language: str):
+        self.language = language
+        self.nltk_name = NLTK_LANGUAGE_NAMES.get(language, "english")
+        factory = STEMMER_FACTORIES.get(language)
+        self.stop_words: FrozenSet[str] = self._load_stop_words() if factory else frozenset()
+        self.stemmer = factory() if factory else None
+    
+    def _load_stop_words(self) -> FrozenSet[str]:
+        """Stop words do NLTK; sem a lista do idioma instalada, segue sem remoção."""
+        try:
+            return frozenset(stopwords.words(self.nltk_name))
+        except (LookupError, OSError):
+            logger.warning("Stop words do NLTK não encontradas para %s; seguindo sem remoção", self.nltk_name)
+            return frozenset()
+
+
+_resources: Dict[str, LanguageResources] = {}
+_resources_lock = threading.Lock()
+_detector = LanguageDetector()
+
+
+def get_language_resources(language: str) -> LanguageResources:
+    """
+    Retorna os recursos do idioma, carregando-os no primeiro uso.
+    
+    Args:
+        language: Código do idioma (ISO 639-1)
+        
+    Returns:
+        LanguageResources: Recursos compartilhados do idioma
+    """
+    resources = _resources.get(language)
+    if resources is None:
+        with _resources_lock:
+            resources = _resources.get(language)
+            if resources is None:
+                resources = _resources[language] = LanguageResources(language)
+                logger.info(
+                    "Recursos NLP carregados: %s (stemming %s)",
+                    language,
+                    "ativo" if resources.stemmer else "desativado"
+                )
+    return resources
 
 
 class TextCleaner:
     """Classe responsável por limpar e normalizar texto de emails com NLP."""
     
-    def __init__(self):
-        """Inicializa o TextCleaner com recursos de NLP."""
-        self.stop_words = set(stopwords.words('portuguese'))
-        self.stemmer = RSLPStemmer()
-        logger.info("TextCleaner inicializado com NLP (português)")
+    def __init__(self, default_language: str = settings.NLP_DEFAULT_LANGUAGE):
+        """
+        Inicializa o TextCleaner.
+        
+        Args:
+            default_language: Idioma usado quando nenhum é informado
+        """
+        self.default_language = default_language
+        logger.info("TextCleaner inicializado com NLP (padrão: %s)", default_language)
+    
+    @property
+    def stop_words(self) -> FrozenSet[str]:
+        """Stop words do idioma padrão."""
+        return get_language_resources(self.default_language).stop_words
+    
+    @property
+    def stemmer(self):
+        """Stemmer do idioma padrão."""
+        return get_language_resources(self.default_language).stemmer
+    
+    def detect_language(self, text: str) -> Tuple[str, float]:
+        """
+        Detecta o idioma do texto (n-gramas de caracteres).
+        
+        Returns:
+            Tuple[str, float]: (código do idioma, confiança); "und" para texto
+            curto ou ambíguo. Com a detecção desativada
+            (NLP_LANGUAGE_DETECTION=false), retorna o idioma padrão.
+        """
+        if not settings.NLP_LANGUAGE_DETECTION:
+            return self.default_language, 1.0
+        return _detector.detect(text)
     
     def clean(self, text: str) -> str:
         """Limpa e normaliza o texto do email."""
@@ -39,54 +153,66 @@ class TextCleaner:
         text = re.sub(r'([.,!?;:])\s+', r'\1 ', text)
         text = text.strip()
         
-        logger.info(f"Texto limpo: {len(text)} caracteres")
+        logger.debug("Texto limpo: %d caracteres", len(text))
         return text
     
     def tokenize(self, text: str) -> List[str]:
-        """Tokeniza o texto em palavras individuais."""
-        try:
-            tokens = word_tokenize(text.lower(), language='portuguese')
-            logger.info(f"Tokenização: {len(tokens)} tokens")
-            return tokens
-        except Exception as e:
-            logger.warning(f"Erro na tokenização: {e}")
-            return text.lower().split()
+        """Tokeniza o texto em palavras (minúsculas, sem pontuação)."""
+        tokens = tokenize(text)
+        logger.debug("Tokenização: %d tokens", len(tokens))
+        return tokens
     
-    def remove_stopwords(self, tokens: List[str]) -> List[str]:
+    def tokenize_without_stopwords(self, text: str, language: Optional[str] = None) -> List[str]:
+        """Tokeniza o texto e remove as stop words na mesma passada."""
+        stop_words = get_language_resources(language or self.default_language).stop_words
+        tokens = tokenize(text, stop_words)
+        logger.debug("Tokenização sem stop words: %d tokens", len(tokens))
+        return tokens
+    
+    def remove_stopwords(self, tokens: List[str], language: Optional[str] = None) -> List[str]:
         """Remove stop words dos tokens."""
+        stop_words = get_language_resources(language or self.default_language).stop_words
         filtered_tokens = [
             token for token in tokens 
-            if token.isalnum() and token not in self.stop_words
+            if token.isalnum() and token not in stop_words
         ]
         removed_count = len(tokens) - len(filtered_tokens)
-        logger.info(f"Stop words removidas: {removed_count}")
+        logger.debug("Stop words removidas: %d", removed_count)
         return filtered_tokens
     
-    def stem_tokens(self, tokens: List[str]) -> List[str]:
-        """Aplica stemming nos tokens."""
-        stemmed = [self.stemmer.stem(token) for token in tokens]
-        logger.info(f"Stemming aplicado: {len(stemmed)} tokens")
+    def stem_tokens(self, tokens: List[str], language: Optional[str] = None) -> List[str]:
+        """Aplica stemming nos tokens (idiomas sem stemmer retornam os tokens)."""
+        stemmer = get_language_resources(language or self.default_language).stemmer
+        if stemmer is None:
+            return tokens
+        stemmed = [stemmer.stem(token) for token in tokens]
+        logger.debug("Stemming aplicado: %d tokens", len(stemmed))
         return stemmed
     
-    def apply_nlp_preprocessing(self, text: str) -> str:
+    def apply_nlp_preprocessing(self, text: str, language: Optional[str] = None) -> str:
         """
         Aplica pipeline completo de NLP:
         1. Limpeza básica
-        2. Tokenização
-        3. Remoção de stop words
-        4. Stemming
-        5. Reconstrução do texto
+        2. Tokenização com remoção de stop words (uma passada)
+        3. Stemming (apenas idiomas suportados)
+        4. Reconstrução do texto
+        
+        Args:
+            text: Texto do email
+            language: Idioma do texto (padrão: default_language)
         """
         if not text:
             return ""
         
-        logger.info("Iniciando processamento NLP...")
-        cleaned = self.clean(text)
-        tokens = self.tokenize(cleaned)
-        tokens = self.remove_stopwords(tokens)
-        tokens = self.stem_tokens(tokens)
+        logger.debug("Iniciando processamento NLP...")
+        with span("nlp.clean"):
+            cleaned = self.clean(text)
+        with span("nlp.tokenize"):
+            tokens = self.tokenize_without_stopwords(cleaned, language)
+        with span("nlp.stem"):
+            tokens = self.stem_tokens(tokens, language)
         processed_text = ' '.join(tokens)
-        logger.info(f"NLP completo: {len(processed_text)} caracteres finais")
+        logger.debug("NLP completo: %d caracteres finais", len(processed_text))
         return processed_text
     
     def extract_main_content(self, text: str) -> str:
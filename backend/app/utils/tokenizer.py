@@ -0,0 +1,76 @@
+"""
+Word Tokenizer
+==============
+Tokenizador de palavras do pipeline de NLP em uma única passada de regex.
+
+Produz o mesmo que `word_tokenize` do NLTK seguido do filtro de
+alfanuméricos e stop words, sem a segmentação de sentenças do Punkt (e sem
+os dados punkt), sem a cascata de regex do Treebank e sem a lista de tokens
+de pontuação: saem só palavras (letras com acento e dígitos), em
+minúsculas e já sem stop words.
+
+Uma sequência de letras e dígitos só vira palavra quando o NLTK também a
+separaria dos vizinhos. Palavras coladas a outras por hífen, barra, ponto
+interno, apóstrofo etc. ("e-mail", "e/ou", "1.500,00") formavam um único
+token não alfanumérico, descartado pelo filtro, e continuam descartadas.
+
+Diferenças conhecidas, raras em emails:
+    - abreviações do modelo Punkt treinado ("sr.", "dra.") viram palavras;
+      o NLTK as mantinha com o ponto e elas eram descartadas
+    - contrações do inglês como "cannot" e "gonna" não são divididas
+    - sequências artificiais de pontuação colada ("ab.]n't", "“@,,ab")
+"""
+
+from typing import AbstractSet, List
+import re
+
+# Pontuação que o NLTK sempre separa das palavras
+_SPLIT = r"""\s!?;@#$%&*()\[\]{}<>"`“”‘’«»"""
+
+# Fronteira que separa a palavra do que vem depois (sem contar o ponto):
+# pontuação sempre separada, espaço, fim do texto, reticências, travessão
+# ("--"), aspas em dois apóstrofos ('') e "," ou ":" antes de algo que não
+# é dígito ("1,5" e "10:30" ficam colados)
+_BREAK = rf"[{_SPLIT}]|$|\.\.|--|''|[,:](?!\d)"
+
+# Ponto que o Punkt trata como fim de sentença (e o Treebank separa): seguido
+# de espaço, do fim do texto ou de pontuação de fechamento
+_PERIOD = r"\.(?:\s|$|[)\";}\]*:@'({\[]|[?!](?!\s|$))"
+
+# Ponto no fim do texto (separado mesmo depois de números e iniciais)
+_FINAL_PERIOD = r"\.[\])}>\"']*\s*$"
+
+# Apóstrofo final ("ab' "), apóstrofo antes de um caractere isolado ("ab'x")
+# e sufixos do inglês que o Treebank separa ("'s", "n't")
+_SUFFIX = rf"(?:'(?:[smd]|ll|re|ve)?|n't)(?:{_BREAK}|{_PERIOD}|{_FINAL_PERIOD})|'(?![mtsdn])\w\b"
+
+# Início de palavra: depois de separador, de "," ou ":" (exceto antes de
+# dígito; em sequências como ",," o Treebank só separa as de tamanho
+# ímpar), de reticências, de pares de hífen ("--" é separado, "-" cola) ou
+# de apóstrofo antes de um caractere isolado ("'x")
+_START = rf"(?<![^{_SPLIT}])|(?<![,:])(?:[,:]{{2}})*[,:](?!\d)|(?<=\.\.)|(?<='')|(?<!-)(?:--)+|(?<=')(?![mtsdn])(?=\w\b)"
+
+# Palavra: sequência de letras e dígitos Unicode (str.isalnum) com bordas
+# válidas. Números e letras isoladas ("1.", "a.") seguidos de ponto não
+# fecham sentença no Punkt: o ponto só os separa no fim do texto. O
+# lookahead inicial descarta rápido as posições onde nenhuma palavra começa.
+WORD_PATTERN = re.compile(
+    rf"(?=[\w,:-])(?:{_START})("
+    rf"(?:\d+|[^\W\d_])(?=(?:{_BREAK}|{_FINAL_PERIOD}|{_SUFFIX}))"
+    rf"|(?!\d+(?![^\W_]))(?![^\W\d_](?![^\W_]))[^\W_]+(?=(?:{_BREAK}|{_PERIOD}|{_FINAL_PERIOD}|{_SUFFIX}))"
+    r")"
+)
+
+
+def tokenize(text: str, stop_words: AbstractSet[str] = frozenset()) -> List[str]:
+    """
+    Extrai as palavras do texto, em minúsculas e sem stop words.
+
+    Args:
+        text: Texto (já limpo)
+        stop_words: Palavras descartadas (em minúsculas)
+
+    Returns:
+        List[str]: Palavras na ordem do texto
+    """
+    return [word for word in WORD_PATTERN.findall(text.lower()) if word not in stop_words]
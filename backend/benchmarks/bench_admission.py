@@ -0,0 +1,122 @@
+"""
+Admission Control Benchmark
+===========================
+Rajada de requisições em POST /api/classify-text contra um upstream com
+capacidade limitada (servidor Groq falso em processo, com no máximo
+--upstream chamadas simultâneas), com e sem controle de admissão:
+
+    - sucessos dentro do timeout do cliente (goodput) e latência deles
+    - recusas rápidas (429/503) e tempo até a recusa
+    - falhas lentas: timeout do cliente ou prazo da requisição esgotado
+
+USO (a partir da raiz do repositório):
+    python -m backend.benchmarks.bench_admission [--requests 400] [--upstream 8]
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+
+import httpx
+
+from backend.app.api import routes
+from backend.app.core.admission import AdmissionController, AdmissionPool
+from backend.app.core.config import settings
+from backend.benchmarks.bench_pipeline_modes import fake_client
+from backend.benchmarks.corpus import generate_corpus
+
+
+def limit_upstream(client, capacity: int) -> None:
+    """Upstream com no máximo `capacity` chamadas simultâneas (as demais esperam)."""
+    create = client.chat.completions.create
+    semaphore = asyncio.Semaphore(capacity)
+
+    async def limited(*args, **kwargs):
+        async with semaphore:
+            return await create(*args, **kwargs)
+
+    client.chat.completions.create = limited
+
+
+async def burst(app, texts: list, spread: float, client_timeout: float) -> list:
+    """
+    Dispara as requisições espalhadas em `spread` segundos.
+
+    Returns:
+        list: (desfecho, segundos) por requisição
+    """
+    async def one(client: httpx.AsyncClient, text: str, delay: float):
+        await asyncio.sleep(delay)
+        start = time.perf_counter()
+        try:
+            response = await asyncio.wait_for(client.post("/api/classify-text", json={"email_text": text}), client_timeout)
+        except asyncio.TimeoutError:
+            return "timeout do cliente", time.perf_counter() - start
+        elapsed = time.perf_counter() - start
+        if response.status_code in (429, 503):
+            return f"recusa {response.status_code}", elapsed
+        if response.status_code == 200 and response.json().get("success"):
+            return "sucesso", elapsed
+        return "falha (prazo)", elapsed
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        return await asyncio.gather(*(
+            one(client, text, index * spread / len(texts)) for index, text in enumerate(texts)
+        ))
+
+
+def summarize(label: str, outcomes: list, wall: float) -> None:
+    groups = {}
+    for outcome, elapsed in outcomes:
+        groups.setdefault(outcome, []).append(elapsed)
+    successes = groups.get("sucesso", [])
+    print(f"\n{label} ({wall:.1f}s de parede)")
+    print(f"{'desfecho':<22} {'qtd':>6} {'p50 (s)':>9} {'p95 (s)':>9}")
+    print("-" * 49)
+    for outcome in sorted(groups):
+        times = sorted(groups[outcome])
+        print(f"{outcome:<22} {len(times):>6} {statistics.median(times):>9.2f} "
+              f"{times[int(0.95 * (len(times) - 1))]:>9.2f}")
+    print(f"goodput: {len(successes) / wall:.1f} classificações/s")
+
+
+async def run(args) -> None:
+    from backend.app.main import app
+
+    texts = generate_corpus(args.requests, args.seed)
+    settings.ADMISSION_MAX_IN_FLIGHT = args.in_flight
+    for enabled in (False, True):
+        routes.classifier.client = fake_client(args.latency, args.seed)
+        limit_upstream(routes.classifier.client, args.upstream)
+        routes.admission = AdmissionController()
+        routes.admission.enabled = enabled
+        start = time.perf_counter()
+        outcomes = await burst(app, texts, args.spread, args.client_timeout)
+        wall = time.perf_counter() - start
+        label = "com controle de admissão" if enabled else "sem controle de admissão"
+        if enabled:
+            pool: AdmissionPool = routes.admission.pools["text"]
+            label += f" (vagas {pool.max_in_flight}, fila {pool.max_queue}, espera {pool.max_wait:.0f}s)"
+        summarize(label, outcomes, wall)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rajada com e sem controle de admissão")
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--spread", type=float, default=2.0, help="segundos em que a rajada chega")
+    parser.add_argument("--upstream", type=int, default=8, help="chamadas simultâneas suportadas pelo upstream")
+    parser.add_argument("--in-flight", type=int, default=8, help="ADMISSION_MAX_IN_FLIGHT do teste")
+    parser.add_argument("--latency", default="lognormal:400:0.3", help="latência do Groq falso")
+    parser.add_argument("--client-timeout", type=float, default=10.0)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
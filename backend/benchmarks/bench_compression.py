@@ -0,0 +1,154 @@
+"""
+HTTP Compression Benchmark
+==========================
+Mede a banda economizada pela compressão contra o custo de CPU, por
+payload típico da API e por codificação/nível:
+
+    - resultado de uma classificação (/classify-text)
+    - status de um job em lote com N resultados (/jobs/{id})
+    - texto extraído de PDF (corpo de requisição comprimido)
+    - página da exportação NDJSON do histórico (streaming)
+
+Para cada combinação: tamanho comprimido, economia, tempo de compressão e
+de descompressão (limitada, como no middleware) e a vazão de compressão.
+A última seção compara a descompressão limitada com a direta.
+
+USO (a partir da raiz do repositório):
+    python -m backend.benchmarks.bench_compression [--batch 500] [--repeat 20]
+"""
+
+import argparse
+import gzip
+import random
+import statistics
+import time
+import zlib
+
+import brotli
+import orjson
+
+from backend.app.api.compression import decompress
+from backend.app.core.config import settings
+
+# Codificações e níveis comparados (o padrão configurado aparece marcado)
+CODECS = (
+    ("gzip", 1), ("gzip", 6), ("gzip", 9),
+    ("br", 1), ("br", 4), ("br", 6), ("br", 11),
+)
+
+WORDS = (
+    "contrato prazo pagamento fatura cliente solicitação suporte sistema acesso relatório "
+    "reunião proposta equipe atualização chamado pendente aprovação documento anexo valor "
+    "empresa departamento financeiro processo análise resultado projeto entrega versão"
+).split()
+
+
+def classification(rng: random.Random) -> dict:
+    """Resultado de classificação (mesmo formato de ClassificationResponse)."""
+    return {
+        "success": True,
+        "classification": "PRODUTIVO" if rng.random() < 0.6 else "IMPRODUTIVO",
+        "confidence": round(rng.uniform(0.5, 1.0), 2),
+        "justification": "Email solicita atualização sobre requisição em andamento no sistema",
+        "suggested_response": "Prezado(a),\n\nRecebemos sua solicitação referente ao chamado "
+                              f"#{rng.randint(1000, 9999)} e nossa equipe já está analisando o caso. "
+                              "Retornaremos com uma atualização em até 2 dias úteis.\n\n"
+                              "Atenciosamente,\nEquipe de Atendimento",
+        "language": "pt",
+        "mode": "two_call",
+        "models": {"classify": "llama-3.1-8b-instant", "response": "llama-3.1-8b-instant"},
+        "prompt_version": "classification-c9b47205+response-6ac87e9c",
+        "processing_time_ms": rng.randint(400, 2500),
+        "timings": {"nlp": 3.2, "llm.classify": 610.4, "llm.response": 820.1, "total": 1434.9},
+    }
+
+
+def pdf_text(rng: random.Random, paragraphs: int = 60) -> str:
+    """Texto corrido como o extraído de um PDF (parágrafos com vocabulário de negócio)."""
+    return "\n\n".join(
+        " ".join(rng.choice(WORDS) for _ in range(rng.randint(40, 90))).capitalize() + "."
+        for _ in range(paragraphs)
+    )
+
+
+def payloads(rng: random.Random, batch: int) -> list:
+    job = {
+        "job_id": "a096ee125e1943f1b9726d0db4674639", "status": "completed",
+        "total": batch, "completed": batch, "failed": 0,
+        "items": [{"index": i, "status": "completed", "result": classification(rng)} for i in range(batch)],
+    }
+    export_page = b"".join(orjson.dumps({"id": i, **classification(rng)}) + b"\n" for i in range(1000))
+    return [
+        ("classificação", orjson.dumps(classification(rng))),
+        (f"job ({batch} itens)", orjson.dumps(job)),
+        ("texto de PDF", orjson.dumps({"email_text": pdf_text(rng)})),
+        ("NDJSON (1000 linhas)", export_page),
+    ]
+
+
+def compress(data: bytes, encoding: str, level: int) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=level)
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def timed(func, repeat: int) -> float:
+    """Mediana do tempo (µs)."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compressão HTTP: banda economizada x custo de CPU")
+    parser.add_argument("--batch", type=int, default=500, help="itens do job em lote")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    limit = settings.COMPRESSION_MAX_DECOMPRESSED_BYTES
+    defaults = {("gzip", settings.COMPRESSION_GZIP_LEVEL), ("br", settings.COMPRESSION_BROTLI_QUALITY)}
+    print(f"Padrão: gzip {settings.COMPRESSION_GZIP_LEVEL}, brotli {settings.COMPRESSION_BROTLI_QUALITY} "
+          f"(marcados com *); respostas abaixo de {settings.COMPRESSION_MIN_SIZE} bytes vão sem compressão\n")
+
+    for label, data in payloads(rng, args.batch):
+        print(f"{label}: {len(data)} bytes")
+        print(f"{'':<10} {'bytes':>10} {'economia':>9} {'comprimir (µs)':>15} {'descomprimir (µs)':>18} {'MB/s':>8}")
+        print("-" * 75)
+        for encoding, level in CODECS:
+            compressed = compress(data, encoding, level)
+            compress_us = timed(lambda: compress(data, encoding, level), args.repeat)
+            decompress_us = timed(lambda: decompress(compressed, encoding, limit), args.repeat)
+            mark = "*" if (encoding, level) in defaults else ""
+            print(f"{f'{encoding} {level}{mark}':<10} {len(compressed):>10} {1 - len(compressed) / len(data):>9.1%} "
+                  f"{compress_us:>15.0f} {decompress_us:>18.0f} {len(data) / compress_us:>8.0f}")
+        print()
+
+    # Custo do limite: descompressão em pedaços com contagem x direta
+    data = payloads(rng, args.batch)[1][1]
+    print(f"Descompressão limitada x direta (job, {len(data)} bytes; µs)\n")
+    print(f"{'':<10} {'direta':>10} {'limitada':>10}")
+    print("-" * 32)
+    for encoding, direct in (("gzip", gzip.decompress), ("br", brotli.decompress)):
+        compressed = compress(data, encoding, 6 if encoding == "gzip" else 4)
+        print(f"{encoding:<10} {timed(lambda: direct(compressed), args.repeat):>10.0f} "
+              f"{timed(lambda: decompress(compressed, encoding, limit), args.repeat):>10.0f}")
+
+    # Zip bomb: tempo até recusar (o corpo inteiro não chega a ser alocado)
+    compressor = zlib.compressobj(9)
+    block = b" " * (1 << 20)
+    bomb = b"".join(compressor.compress(block) for _ in range(1024)) + compressor.flush()
+    start = time.perf_counter()
+    try:
+        decompress(bomb, "deflate", limit)
+    except Exception as e:
+        print(f"\nZip bomb deflate ({len(bomb)} bytes -> 1 GB): recusado em "
+              f"{(time.perf_counter() - start) * 1000:.1f} ms ({e})")
+
+
+if __name__ == "__main__":
+    main()
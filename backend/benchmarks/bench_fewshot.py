@@ -0,0 +1,151 @@
+"""
+Few-Shot Retrieval Benchmark
+============================
+Mede o few-shot dinâmico (exemplos semelhantes recuperados do índice local
+no lugar do bloco de critérios do prompt):
+
+    - índice: tempo de construção, memória e latência da busca (p50/p95/p99)
+      por tamanho, e recall@k da busca aproximada contra a exata
+    - qualidade dos exemplos: acurácia do voto dos k vizinhos
+    - pipeline: tokens de prompt por email, latência e acurácia com o prompt
+      completo e com o prompt few-shot
+
+Por padrão o pipeline usa o servidor Groq falso em processo (tokens
+comparáveis; a "acurácia" reflete a heurística do servidor falso). Para
+medir a acurácia de verdade, use --real (GROQ_API_KEY no .env).
+
+USO (a partir da raiz do repositório):
+    python -m backend.benchmarks.bench_fewshot [--sizes 1000,10000,100000]
+    python -m backend.benchmarks.bench_fewshot --real --size 50
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+
+import numpy as np
+
+from backend.app.core.config import settings
+from backend.app.services.classifier import EmailClassifier
+from backend.app.services.example_index import ExampleIndex, _token_hashes
+from backend.benchmarks.bench_pipeline_modes import count_usage, fake_client
+from backend.benchmarks.corpus import generate_labeled_corpus
+
+
+def build_index(size: int, seed: int) -> ExampleIndex:
+    """Índice com `size` emails rotulados sintéticos."""
+    index = ExampleIndex(dim=settings.FEWSHOT_INDEX_DIM)
+    index.build({"email": email, "categoria": label} for email, label in generate_labeled_corpus(size, seed))
+    return index
+
+
+def search_stats(index: ExampleIndex, queries, k: int):
+    """
+    Latência da busca (ms) e recall@k contra a busca exata.
+
+    Returns:
+        tuple: (p50, p95, p99, recall)
+    """
+    latencies, hits = [], 0
+    matrix = index._matrix[:len(index)]
+    for email, _ in queries:
+        start = time.perf_counter()
+        results = index.search(email, k)
+        latencies.append((time.perf_counter() - start) * 1000)
+        # Busca exata de referência sobre todas as linhas
+        scores = matrix @ index._vectorize(_token_hashes(email))
+        exact = {id(index.examples[row]) for row in np.argpartition(-scores, k - 1)[:k]}
+        hits += sum(id(example) in exact for example, _ in results)
+    latencies.sort()
+    n = len(latencies)
+    return latencies[n // 2], latencies[int(n * 0.95) - 1], latencies[int(n * 0.99) - 1], hits / (n * k)
+
+
+def knn_accuracy(index: ExampleIndex, queries, k: int) -> float:
+    """Acurácia do voto majoritário dos k exemplos recuperados."""
+    correct = 0
+    for email, label in queries:
+        votes = sum(1 if example["categoria"] == "PRODUTIVO" else -1 for example, _ in index.search(email, k))
+        correct += ("PRODUTIVO" if votes >= 0 else "IMPRODUTIVO") == label
+    return correct / len(queries)
+
+
+async def run_pipeline(classifier: EmailClassifier, corpus, usage: list):
+    """Classifica o corpus (sem resposta sugerida)."""
+    usage.clear()
+    latencies, correct = [], 0
+    for email, label in corpus:
+        start = time.perf_counter()
+        result = await classifier.classify_email(email, generate_response=False)
+        latencies.append((time.perf_counter() - start) * 1000)
+        correct += result.get("classification") == label
+    return {
+        "prompt_tokens": sum(p for p, _ in usage) / len(corpus),
+        "latency_ms": statistics.mean(latencies),
+        "accuracy": correct / len(corpus),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Few-shot dinâmico: índice e prompts")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="tamanhos do índice")
+    parser.add_argument("--size", type=int, default=100, help="emails avaliados no pipeline")
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--latency", default="fixed:50", help="latência do servidor falso por chamada")
+    parser.add_argument("--real", action="store_true", help="usa a API configurada em GROQ_API_KEY/GROQ_API_BASE")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    k = settings.FEWSHOT_K
+    queries = generate_labeled_corpus(args.queries, args.seed + 1)
+
+    print(f"Índice de exemplos (dim {settings.FEWSHOT_INDEX_DIM}, k={k}, {args.queries} consultas)\n")
+    print(f"{'exemplos':>9} {'busca':>12} {'build (s)':>10} {'MB':>7} {'p50 (ms)':>9} {'p95 (ms)':>9} "
+          f"{'p99 (ms)':>9} {'recall@k':>9} {'voto k-NN':>10}")
+    print("-" * 92)
+    index = None
+    for size in (int(value) for value in args.sizes.split(",")):
+        start = time.perf_counter()
+        index = build_index(size, args.seed)
+        build_s = time.perf_counter() - start
+        p50, p95, p99, recall = search_stats(index, queries, k)
+        print(f"{size:>9} {index.snapshot()['search']:>12} {build_s:>10.1f} {index._matrix.nbytes / 2**20:>7.0f} "
+              f"{p50:>9.2f} {p95:>9.2f} {p99:>9.2f} {recall:>9.1%} {knn_accuracy(index, queries, k):>10.1%}")
+
+    classifier = EmailClassifier()
+    if not args.real:
+        classifier.client = fake_client(args.latency, args.seed)
+    elif classifier.client is None:
+        raise SystemExit("--real requer GROQ_API_KEY configurada")
+    usage: list = []
+    count_usage(classifier.client, usage)
+    corpus = generate_labeled_corpus(args.size, args.seed + 2)
+
+    async def run_both():
+        classifier.example_index = None
+        full = await run_pipeline(classifier, corpus, usage)
+        classifier.example_index = index
+        settings.FEWSHOT_MIN_EXAMPLES = 0
+        fewshot = await run_pipeline(classifier, corpus, usage)
+        return full, fewshot
+
+    full, fewshot = asyncio.run(run_both())
+    print(f"\nPipeline de classificação: {len(corpus)} emails "
+          f"({'API real' if args.real else 'servidor falso: ' + args.latency}), índice com {len(index)} exemplos\n")
+    print(f"{'':<24} {'completo':>10} {'few-shot':>10} {'variação':>10}")
+    print("-" * 58)
+    for label, key, fmt in (
+        ("tokens de prompt/email", "prompt_tokens", "{:>10.0f}"),
+        ("latência média (ms)", "latency_ms", "{:>10.1f}"),
+    ):
+        change = fewshot[key] / full[key] - 1 if full[key] else 0.0
+        print(f"{label:<24} {fmt.format(full[key])} {fmt.format(fewshot[key])} {change:>+10.1%}")
+    print(f"{'acurácia':<24} {full['accuracy']:>10.1%} {fewshot['accuracy']:>10.1%}")
+    print(f"prompts few-shot: {classifier._fewshot_prompts['fewshot']}, completos: {classifier._fewshot_prompts['full']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+"""
+History Store Benchmark
+=======================
+Mede o histórico persistente de classificações:
+
+    - custo no caminho da requisição: gravação síncrona (uma transação por
+      classificação) x enfileirar para a thread de escrita em lote
+    - vazão de escrita: linhas/s por transação x em lotes
+    - consultas: latência da primeira página e de uma página profunda por
+      filtro, paginação por cursor (keyset) x OFFSET
+    - exportação: pico de memória do NDJSON em streaming x carregar tudo
+
+Usa um banco temporário, removido no fim.
+
+USO (a partir da raiz do repositório):
+    python -m backend.benchmarks.bench_history [--rows 200000]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+import orjson
+
+from backend.app.core.config import settings
+from backend.app.services.history_manager import HistoryManager
+from backend.app.services.history_store import HistoryStore
+
+
+def fake_result(rng: random.Random) -> dict:
+    """Resultado de classificação sintético (tamanho típico)."""
+    produtivo = rng.random() < 0.6
+    return {
+        "success": True,
+        "classification": "PRODUTIVO" if produtivo else "IMPRODUTIVO",
+        "confidence": round(rng.uniform(0.5, 1.0), 2),
+        "justification": "Email solicita atualização sobre requisição em andamento",
+        "suggested_response": "Prezado(a),\n\nRecebemos sua solicitação e retornaremos em breve.\n\n"
+                              "Atenciosamente,\nEquipe de Atendimento",
+        "language": "pt",
+        "mode": "two_call",
+        "models": {"classify": "llama-3.1-8b-instant", "response": "llama-3.1-8b-instant"},
+        "prompt_version": "classification-c9b47205+response-6ac87e9c",
+        "processing_time_ms": rng.randint(400, 2500),
+        "timings": {"nlp": 3.2, "llm.classify": 610.4, "llm.response": 820.1, "total": 1434.9},
+    }
+
+
+def percentiles(samples: list) -> tuple:
+    samples = sorted(samples)
+    n = len(samples)
+    return statistics.median(samples), samples[int(n * 0.95) - 1], samples[int(n * 0.99) - 1]
+
+
+def bench_request_path(path: str, count: int, rng: random.Random) -> None:
+    """Custo por classificação no caminho da requisição."""
+    results = [fake_result(rng) for _ in range(count)]
+    store = HistoryStore(path)
+    manager = HistoryManager(store)
+
+    sync_samples = []
+    for index, result in enumerate(results):
+        start = time.perf_counter()
+        store.insert_many([HistoryManager.build_row(f"email {index}", result, "text")])
+        sync_samples.append((time.perf_counter() - start) * 1e6)
+
+    async def run_batched():
+        await manager.start()
+        samples = []
+        for index, result in enumerate(results):
+            start = time.perf_counter()
+            manager.record(f"email {index}", result, "text")
+            samples.append((time.perf_counter() - start) * 1e6)
+        await manager.stop()
+        return samples
+
+    batched_samples = asyncio.run(run_batched())
+    print(f"Caminho da requisição: {count} classificações (µs por classificação)\n")
+    print(f"{'':<28} {'p50':>8} {'p95':>8} {'p99':>8}")
+    print("-" * 56)
+    for label, samples in (("transação por requisição", sync_samples), ("fila + escrita em lote", batched_samples)):
+        p50, p95, p99 = percentiles(samples)
+        print(f"{label:<28} {p50:>8.1f} {p95:>8.1f} {p99:>8.1f}")
+    print(f"gravadas em lote: {manager.stats['written']} em {manager.stats['batches']} lote(s), "
+          f"descartadas: {manager.stats['dropped']}")
+
+
+def bench_write_throughput(path: str, rows: list) -> None:
+    """Linhas/s gravadas uma por transação x em lotes."""
+    print(f"\nVazão de escrita ({len(rows)} linhas)\n")
+    for label, batch in (("1 linha/transação", 1), (f"lotes de {settings.HISTORY_BATCH_SIZE}", settings.HISTORY_BATCH_SIZE)):
+        store = HistoryStore(path)
+        sample = rows[:20000] if batch == 1 else rows
+        start = time.perf_counter()
+        for offset in range(0, len(sample), batch):
+            store.insert_many(sample[offset:offset + batch])
+        elapsed = time.perf_counter() - start
+        print(f"{label:<28} {len(sample) / elapsed:>10.0f} linhas/s")
+        store.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+
+def bench_queries(store: HistoryStore, total: int, now: float, days: int) -> None:
+    """Latência da primeira página e de uma página profunda, por filtro."""
+    filters = (
+        ("sem filtro", {}),
+        ("últimos 7 dias", {"start": now - 7 * 86400}),
+        ("categoria", {"classification": "IMPRODUTIVO"}),
+        ("confiança < 0.6", {"max_confidence": 0.6}),
+        ("categoria + período", {"classification": "PRODUTIVO", "start": now - 30 * 86400, "end": now - 15 * 86400}),
+    )
+    depth = 100
+    print(f"\nConsultas ({total} linhas em {days} dias, páginas de 50; ms)\n")
+    print(f"{'filtro':<22} {'1ª página':>10} {f'página {depth} (cursor)':>20} {f'página {depth} (OFFSET)':>21}")
+    print("-" * 76)
+    for label, params in filters:
+        first = []
+        for _ in range(20):
+            start = time.perf_counter()
+            rows, after = store.query(limit=50, **params)
+            first.append((time.perf_counter() - start) * 1000)
+
+        # Avança `depth` páginas pelo cursor e mede a última
+        after = None
+        for _ in range(depth - 1):
+            rows, after = store.query(limit=50, after=after, **params)
+            if after is None:
+                break
+        keyset = []
+        for _ in range(20):
+            start = time.perf_counter()
+            store.query(limit=50, after=after, **params)
+            keyset.append((time.perf_counter() - start) * 1000)
+
+        # Mesma página com OFFSET (referência)
+        where, values = [], []
+        for key, column, op in (("start", "created_at", ">="), ("end", "created_at", "<"),
+                                ("classification", "classification", "="),
+                                ("max_confidence", "confidence", "<=")):
+            if key in params:
+                where.append(f"{column} {op} ?")
+                values.append(params[key])
+        sql = (f"SELECT * FROM classification_history {'WHERE ' + ' AND '.join(where) if where else ''} "
+               "ORDER BY created_at DESC, id DESC LIMIT 50 OFFSET ?")
+        offset = []
+        for _ in range(20):
+            start = time.perf_counter()
+            store._conn.execute(sql, (*values, (depth - 1) * 50)).fetchall()
+            offset.append((time.perf_counter() - start) * 1000)
+
+        print(f"{label:<22} {statistics.median(first):>10.2f} {statistics.median(keyset):>20.2f} "
+              f"{statistics.median(offset):>21.2f}")
+
+
+def bench_export(store: HistoryStore, total: int) -> None:
+    """Pico de memória da exportação NDJSON: streaming x tudo em memória."""
+    manager = HistoryManager(store)
+
+    async def streamed():
+        size = 0
+        async for chunk in manager.export("ndjson"):
+            size += len(chunk)
+        return size
+
+    def in_memory():
+        rows = [HistoryStore._row_to_dict(row) for row in store._conn.execute(
+            "SELECT * FROM classification_history ORDER BY created_at DESC, id DESC"
+        ).fetchall()]
+        return len(b"".join(orjson.dumps(row) + b"\n" for row in rows))
+
+    def measure(func):
+        """Tempo (sem tracemalloc, que deixa as alocações lentas) e pico de memória."""
+        start = time.perf_counter()
+        size = func()
+        elapsed = time.perf_counter() - start
+        tracemalloc.start()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return size, elapsed, peak
+
+    size, stream_s, stream_peak = measure(lambda: asyncio.run(streamed()))
+    _, full_s, full_peak = measure(in_memory)
+
+    print(f"\nExportação NDJSON ({total} linhas, {size / 2**20:.0f} MB)\n")
+    print(f"{'':<28} {'pico (MB)':>10} {'tempo (s)':>10}")
+    print("-" * 50)
+    print(f"{'tudo em memória':<28} {full_peak / 2**20:>10.1f} {full_s:>10.2f}")
+    print(f"{'streaming por páginas':<28} {stream_peak / 2**20:>10.1f} {stream_s:>10.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Histórico de classificações: escrita, consultas e exportação")
+    parser.add_argument("--rows", type=int, default=200000, help="linhas do histórico para consultas/exportação")
+    parser.add_argument("--requests", type=int, default=5000, help="classificações no teste do caminho da requisição")
+    parser.add_argument("--days", type=int, default=90, help="período coberto pelas linhas")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    rng = random.Random(args.seed)
+    directory = tempfile.mkdtemp(prefix="bench_history_")
+    path = os.path.join(directory, "history.db")
+    try:
+        bench_request_path(os.path.join(directory, "request_path.db"), args.requests, rng)
+
+        now = time.time()
+        rows = sorted(
+            (HistoryManager.build_row(f"email {index}", fake_result(rng), "text",
+                                      now - rng.uniform(0, args.days * 86400))
+             for index in range(args.rows)),
+            key=lambda row: row[0]
+        )
+        bench_write_throughput(path, rows)
+
+        store = HistoryStore(path)
+        for offset in range(0, len(rows), 5000):
+            store.insert_many(rows[offset:offset + 5000])
+        del rows
+        bench_queries(store, args.rows, now, args.days)
+        bench_export(store, args.rows)
+        store.close()
+    finally:
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+        os.rmdir(directory)
+
+
+if __name__ == "__main__":
+    main()
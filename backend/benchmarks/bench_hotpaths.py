@@ -0,0 +1,76 @@
+"""
+Hot Path Benchmarks
+===================
+Micro-benchmarks dos caminhos quentes do pipeline: pré-processamento NLP,
+extração de arquivos, parsing do JSON do LLM e montagem dos prompts.
+
+USO (a partir da raiz do repositório):
+    python -m backend.benchmarks.bench_hotpaths [--save | --compare] [--threshold 0.15]
+"""
+
+import sys
+
+from backend.app.core.prompts import get_classification_prompt, get_response_generation_prompt
+from backend.app.services.file_processor import FileProcessor
+from backend.app.utils.language_detector import LanguageDetector
+from backend.app.utils.reply_parser import ReplyChainParser
+from backend.app.utils.result_parser import ClassificationResultParser
+from backend.app.utils.text_cleaner import TextCleaner
+from backend.benchmarks.corpus import generate_corpus, generate_llm_outputs, generate_thread_corpus, make_pdf
+from backend.benchmarks.runner import BenchCase, run_suite
+
+SUITE = "hotpaths"
+
+
+def build_cases(corpus_size: int = 200):
+    """
+    Monta os casos de benchmark sobre o corpus sintético.
+
+    Args:
+        corpus_size: Quantidade de emails do corpus
+
+    Returns:
+        List[BenchCase]: Casos da suíte
+    """
+    cleaner = TextCleaner()
+    detector = LanguageDetector()
+    reply_parser = ReplyChainParser()
+    result_parser = ClassificationResultParser()
+    processor = FileProcessor()
+
+    corpus = generate_corpus(corpus_size)
+    main_contents = [cleaner.extract_main_content(text) for text in corpus]
+    cleaned = [cleaner.clean(text) for text in main_contents]
+    tokens = [cleaner.tokenize(text) for text in cleaned]
+    filtered = [cleaner.remove_stopwords(items) for items in tokens]
+    nlp_texts = [cleaner.apply_nlp_preprocessing(text) for text in main_contents]
+    llm_outputs = generate_llm_outputs(corpus_size)
+    threads = generate_thread_corpus(corpus_size)
+
+    txt_files = [text.encode("utf-8") for text in corpus]
+    # PDFs são mais caros: um subconjunto com todos os tamanhos é suficiente
+    pdf_files = [make_pdf(text) for text in corpus[:40]]
+
+    return [
+        BenchCase("language_detector.detect", detector.detect, main_contents),
+        BenchCase("text_cleaner.clean", cleaner.clean, main_contents),
+        BenchCase("text_cleaner.tokenize", cleaner.tokenize, cleaned),
+        BenchCase("text_cleaner.remove_stopwords", cleaner.remove_stopwords, tokens),
+        BenchCase("text_cleaner.stem_tokens", cleaner.stem_tokens, filtered),
+        BenchCase("text_cleaner.apply_nlp_preprocessing", cleaner.apply_nlp_preprocessing, main_contents),
+        BenchCase("text_cleaner.extract_main_content", cleaner.extract_main_content, corpus),
+        BenchCase("reply_parser.parse", reply_parser.parse, threads),
+        BenchCase("file_processor.process_txt", processor._process_txt, txt_files),
+        BenchCase("file_processor.process_pdf", processor._process_pdf, pdf_files),
+        BenchCase("result_parser.parse", result_parser.parse, llm_outputs),
+        BenchCase("prompts.classification", get_classification_prompt, nlp_texts),
+        BenchCase(
+            "prompts.response_generation",
+            lambda text: get_response_generation_prompt(text, "PRODUTIVO"),
+            corpus
+        ),
+    ]
+
+
+if __name__ == "__main__":
+    sys.exit(run_suite(SUITE, build_cases()))
@@ -0,0 +1,72 @@
+"""
+HTML Extraction Benchmarks
+==========================
+Conversão HTML → texto sobre newsletters sintéticas de vários tamanhos
+(layout em tabelas, CSS inline, script, preheader oculto e pixels de
+rastreamento).
+
+Antes da tabela de tempos, mostra a redução de tamanho e o quanto do
+orçamento de 3.000 caracteres do prompt de classificação é ocupado pelo
+texto visível, com e sem a conversão.
+
+USO (a partir da raiz do repositório):
+    python -m backend.benchmarks.bench_html [--save | --compare]
+"""
+
+import sys
+
+from backend.app.utils.html_extractor import html_to_text
+from backend.app.utils.text_cleaner import TextCleaner
+from backend.benchmarks.corpus import make_newsletter_html
+from backend.benchmarks.runner import BenchCase, run_suite
+
+SUITE = "html"
+
+# Tamanhos das newsletters (bytes)
+SIZES = (20_000, 200_000, 1_000_000)
+
+# Orçamento de caracteres do prompt de classificação (core/prompts.py)
+PROMPT_BUDGET = 3000
+
+
+def visible_share(prompt_text: str, visible_words: set) -> float:
+    """Fração das palavras do trecho do prompt que são texto visível do email."""
+    words = prompt_text[:PROMPT_BUDGET].split()
+    if not words:
+        return 0.0
+    return sum(word in visible_words for word in words) / len(words)
+
+
+def print_reduction(documents) -> None:
+    """Imprime a redução de tamanho e o aproveitamento do prompt."""
+    cleaner = TextCleaner()
+    print(f"{'documento':<14} {'HTML (bytes)':>14} {'texto (chars)':>14} {'redução':>9} {'prompt útil antes':>18} {'depois':>8}")
+    print("-" * 84)
+    for name, html in documents:
+        text = html_to_text(html)
+        visible = set(cleaner.apply_nlp_preprocessing(text).split())
+        before = visible_share(cleaner.apply_nlp_preprocessing(html), visible)
+        after = visible_share(cleaner.apply_nlp_preprocessing(text), visible)
+        print(
+            f"{name:<14} {len(html):>14} {len(text):>14} {1 - len(text) / len(html):>9.1%} "
+            f"{before:>18.1%} {after:>8.1%}"
+        )
+    print()
+
+
+def build_cases():
+    """
+    Monta os casos: um documento por tamanho.
+
+    Returns:
+        tuple: (casos, documentos)
+    """
+    documents = [(f"newsletter_{size // 1000}k", make_newsletter_html(size)) for size in SIZES]
+    cases = [BenchCase(f"html_to_text.{name}", html_to_text, [html]) for name, html in documents]
+    return cases, documents
+
+
+if __name__ == "__main__":
+    cases, documents = build_cases()
+    print_reduction(documents)
+    sys.exit(run_suite(SUITE, cases))
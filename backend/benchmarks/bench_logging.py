@@ -0,0 +1,122 @@
+"""
+Logging Overhead Benchmark
+==========================
+Mede o custo do logging por requisição de classificação (modo simulação,
+sem rede) em três configurações:
+
+    - sem logging: referência (logging desativado)
+    - antes: handler síncrono em texto, etapas do pipeline em nível INFO
+    - depois: fila + thread de escrita em JSON, etapas em DEBUG e amostragem
+
+Para cada configuração são reportados o tempo de parede no caminho da
+requisição e o tempo de CPU do processo (inclui a thread de escrita).
+
+USO (a partir da raiz do repositório):
+    python -m backend.benchmarks.bench_logging [--requests 2000]
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+from backend.app.core.logging_config import TEXT_FORMAT, setup_logging, shutdown_logging
+from backend.app.services.classifier import EmailClassifier
+from backend.benchmarks.corpus import generate_corpus
+from backend.benchmarks.runner import run_coroutine
+
+# Loggers que emitiam INFO por etapa antes do pipeline assíncrono
+STAGE_LOGGERS = (
+    "backend.app.utils.text_cleaner",
+    "backend.app.services.classifier",
+    "backend.app.api.routes",
+)
+
+
+def configure_before(path: str) -> logging.Handler:
+    """Reproduz a configuração anterior: basicConfig síncrono, tudo em INFO."""
+    shutdown_logging()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    handler = logging.FileHandler(path, encoding="utf-8")
+    handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+    root.addHandler(handler)
+    root.setLevel(logging.INFO)
+    # As mensagens de etapa hoje são DEBUG; liberar para igualar o volume antigo
+    for name in STAGE_LOGGERS:
+        logging.getLogger(name).setLevel(logging.DEBUG)
+    return handler
+
+
+def configure_after(path: str):
+    """Configuração atual: fila, JSON, INFO e amostragem padrão."""
+    for name in STAGE_LOGGERS:
+        logging.getLogger(name).setLevel(logging.NOTSET)
+    stream = open(path, "a", encoding="utf-8")
+    setup_logging(level="INFO", log_format="json", stream=stream)
+    return stream
+
+
+def run_requests(classifier: EmailClassifier, corpus, requests: int):
+    """
+    Executa `requests` classificações e mede parede e CPU por requisição.
+
+    Returns:
+        tuple: (µs de parede por requisição, µs de CPU por requisição)
+    """
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    for i in range(requests):
+        run_coroutine(classifier.classify_email(corpus[i % len(corpus)]))
+    wall = time.perf_counter() - wall_start
+    # Esvazia a fila para contabilizar a CPU da thread de escrita
+    shutdown_logging()
+    cpu = time.process_time() - cpu_start
+    return wall / requests * 1e6, cpu / requests * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Overhead de logging por requisição")
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    corpus = generate_corpus(200)
+    classifier = EmailClassifier()
+    tmpdir = tempfile.mkdtemp(prefix="bench_logging_")
+    results = {}
+
+    # Aquecimento (caches do NLTK, regex compiladas)
+    logging.disable(logging.CRITICAL)
+    run_requests(classifier, corpus, 200)
+
+    results["sem logging"] = run_requests(classifier, corpus, args.requests)
+    logging.disable(logging.NOTSET)
+
+    before_path = os.path.join(tmpdir, "before.log")
+    handler = configure_before(before_path)
+    results["antes (síncrono, INFO)"] = run_requests(classifier, corpus, args.requests)
+    handler.close()
+    logging.getLogger().removeHandler(handler)
+
+    after_path = os.path.join(tmpdir, "after.log")
+    stream = configure_after(after_path)
+    results["depois (fila, JSON, DEBUG)"] = run_requests(classifier, corpus, args.requests)
+    stream.close()
+
+    base_wall, base_cpu = results["sem logging"]
+    print(f"{args.requests} requisições (modo simulação)\n")
+    print(f"{'configuração':<30} {'parede/req (µs)':>16} {'overhead':>10} {'CPU/req (µs)':>14} {'overhead':>10}")
+    print("-" * 84)
+    for name, (wall, cpu) in results.items():
+        print(f"{name:<30} {wall:>16.1f} {wall - base_wall:>+10.1f} {cpu:>14.1f} {cpu - base_cpu:>+10.1f}")
+
+    for label, path in (("antes", before_path), ("depois", after_path)):
+        with open(path, encoding="utf-8") as f:
+            lines = sum(1 for _ in f)
+        print(f"\nLinhas de log ({label}): {lines} ({lines / args.requests:.1f} por requisição)")
+
+
+if __name__ == "__main__":
+    main()
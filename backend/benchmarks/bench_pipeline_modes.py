@@ -0,0 +1,145 @@
+"""
+Pipeline Modes Comparison
+=========================
+Compara, sobre emails rotulados, o pipeline de duas chamadas (classificação
+e depois resposta) com o modo combinado (uma chamada retorna os dois):
+
+    - latência por email (média, p50, p95)
+    - chamadas ao LLM e tokens (prompt e completion) por email
+    - acurácia contra a categoria esperada e concordância entre os modos
+    - respostas sugeridas válidas (sem cair na resposta padrão)
+
+Por padrão usa o servidor Groq falso (backend/loadtest/fake_groq.py) em
+processo, sem rede: latência e tokens são comparáveis, mas a "qualidade"
+reflete a heurística de palavras-chave do servidor falso. Para medir a
+qualidade de verdade, aponte para a API real (GROQ_API_KEY no .env):
+
+USO (a partir da raiz do repositório):
+    python -m backend.benchmarks.bench_pipeline_modes [--size 100]
+    python -m backend.benchmarks.bench_pipeline_modes --real --size 50
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+
+import httpx
+from groq import AsyncGroq
+
+from backend.app.core.config import settings
+from backend.app.services.classifier import EmailClassifier
+from backend.benchmarks.corpus import generate_labeled_corpus
+from backend.loadtest.fake_groq import FakeGroqState, create_app
+
+MODES = ("two_call", "combined")
+
+
+def fake_client(latency: str, seed: int, **options) -> AsyncGroq:
+    """
+    Cliente Groq ligado ao servidor falso em processo (transporte ASGI).
+    `options` vão para o FakeGroqState (ex.: malformed_rate).
+    """
+    state = FakeGroqState(latency=latency, error_rate=0.0, timeout_rate=0.0, rate_limit=0, seed=seed, **options)
+    transport = httpx.ASGITransport(app=create_app(state))
+    return AsyncGroq(
+        api_key="fake-key",
+        base_url="http://fake-groq",
+        http_client=httpx.AsyncClient(transport=transport, base_url="http://fake-groq"),
+        max_retries=0
+    )
+
+
+def count_usage(client: AsyncGroq, usage: list) -> None:
+    """Registra o `usage` de cada chamada ao LLM feita pelo cliente."""
+    create = client.chat.completions.create
+
+    async def counted(*args, **kwargs):
+        response = await create(*args, **kwargs)
+        usage.append((response.usage.prompt_tokens, response.usage.completion_tokens))
+        return response
+
+    client.chat.completions.create = counted
+
+
+async def run_mode(classifier: EmailClassifier, corpus, mode: str, usage: list):
+    """
+    Classifica o corpus em um modo.
+
+    Returns:
+        dict: latências, categorias, respostas válidas e uso de tokens
+    """
+    usage.clear()
+    latencies, categories, valid_replies = [], [], 0
+    for email, _ in corpus:
+        start = time.perf_counter()
+        result = await classifier.classify_email(email, mode=mode)
+        latencies.append((time.perf_counter() - start) * 1000)
+        categories.append(result.get("classification"))
+        valid_replies += bool(result.get("success")) and result["models"]["response"] != "default"
+    return {
+        "latencies": sorted(latencies),
+        "categories": categories,
+        "valid_replies": valid_replies,
+        "calls": len(usage),
+        "prompt_tokens": sum(p for p, _ in usage),
+        "completion_tokens": sum(c for _, c in usage),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Duas chamadas vs modo combinado")
+    parser.add_argument("--size", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--latency", default="lognormal:400:0.4",
+                        help="latência do servidor falso por chamada (ver LatencyDistribution)")
+    parser.add_argument("--real", action="store_true", help="usa a API configurada em GROQ_API_KEY/GROQ_API_BASE")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    corpus = generate_labeled_corpus(args.size, args.seed)
+    classifier = EmailClassifier()
+    if not args.real:
+        classifier.client = fake_client(args.latency, args.seed)
+    elif classifier.client is None:
+        raise SystemExit("--real requer GROQ_API_KEY configurada")
+
+    usage: list = []
+    count_usage(classifier.client, usage)
+
+    async def run_all():
+        return {mode: await run_mode(classifier, corpus, mode, usage) for mode in MODES}
+
+    results = asyncio.run(run_all())
+
+    n = len(corpus)
+    labels = [label for _, label in corpus]
+    print(f"{n} emails rotulados ({'API real' if args.real else 'servidor falso: ' + args.latency}), modelo {settings.GROQ_MODEL}\n")
+    print(f"{'':<26} {'two_call':>12} {'combined':>12} {'variação':>10}")
+    print("-" * 64)
+
+    def row(label, values, fmt="{:>12.1f}", relative=True):
+        before, after = values
+        change = f"{after / before - 1:>+10.1%}" if relative and before else f"{'':>10}"
+        print(f"{label:<26} {fmt.format(before)} {fmt.format(after)} {change}")
+
+    row("latência média (ms)", [statistics.mean(results[m]["latencies"]) for m in MODES])
+    row("latência p50 (ms)", [results[m]["latencies"][n // 2] for m in MODES])
+    row("latência p95 (ms)", [results[m]["latencies"][int(n * 0.95) - 1] for m in MODES])
+    row("chamadas ao LLM/email", [results[m]["calls"] / n for m in MODES], "{:>12.2f}")
+    row("tokens de prompt/email", [results[m]["prompt_tokens"] / n for m in MODES], "{:>12.0f}")
+    row("tokens de saída/email", [results[m]["completion_tokens"] / n for m in MODES], "{:>12.0f}")
+    row("tokens totais/email", [
+        (results[m]["prompt_tokens"] + results[m]["completion_tokens"]) / n for m in MODES
+    ], "{:>12.0f}")
+    row("acurácia", [
+        sum(c == label for c, label in zip(results[m]["categories"], labels)) / n for m in MODES
+    ], "{:>12.1%}", relative=False)
+    row("respostas válidas", [results[m]["valid_replies"] / n for m in MODES], "{:>12.1%}", relative=False)
+    agreement = sum(a == b for a, b in zip(results["two_call"]["categories"], results["combined"]["categories"])) / n
+    print(f"{'concordância entre modos':<26} {agreement:>25.1%}")
+
+
+if __name__ == "__main__":
+    main()
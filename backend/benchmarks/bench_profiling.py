@@ -0,0 +1,109 @@
+"""
+Profiling Overhead Benchmark
+============================
+Custo do profiling sob demanda por requisição em POST /api/classify-text
+(Groq falso sem latência, para medir só o servidor), via ASGI e sem rede:
+
+    - sem o middleware (PROFILING_ENABLED=false, o padrão)
+    - middleware registrado e ocioso (sem header e sem sessão)
+    - X-Profile: sample e X-Profile: cpu em cada requisição
+    - sessão de memória (tracemalloc) aberta durante as requisições
+
+Os artefatos vão para um diretório temporário, apagado no fim.
+
+USO (a partir da raiz do repositório):
+    python -m backend.benchmarks.bench_profiling [--requests 300]
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import tempfile
+import time
+
+import httpx
+
+from backend.app.api import routes
+from backend.app.api.profiling import ProfilingMiddleware
+from backend.app.core.config import settings
+from backend.app.core.profiling import Profiler
+from backend.benchmarks.bench_pipeline_modes import fake_client
+from backend.benchmarks.corpus import generate_corpus
+
+TOKEN = "bench"
+
+
+async def measure(app, texts: list, headers: dict, profiler: Profiler) -> list:
+    """
+    Tempo (µs) de cada requisição; a gravação dos artefatos de um perfil
+    por header termina antes da próxima requisição e fica fora da medição.
+    """
+    samples = []
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        for text in texts:
+            start = time.perf_counter()
+            response = await client.post(
+                "/api/classify-text", json={"email_text": text}, headers=headers
+            )
+            samples.append((time.perf_counter() - start) * 1e6)
+            if response.status_code != 200 or response.headers.get("x-profile-status") == "busy":
+                raise RuntimeError(f"resposta inesperada: {response.status_code} {response.text}")
+            await profiler.drain()
+    return samples
+
+
+async def run(args) -> None:
+    from backend.app.main import app
+
+    texts = generate_corpus(args.requests, args.seed)
+    routes.classifier.client = fake_client("fixed:0", args.seed)
+
+    with tempfile.TemporaryDirectory() as directory:
+        settings.PROFILING_ENABLED = True
+        settings.PROFILING_TOKEN = TOKEN
+        settings.PROFILING_DIR = directory
+        settings.PROFILING_MAX_ARTIFACTS = 10
+        profiler = Profiler()
+        profiled = ProfilingMiddleware(app, profiler)
+        token = {"X-Profile-Token": TOKEN}
+
+        # Aquecimento (caches do pipeline e do NLTK)
+        await measure(app, texts[:20], {}, profiler)
+
+        results = [
+            ("sem middleware", await measure(app, texts, {}, profiler)),
+            ("middleware ocioso", await measure(profiled, texts, {}, profiler)),
+            ("X-Profile: sample", await measure(profiled, texts, {"X-Profile": "sample", **token}, profiler)),
+            ("X-Profile: cpu", await measure(profiled, texts, {"X-Profile": "cpu", **token}, profiler)),
+        ]
+        session = profiler.start("memory", requests=len(texts))
+        results.append(("sessão memory", await measure(profiled, texts, {}, profiler)))
+        if profiler.session is session:
+            profiler.finish()
+        await profiler.drain()
+        written = profiler.stats["artifacts_written"]
+
+    base = statistics.median(results[0][1])
+    print(f"POST /api/classify-text, {len(texts)} requisições por modo (µs)\n")
+    print(f"{'modo':<20} {'p50':>8} {'p95':>8} {'média':>8} {'overhead p50':>13}")
+    print("-" * 61)
+    for label, samples in results:
+        p50 = statistics.median(samples)
+        p95 = statistics.quantiles(samples, n=20)[-1]
+        print(f"{label:<20} {p50:>8.0f} {p95:>8.0f} {statistics.fmean(samples):>8.0f} {(p50 / base - 1) * 100:>12.1f}%")
+    print(f"\nArtefatos gravados: {written}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Overhead por requisição do profiling sob demanda")
+    parser.add_argument("--requests", type=int, default=300, help="requisições por modo")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Reply Chain Benchmark
+=====================
+Mede o efeito da remoção do histórico citado (respostas e encaminhamentos)
+sobre um corpus de emails com cadeias de resposta:
+
+    - tamanho dos prompts enviados ao LLM (caracteres e tokens estimados)
+    - quantos prompts ainda são truncados pelo limite de tamanho
+    - latência do pipeline local (modo simulação, sem rede)
+    - custo do parser por tamanho de email (deve crescer linearmente)
+
+USO (a partir da raiz do repositório):
+    python -m backend.benchmarks.bench_reply_chain [--size 200]
+"""
+
+import argparse
+import logging
+import statistics
+import time
+
+from backend.app.core.config import settings
+from backend.app.core.prompts import get_classification_prompt, get_response_generation_prompt
+from backend.app.services.classifier import EmailClassifier
+from backend.app.utils.reply_parser import ReplyChainParser
+from backend.benchmarks.corpus import generate_thread_corpus
+from backend.benchmarks.runner import run_coroutine
+
+# Aproximação de tokens para texto em português (caracteres por token)
+CHARS_PER_TOKEN = 4
+
+TRUNCATION_MARKER = "[... texto truncado ...]"
+
+
+def prompt_sizes(classifier: EmailClassifier, email: str, strip: bool):
+    """
+    Monta os dois prompts (classificação e resposta) como o classificador faria.
+
+    Returns:
+        tuple: (caracteres do texto do email nos prompts, caracteres dos
+        prompts, prompts truncados)
+    """
+    thread = email
+    message = classifier.text_cleaner.extract_main_content(email)
+    if strip:
+        parsed = classifier.reply_parser.parse(email)
+        if parsed.text:
+            thread = parsed.with_summary()
+            message = parsed.with_summary(classifier.text_cleaner.extract_main_content(parsed.text))
+
+    language, _ = classifier.text_cleaner.detect_language(message)
+    nlp_text = classifier.text_cleaner.apply_nlp_preprocessing(message, language)
+    prompts = (get_classification_prompt(nlp_text), get_response_generation_prompt(thread, "PRODUTIVO"))
+    return (
+        len(nlp_text) + len(thread),
+        sum(len(p) for p in prompts),
+        sum(TRUNCATION_MARKER in p for p in prompts)
+    )
+
+
+def pipeline_latency(classifier: EmailClassifier, corpus, strip: bool, rounds: int):
+    """Latência (ms, média e mediana) do classify_email em modo simulação."""
+    settings.REPLY_CHAIN_STRIPPING = strip
+    best = []
+    for email in corpus:
+        timings = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            run_coroutine(classifier.classify_email(email))
+            timings.append((time.perf_counter() - start) * 1000)
+        best.append(min(timings))
+    return statistics.mean(best), statistics.median(best)
+
+
+def parser_scaling(parser: ReplyChainParser, corpus):
+    """Custo do parser (µs) por faixa de tamanho de email."""
+    buckets = {}
+    for email in corpus:
+        bucket = min(10000, (len(email) // 2500 + 1) * 2500)
+        start = time.perf_counter()
+        for _ in range(20):
+            parser.parse(email)
+        elapsed = (time.perf_counter() - start) / 20 * 1e6
+        buckets.setdefault(bucket, []).append((elapsed, len(email)))
+    return {
+        bucket: (statistics.mean(t for t, _ in items), statistics.mean(t / n for t, n in items))
+        for bucket, items in sorted(buckets.items())
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Remoção de histórico citado: prompts e latência")
+    parser.add_argument("--size", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    corpus = generate_thread_corpus(args.size)
+    classifier = EmailClassifier()
+    classifier.client = None  # Modo simulação, sem rede
+
+    before = [prompt_sizes(classifier, email, strip=False) for email in corpus]
+    after = [prompt_sizes(classifier, email, strip=True) for email in corpus]
+
+    print(f"{len(corpus)} emails com histórico (média {statistics.mean(map(len, corpus)):.0f} caracteres)\n")
+    print(f"{'':<28} {'sem remoção':>14} {'com remoção':>14} {'redução':>10}")
+    print("-" * 70)
+    for label, column in (("tokens do email (estimado)", 0), ("tokens dos prompts", 1)):
+        total_before = sum(row[column] for row in before)
+        total_after = sum(row[column] for row in after)
+        print(
+            f"{label:<28} {total_before / len(corpus) / CHARS_PER_TOKEN:>14.0f} "
+            f"{total_after / len(corpus) / CHARS_PER_TOKEN:>14.0f} {1 - total_after / total_before:>10.1%}"
+        )
+    print(f"{'prompts truncados':<28} {sum(row[2] for row in before):>14} {sum(row[2] for row in after):>14}")
+
+    run_coroutine(classifier.classify_email(corpus[0]))  # aquecimento
+    mean_before, median_before = pipeline_latency(classifier, corpus, False, args.rounds)
+    mean_after, median_after = pipeline_latency(classifier, corpus, True, args.rounds)
+    settings.REPLY_CHAIN_STRIPPING = True
+    print(f"{'pipeline local média (ms)':<28} {mean_before:>14.2f} {mean_after:>14.2f} {1 - mean_after / mean_before:>10.1%}")
+    print(f"{'pipeline local p50 (ms)':<28} {median_before:>14.2f} {median_after:>14.2f} {1 - median_after / median_before:>10.1%}")
+
+    print("\nCusto do parser por tamanho de email:")
+    print(f"{'até (caracteres)':<18} {'µs/email':>10} {'µs/1000 caracteres':>20}")
+    for bucket, (per_email, per_char) in parser_scaling(classifier.reply_parser, corpus).items():
+        print(f"{bucket:<18} {per_email:>10.1f} {per_char * 1000:>20.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Result Parser Benchmark
+=======================
+Compara o parsing do JSON de classificação antes (recorte com find/rfind +
+json.loads, retry a cada erro) e depois (parser tolerante + formato JSON do
+provedor):
+
+    - respostas aproveitadas sem nova chamada, por tipo de saída
+    - custo do parsing (µs por resposta) em saídas limpas e com ruído
+    - chamadas ao LLM e latência por email no pipeline completo, com o
+      servidor Groq falso em processo devolvendo JSON defeituoso
+
+USO (a partir da raiz do repositório):
+    python -m backend.benchmarks.bench_result_parser [--size 200] [--malformed-rate 0.3]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import time
+
+from backend.app.core.config import settings
+from backend.app.services.classifier import EmailClassifier
+from backend.app.utils.result_parser import ClassificationResultParser, ResultParseError
+from backend.benchmarks.bench_pipeline_modes import count_usage, fake_client
+from backend.benchmarks.corpus import generate_labeled_corpus, generate_llm_outputs
+
+
+class LegacyParser:
+    """Parsing anterior: recorte do objeto, json.loads e validação estrita."""
+
+    def parse(self, text: str) -> dict:
+        text = text.replace("```json", "").replace("```", "")
+        start_idx = text.find("{")
+        end_idx = text.rfind("}") + 1
+        if start_idx != -1 and end_idx != 0:
+            text = text[start_idx:end_idx]
+        result = json.loads(text.strip())
+        if not all(key in result for key in ("categoria", "confianca", "justificativa")):
+            raise ValueError("Resposta da IA em formato inválido")
+        if result["categoria"] not in ["PRODUTIVO", "IMPRODUTIVO", "produtivo", "improdutivo"]:
+            raise ValueError("Resposta da IA em formato inválido")
+        if not isinstance(result["confianca"], (int, float)) or not 0 <= result["confianca"] <= 1:
+            raise ValueError("Resposta da IA em formato inválido")
+        result["categoria"] = result["categoria"].upper()
+        return result
+
+
+def _body(output: str) -> str:
+    """Objeto JSON contido em uma resposta limpa."""
+    return output[output.find("{"):output.rfind("}") + 1]
+
+
+def parse_rate(parser, outputs) -> float:
+    """Fração das respostas aproveitadas (sem nova chamada ao LLM)."""
+    ok = 0
+    for output in outputs:
+        try:
+            parser.parse(output)
+            ok += 1
+        except (ValueError, ResultParseError):
+            pass
+    return ok / len(outputs)
+
+
+def parse_cost_us(parser, outputs, rounds: int = 20) -> float:
+    """Custo médio do parsing (µs por resposta, melhor de `rounds`)."""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for output in outputs:
+            try:
+                parser.parse(output)
+            except (ValueError, ResultParseError):
+                pass
+        best = min(best, (time.perf_counter() - start) / len(outputs) * 1e6)
+    return best
+
+
+def run_pipeline(corpus, parser, json_mode: bool, malformed_rate: float, latency: str, seed: int):
+    """
+    Classifica o corpus (sem resposta sugerida) contra o servidor falso.
+
+    Returns:
+        dict: chamadas/email, latência média e p95 (ms), falhas
+    """
+    settings.AI_JSON_MODE = json_mode
+    classifier = EmailClassifier()
+    classifier.client = fake_client(latency, seed, malformed_rate=malformed_rate)
+    classifier.result_parser = parser
+    usage: list = []
+    count_usage(classifier.client, usage)
+
+    async def run_all():
+        latencies, failures = [], 0
+        for email, _ in corpus:
+            start = time.perf_counter()
+            result = await classifier.classify_email(email, generate_response=False)
+            latencies.append((time.perf_counter() - start) * 1000)
+            failures += not result["success"]
+        return sorted(latencies), failures
+
+    latencies, failures = asyncio.run(run_all())
+    n = len(corpus)
+    return {
+        "calls": len(usage) / n,
+        "mean_ms": statistics.mean(latencies),
+        "p95_ms": latencies[int(n * 0.95) - 1],
+        "failures": failures,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Parsing do JSON de classificação: antes x depois")
+    parser.add_argument("--size", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--malformed-rate", type=float, default=0.3,
+                        help="fração de respostas defeituosas (corpus e servidor falso)")
+    parser.add_argument("--latency", default="fixed:50", help="latência do servidor falso por chamada")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    clean = generate_llm_outputs(args.size, args.seed)
+    noisy = generate_llm_outputs(args.size, args.seed, defect_rate=1.0)
+    mixed = generate_llm_outputs(args.size, args.seed, defect_rate=args.malformed_rate)
+    # Saída do formato JSON do provedor: apenas o objeto
+    compact = [json.dumps(json.loads(_body(output)), ensure_ascii=False) for output in clean]
+
+    legacy, tolerant = LegacyParser(), ClassificationResultParser()
+    print(f"Parsing de {args.size} respostas por conjunto\n")
+    print(f"{'':<40} {'antes':>10} {'depois':>10}")
+    print("-" * 62)
+    for label, outputs in (
+        ("JSON puro (formato JSON)", compact),
+        ("com markdown/texto extra", clean),
+        (f"{args.malformed_rate:.0%} com defeitos", mixed),
+        ("100% com defeitos", noisy),
+    ):
+        print(f"{'aproveitadas: ' + label:<40} {parse_rate(legacy, outputs):>10.1%} {parse_rate(tolerant, outputs):>10.1%}")
+    for label, outputs in (("JSON puro", compact), ("com defeitos", noisy)):
+        print(f"{'µs/resposta: ' + label:<40} {parse_cost_us(legacy, outputs):>10.1f} {parse_cost_us(tolerant, outputs):>10.1f}")
+
+    corpus = generate_labeled_corpus(min(args.size, 100), args.seed)
+    configs = (
+        ("antes (parser antigo)", LegacyParser(), False),
+        ("parser tolerante", ClassificationResultParser(), False),
+        ("tolerante + formato JSON", ClassificationResultParser(), True),
+    )
+    print(f"\nPipeline de classificação: {len(corpus)} emails, servidor falso ({args.latency}, "
+          f"{args.malformed_rate:.0%} de JSON defeituoso sem response_format)\n")
+    print(f"{'':<26} {'chamadas/email':>15} {'média (ms)':>11} {'p95 (ms)':>10} {'falhas':>7}")
+    print("-" * 73)
+    for label, result_parser, json_mode in configs:
+        stats = run_pipeline(corpus, result_parser, json_mode, args.malformed_rate, args.latency, args.seed)
+        print(f"{label:<26} {stats['calls']:>15.2f} {stats['mean_ms']:>11.1f} {stats['p95_ms']:>10.1f} {stats['failures']:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+LLM Scheduler Benchmark
+=======================
+Um cliente de carga em lote dispara centenas de classificações de uma vez
+enquanto a triagem pelo frontend (outro tenant) e emails urgentes (um
+terceiro tenant) chegam aos poucos. O upstream aceita no máximo --upstream
+chamadas simultâneas (servidor Groq falso em processo). Compara:
+
+    - fila FIFO no upstream (escalonador desativado)
+    - escalonador com classes de prioridade e fair queueing por tenant
+
+Mede a latência de cada grupo (p50/p95) e o tempo até o lote terminar.
+
+USO (a partir da raiz do repositório):
+    python -m backend.benchmarks.bench_scheduler [--bulk 300] [--upstream 8]
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+
+from backend.app.core.config import settings
+from backend.app.core.deadline import Deadline
+from backend.app.services.classifier import EmailClassifier
+from backend.app.services.llm_scheduler import LLMScheduler
+from backend.benchmarks.bench_admission import limit_upstream
+from backend.benchmarks.bench_pipeline_modes import fake_client
+from backend.benchmarks.corpus import generate_corpus
+
+URGENT_EMAIL = "Bom dia, o prazo do contrato vence hoje e preciso da segunda via do boleto com urgência. É urgente!"
+
+
+async def classify(classifier: EmailClassifier, text: str, priority: str, tenant: str, delay: float, deadline: float):
+    """Uma classificação após `delay` segundos; devolve a latência (s)."""
+    await asyncio.sleep(delay)
+    start = time.perf_counter()
+    await classifier.classify_email(
+        text, Deadline(deadline), generate_response=False, priority=priority, tenant=tenant
+    )
+    return time.perf_counter() - start
+
+
+async def scenario(args, enabled: bool) -> dict:
+    """
+    Roda a carga mista.
+
+    Returns:
+        dict: Grupo -> latências (s), e "__wall__" com a duração total
+    """
+    classifier = EmailClassifier()
+    classifier.client = fake_client(args.latency, args.seed)
+    limit_upstream(classifier.client, args.upstream)
+    classifier.scheduler = LLMScheduler(
+        args.upstream, settings.SCHEDULER_WEIGHTS, settings.SCHEDULER_URGENT_KEYWORDS
+    ) if enabled else None
+
+    # Sem "urgente"/"prazo" nos textos comuns (mesma carga nos dois cenários): só o grupo urgente é promovido
+    keywords = LLMScheduler(1, settings.SCHEDULER_WEIGHTS, settings.SCHEDULER_URGENT_KEYWORDS)
+    texts = [text for text in generate_corpus(4 * (args.bulk + args.interactive), args.seed)
+             if not keywords.is_urgent(text)]
+    bulk, interactive = texts[:args.bulk], texts[args.bulk:args.bulk + args.interactive]
+
+    start = time.perf_counter()
+    groups = {
+        # Padrão: cliente de lote que não se declara batch (pior caso: mesma classe do frontend)
+        f"lote ({args.bulk_priority})": [
+            classify(classifier, text, args.bulk_priority, "bulk-client", 0.0, args.deadline) for text in bulk
+        ],
+        "frontend": [classify(classifier, text, "interactive", "frontend", 0.2 + index * args.gap, args.deadline)
+                     for index, text in enumerate(interactive)],
+        "urgente": [classify(classifier, URGENT_EMAIL, "interactive", "support-desk", 0.3 + index * 4 * args.gap,
+                             args.deadline)
+                    for index in range(args.urgent)],
+    }
+    futures = {name: asyncio.gather(*coroutines) for name, coroutines in groups.items()}
+    results = {name: await future for name, future in futures.items()}
+    results["__wall__"] = time.perf_counter() - start
+    return results
+
+
+def report(label: str, results: dict) -> None:
+    print(f"\n{label} (lote concluído em {results.pop('__wall__'):.1f}s)")
+    print(f"{'grupo':<20} {'qtd':>5} {'p50 (s)':>9} {'p95 (s)':>9} {'máx (s)':>9}")
+    print("-" * 56)
+    for name, latencies in results.items():
+        ordered = sorted(latencies)
+        print(f"{name:<20} {len(ordered):>5} {statistics.median(ordered):>9.2f} "
+              f"{ordered[int(0.95 * (len(ordered) - 1))]:>9.2f} {ordered[-1]:>9.2f}")
+
+
+async def run(args) -> None:
+    for enabled in (False, True):
+        results = await scenario(args, enabled)
+        report("com escalonador" if enabled else "FIFO no upstream", results)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Prioridade e fair queueing das chamadas ao LLM")
+    parser.add_argument("--bulk", type=int, default=300, help="classificações do cliente de lote")
+    parser.add_argument("--bulk-priority", choices=("interactive", "batch"), default="interactive",
+                        help="classe do cliente de lote (X-Priority)")
+    parser.add_argument("--interactive", type=int, default=40, help="classificações do frontend")
+    parser.add_argument("--urgent", type=int, default=10, help="emails urgentes")
+    parser.add_argument("--gap", type=float, default=0.1, help="intervalo entre classificações do frontend (s)")
+    parser.add_argument("--upstream", type=int, default=8, help="chamadas simultâneas suportadas pelo upstream")
+    parser.add_argument("--latency", default="lognormal:400:0.3", help="latência do Groq falso")
+    parser.add_argument("--deadline", type=float, default=120.0, help="prazo de cada classificação (s)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
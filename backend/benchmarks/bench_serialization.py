@@ -0,0 +1,105 @@
+"""
+Serialization Benchmarks
+========================
+Compara a serialização das respostas da API:
+
+    - fastapi: caminho padrão de um dict retornado com `response_model`
+      (validação + jsonable_encoder + json.dumps do JSONResponse)
+    - orjson: validação única no schema + ORJSONResponse
+    - msgpack: validação única no schema + MsgPackResponse
+
+Para uma resposta de classificação e para o status de um job com 10.000
+itens (os itens já foram validados ao serem gravados).
+
+USO (a partir da raiz do repositório):
+    python -m backend.benchmarks.bench_serialization [--save | --compare]
+"""
+
+import sys
+
+import orjson
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from backend.app.api.responses import MsgPackResponse, validate_once
+from backend.app.models.schemas import ClassificationResponse, JobStatusResponse
+from backend.app.services.classifier import EmailClassifier
+from backend.benchmarks.corpus import generate_corpus
+from backend.benchmarks.runner import BenchCase, run_coroutine, run_suite
+
+SUITE = "serialization"
+
+BATCH_SIZE = 10_000
+
+
+def fastapi_default(field):
+    """Reproduz o caminho padrão do FastAPI para um dict retornado."""
+    def encode(content):
+        data = run_coroutine(serialize_response(field=field, response_content=content, is_coroutine=True))
+        return JSONResponse(content=data).body
+    return encode
+
+
+def build_cases(corpus_size: int = 200):
+    """
+    Monta os casos de benchmark com resultados reais do classificador
+    (modo simulação).
+
+    Returns:
+        List[BenchCase]: Casos da suíte
+    """
+    classifier = EmailClassifier()
+    classifier.client = None  # Modo simulação, sem rede
+    results = []
+    for index, text in enumerate(generate_corpus(corpus_size)):
+        result = run_coroutine(classifier.classify_email(text))
+        result["timings"] = {"nlp": 1.2, "llm.simulate": 0.4, "total": 2.1}
+        if index % 2:
+            result["filename"] = f"email_{index}.txt"
+        results.append(result)
+
+    stored = [validate_once(ClassificationResponse, result, exclude_none=True) for result in results]
+    job = {
+        "job_id": "0" * 32,
+        "status": "completed",
+        "total": BATCH_SIZE,
+        "completed": BATCH_SIZE,
+        "failed": 0,
+        "progress": 1.0,
+        "created_at": 0.0,
+        "updated_at": 0.0,
+        "finished_at": 0.0,
+        "expires_at": 86400.0,
+        "results": [
+            {"index": i, "filename": None, "status": "completed", "result": stored[i % len(stored)]}
+            for i in range(BATCH_SIZE)
+        ],
+    }
+
+    single_field = create_model_field("response", ClassificationResponse, mode="serialization")
+    job_field = create_model_field("response", JobStatusResponse, mode="serialization")
+    payload_size = lambda item: len(orjson.dumps(item))
+
+    return [
+        BenchCase("single.fastapi", fastapi_default(single_field), results, payload_size),
+        BenchCase(
+            "single.orjson",
+            lambda result: ORJSONResponse(validate_once(ClassificationResponse, result)).body,
+            results,
+            payload_size
+        ),
+        BenchCase(
+            "single.msgpack",
+            lambda result: MsgPackResponse(validate_once(ClassificationResponse, result)).body,
+            results,
+            payload_size
+        ),
+        BenchCase("batch_10k.fastapi", fastapi_default(job_field), [job], payload_size),
+        BenchCase("batch_10k.orjson", lambda data: ORJSONResponse(data).body, [job], payload_size),
+        BenchCase("batch_10k.msgpack", lambda data: MsgPackResponse(data).body, [job], payload_size),
+    ]
+
+
+if __name__ == "__main__":
+    sys.exit(run_suite(SUITE, build_cases()))
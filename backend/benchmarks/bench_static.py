@@ -0,0 +1,140 @@
+"""
+Static Frontend Benchmark
+=========================
+Compara a entrega do frontend antes (FileResponse no index.html e
+StaticFiles em css/js, comprimidos a cada requisição pelo middleware) com a
+entrega atual (em memória, nomes com hash, pré-comprimidos):
+
+    - tempo de servidor por arquivo (µs, via ASGI, sem rede)
+    - bytes e requisições de uma primeira visita e de uma visita repetida
+      (navegador com cache: revalida o que não é immutable)
+
+USO (a partir da raiz do repositório):
+    python -m backend.benchmarks.bench_static [--requests 500]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import re
+import statistics
+import time
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import FileResponse
+from fastapi.staticfiles import StaticFiles
+
+from backend.app.api.compression import CompressionMiddleware
+
+FRONTEND_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "frontend")
+HEADERS = {"Accept-Encoding": "gzip, deflate, br"}
+
+
+def before_app() -> FastAPI:
+    """Entrega anterior: arquivos lidos do disco e comprimidos por requisição."""
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware)
+    for directory in ("css", "js"):
+        app.mount(f"/{directory}", StaticFiles(directory=os.path.join(FRONTEND_PATH, directory)))
+
+    @app.get("/")
+    async def root():
+        return FileResponse(os.path.join(FRONTEND_PATH, "index.html"), media_type="text/html")
+
+    return app
+
+
+def after_app() -> FastAPI:
+    """Entrega atual (mesmas rotas de main.py)."""
+    from backend.app.main import app
+    return app
+
+
+def page_urls(html: str) -> list:
+    """index.html + css/js referenciados por ele."""
+    return ["/"] + ["/" + path for path in re.findall(r'(?:href|src)="((?:css|js)/[^"]+)"', html)]
+
+
+async def visit(client: httpx.AsyncClient, cache: dict) -> tuple:
+    """
+    Uma visita à página com o cache de um navegador: arquivos immutable em
+    cache não são pedidos; os demais são revalidados com If-None-Match.
+
+    Returns:
+        tuple: (requisições, bytes do corpo recebidos, respostas 304)
+    """
+    requests = received = not_modified = 0
+    urls = ["/"]
+    for url in urls:
+        cached = cache.get(url)
+        if cached and "immutable" in cached["cache_control"]:
+            continue
+        headers = dict(HEADERS)
+        if cached and cached["etag"]:
+            headers["If-None-Match"] = cached["etag"]
+        response = await client.get(url, headers=headers)
+        requests += 1
+        # Bytes como chegaram (comprimidos), não os descomprimidos pelo httpx
+        received += response.num_bytes_downloaded
+        if response.status_code == 304:
+            not_modified += 1
+        else:
+            cache[url] = {"etag": response.headers.get("etag"),
+                          "cache_control": response.headers.get("cache-control", ""),
+                          "text": response.text}
+        if url == "/":
+            urls += page_urls(cache[url]["text"])[1:]
+    return requests, received, not_modified
+
+
+async def server_times(client: httpx.AsyncClient, urls: list, count: int) -> dict:
+    """Mediana (µs) por arquivo, respostas completas (200)."""
+    times = {}
+    for url in urls:
+        samples = []
+        for _ in range(count):
+            start = time.perf_counter()
+            await client.get(url, headers=HEADERS)
+            samples.append((time.perf_counter() - start) * 1e6)
+        times[url] = statistics.median(samples)
+    return times
+
+
+async def run(count: int) -> None:
+    results = {}
+    for label, app in (("antes", before_app()), ("depois", after_app())):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            urls = page_urls((await client.get("/", headers=HEADERS)).text)
+            cache: dict = {}
+            first = await visit(client, cache)
+            repeat = await visit(client, cache)
+            results[label] = (urls, await server_times(client, urls, count), first, repeat)
+
+    print(f"Tempo de servidor por arquivo (mediana de {count}; µs)\n")
+    print(f"{'arquivo':<10} {'antes':>10} {'depois':>10}")
+    print("-" * 32)
+    for (before_url, before_us), (after_url, after_us) in zip(results["antes"][1].items(), results["depois"][1].items()):
+        name = os.path.basename(before_url) or "index.html"
+        print(f"{name:<10} {before_us:>10.0f} {after_us:>10.0f}")
+
+    print(f"\nVisitas (Accept-Encoding: {HEADERS['Accept-Encoding']})\n")
+    print(f"{'':<16} {'requisições':>12} {'bytes':>8} {'304':>5}")
+    print("-" * 44)
+    for label in ("antes", "depois"):
+        _, _, first, repeat = results[label]
+        print(f"{label + ' (1ª)':<16} {first[0]:>12} {first[1]:>8} {first[2]:>5}")
+        print(f"{label + ' (repetida)':<16} {repeat[0]:>12} {repeat[1]:>8} {repeat[2]:>5}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Frontend estático: disco + compressão por requisição x memória pré-comprimida")
+    parser.add_argument("--requests", type=int, default=500, help="requisições por arquivo na medição de tempo")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+    asyncio.run(run(args.requests))
+
+
+if __name__ == "__main__":
+    main()
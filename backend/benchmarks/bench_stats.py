@@ -0,0 +1,147 @@
+"""
+Stats Rollups Benchmark
+=======================
+Mede as estatísticas por rollups (GET /api/stats) contra o recálculo a
+partir dos resultados brutos (histórico de classificações):
+
+    - custo de registrar um resultado nos rollups (µs)
+    - precisão dos percentis do sketch de latência contra os exatos
+    - tempo de consulta por tamanho de janela (1, 7, 30 e 90 dias): rollups
+      de vários workers x varredura dos resultados brutos no SQLite
+
+Usa bancos temporários, removidos no fim.
+
+USO (a partir da raiz do repositório):
+    python -m backend.benchmarks.bench_stats [--days 90] [--per-hour 200] [--workers 4]
+"""
+
+import argparse
+import logging
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from backend.app.core.stats import DAY, HOUR, LatencySketch, StatsRollups
+from backend.app.services.history_manager import HistoryManager
+from backend.app.services.history_store import HistoryStore
+from backend.app.services.stats_manager import StatsManager
+from backend.app.services.stats_store import StatsStore
+
+
+def fake_result(rng: random.Random) -> dict:
+    """Resultado sintético: latência log-normal, ~2% de falhas, ~3% de resposta padrão."""
+    if rng.random() < 0.02:
+        return {"success": False, "error": "Tempo limite da requisição excedido (20.0s)"}
+    return {
+        "success": True,
+        "classification": "PRODUTIVO" if rng.random() < 0.6 else "IMPRODUTIVO",
+        "confidence": round(rng.betavariate(8, 2), 3),
+        "justification": "Email solicita atualização sobre requisição em andamento",
+        "models": {"classify": "llama-3.1-8b-instant",
+                   "response": "default" if rng.random() < 0.03 else "llama-3.1-8b-instant"},
+        "processing_time_ms": int(rng.lognormvariate(7.0, 0.5)),
+    }
+
+
+def raw_stats(store: HistoryStore, start: float, end: float) -> dict:
+    """Mesmos indicadores recalculados a partir das linhas do histórico."""
+    rows = store._conn.execute(
+        "SELECT classification, confidence, processing_time_ms, model_response "
+        "FROM classification_history WHERE created_at >= ? AND created_at < ?",
+        (start, end)
+    ).fetchall()
+    latencies = sorted(row[2] for row in rows)
+    n = len(latencies)
+    return {
+        "total": n,
+        "categories": {c: sum(1 for row in rows if row[0] == c) for c in ("PRODUTIVO", "IMPRODUTIVO")},
+        "p95": latencies[int(0.95 * (n - 1))] if n else None,
+        "default_responses": sum(1 for row in rows if row[3] == "default"),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Estatísticas: rollups x recálculo dos resultados brutos")
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--per-hour", type=int, default=200, help="classificações por hora (todos os workers)")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    rng = random.Random(args.seed)
+
+    # 1. Custo de registrar um resultado
+    results = [fake_result(rng) for _ in range(20000)]
+    rollups = StatsRollups()
+    start = time.perf_counter()
+    for result in results:
+        rollups.record(result)
+    print(f"Registro nos rollups (hora + dia): {(time.perf_counter() - start) / len(results) * 1e6:.1f} µs/resultado\n")
+
+    # 2. Precisão do sketch
+    samples = [rng.lognormvariate(7.0, 0.8) for _ in range(200000)]
+    sketch = LatencySketch()
+    for value in samples:
+        sketch.add(value)
+    samples.sort()
+    print(f"Sketch de latência ({len(samples)} amostras, {len(sketch.buckets)} buckets)\n")
+    print(f"{'percentil':<10} {'exato (ms)':>12} {'sketch (ms)':>12} {'erro':>8}")
+    print("-" * 45)
+    for fraction in (0.5, 0.9, 0.95, 0.99, 0.999):
+        exact = samples[int(fraction * (len(samples) - 1))]
+        approx = sketch.quantile(fraction)
+        print(f"{'p' + format(fraction * 100, 'g'):<10} {exact:>12.1f} {approx:>12.1f} {abs(approx - exact) / exact:>8.2%}")
+
+    # 3. Consultas: rollups de N workers x resultados brutos
+    directory = tempfile.mkdtemp(prefix="bench_stats_")
+    try:
+        stats_store = StatsStore(os.path.join(directory, "stats.db"))
+        history = HistoryStore(os.path.join(directory, "history.db"))
+        now = int(time.time() // HOUR) * HOUR
+        first_hour = now - args.days * DAY
+        print(f"\nGerando {args.days} dias x {args.per_hour} classificações/hora em {args.workers} workers...")
+        for day in range(first_hour, now, DAY):
+            day_rollups = [StatsRollups() for _ in range(args.workers)]
+            rows = []
+            for hour in range(day, min(day + DAY, now), HOUR):
+                for _ in range(args.per_hour):
+                    created_at = hour + rng.random() * HOUR
+                    result = fake_result(rng)
+                    day_rollups[rng.randrange(args.workers)].record(result, now=created_at)
+                    if result["success"]:
+                        rows.append(HistoryManager.build_row("email", result, "text", created_at))
+            history.insert_many(rows)
+            for worker, worker_rollups in enumerate(day_rollups):
+                stats_store.save(f"worker-{worker}", worker_rollups.pending())
+
+        manager = StatsManager(StatsRollups(), stats_store)
+        print("\nConsulta por janela (mediana de 5; ms)\n")
+        print(f"{'janela':<10} {'resultados':>11} {'rollups':>10} {'brutos':>10} {'p95 rollups':>12} {'p95 exato':>10}")
+        print("-" * 68)
+        for days in (1, 7, 30, args.days):
+            end = now - 1800
+            begin = end - days * DAY
+            rollup_ms, raw_ms = [], []
+            for _ in range(5):
+                started = time.perf_counter()
+                stats = manager.query(begin, end)
+                rollup_ms.append((time.perf_counter() - started) * 1000)
+                started = time.perf_counter()
+                # A janela do /api/stats é alinhada a horas: mesma janela no recálculo
+                raw = raw_stats(history, stats["start"], stats["end"])
+                raw_ms.append((time.perf_counter() - started) * 1000)
+            print(f"{f'{days} dia(s)':<10} {stats['total']:>11} {statistics.median(rollup_ms):>10.2f} "
+                  f"{statistics.median(raw_ms):>10.1f} {stats['latency_ms']['p95']:>12.1f} {raw['p95']:>10}")
+        stats_store.close()
+        history.close()
+    finally:
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+        os.rmdir(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Tokenizer Benchmarks
+====================
+Tokenização com remoção de stop words sobre o corpus sintético:
+
+    - NLTK: word_tokenize (Punkt + Treebank) e filtro de alfanuméricos e
+      stop words, como o pipeline fazia (precisa dos dados punkt)
+    - regex: utils/tokenizer.py, uma passada com as stop words no mesmo laço
+
+Antes da tabela de tempos, mostra quantos emails têm a mesma saída nas duas
+tokenizações. O throughput da tabela é em caracteres de texto por segundo.
+
+USO (a partir da raiz do repositório):
+    python -m backend.benchmarks.bench_tokenizer [--save | --compare]
+"""
+
+import sys
+
+from backend.app.utils.text_cleaner import TextCleaner, get_language_resources
+from backend.app.utils.tokenizer import tokenize
+from backend.benchmarks.corpus import generate_corpus, generate_thread_corpus
+from backend.benchmarks.runner import BenchCase, run_suite
+
+SUITE = "tokenizer"
+
+
+def nltk_tokenizer(stop_words):
+    """
+    Tokenização anterior (NLTK), ou None se os dados punkt não estão instalados.
+    """
+    from nltk.tokenize import word_tokenize
+
+    def tokenize_nltk(text):
+        return [
+            token for token in word_tokenize(text.lower(), language="portuguese")
+            if token.isalnum() and token not in stop_words
+        ]
+
+    try:
+        tokenize_nltk("Teste.")
+    except LookupError:
+        return None
+    return tokenize_nltk
+
+
+def build_cases(corpus_size: int = 500):
+    """
+    Monta os casos sobre emails limpos (entrada da tokenização no pipeline).
+
+    Returns:
+        tuple: (casos, textos, tokenização NLTK ou None)
+    """
+    cleaner = TextCleaner("pt")
+    stop_words = get_language_resources("pt").stop_words
+    corpus = generate_corpus(corpus_size) + generate_thread_corpus(corpus_size // 5)
+    texts = [cleaner.clean(cleaner.extract_main_content(text)) for text in corpus]
+    tokenize_nltk = nltk_tokenizer(stop_words)
+
+    cases = [BenchCase("regex.tokenize", lambda text: tokenize(text, stop_words), texts)]
+    if tokenize_nltk is not None:
+        cases.insert(0, BenchCase("nltk.word_tokenize", tokenize_nltk, texts))
+    cases.append(BenchCase("text_cleaner.apply_nlp_preprocessing", cleaner.apply_nlp_preprocessing, texts))
+    return cases, texts, tokenize_nltk
+
+
+def print_parity(texts, tokenize_nltk) -> None:
+    """Imprime quantos emails têm a mesma saída com NLTK e com o regex."""
+    if tokenize_nltk is None:
+        print("Dados punkt do NLTK não instalados: medindo apenas o tokenizador por regex\n")
+        return
+    stop_words = get_language_resources("pt").stop_words
+    same = sum(tokenize(text, stop_words) == tokenize_nltk(text) for text in texts)
+    tokens = sum(len(tokenize(text, stop_words)) for text in texts)
+    print(f"Paridade com o NLTK: {same}/{len(texts)} emails idênticos ({tokens} tokens)\n")
+
+
+if __name__ == "__main__":
+    cases, texts, tokenize_nltk = build_cases()
+    print_parity(texts, tokenize_nltk)
+    sys.exit(run_suite(SUITE, cases))
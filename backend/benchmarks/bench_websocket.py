@@ -0,0 +1,165 @@
+"""
+WebSocket Benchmark
+===================
+Fluxo contínuo de classificações de um mesmo cliente (ex.: gateway de
+email), com o mesmo número de mensagens em andamento:
+
+    - HTTP: POST /api/classify-text por mensagem (keep-alive, N workers)
+    - WebSocket: uma conexão em /api/ws/classify com N créditos
+
+Sobe o servidor com uvicorn em um subprocesso, em modo de simulação (sem
+GROQ_API_KEY): o pipeline de NLP roda inteiro e a diferença medida é o
+custo por mensagem do transporte (HTTP, parsing do corpo, validação).
+Mede mensagens/s, latência por mensagem e CPU do servidor por mensagem.
+
+USO (a partir da raiz do repositório):
+    python -m backend.benchmarks.bench_websocket [--messages 3000] [--in-flight 16]
+"""
+
+import argparse
+import asyncio
+import itertools
+import logging
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+import orjson
+import websockets
+
+from backend.benchmarks.corpus import generate_corpus
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def cpu_seconds(pid: int) -> float:
+    """CPU (usuário + sistema) do processo, via /proc (Linux)."""
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def start_server(port: int, workdir: str) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        GROQ_API_KEY="",
+        LOG_LEVEL="ERROR",
+        HISTORY_ENABLED="false",
+        JOBS_DB_PATH=os.path.join(workdir, "jobs.db"),
+        STATS_DB_PATH=os.path.join(workdir, "stats.db"),
+    )
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.app.main:app", "--port", str(port), "--log-level", "error"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+
+async def wait_ready(base_url: str) -> None:
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        for _ in range(200):
+            try:
+                if (await client.get("/api/health")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.05)
+    raise RuntimeError("Servidor não respondeu")
+
+
+async def run_http(base_url: str, texts: list, in_flight: int) -> list:
+    """Latências (s) com N workers fazendo POST em sequência."""
+    latencies = []
+    source = iter(texts)
+
+    async def worker(client: httpx.AsyncClient):
+        for text in source:
+            start = time.perf_counter()
+            response = await client.post("/api/classify-text", json={"email_text": text, "generate_response": False})
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+
+    limits = httpx.Limits(max_connections=in_flight, max_keepalive_connections=in_flight)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits) as client:
+        await asyncio.gather(*(worker(client) for _ in range(in_flight)))
+    return latencies
+
+
+async def run_websocket(base_url: str, texts: list, in_flight: int) -> list:
+    """Latências (s) em uma conexão, mantendo `in_flight` mensagens em andamento."""
+    latencies = []
+    sent = {}
+    async with websockets.connect(base_url.replace("http", "ws") + "/api/ws/classify") as ws:
+        ready = orjson.loads(await ws.recv())
+        credits = min(in_flight, ready["credits"])
+        ids = itertools.count()
+        pending = iter(texts)
+
+        async def send_next():
+            text = next(pending, None)
+            if text is not None:
+                message_id = next(ids)
+                sent[message_id] = time.perf_counter()
+                await ws.send(orjson.dumps({"id": message_id, "email_text": text, "generate_response": False}).decode())
+
+        for _ in range(credits):
+            await send_next()
+        while sent:
+            reply = orjson.loads(await ws.recv())
+            if reply["type"] != "result":
+                raise RuntimeError(f"Erro na mensagem {reply['id']}: {reply['detail']}")
+            latencies.append(time.perf_counter() - sent.pop(reply["id"]))
+            # Cada resposta devolve um crédito
+            await send_next()
+    return latencies
+
+
+async def run(args) -> None:
+    texts = generate_corpus(args.messages, args.seed)
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    with tempfile.TemporaryDirectory() as workdir:
+        server = start_server(port, workdir)
+        try:
+            await wait_ready(base_url)
+            # Aquecimento (imports, caches do NLP)
+            await run_http(base_url, texts[:200], args.in_flight)
+            await run_websocket(base_url, texts[:200], args.in_flight)
+
+            print(f"{args.messages} mensagens, {args.in_flight} em andamento (modo simulação)\n")
+            print(f"{'transporte':<12} {'msg/s':>8} {'p50 (ms)':>10} {'p95 (ms)':>10} {'CPU/msg (µs)':>14}")
+            print("-" * 58)
+            for label, runner in (("HTTP", run_http), ("WebSocket", run_websocket)):
+                cpu_before = cpu_seconds(server.pid)
+                start = time.perf_counter()
+                latencies = sorted(await runner(base_url, texts, args.in_flight))
+                wall = time.perf_counter() - start
+                cpu = cpu_seconds(server.pid) - cpu_before
+                print(f"{label:<12} {len(latencies) / wall:>8.0f} {statistics.median(latencies) * 1000:>10.2f} "
+                      f"{latencies[int(0.95 * (len(latencies) - 1))] * 1000:>10.2f} {cpu / len(latencies) * 1e6:>14.0f}")
+        finally:
+            server.terminate()
+            server.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Classificação por HTTP x WebSocket")
+    parser.add_argument("--messages", type=int, default=3000)
+    parser.add_argument("--in-flight", type=int, default=16, help="mensagens em andamento (workers HTTP ou créditos)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
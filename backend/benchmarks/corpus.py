@@ -0,0 +1,378 @@
+"""
+Synthetic Corpus
+================
+Gera um corpus sintético de emails corporativos em português para os
+benchmarks. A geração é determinística (seed fixa) e segue uma distribuição
+de tamanhos próxima da real: maioria de emails curtos, uma parcela média e
+uma cauda de emails longos (até o limite de 10.000 caracteres da API).
+"""
+
+import random
+import re
+from typing import List, Optional, Tuple
+
+# ==================== FRAGMENTOS ====================
+
+SAUDACOES = [
+    "Prezados,", "Prezada equipe,", "Olá,", "Bom dia,", "Boa tarde, pessoal,",
+    "Caro suporte,", "Olá equipe de atendimento,",
+]
+
+FRASES_PRODUTIVAS = [
+    "Gostaria de solicitar o status da minha requisição #{num} aberta na semana passada.",
+    "O sistema de pagamentos está apresentando erro ao processar transações acima de R$ {valor}.",
+    "Não consigo acessar minha conta desde ontem, aparece a mensagem \"senha inválida\".",
+    "Preciso de uma cópia do contrato {num} assinado para enviar à auditoria até {data}.",
+    "Poderiam verificar por que o boleto com vencimento em {data} ainda consta como pendente?",
+    "O relatório de conciliação não está sendo gerado; já tentei limpar o cache e trocar de navegador.",
+    "Venho registrar minha insatisfação com o atendimento recebido no último sábado.",
+    "Qual é o prazo para a análise da documentação enviada no protocolo {num}?",
+    "A integração com a API retorna timeout (erro 504) em aproximadamente 30% das chamadas.",
+    "Solicito a atualização cadastral do CNPJ {cnpj} conforme documentos em anexo.",
+    "Há uma divergência de R$ {valor} entre o extrato e a fatura do mês de {mes}.",
+    "É urgente: o prazo regulatório vence em {data} e ainda não recebemos o parecer.",
+]
+
+FRASES_IMPRODUTIVAS = [
+    "Passando para desejar a todos um Feliz Natal e um próspero Ano Novo!",
+    "Muito obrigado pela ajuda de ontem, vocês são incríveis!",
+    "Parabéns pelo aniversário da empresa, que venham muitos anos de sucesso.",
+    "Lembre-se: cada dia é uma nova oportunidade de fazer a diferença!",
+    "Compartilhe esta mensagem com seus amigos e colegas de trabalho.",
+    "Foi um prazer participar do evento de integração na sexta-feira.",
+    "Segue a foto da confraternização de fim de ano, ficou ótima!",
+]
+
+FRASES_CONTEXTO = [
+    "Conforme conversamos por telefone, segue o detalhamento da situação.",
+    "Já entrei em contato anteriormente, mas não obtive retorno.",
+    "Anexei os comprovantes e as telas de erro para facilitar a análise.",
+    "Caso precisem de mais informações, fico à disposição.",
+    "Esse problema está impactando diretamente o fechamento do mês.",
+    "Agradeço desde já a atenção e aguardo um retorno.",
+    "Ressalto que a operação envolve clientes do segmento corporativo.",
+    "Segundo o gerente da conta, o procedimento deveria levar dois dias úteis.",
+]
+
+ASSINATURAS = [
+    "\n\nAtenciosamente,\n{nome}\nAnalista Financeiro\nTel.: (11) 9{num}",
+    "\n\nAtt,\n{nome}",
+    "\n\nCordialmente,\n{nome}\nGerente de Operações",
+    "\n--\n{nome}\nEnviado do meu iPhone",
+    "\n\nUm abraço,\n{nome}",
+]
+
+NOMES = [
+    "João Silva", "Maria Santos", "Paula Oliveira", "Carlos Souza",
+    "Ana Paula Lima", "Ricardo Almeida", "Fernanda Costa",
+]
+
+MESES = ["janeiro", "fevereiro", "março", "abril", "maio", "junho"]
+
+# Faixas de tamanho (caracteres) e sua participação no corpus
+SIZE_BUCKETS = [
+    (150, 600, 0.60),     # curtos
+    (600, 2500, 0.30),    # médios
+    (2500, 9500, 0.10),   # longos
+]
+
+
+def _fill(template: str, rng: random.Random) -> str:
+    """Preenche os campos variáveis de um fragmento."""
+    return template.format(
+        num=rng.randint(10000, 99999),
+        valor=f"{rng.randint(1, 99)}.{rng.randint(100, 999)},{rng.randint(10, 99)}",
+        data=f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/2026",
+        cnpj=f"{rng.randint(10, 99)}.{rng.randint(100, 999)}.{rng.randint(100, 999)}/0001-{rng.randint(10, 99)}",
+        mes=rng.choice(MESES),
+        nome=rng.choice(NOMES),
+    )
+
+
+def generate_email(rng: random.Random, target_length: int, produtivo: Optional[bool] = None) -> str:
+    """
+    Gera um email sintético com aproximadamente `target_length` caracteres.
+
+    Args:
+        rng: Gerador aleatório
+        target_length: Tamanho aproximado do corpo
+        produtivo: Categoria do email (None = sorteada, 70% produtivos)
+
+    Returns:
+        str: Email completo (saudação, corpo e assinatura)
+    """
+    if produtivo is None:
+        produtivo = rng.random() < 0.7
+    frases = FRASES_PRODUTIVAS if produtivo else FRASES_IMPRODUTIVAS
+
+    parts = [rng.choice(SAUDACOES), "\n\n"]
+    length = 0
+    paragraph_len = 0
+    while length < target_length:
+        pool = frases if rng.random() < 0.6 else FRASES_CONTEXTO
+        sentence = _fill(rng.choice(pool), rng)
+        parts.append(sentence)
+        length += len(sentence) + 1
+        paragraph_len += 1
+        if paragraph_len >= rng.randint(2, 4):
+            parts.append("\n\n")
+            paragraph_len = 0
+        else:
+            parts.append(" ")
+
+    parts.append(_fill(rng.choice(ASSINATURAS), rng))
+    return "".join(parts).strip()
+
+
+def generate_corpus(size: int = 200, seed: int = 42) -> List[str]:
+    """
+    Gera o corpus de emails respeitando a distribuição de tamanhos.
+
+    Args:
+        size: Quantidade de emails
+        seed: Semente para reprodutibilidade
+
+    Returns:
+        List[str]: Emails gerados
+    """
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(size):
+        roll = rng.random()
+        acc = 0.0
+        for low, high, share in SIZE_BUCKETS:
+            acc += share
+            if roll <= acc:
+                break
+        corpus.append(generate_email(rng, rng.randint(low, high)))
+    return corpus
+
+
+def generate_labeled_corpus(size: int = 200, seed: int = 42) -> List[Tuple[str, str]]:
+    """
+    Gera emails com a categoria esperada (PRODUTIVO/IMPRODUTIVO), para
+    comparar a qualidade de variações do pipeline.
+
+    Args:
+        size: Quantidade de emails
+        seed: Semente para reprodutibilidade
+
+    Returns:
+        List[Tuple[str, str]]: (email, categoria esperada)
+    """
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(size):
+        produtivo = rng.random() < 0.7
+        email = generate_email(rng, rng.randint(80, 1500), produtivo=produtivo)
+        corpus.append((email, "PRODUTIVO" if produtivo else "IMPRODUTIVO"))
+    return corpus
+
+
+# Estilos de citação das mensagens anteriores em cadeias de resposta
+THREAD_STYLES = ("gmail", "outlook", "forward")
+
+
+def _quote_previous(message: str, style: str, rng: random.Random) -> str:
+    """Formata uma mensagem anterior como histórico citado no estilo informado."""
+    nome = rng.choice(NOMES)
+    data = f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/2026"
+    if style == "gmail":
+        quoted = "\n".join(f"> {line}" if line else ">" for line in message.split("\n"))
+        return f"Em {data} às {rng.randint(8, 18)}:{rng.randint(10, 59)}, {nome} <contato@empresa.com.br> escreveu:\n{quoted}"
+    if style == "outlook":
+        return (
+            f"-----Mensagem original-----\nDe: {nome} <contato@empresa.com.br>\n"
+            f"Enviada em: {data}\nPara: Suporte\nAssunto: RE: Solicitação\n\n{message}"
+        )
+    return (
+        f"---------- Forwarded message ---------\nDe: {nome} <contato@empresa.com.br>\n"
+        f"Date: {data}\nSubject: Solicitação\nTo: <suporte@empresa.com.br>\n\n{message}"
+    )
+
+
+def generate_thread_corpus(size: int = 200, seed: int = 42, max_length: int = 10000) -> List[str]:
+    """
+    Gera emails com cadeias de resposta: uma mensagem nova curta seguida de
+    1 a 5 mensagens anteriores citadas (Gmail, Outlook ou encaminhamento).
+
+    Args:
+        size: Quantidade de emails
+        seed: Semente para reprodutibilidade
+        max_length: Tamanho máximo de cada email
+
+    Returns:
+        List[str]: Emails com histórico citado
+    """
+    rng = random.Random(seed)
+    threads = []
+    for _ in range(size):
+        thread = generate_email(rng, rng.randint(80, 400))
+        for _ in range(rng.randint(1, 5)):
+            previous = generate_email(rng, rng.randint(150, 2000))
+            candidate = f"{thread}\n\n{_quote_previous(previous, rng.choice(THREAD_STYLES), rng)}"
+            if len(candidate) > max_length:
+                break
+            thread = candidate
+        threads.append(thread)
+    return threads
+
+
+def generate_llm_outputs(size: int = 200, seed: int = 42, defect_rate: float = 0.0) -> List[str]:
+    """
+    Gera respostas de classificação no estilo do LLM (com ruídos comuns:
+    blocos markdown, texto antes/depois do JSON).
+
+    Args:
+        size: Quantidade de respostas
+        seed: Semente para reprodutibilidade
+        defect_rate: Fração com defeitos de sintaxe (aspas simples, vírgula
+            decimal, categoria em minúsculas ou JSON cortado)
+
+    Returns:
+        List[str]: Respostas brutas
+    """
+    rng = random.Random(seed)
+    outputs = []
+    for _ in range(size):
+        categoria = rng.choice(["PRODUTIVO", "IMPRODUTIVO"])
+        body = (
+            '{\n  "categoria": "%s",\n  "confianca": 0.%02d,\n'
+            '  "justificativa": "Email solicita status de requisição com prazo definido"\n}'
+            % (categoria, rng.randint(50, 99))
+        )
+        style = rng.random()
+        if style < 0.5:
+            outputs.append(body)
+        elif style < 0.8:
+            outputs.append(f"```json\n{body}\n```")
+        else:
+            outputs.append(f"Aqui está a classificação:\n{body}\nEspero ter ajudado.")
+        if defect_rate and rng.random() < defect_rate:
+            outputs[-1] = _llm_defect(outputs[-1], rng)
+    return outputs
+
+
+def _llm_defect(output: str, rng: random.Random) -> str:
+    """Aplica um defeito de sintaxe comum em saídas de LLM."""
+    defect = rng.choice(("single_quotes", "decimal_comma", "decimal_string", "lowercase", "truncated"))
+    if defect == "single_quotes":
+        return output.replace('"', "'")
+    if defect == "decimal_comma":
+        return output.replace('"confianca": 0.', '"confianca": 0,')
+    if defect == "decimal_string":
+        return re.sub(r'"confianca": 0\.(\d+)', r'"confianca": "0,\1"', output)
+    if defect == "lowercase":
+        return output.replace('PRODUTIVO"', 'produtivo"')
+    return output[:len(output) // 2]
+
+
+def make_newsletter_html(target_bytes: int = 200_000, seed: int = 42) -> str:
+    """
+    Gera um email HTML no estilo de newsletter: layout em tabelas com CSS
+    inline, bloco <style>, script, preheader oculto e pixels de rastreamento.
+
+    Args:
+        target_bytes: Tamanho aproximado do documento
+        seed: Semente para reprodutibilidade
+
+    Returns:
+        str: Documento HTML
+    """
+    rng = random.Random(seed)
+    cell_style = (
+        'style="font-family:Arial,Helvetica,sans-serif;font-size:14px;line-height:20px;'
+        'color:#333333;padding:12px 24px;mso-line-height-rule:exactly;"'
+    )
+    head = (
+        "<!DOCTYPE html><html><head><meta charset=\"utf-8\"><title>Novidades</title>"
+        "<style>body{margin:0;padding:0}.btn{background:#0a66c2;color:#fff}"
+        "@media only screen and (max-width:600px){.col{width:100%!important}}</style>"
+        "<script>window.dataLayer=window.dataLayer||[];</script></head>"
+        "<body><div style=\"display:none;max-height:0;overflow:hidden\">"
+        "Confira as novidades deste mês &zwnj;&nbsp;&zwnj;&nbsp;</div>"
+        "<table role=\"presentation\" width=\"100%\" cellpadding=\"0\" cellspacing=\"0\" border=\"0\">"
+    )
+    parts = [head]
+    size = len(head)
+    while size < target_bytes:
+        sentence = _fill(rng.choice(FRASES_CONTEXTO + FRASES_IMPRODUTIVAS), rng)
+        block = (
+            f'<tr><td class="col" {cell_style}><h2 style="margin:0;font-size:18px">Destaque {rng.randint(1, 99)}</h2>'
+            f'<p style="margin:8px 0">{sentence} Saiba mais &raquo;</p>'
+            f'<a class="btn" href="https://click.example.com/?u={rng.randint(10**8, 10**9)}&amp;id={rng.randint(1, 999)}" '
+            f'style="display:inline-block;padding:10px 16px;border-radius:4px">Ler mais</a>'
+            f'<img src="https://track.example.com/open.gif?id={rng.randint(10**8, 10**9)}" width="1" height="1" '
+            f'style="display:block;border:0" alt=""></td></tr>'
+        )
+        parts.append(block)
+        size += len(block)
+    parts.append("</table></body></html>")
+    return "".join(parts)
+
+
+def _pdf_escape(text: str) -> str:
+    """Escapa caracteres especiais de strings PDF."""
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(text: str, lines_per_page: int = 50, chars_per_line: int = 90) -> bytes:
+    """
+    Monta um PDF mínimo (Helvetica, WinAnsi) contendo o texto informado.
+
+    Args:
+        text: Texto a ser escrito no PDF
+        lines_per_page: Linhas por página
+        chars_per_line: Quebra de linha aproximada
+
+    Returns:
+        bytes: Conteúdo do arquivo PDF
+    """
+    lines: List[str] = []
+    for paragraph in text.split("\n"):
+        while len(paragraph) > chars_per_line:
+            cut = paragraph.rfind(" ", 0, chars_per_line)
+            cut = cut if cut > 0 else chars_per_line
+            lines.append(paragraph[:cut])
+            paragraph = paragraph[cut:].lstrip()
+        lines.append(paragraph)
+
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[""]]
+
+    objects: List[bytes] = []
+    # 1: catálogo, 2: árvore de páginas, 3: fonte; depois pares (página, conteúdo)
+    page_ids = [4 + 2 * i for i in range(len(pages))]
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    kids = " ".join(f"{pid} 0 R" for pid in page_ids)
+    objects.append(f"<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>".encode())
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+
+    for i, page_lines in enumerate(pages):
+        stream_lines = ["BT", "/F1 10 Tf", "14 TL", "40 800 Td"]
+        for line in page_lines:
+            stream_lines.append(f"({_pdf_escape(line)}) Tj T*")
+        stream_lines.append("ET")
+        stream = "\n".join(stream_lines).encode("cp1252", errors="replace")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_ids[i] + 1} 0 R >>".encode()
+        )
+        objects.append(
+            b"<< /Length " + str(len(stream)).encode() + b" >>\nstream\n" + stream + b"\nendstream"
+        )
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+
+    xref_offset = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode()
+    out += (
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+        f"startxref\n{xref_offset}\n%%EOF\n"
+    ).encode()
+    return bytes(out)
@@ -0,0 +1,234 @@
+"""
+Benchmark Runner
+================
+Infraestrutura comum dos benchmarks: medição por chamada, relatório,
+gravação de baselines e comparação com detecção de regressões.
+
+USO (a partir da raiz do repositório):
+    python -m backend.benchmarks.bench_hotpaths                 # apenas mede
+    python -m backend.benchmarks.bench_hotpaths --save          # grava baseline
+    python -m backend.benchmarks.bench_hotpaths --compare       # compara com baseline
+    python -m backend.benchmarks.bench_hotpaths --compare --threshold 0.10
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Sequence
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import os
+import platform
+import statistics
+import time
+
+# Diretório padrão das baselines
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), "baselines")
+
+
+class BenchCase:
+    """
+    Caso de benchmark: uma função aplicada a cada entrada do corpus.
+
+    Attributes:
+        name: Nome do caso (chave na baseline)
+        func: Função medida (síncrona ou coroutine function)
+        inputs: Entradas passadas uma a uma para a função
+        size_of: Função que retorna o tamanho de uma entrada (para throughput)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[Any], Any],
+        inputs: Sequence[Any],
+        size_of: Optional[Callable[[Any], int]] = None
+    ):
+        self.name = name
+        self.func = func
+        self.inputs = inputs
+        self.size_of = size_of or (lambda item: len(item) if hasattr(item, "__len__") else 0)
+
+
+def run_coroutine(coro) -> Any:
+    """
+    Executa uma coroutine que não suspende (ex.: `classify_email` em modo de
+    simulação) sem o custo de um event loop, para não medir o overhead do loop.
+    """
+    try:
+        coro.send(None)
+    except StopIteration as stop:
+        return stop.value
+    coro.close()
+    raise RuntimeError("coroutine suspendeu; use asyncio.run")
+
+
+def measure(case: BenchCase, rounds: int = 5, warmup: int = 1) -> Dict[str, float]:
+    """
+    Mede cada chamada individualmente ao longo de várias rodadas.
+
+    Para cada entrada é mantido o melhor tempo entre as rodadas; os
+    percentis refletem então a distribuição de tamanhos do corpus.
+
+    Args:
+        case: Caso de benchmark
+        rounds: Rodadas completas sobre as entradas
+        warmup: Rodadas descartadas (aquecimento de caches)
+
+    Returns:
+        Dict com p50/p95/média por chamada (µs) e throughput
+    """
+    is_async = asyncio.iscoroutinefunction(case.func)
+    func = case.func
+    # Melhor tempo de cada entrada entre as rodadas (reduz ruído do sistema)
+    best: List[int] = [0] * len(case.inputs)
+    total_size = sum(case.size_of(item) for item in case.inputs)
+
+    for round_index in range(warmup + rounds):
+        gc.collect()
+        gc.disable()
+        try:
+            for index, item in enumerate(case.inputs):
+                start = time.perf_counter_ns()
+                if is_async:
+                    run_coroutine(func(item))
+                else:
+                    func(item)
+                elapsed = time.perf_counter_ns() - start
+                if round_index == warmup or (round_index > warmup and elapsed < best[index]):
+                    best[index] = elapsed
+        finally:
+            gc.enable()
+
+    samples = sorted(best)
+    total_s = sum(samples) / 1e9
+    return {
+        "calls": len(samples) * rounds,
+        "p50_us": samples[len(samples) // 2] / 1e3,
+        "p95_us": samples[int(len(samples) * 0.95)] / 1e3,
+        "mean_us": statistics.fmean(samples) / 1e3,
+        "throughput_mb_s": (total_size / 1e6) / total_s if total_s else 0.0,
+    }
+
+
+def print_report(results: Dict[str, Dict[str, float]]) -> None:
+    """Imprime tabela com os resultados."""
+    print(f"{'caso':<40} {'p50 (µs)':>12} {'p95 (µs)':>12} {'média (µs)':>12} {'MB/s':>10}")
+    print("-" * 90)
+    for name, stats in results.items():
+        print(
+            f"{name:<40} {stats['p50_us']:>12.1f} {stats['p95_us']:>12.1f} "
+            f"{stats['mean_us']:>12.1f} {stats['throughput_mb_s']:>10.2f}"
+        )
+
+
+def save_baseline(suite: str, results: Dict[str, Dict[str, float]], path: Optional[str] = None) -> str:
+    """
+    Grava os resultados como baseline da suíte.
+
+    Returns:
+        str: Caminho do arquivo gravado
+    """
+    path = path or os.path.join(BASELINE_DIR, f"{suite}.json")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    payload = {
+        "suite": suite,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2, ensure_ascii=False)
+    return path
+
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    threshold: float
+) -> List[str]:
+    """
+    Compara resultados com a baseline usando o p50 por chamada.
+
+    Args:
+        results: Resultados atuais
+        baseline: Resultados da baseline
+        threshold: Piora relativa tolerada (0.15 = 15%)
+
+    Returns:
+        List[str]: Casos que regrediram além do limite
+    """
+    regressions = []
+    print(f"\n{'caso':<40} {'baseline':>12} {'atual':>12} {'variação':>10}")
+    print("-" * 78)
+    for name, stats in results.items():
+        if name not in baseline:
+            print(f"{name:<40} {'-':>12} {stats['p50_us']:>12.1f} {'novo':>10}")
+            continue
+        before = baseline[name]["p50_us"]
+        after = stats["p50_us"]
+        delta = (after - before) / before if before else 0.0
+        flag = ""
+        if delta > threshold:
+            regressions.append(name)
+            flag = "  << REGRESSÃO"
+        print(f"{name:<40} {before:>12.1f} {after:>12.1f} {delta:>+9.1%}{flag}")
+    return regressions
+
+
+def run_suite(suite: str, cases: List[BenchCase], argv: Optional[List[str]] = None) -> int:
+    """
+    Ponto de entrada de linha de comando das suítes.
+
+    Args:
+        suite: Nome da suíte (define o arquivo de baseline)
+        cases: Casos a medir
+        argv: Argumentos (padrão: sys.argv)
+
+    Returns:
+        int: Código de saída (1 se houver regressão)
+    """
+    parser = argparse.ArgumentParser(description=f"Benchmarks: {suite}")
+    parser.add_argument("--rounds", type=int, default=5, help="rodadas medidas")
+    parser.add_argument("--filter", default="", help="mede apenas casos que contêm o texto")
+    parser.add_argument("--save", action="store_true", help="grava os resultados como baseline")
+    parser.add_argument("--compare", action="store_true", help="compara com a baseline gravada")
+    parser.add_argument("--baseline", default=None, help="caminho alternativo da baseline")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="piora relativa do p50 considerada regressão (padrão: 0.15)")
+    parser.add_argument("--with-logging", action="store_true",
+                        help="mantém o logging ativo durante a medição")
+    args = parser.parse_args(argv)
+
+    if not args.with_logging:
+        logging.disable(logging.CRITICAL)
+
+    results: Dict[str, Dict[str, float]] = {}
+    for case in cases:
+        if args.filter and args.filter not in case.name:
+            continue
+        results[case.name] = measure(case, rounds=args.rounds)
+
+    print_report(results)
+
+    exit_code = 0
+    if args.compare:
+        path = args.baseline or os.path.join(BASELINE_DIR, f"{suite}.json")
+        if not os.path.exists(path):
+            print(f"\n[AVISO] Baseline não encontrada: {path} (use --save)")
+        else:
+            with open(path, encoding="utf-8") as f:
+                baseline = json.load(f)["results"]
+            regressions = compare(results, baseline, args.threshold)
+            if regressions:
+                print(f"\n[ERRO] {len(regressions)} regressão(ões) acima de {args.threshold:.0%}: "
+                      f"{', '.join(regressions)}")
+                exit_code = 1
+            else:
+                print(f"\n[OK] Nenhuma regressão acima de {args.threshold:.0%}")
+
+    if args.save:
+        print(f"\nBaseline gravada em {save_baseline(suite, results, args.baseline)}")
+
+    return exit_code
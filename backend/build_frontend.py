@@ -0,0 +1,38 @@
+"""
+Frontend Build
+==============
+Gera frontend/dist: assets de frontend/css, frontend/js e frontend/assets
+com o hash do conteúdo no nome, versões pré-comprimidas (.gz e .br), o
+index.html apontando para os nomes com hash e o manifesto.
+
+O servidor carrega o build na inicialização; sem ele (ou com os fontes
+alterados depois do build), o mesmo processamento é feito em memória.
+
+USO (a partir da raiz do repositório):
+    python -m backend.build_frontend
+"""
+
+import logging
+import os
+import time
+
+from backend.app.api.static_assets import DIST_DIRECTORY, write_dist
+
+FRONTEND_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "frontend")
+
+
+def main() -> None:
+    logging.disable(logging.CRITICAL)
+    start = time.perf_counter()
+    sizes = write_dist(FRONTEND_PATH)
+    elapsed = time.perf_counter() - start
+
+    print(f"Build em {os.path.join(FRONTEND_PATH, DIST_DIRECTORY)} ({elapsed * 1000:.0f} ms)\n")
+    print(f"{'arquivo':<32} {'original':>10} {'gzip':>8} {'br':>8}")
+    print("-" * 61)
+    for path, size in sorted(sizes.items()):
+        print(f"{path:<32} {size['original']:>10} {size.get('gzip', '-'):>8} {size.get('br', '-'):>8}")
+
+
+if __name__ == "__main__":
+    main()
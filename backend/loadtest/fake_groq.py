@@ -0,0 +1,322 @@
+"""
+Fake Groq Server
+================
+Servidor local compatível com a API OpenAI/Groq (`/openai/v1/chat/completions`)
+para testes de carga sem chamar a API real.
+
+Latência, taxa de erros e rate limit são configuráveis na linha de comando
+ou em tempo de execução via `POST /fake/config` (usado pelos cenários).
+Sem `response_format` JSON, uma fração das classificações pode vir com os
+defeitos comuns de LLMs (--malformed-rate); com ele, o JSON é sempre limpo
+(ou a chamada é recusada com --no-json-mode, como em modelos sem suporte).
+
+USO (a partir da raiz do repositório):
+    python -m backend.loadtest.fake_groq --port 9000 --latency lognormal:400:0.6 \\
+        --error-rate 0.02 --rate-limit 30
+
+    # Apontar a aplicação para o servidor falso:
+    GROQ_API_KEY=fake GROQ_API_BASE=http://127.0.0.1:9000/openai/v1 \\
+        uvicorn backend.app.main:app
+"""
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from typing import Any, Dict, Optional
+import argparse
+import asyncio
+import json
+import math
+import random
+import re
+import time
+import uuid
+
+# Palavras que indicam email produtivo (mesma ideia do modo simulação)
+KEYWORDS_PRODUTIVO = [
+    "solicit", "dúvida", "duvida", "problema", "suporte", "ajuda", "status",
+    "erro", "falha", "requisi", "reclama", "prazo", "urgent", "pendente",
+]
+
+
+class LatencyDistribution:
+    """
+    Distribuição de latência em milissegundos.
+
+    Formatos aceitos:
+        fixed:<ms>
+        uniform:<min_ms>:<max_ms>
+        normal:<media_ms>:<desvio_ms>
+        lognormal:<mediana_ms>:<sigma>
+        bimodal:<rapido_ms>:<lento_ms>:<fracao_lenta>
+    """
+
+    def __init__(self, spec: str):
+        self.spec = spec
+        kind, *params = spec.split(":")
+        self.kind = kind
+        self.params = [float(p) for p in params]
+        expected = {"fixed": 1, "uniform": 2, "normal": 2, "lognormal": 2, "bimodal": 3}
+        if kind not in expected or len(self.params) != expected[kind]:
+            raise ValueError(f"Distribuição de latência inválida: {spec}")
+
+    def sample(self, rng: random.Random) -> float:
+        """Sorteia uma latência (ms)."""
+        p = self.params
+        if self.kind == "fixed":
+            return p[0]
+        if self.kind == "uniform":
+            return rng.uniform(p[0], p[1])
+        if self.kind == "normal":
+            return max(0.0, rng.gauss(p[0], p[1]))
+        if self.kind == "lognormal":
+            return rng.lognormvariate(math.log(p[0]), p[1])
+        # bimodal: maioria rápida, uma fração lenta (cauda)
+        return p[1] if rng.random() < p[2] else p[0]
+
+
+class TokenBucket:
+    """Rate limit simples (requisições por segundo com rajada)."""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.capacity = burst or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def try_acquire(self) -> bool:
+        """Consome um token se disponível."""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class FakeGroqState:
+    """
+    Configuração e contadores do servidor falso.
+    """
+
+    def __init__(
+        self,
+        latency: str = "lognormal:400:0.5",
+        error_rate: float = 0.0,
+        timeout_rate: float = 0.0,
+        rate_limit: float = 0.0,
+        seed: Optional[int] = None,
+        malformed_rate: float = 0.0,
+        json_mode: bool = True
+    ):
+        self.rng = random.Random(seed)
+        self.configure(latency=latency, error_rate=error_rate, timeout_rate=timeout_rate,
+                       rate_limit=rate_limit, malformed_rate=malformed_rate, json_mode=json_mode)
+        self.stats: Dict[str, int] = {
+            "requests": 0, "ok": 0, "errors": 0, "rate_limited": 0, "timeouts": 0,
+            "json_mode": 0, "malformed": 0,
+        }
+
+    def configure(self, **changes: Any) -> None:
+        """Atualiza a configuração (apenas os campos informados)."""
+        if "latency" in changes:
+            self.latency = LatencyDistribution(changes["latency"])
+        if "error_rate" in changes:
+            self.error_rate = float(changes["error_rate"])
+        if "timeout_rate" in changes:
+            self.timeout_rate = float(changes["timeout_rate"])
+        if "rate_limit" in changes:
+            rate = float(changes["rate_limit"])
+            self.bucket = TokenBucket(rate) if rate > 0 else None
+        if "malformed_rate" in changes:
+            self.malformed_rate = float(changes["malformed_rate"])
+        if "json_mode" in changes:
+            self.json_mode = bool(changes["json_mode"])
+
+    def describe(self) -> Dict[str, Any]:
+        """Configuração atual."""
+        return {
+            "latency": self.latency.spec,
+            "error_rate": self.error_rate,
+            "timeout_rate": self.timeout_rate,
+            "rate_limit": self.bucket.rate if self.bucket else 0,
+            "malformed_rate": self.malformed_rate,
+            "json_mode": self.json_mode,
+        }
+
+
+def _completion(model: str, content: str, prompt_chars: int) -> Dict[str, Any]:
+    """Monta uma resposta no formato chat.completion."""
+    prompt_tokens = max(1, prompt_chars // 4)
+    completion_tokens = max(1, len(content) // 4)
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop",
+            "logprobs": None,
+        }],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+        "system_fingerprint": "fp_fake",
+    }
+
+
+def _malform(content: str, rng: random.Random) -> str:
+    """Aplica a um JSON de classificação um defeito comum de saída de LLM."""
+    defect = rng.choice(("extra_text", "fence", "single_quotes", "decimal_comma", "lowercase", "truncated"))
+    if defect == "extra_text":
+        return f"Aqui está a classificação:\n{content}\nEspero ter ajudado."
+    if defect == "fence":
+        return f"```json\n{content}\n```"
+    if defect == "single_quotes":
+        return content.replace('"', "'")
+    if defect == "decimal_comma":
+        return re.sub(r'("confianca": \d+)\.(\d+)', r"\1,\2", content)
+    if defect == "lowercase":
+        return content.replace("PRODUTIVO", "produtivo")
+    # Irrecuperável: resposta cortada no meio
+    return content[:len(content) // 2]
+
+
+def _answer(messages: list, rng: random.Random) -> str:
+    """Gera o conteúdo da resposta conforme o tipo de chamada."""
+    system = messages[0].get("content", "") if messages else ""
+    user = messages[-1].get("content", "") if messages else ""
+    lower = user.lower()
+    produtivo = any(kw in lower for kw in KEYWORDS_PRODUTIVO)
+
+    reply = (
+        "Prezado(a),\n\nRecebemos sua mensagem e nossa equipe já está analisando "
+        "sua solicitação. Retornaremos em breve.\n\nAtenciosamente,\nEquipe de Atendimento"
+    )
+
+    if "JSON" in system or '"categoria"' in user:
+        result = {
+            "categoria": "PRODUTIVO" if produtivo else "IMPRODUTIVO",
+            "confianca": round(rng.uniform(0.7, 0.98), 2),
+            "justificativa": "Classificação gerada pelo servidor de teste",
+        }
+        if '"resposta"' in user:
+            # Modo combinado: classificação e resposta no mesmo JSON
+            result["resposta"] = reply
+        return json.dumps(result, ensure_ascii=False)
+
+    return reply
+
+
+def create_app(state: FakeGroqState) -> FastAPI:
+    """
+    Cria a aplicação do servidor falso.
+
+    Args:
+        state: Configuração e contadores
+
+    Returns:
+        FastAPI: Aplicação pronta para o uvicorn
+    """
+    app = FastAPI(title="Fake Groq Server")
+
+    @app.post("/openai/v1/chat/completions")
+    async def chat_completions(request: Request):
+        state.stats["requests"] += 1
+        body = await request.json()
+
+        if state.bucket and not state.bucket.try_acquire():
+            state.stats["rate_limited"] += 1
+            return JSONResponse(
+                status_code=429,
+                headers={"retry-after": "1"},
+                content={"error": {"message": "Rate limit reached", "type": "rate_limit_exceeded"}},
+            )
+
+        if state.rng.random() < state.timeout_rate:
+            # Simula uma chamada que nunca responde a tempo
+            state.stats["timeouts"] += 1
+            await asyncio.sleep(600)
+
+        await asyncio.sleep(state.latency.sample(state.rng) / 1000)
+
+        if state.rng.random() < state.error_rate:
+            state.stats["errors"] += 1
+            return JSONResponse(
+                status_code=500,
+                content={"error": {"message": "Internal server error", "type": "internal_error"}},
+            )
+
+        messages = body.get("messages", [])
+        prompt_chars = sum(len(m.get("content", "")) for m in messages)
+        content = _answer(messages, state.rng)
+        json_mode = (body.get("response_format") or {}).get("type") == "json_object"
+        if json_mode:
+            if not state.json_mode:
+                state.stats["errors"] += 1
+                return JSONResponse(
+                    status_code=400,
+                    content={"error": {
+                        "message": "response_format `json_object` is not supported with this model",
+                        "type": "invalid_request_error",
+                    }},
+                )
+            state.stats["json_mode"] += 1
+        elif content.startswith("{") and state.rng.random() < state.malformed_rate:
+            state.stats["malformed"] += 1
+            content = _malform(content, state.rng)
+        state.stats["ok"] += 1
+        return _completion(body.get("model", "fake"), content, prompt_chars)
+
+    @app.get("/fake/config")
+    async def get_config():
+        return state.describe()
+
+    @app.post("/fake/config")
+    async def set_config(request: Request):
+        state.configure(**(await request.json()))
+        return state.describe()
+
+    @app.get("/fake/stats")
+    async def get_stats():
+        return state.stats
+
+    return app
+
+
+def main() -> None:
+    """Inicia o servidor falso via uvicorn."""
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Servidor falso compatível com a API Groq")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency", default="lognormal:400:0.5",
+                        help="distribuição de latência (ver LatencyDistribution)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fração de respostas 500")
+    parser.add_argument("--timeout-rate", type=float, default=0.0, help="fração de chamadas que travam")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="req/s antes de responder 429 (0 = sem limite)")
+    parser.add_argument("--malformed-rate", type=float, default=0.0,
+                        help="fração de classificações com JSON defeituoso (sem response_format)")
+    parser.add_argument("--no-json-mode", action="store_true", help="recusa response_format com 400")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    state = FakeGroqState(
+        latency=args.latency,
+        error_rate=args.error_rate,
+        timeout_rate=args.timeout_rate,
+        rate_limit=args.rate_limit,
+        seed=args.seed,
+        malformed_rate=args.malformed_rate,
+        json_mode=not args.no_json_mode,
+    )
+    uvicorn.run(create_app(state), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+"""
+Load Generator
+==============
+Gerador de carga para `/api/classify-text` e `/api/classify-file`.
+
+Dois modos:
+    - taxa alvo (open loop): chegadas de Poisson a N req/s, independente das respostas
+    - concorrência (closed loop): N clientes enviando em sequência
+
+Relata throughput, latência p50/p95/p99 e erros por tipo.
+
+USO (a partir da raiz do repositório):
+    python -m backend.loadtest.loadgen --url http://127.0.0.1:8000 --rate 10 --duration 30
+    python -m backend.loadtest.loadgen --concurrency 8 --duration 30 --endpoint file
+"""
+
+from typing import Any, Dict, List, Optional
+import argparse
+import asyncio
+import json
+import random
+import time
+
+import httpx
+
+from backend.benchmarks.corpus import generate_corpus, make_pdf
+
+
+class LoadResult:
+    """
+    Amostras coletadas durante uma execução de carga.
+    """
+
+    def __init__(self):
+        self.latencies_ms: List[float] = []
+        self.errors: Dict[str, int] = {}
+        self.sent = 0
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+
+    def record(self, latency_ms: float, error: Optional[str]) -> None:
+        """Registra o resultado de uma requisição."""
+        if error:
+            self.errors[error] = self.errors.get(error, 0) + 1
+        else:
+            self.latencies_ms.append(latency_ms)
+
+    def summary(self) -> Dict[str, Any]:
+        """Resume a execução (throughput, percentis e erros)."""
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        ok = sorted(self.latencies_ms)
+        total_errors = sum(self.errors.values())
+
+        def pct(p: float) -> Optional[float]:
+            if not ok:
+                return None
+            return round(ok[min(len(ok) - 1, int(len(ok) * p))], 1)
+
+        return {
+            "duration_s": round(elapsed, 2),
+            "sent": self.sent,
+            "ok": len(ok),
+            "errors": total_errors,
+            "error_rate": round(total_errors / self.sent, 4) if self.sent else 0.0,
+            "throughput_rps": round(len(ok) / elapsed, 2) if elapsed else 0.0,
+            "latency_ms": {"p50": pct(0.50), "p95": pct(0.95), "p99": pct(0.99), "max": pct(1.0)},
+            "error_breakdown": dict(sorted(self.errors.items(), key=lambda kv: -kv[1])),
+        }
+
+
+class Payloads:
+    """
+    Payloads de teste gerados a partir do corpus sintético dos benchmarks.
+    """
+
+    def __init__(self, size: int = 200, seed: int = 7):
+        self.texts = [text[:10000] for text in generate_corpus(size, seed)]
+        self.pdfs = [make_pdf(text) for text in self.texts[:20]]
+        self.rng = random.Random(seed)
+
+    def text(self) -> str:
+        return self.rng.choice(self.texts)
+
+    def file(self) -> tuple:
+        if self.rng.random() < 0.5:
+            return ("email.pdf", self.rng.choice(self.pdfs), "application/pdf")
+        return ("email.txt", self.text().encode("utf-8"), "text/plain")
+
+
+async def send_one(
+    client: httpx.AsyncClient,
+    endpoint: str,
+    payloads: Payloads,
+    result: LoadResult
+) -> None:
+    """
+    Envia uma requisição e registra latência ou tipo de erro.
+    """
+    if endpoint == "mix":
+        endpoint = "text" if payloads.rng.random() < 0.7 else "file"
+
+    result.sent += 1
+    start = time.perf_counter()
+    error = None
+    try:
+        if endpoint == "text":
+            response = await client.post("/api/classify-text", json={"email_text": payloads.text()})
+        else:
+            response = await client.post("/api/classify-file", files={"file": payloads.file()})
+
+        if response.status_code != 200:
+            error = f"http_{response.status_code}"
+        elif not response.json().get("success", False):
+            error = "success_false"
+    except httpx.TimeoutException:
+        error = "client_timeout"
+    except httpx.TransportError as e:
+        error = f"transport_{type(e).__name__}"
+
+    result.record((time.perf_counter() - start) * 1000, error)
+
+
+async def run_rate(
+    client: httpx.AsyncClient,
+    endpoint: str,
+    payloads: Payloads,
+    result: LoadResult,
+    rate: float,
+    duration: float
+) -> None:
+    """Open loop: chegadas de Poisson na taxa alvo durante `duration` segundos."""
+    tasks = set()
+    deadline = time.perf_counter() + duration
+    next_at = time.perf_counter()
+    while True:
+        next_at += payloads.rng.expovariate(rate)
+        if next_at >= deadline:
+            break
+        await asyncio.sleep(max(0.0, next_at - time.perf_counter()))
+        task = asyncio.create_task(send_one(client, endpoint, payloads, result))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+    if tasks:
+        await asyncio.gather(*tasks)
+
+
+async def run_concurrency(
+    client: httpx.AsyncClient,
+    endpoint: str,
+    payloads: Payloads,
+    result: LoadResult,
+    concurrency: int,
+    duration: float
+) -> None:
+    """Closed loop: `concurrency` clientes em sequência durante `duration` segundos."""
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            await send_one(client, endpoint, payloads, result)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+
+async def run_load(
+    url: str,
+    endpoint: str = "text",
+    rate: Optional[float] = None,
+    concurrency: Optional[int] = None,
+    duration: float = 30.0,
+    timeout: float = 60.0,
+    payloads: Optional[Payloads] = None,
+    result: Optional[LoadResult] = None
+) -> LoadResult:
+    """
+    Executa uma fase de carga.
+
+    Args:
+        url: URL base da aplicação
+        endpoint: "text", "file" ou "mix"
+        rate: Taxa alvo em req/s (open loop)
+        concurrency: Clientes simultâneos (closed loop), se rate não for informado
+        duration: Duração da fase em segundos
+        timeout: Timeout do cliente por requisição
+        payloads: Payloads reutilizados entre fases
+        result: Resultado acumulado entre fases
+
+    Returns:
+        LoadResult: Amostras coletadas
+    """
+    payloads = payloads or Payloads()
+    result = result or LoadResult()
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=100)
+    async with httpx.AsyncClient(base_url=url, timeout=timeout, limits=limits) as client:
+        if rate:
+            await run_rate(client, endpoint, payloads, result, rate, duration)
+        else:
+            await run_concurrency(client, endpoint, payloads, result, concurrency or 1, duration)
+    result.finished = time.perf_counter()
+    return result
+
+
+def print_summary(summary: Dict[str, Any], title: str = "RESULTADO") -> None:
+    """Imprime o resumo de forma legível."""
+    latency = summary["latency_ms"]
+    print("=" * 60)
+    print(f" {title}")
+    print("=" * 60)
+    print(f"Duração:     {summary['duration_s']}s")
+    print(f"Enviadas:    {summary['sent']}  (ok: {summary['ok']}, erros: {summary['errors']})")
+    print(f"Throughput:  {summary['throughput_rps']} req/s")
+    print(f"Latência:    p50={latency['p50']}ms  p95={latency['p95']}ms  "
+          f"p99={latency['p99']}ms  max={latency['max']}ms")
+    print(f"Taxa de erro: {summary['error_rate']:.2%}")
+    for kind, count in summary["error_breakdown"].items():
+        print(f"   {kind}: {count}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Gerador de carga do Email Classifier")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--endpoint", choices=["text", "file", "mix"], default="text")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--rate", type=float, help="taxa alvo em req/s (open loop)")
+    group.add_argument("--concurrency", type=int, default=4, help="clientes simultâneos (closed loop)")
+    parser.add_argument("--duration", type=float, default=30.0, help="duração em segundos")
+    parser.add_argument("--timeout", type=float, default=60.0, help="timeout do cliente (s)")
+    parser.add_argument("--json", action="store_true", help="imprime o resumo em JSON")
+    args = parser.parse_args()
+
+    result = asyncio.run(run_load(
+        args.url, args.endpoint, rate=args.rate, concurrency=args.concurrency,
+        duration=args.duration, timeout=args.timeout
+    ))
+    summary = result.summary()
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print_summary(summary)
+
+
+if __name__ == "__main__":
+    main()
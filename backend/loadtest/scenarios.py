@@ -0,0 +1,201 @@
+"""
+Load Test Scenarios
+===================
+Cenários prontos de teste de carga de ponta a ponta.
+
+Sobe o servidor Groq falso e a aplicação (uvicorn, com N workers) apontando
+para ele, executa as fases do cenário reconfigurando o servidor falso entre
+elas e imprime o resumo por fase e o total.
+
+USO (a partir da raiz do repositório):
+    python -m backend.loadtest.scenarios steady
+    python -m backend.loadtest.scenarios burst --workers 2
+    python -m backend.loadtest.scenarios degraded --scale 0.5
+    python -m backend.loadtest.scenarios --list
+"""
+
+from typing import Any, Dict, List
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+from backend.loadtest.loadgen import LoadResult, Payloads, print_summary, run_load
+
+# Configuração "saudável" do servidor falso
+HEALTHY = {"latency": "lognormal:400:0.4", "error_rate": 0.0, "timeout_rate": 0.0, "rate_limit": 0}
+
+# Cada fase: configuração do servidor falso + carga (rate ou concurrency) + duração (s)
+SCENARIOS: Dict[str, Dict[str, Any]] = {
+    "steady": {
+        "description": "Carga constante com upstream saudável",
+        "phases": [
+            {"name": "steady", "fake": HEALTHY, "rate": 5, "duration": 60},
+        ],
+    },
+    "burst": {
+        "description": "Rajada de 10x a taxa base seguida de recuperação",
+        "phases": [
+            {"name": "base", "fake": HEALTHY, "rate": 2, "duration": 20},
+            {"name": "burst", "fake": HEALTHY, "rate": 20, "duration": 10},
+            {"name": "recovery", "fake": HEALTHY, "rate": 2, "duration": 20},
+        ],
+    },
+    "degraded": {
+        "description": "Upstream lento e instável (latência alta, erros 500 e 429)",
+        "phases": [
+            {"name": "healthy", "fake": HEALTHY, "rate": 5, "duration": 20},
+            {
+                "name": "degraded",
+                "fake": {"latency": "lognormal:3000:0.8", "error_rate": 0.1,
+                         "timeout_rate": 0.01, "rate_limit": 5},
+                "rate": 5,
+                "duration": 30,
+            },
+            {"name": "recovered", "fake": HEALTHY, "rate": 5, "duration": 20},
+        ],
+    },
+    "tail": {
+        "description": "Latência bimodal: 5% das chamadas levam 8s",
+        "phases": [
+            {"name": "tail", "fake": {**HEALTHY, "latency": "bimodal:400:8000:0.05"},
+             "rate": 5, "duration": 60},
+        ],
+    },
+    "saturation": {
+        "description": "Concorrência crescente para achar o throughput máximo por worker",
+        "phases": [
+            {"name": f"c={c}", "fake": HEALTHY, "concurrency": c, "duration": 20}
+            for c in (1, 4, 16, 32)
+        ],
+    },
+}
+
+
+def _wait_ready(url: str, timeout: float = 30.0) -> None:
+    """Aguarda um servidor responder na URL."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=1.0).status_code < 500:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Servidor não respondeu: {url}")
+
+
+def start_processes(fake_port: int, app_port: int, workers: int) -> List[subprocess.Popen]:
+    """
+    Sobe o servidor falso e a aplicação apontando para ele.
+
+    Returns:
+        List[subprocess.Popen]: Processos iniciados (encerrar ao final)
+    """
+    fake = subprocess.Popen(
+        [sys.executable, "-m", "backend.loadtest.fake_groq", "--port", str(fake_port)]
+    )
+    env = {
+        **os.environ,
+        "GROQ_API_KEY": "fake-key",
+        "GROQ_API_BASE": f"http://127.0.0.1:{fake_port}/openai/v1",
+    }
+    app = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.app.main:app",
+         "--port", str(app_port), "--workers", str(workers), "--log-level", "warning"],
+        env=env,
+    )
+    processes = [fake, app]
+    try:
+        _wait_ready(f"http://127.0.0.1:{fake_port}/fake/config")
+        _wait_ready(f"http://127.0.0.1:{app_port}/api/health")
+    except RuntimeError:
+        stop_processes(processes)
+        raise
+    return processes
+
+
+def stop_processes(processes: List[subprocess.Popen]) -> None:
+    """Encerra os processos iniciados."""
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+async def run_scenario(name: str, app_url: str, fake_url: str, scale: float, endpoint: str) -> None:
+    """
+    Executa as fases de um cenário e imprime os resumos.
+    """
+    scenario = SCENARIOS[name]
+    print(f"\nCenário: {name} - {scenario['description']}\n")
+
+    payloads = Payloads()
+    total = LoadResult()
+    for phase in scenario["phases"]:
+        async with httpx.AsyncClient() as client:
+            await client.post(f"{fake_url}/fake/config", json=phase["fake"])
+
+        result = await run_load(
+            app_url,
+            endpoint,
+            rate=phase.get("rate"),
+            concurrency=phase.get("concurrency"),
+            duration=phase["duration"] * scale,
+            payloads=payloads,
+        )
+        print_summary(result.summary(), f"FASE: {phase['name']}")
+
+        total.sent += result.sent
+        total.latencies_ms.extend(result.latencies_ms)
+        for kind, count in result.errors.items():
+            total.errors[kind] = total.errors.get(kind, 0) + count
+
+    total.finished = time.perf_counter()
+    print_summary(total.summary(), f"TOTAL: {name}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cenários de teste de carga")
+    parser.add_argument("scenario", nargs="?", choices=sorted(SCENARIOS))
+    parser.add_argument("--list", action="store_true", help="lista os cenários")
+    parser.add_argument("--workers", type=int, default=1, help="workers do uvicorn")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplica a duração das fases")
+    parser.add_argument("--endpoint", choices=["text", "file", "mix"], default="mix")
+    parser.add_argument("--fake-port", type=int, default=9000)
+    parser.add_argument("--app-port", type=int, default=8100)
+    parser.add_argument("--app-url", default=None,
+                        help="usa uma aplicação já em execução (deve apontar para o servidor falso)")
+    args = parser.parse_args()
+
+    if args.list or not args.scenario:
+        for name, scenario in SCENARIOS.items():
+            print(f"{name:<12} {scenario['description']}")
+        return
+
+    fake_url = f"http://127.0.0.1:{args.fake_port}"
+    if args.app_url:
+        processes = [subprocess.Popen(
+            [sys.executable, "-m", "backend.loadtest.fake_groq", "--port", str(args.fake_port)]
+        )]
+        _wait_ready(f"{fake_url}/fake/config")
+        app_url = args.app_url
+    else:
+        processes = start_processes(args.fake_port, args.app_port, args.workers)
+        app_url = f"http://127.0.0.1:{args.app_port}"
+
+    try:
+        asyncio.run(run_scenario(args.scenario, app_url, fake_url, args.scale, args.endpoint))
+    finally:
+        stop_processes(processes)
+
+
+if __name__ == "__main__":
+    main()
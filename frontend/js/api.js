@@ -11,7 +11,10 @@ const API_CONFIG = {
         ? 'http://localhost:8000/api'  // Desenvolvimento local
         : '/api',  // Produção (mesmo domínio)
     
-    timeout: 30000  // 30 segundos
+    timeout: 30000,  // 30 segundos
+
+    // Corpos JSON a partir deste tamanho (bytes) vão comprimidos com gzip
+    compressMinSize: 1024
 };
 
 /**
@@ -22,6 +25,23 @@ class APIClient {
         this.baseURL = baseURL;
     }
 
+    /**
+     * Monta o corpo JSON, comprimido com gzip quando é grande e o navegador
+     * suporta CompressionStream (o backend aceita Content-Encoding: gzip)
+     * @param {Object} payload - Dados da requisição
+     * @returns {Promise<{body: (string|Blob), headers: Object}>} Corpo e headers
+     */
+    async jsonBody(payload) {
+        const json = JSON.stringify(payload);
+        const headers = { 'Content-Type': 'application/json' };
+        if (typeof CompressionStream === 'undefined' || json.length < API_CONFIG.compressMinSize) {
+            return { body: json, headers };
+        }
+        const stream = new Blob([json]).stream().pipeThrough(new CompressionStream('gzip'));
+        const body = await new Response(stream).blob();
+        return { body, headers: { ...headers, 'Content-Encoding': 'gzip' } };
+    }
+
     /**
      * Classifica um email enviado como texto
      * @param {string} emailText - Texto do email
@@ -29,14 +49,11 @@ class APIClient {
      */
     async classifyText(emailText) {
         try {
+            const { body, headers } = await this.jsonBody({ email_text: emailText });
             const response = await fetch(`${this.baseURL}/classify-text`, {
                 method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                },
-                body: JSON.stringify({
-                    email_text: emailText
-                })
+                headers,
+                body
             });
 
             if (!response.ok) {
@@ -66,7 +83,7 @@ class APIClient {
 
     /**
      * Classifica um email enviado como arquivo
-     * @param {File} file - Arquivo (.txt ou .pdf)
+     * @param {File} file - Arquivo (.txt, .pdf, .html ou .eml)
      * @returns {Promise<Object>} Resultado da classificação
      */
     async classifyFile(file) {
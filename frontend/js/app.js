@@ -137,11 +137,11 @@ function handleFileSelection(file) {
     if (!file) return;
     
     // Validar tipo
-    const validTypes = ['.txt', '.pdf'];
+    const validTypes = ['.txt', '.pdf', '.html', '.htm', '.eml'];
     const fileExt = '.' + file.name.split('.').pop().toLowerCase();
     
     if (!validTypes.includes(fileExt)) {
-        showError('Apenas arquivos .txt e .pdf são aceitos');
+        showError('Apenas arquivos .txt, .pdf, .html e .eml são aceitos');
         return;
     }
     
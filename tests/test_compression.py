@@ -0,0 +1,222 @@
+"""
+Compression Tests
+=================
+Middleware de compressão (api/compression.py): limite de descompressão
+contra "zip bombs", corpos inválidos, endpoints e codificações recusados,
+negociação do Accept-Encoding e compressão das respostas.
+
+USO (a partir da raiz do repositório):
+    python -m pytest tests/test_compression.py
+"""
+
+import gzip
+import os
+import zlib
+
+import brotli
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse
+from fastapi.testclient import TestClient
+
+from backend.app.api.compression import (
+    CompressionMiddleware,
+    DecompressionError,
+    choose_encoding,
+    decompress,
+    parse_quality_values,
+)
+from backend.app.core.config import settings
+
+LIMIT = 1024 * 1024
+
+
+@pytest.fixture(autouse=True)
+def compression_settings(monkeypatch):
+    monkeypatch.setattr(settings, "COMPRESSION_ENABLED", True)
+    monkeypatch.setattr(settings, "COMPRESSION_MIN_SIZE", 1024)
+    monkeypatch.setattr(settings, "COMPRESSION_MAX_DECOMPRESSED_BYTES", LIMIT)
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware)
+
+    @app.post("/api/classify-text")
+    async def echo(request: Request):
+        body = await request.body()
+        return {"size": len(body), "content_encoding": request.headers.get("content-encoding")}
+
+    @app.post("/api/other")
+    async def other(request: Request):
+        return {"size": len(await request.body())}
+
+    @app.get("/text")
+    async def text(size: int = 4096):
+        return PlainTextResponse("a" * size, headers={"ETag": '"v1"'})
+
+    return TestClient(app)
+
+
+def raw_deflate(data: bytes) -> bytes:
+    compressor = zlib.compressobj(9, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+ENCODERS = {
+    "gzip": gzip.compress,
+    "deflate": zlib.compress,
+    "br": brotli.compress,
+}
+
+
+# ==================== decompress ====================
+
+@pytest.mark.parametrize("encoding", ["gzip", "x-gzip", "deflate", "br"])
+def test_decompress_round_trip(encoding):
+    data = b'{"email_text": "Preciso de ajuda com o acesso ao sistema"}' * 200
+    encoded = ENCODERS.get(encoding, gzip.compress)(data)
+    assert decompress(encoded, encoding, LIMIT) == data
+
+
+def test_decompress_accepts_raw_deflate():
+    data = b"corpo sem o envelope zlib" * 50
+    assert decompress(raw_deflate(data), "deflate", LIMIT) == data
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "deflate", "br"])
+def test_decompress_bomb_stops_at_limit(encoding):
+    bomb = ENCODERS[encoding](b"\0" * (16 * LIMIT))
+    assert len(bomb) < LIMIT // 10
+    with pytest.raises(DecompressionError) as error:
+        decompress(bomb, encoding, LIMIT)
+    assert error.value.status_code == 413
+
+
+def test_decompress_exactly_at_limit():
+    data = b"x" * LIMIT
+    assert decompress(gzip.compress(data), "gzip", LIMIT) == data
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "deflate", "br"])
+def test_decompress_truncated_or_corrupt(encoding):
+    encoded = ENCODERS[encoding](os.urandom(4096))
+    for data in (encoded[: len(encoded) // 2], b"isto nao esta comprimido"):
+        with pytest.raises(DecompressionError) as error:
+            decompress(data, encoding, LIMIT)
+        assert error.value.status_code == 400
+
+
+# ==================== Requisições pelo middleware ====================
+
+@pytest.mark.parametrize("encoding", ["gzip", "deflate", "br"])
+def test_request_decompressed(client, encoding):
+    body = b'{"email_text": "Preciso de ajuda"}' * 100
+    response = client.post(
+        "/api/classify-text", content=ENCODERS[encoding](body), headers={"Content-Encoding": encoding}
+    )
+    assert response.status_code == 200
+    assert response.json() == {"size": len(body), "content_encoding": None}
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "deflate", "br"])
+def test_request_bomb_returns_413(client, encoding):
+    bomb = ENCODERS[encoding](b"\0" * (16 * LIMIT))
+    response = client.post("/api/classify-text", content=bomb, headers={"Content-Encoding": encoding})
+    assert response.status_code == 413
+
+
+def test_request_compressed_body_over_limit_returns_413(client):
+    # Incompressível: o corpo comprimido já passa do limite
+    body = gzip.compress(os.urandom(LIMIT + 1024))
+    response = client.post("/api/classify-text", content=body, headers={"Content-Encoding": "gzip"})
+    assert response.status_code == 413
+    assert response.json()["detail"].startswith("Corpo comprimido excede")
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "deflate", "br"])
+def test_request_truncated_returns_400(client, encoding):
+    encoded = ENCODERS[encoding](os.urandom(4096))
+    response = client.post(
+        "/api/classify-text", content=encoded[:-32], headers={"Content-Encoding": encoding}
+    )
+    assert response.status_code == 400
+
+
+def test_request_corrupt_returns_400(client):
+    response = client.post("/api/classify-text", content=b"nao e gzip", headers={"Content-Encoding": "gzip"})
+    assert response.status_code == 400
+
+
+def test_request_wrong_endpoint_returns_415(client):
+    response = client.post("/api/other", content=gzip.compress(b"{}"), headers={"Content-Encoding": "gzip"})
+    assert response.status_code == 415
+    assert "br" in response.headers["accept-encoding"]
+
+
+def test_request_unsupported_encoding_returns_415(client):
+    response = client.post("/api/classify-text", content=b"\x28\xb5\x2f\xfd", headers={"Content-Encoding": "zstd"})
+    assert response.status_code == 415
+    assert response.headers["accept-encoding"] == "gzip, x-gzip, deflate, br"
+
+
+def test_request_identity_passes_through(client):
+    response = client.post("/api/other", content=b"abc", headers={"Content-Encoding": "identity"})
+    assert response.json() == {"size": 3}
+
+
+# ==================== Accept-Encoding ====================
+
+@pytest.mark.parametrize("header,expected", [
+    ("gzip, deflate, br", "br"),
+    ("gzip", "gzip"),
+    ("GZIP", "gzip"),
+    ("br;q=0, gzip", "gzip"),
+    ("br; q=0 , gzip;q=0.5", "gzip"),
+    ("gzip;q=0", None),
+    ("gzip;q=0.000, br;q=0", None),
+    ("br;level=5;q=0, gzip", "gzip"),
+    ("gzip;q=abc", None),
+    ("*", "br"),
+    ("*;q=0", None),
+    ("br;q=0, *", "gzip"),
+    ("gzip;q=0, *;q=1", "br"),
+    ("identity", None),
+    ("", None),
+])
+def test_choose_encoding(header, expected):
+    assert choose_encoding(header) == expected
+
+
+def test_parse_quality_values():
+    assert parse_quality_values("application/msgpack;q=0, application/json ; q=0.8, */*") == {
+        "application/msgpack": 0.0, "application/json": 0.8, "*/*": 1.0
+    }
+
+
+# ==================== Respostas ====================
+
+def test_response_compressed_with_weak_etag(client):
+    response = client.get("/text", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == 'W/"v1"'
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.text == "a" * 4096
+
+
+def test_response_prefers_brotli(client):
+    response = client.get("/text", headers={"Accept-Encoding": "gzip, br"})
+    assert response.headers["content-encoding"] == "br"
+
+
+def test_small_response_not_compressed(client):
+    response = client.get("/text?size=100", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.headers["etag"] == '"v1"'
+
+
+def test_response_refused_encoding_not_compressed(client):
+    response = client.get("/text", headers={"Accept-Encoding": "gzip;q=0"})
+    assert "content-encoding" not in response.headers
+    assert response.headers["vary"] == "Accept-Encoding"
@@ -0,0 +1,156 @@
+"""
+Hedging Tests
+=============
+Cópias de chamadas lentas (services/hedging.py): limiar, orçamento, prazo
+da requisição e vaga da cópia no escalonador.
+
+USO (a partir da raiz do repositório):
+    python -m pytest tests/test_hedging.py
+"""
+
+import asyncio
+
+from backend.app.core.deadline import MIN_ATTEMPT_SECONDS, Deadline
+from backend.app.services.hedging import RequestHedger
+from backend.app.services.llm_scheduler import LLMScheduler
+
+
+def make_hedger(threshold_ms=10.0):
+    hedger = RequestHedger(min_samples=20, budget_ratio=0.05, budget_burst=10.0)
+    for _ in range(20):
+        hedger.latency.record("classify", threshold_ms)
+    return hedger
+
+
+def slow_then_fast(timeouts, deadline=None, delays=(0.2, 0.0)):
+    """Fábrica de chamadas: a primeira é lenta, a cópia responde na hora."""
+    calls = []
+
+    async def call():
+        index = len(calls)
+        calls.append(index)
+        if deadline is not None:
+            timeouts.append(deadline.timeout())
+        await asyncio.sleep(delays[min(index, len(delays) - 1)])
+        return index
+
+    return call
+
+
+def test_no_hedge_without_samples():
+    async def run():
+        hedger = RequestHedger(min_samples=20)
+        return await hedger.run("classify", slow_then_fast([], delays=(0.05,)))
+
+    assert asyncio.run(run()) == (0, None)
+
+
+def test_hedge_wins_slow_call():
+    async def run():
+        hedger = make_hedger()
+        result = await hedger.run("classify", slow_then_fast([]))
+        return result, hedger.snapshot()["calls"]["classify"]
+
+    result, stats = asyncio.run(run())
+    assert result == (1, "hedge")
+    assert stats["hedged"] == 1 and stats["hedge_wins"] == 1
+
+
+def test_hedge_timeout_comes_from_remaining_deadline():
+    async def run():
+        hedger = make_hedger(threshold_ms=100.0)
+        deadline = Deadline(2.0)
+        timeouts = []
+        await hedger.run("classify", slow_then_fast(timeouts, deadline, delays=(1.0, 0.0)), deadline)
+        return timeouts
+
+    primary, hedge = asyncio.run(run())
+    # A cópia sai depois do limiar e recebe só o que resta do prazo
+    assert primary - hedge >= 0.09
+
+
+def test_no_hedge_when_deadline_too_short():
+    async def run():
+        hedger = make_hedger()
+        deadline = Deadline(MIN_ATTEMPT_SECONDS + 0.005)
+        result = await hedger.run("classify", slow_then_fast([], delays=(0.05, 0.0)), deadline)
+        return result, hedger.snapshot()["calls"]["classify"]
+
+    result, stats = asyncio.run(run())
+    assert result == (0, None)
+    assert stats["hedged"] == 0 and stats["deadline_skipped"] == 1
+
+
+def test_budget_limits_hedges():
+    async def run():
+        hedger = RequestHedger(min_samples=20, budget_ratio=0.0, budget_burst=1.0)
+        for _ in range(20):
+            hedger.latency.record("classify", 10.0)
+        first = await hedger.run("classify", slow_then_fast([], delays=(0.05, 0.0)))
+        second = await hedger.run("classify", slow_then_fast([], delays=(0.05, 0.0)))
+        return first, second, hedger.snapshot()["calls"]["classify"]
+
+    first, second, stats = asyncio.run(run())
+    assert first == (1, "hedge") and second == (0, None)
+    assert stats["budget_exhausted"] == 1
+
+
+def test_hedge_takes_its_own_scheduler_slot():
+    async def run():
+        hedger = make_hedger()
+        scheduler = LLMScheduler(2, {}, [])
+        await scheduler.acquire("interactive", "a")
+        in_flight = []
+
+        async def call():
+            in_flight.append(scheduler.in_flight)
+            await asyncio.sleep(0.2 if len(in_flight) == 1 else 0.0)
+            return len(in_flight)
+
+        result = await hedger.run(
+            "classify", call, acquire_slot=lambda: scheduler.try_acquire("interactive"),
+            release_slot=scheduler.release
+        )
+        await asyncio.sleep(0)
+        return result, in_flight, scheduler.in_flight
+
+    result, in_flight, after = asyncio.run(run())
+    assert result == (2, "hedge")
+    assert in_flight == [1, 2]
+    # A vaga da cópia volta; a da chamada original fica com quem a ocupou
+    assert after == 1
+
+
+def test_no_hedge_without_free_slot():
+    async def run():
+        hedger = make_hedger()
+        scheduler = LLMScheduler(1, {}, [])
+        await scheduler.acquire("interactive", "a")
+        result = await hedger.run(
+            "classify", slow_then_fast([], delays=(0.05, 0.0)),
+            acquire_slot=lambda: scheduler.try_acquire("interactive"), release_slot=scheduler.release
+        )
+        return result, hedger.snapshot(), scheduler.in_flight
+
+    result, snapshot, in_flight = asyncio.run(run())
+    assert result == (0, None) and in_flight == 1
+    stats = snapshot["calls"]["classify"]
+    assert stats["no_slot"] == 1 and stats["hedged"] == 0
+    # O orçamento não é gasto sem a cópia
+    assert snapshot["budget_tokens"] == 10.0
+
+
+def test_error_propagates_when_all_copies_fail():
+    async def run():
+        hedger = make_hedger()
+
+        async def fail():
+            await asyncio.sleep(0.02)
+            raise TimeoutError("upstream")
+
+        try:
+            await hedger.run("classify", fail)
+        except TimeoutError as error:
+            return str(error)
+
+    assert asyncio.run(run()) == "upstream"
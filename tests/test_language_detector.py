@@ -0,0 +1,66 @@
+"""
+Language Detector Tests
+=======================
+Detecção de idioma (utils/language_detector.py): idiomas suportados, texto
+curto e idiomas de fora, que ficam indeterminados ("und") e passam pelo NLP
+sem stop words nem stemming.
+
+USO (a partir da raiz do repositório):
+    python -m pytest tests/test_language_detector.py
+"""
+
+import pytest
+
+from backend.app.utils.language_detector import UNDETERMINED, LanguageDetector
+from backend.app.utils.text_cleaner import TextCleaner, get_language_resources
+
+SUPPORTED = [
+    ("pt", "Bom dia, poderiam verificar o boleto em anexo? Obrigado."),
+    ("pt", "Parabéns pelo aniversário! Tudo de bom."),
+    ("en", "The deployment failed again last night, logs attached. Who is on call?"),
+    ("es", "Hola, ¿pueden revisar la factura que envié ayer? Gracias."),
+    ("fr", "Le serveur ne répond plus depuis ce matin, pouvez-vous regarder rapidement?"),
+    ("it", "Il server non risponde da stamattina, potete verificare con urgenza?"),
+    ("de", "Der Server ist seit heute früh nicht erreichbar, bitte dringend prüfen."),
+]
+
+# Idiomas sem perfil: parecidos com algum suportado, mas não o bastante
+UNSUPPORTED = [
+    "Goedemorgen, ik wil graag weten wat de status van mijn aanvraag is, want ik heb nog "
+    "geen antwoord ontvangen van het team. Kunt u mij helpen?",
+    "Merhaba, başvurumun durumunu öğrenmek istiyorum çünkü ekipten henüz bir yanıt almadım. "
+    "Bana yardımcı olabilir misiniz?",
+    "God morgon, jag skulle vilja veta status på min förfrågan, eftersom jag inte har fått "
+    "något svar från teamet ännu.",
+    "Dzień dobry, chciałbym wiedzieć, jaki jest status mojego zgłoszenia, ponieważ nie "
+    "otrzymałem jeszcze odpowiedzi od zespołu.",
+]
+
+
+@pytest.fixture(scope="module")
+def detector():
+    return LanguageDetector()
+
+
+@pytest.mark.parametrize("language,text", SUPPORTED)
+def test_detects_supported_language(detector, language, text):
+    assert detector.detect(text)[0] == language
+
+
+@pytest.mark.parametrize("text", UNSUPPORTED)
+def test_unsupported_language_is_undetermined(detector, text):
+    assert detector.detect(text)[0] == UNDETERMINED
+
+
+@pytest.mark.parametrize("text", ["", "ok", "Obrigado!", "12345 67890 !!!"])
+def test_short_text_is_undetermined(detector, text):
+    assert detector.detect(text) == (UNDETERMINED, 0.0)
+
+
+def test_undetermined_skips_stop_words_and_stemming():
+    resources = get_language_resources(UNDETERMINED)
+    assert resources.stemmer is None and not resources.stop_words
+    text = "Goedemorgen, ik wil graag weten wat de status van mijn aanvraag is"
+    assert TextCleaner().apply_nlp_preprocessing(text, UNDETERMINED) == (
+        "goedemorgen ik wil graag weten wat de status van mijn aanvraag is"
+    )
@@ -0,0 +1,200 @@
+"""
+LLM Scheduler Tests
+===================
+Proporções de despacho do escalonador (services/llm_scheduler.py): fatias
+por peso entre classes, divisão igual entre os tenants de uma classe,
+cancelamento e prazo na fila.
+
+Cada teste ocupa a única vaga, enfileira as chamadas e libera a vaga uma a
+uma, registrando a ordem em que as chamadas recebem a vaga.
+
+USO (a partir da raiz do repositório):
+    python -m pytest tests/test_llm_scheduler.py
+"""
+
+from collections import Counter
+import asyncio
+
+import pytest
+
+from backend.app.core.deadline import Deadline, DeadlineExceeded
+from backend.app.services.llm_scheduler import LLMScheduler
+
+WEIGHTS = {"urgent": 8, "interactive": 4, "batch": 1}
+
+
+def make_scheduler(max_concurrent=1):
+    return LLMScheduler(max_concurrent, WEIGHTS, ["urgente", "prazo"])
+
+
+async def settle():
+    """Deixa as chamadas liberadas voltarem de `acquire` (wait_for + shield)."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def dispatch_order(flows, dispatches):
+    """
+    Enfileira `flows` ((classe, tenant, quantidade), na ordem dada) atrás da
+    vaga ocupada e devolve as `dispatches` primeiras (classe, tenant) atendidas.
+    """
+
+    async def run():
+        scheduler = make_scheduler()
+        await scheduler.acquire("interactive", "holder")
+        order = []
+
+        async def call(priority, tenant):
+            await scheduler.acquire(priority, tenant)
+            order.append((priority, tenant))
+
+        tasks = [
+            asyncio.create_task(call(priority, tenant))
+            for priority, tenant, count in flows for _ in range(count)
+        ]
+        await asyncio.sleep(0)
+        for _ in range(dispatches):
+            scheduler.release()
+            await settle()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        return order
+
+    return asyncio.run(run())
+
+
+def test_classes_share_capacity_by_weight():
+    order = dispatch_order([("batch", "b", 200), ("interactive", "i", 200), ("urgent", "u", 200)], 130)
+    assert Counter(priority for priority, _ in order) == {"urgent": 80, "interactive": 40, "batch": 10}
+
+
+def test_tenant_count_does_not_grow_class_share():
+    one = dispatch_order([("batch", "b0", 1200), ("interactive", "i", 200)], 100)
+    many = dispatch_order([("batch", f"b{n}", 100) for n in range(12)] + [("interactive", "i", 200)], 100)
+    for order in (one, many):
+        assert Counter(priority for priority, _ in order) == {"interactive": 80, "batch": 20}
+
+
+def test_tenants_in_class_split_its_share_equally():
+    order = dispatch_order([("batch", f"b{n}", 100) for n in range(12)] + [("interactive", "i", 500)], 600)
+    batch = Counter(tenant for priority, tenant in order if priority == "batch")
+    assert sum(batch.values()) == 120
+    assert set(batch.values()) == {10}
+
+
+def test_late_tenant_is_not_stuck_behind_earlier_backlog():
+    order = dispatch_order([("batch", "bulk", 1000), ("batch", "small", 5)], 10)
+    assert Counter(tenant for _, tenant in order) == {"bulk": 5, "small": 5}
+
+
+def test_idle_class_does_not_accumulate_credit():
+    async def run():
+        scheduler = make_scheduler()
+        await scheduler.acquire("batch", "holder")
+        order = []
+
+        async def call(priority, tenant):
+            await scheduler.acquire(priority, tenant)
+            order.append(priority)
+
+        batch = [asyncio.create_task(call("batch", "b")) for _ in range(50)]
+        await asyncio.sleep(0)
+        for _ in range(20):
+            scheduler.release()
+            await settle()
+        # Interativo chega depois de 20 vagas do lote: não recebe 20 vagas seguidas
+        interactive = [asyncio.create_task(call("interactive", "i")) for _ in range(50)]
+        await asyncio.sleep(0)
+        order.clear()
+        for _ in range(10):
+            scheduler.release()
+            await settle()
+        for task in batch + interactive:
+            task.cancel()
+        await asyncio.gather(*batch, *interactive, return_exceptions=True)
+        return order
+
+    assert Counter(asyncio.run(run())) == {"interactive": 8, "batch": 2}
+
+
+def test_passes_straight_through_without_queue():
+    async def run():
+        scheduler = make_scheduler(max_concurrent=2)
+        await scheduler.acquire("batch", "a")
+        await scheduler.acquire("batch", "b")
+        assert scheduler.in_flight == 2 and scheduler.queued == 0
+        scheduler.release()
+        scheduler.release()
+        return scheduler.snapshot()
+
+    snapshot = asyncio.run(run())
+    assert snapshot["in_flight"] == 0
+    assert snapshot["classes"]["batch"]["dispatched"] == 2
+    assert snapshot["classes"]["batch"]["enqueued"] == 0
+
+
+def test_try_acquire_never_waits_or_jumps_the_queue():
+    async def run():
+        scheduler = make_scheduler(max_concurrent=2)
+        assert scheduler.try_acquire("interactive")
+        await scheduler.acquire("batch", "a")
+        # Sem vaga livre
+        assert not scheduler.try_acquire("urgent")
+        waiter = asyncio.create_task(scheduler.acquire("batch", "b"))
+        await asyncio.sleep(0)
+        scheduler.release()
+        # A vaga liberada vai para a fila, não para quem tenta sem esperar
+        assert not scheduler.try_acquire("urgent")
+        await waiter
+        scheduler.release()
+        scheduler.release()
+        assert scheduler.try_acquire("urgent")
+        scheduler.release()
+        return scheduler.snapshot()
+
+    snapshot = asyncio.run(run())
+    assert snapshot["in_flight"] == 0
+    assert snapshot["classes"]["urgent"]["dispatched"] == 1
+
+
+def test_cancelled_waiter_skipped_and_slot_kept():
+    async def run():
+        scheduler = make_scheduler()
+        await scheduler.acquire("batch", "holder")
+        first = asyncio.create_task(scheduler.acquire("batch", "a"))
+        second = asyncio.create_task(scheduler.acquire("batch", "b"))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.gather(first, return_exceptions=True)
+        assert scheduler.queued == 1 and scheduler.snapshot()["queued_tenants"] == 1
+        scheduler.release()
+        await second
+        assert scheduler.in_flight == 1 and scheduler.queued == 0
+        scheduler.release()
+        return scheduler.in_flight
+
+    assert asyncio.run(run()) == 0
+
+
+def test_deadline_expires_in_queue():
+    async def run():
+        scheduler = make_scheduler()
+        await scheduler.acquire("batch", "holder")
+        with pytest.raises(DeadlineExceeded):
+            await scheduler.acquire("batch", "late", Deadline(0.55))
+        assert scheduler.queued == 0
+        # A vaga volta ao pool quando a fila está vazia
+        scheduler.release()
+        return scheduler.snapshot()
+
+    snapshot = asyncio.run(run())
+    assert snapshot["in_flight"] == 0
+    assert snapshot["classes"]["batch"]["expired"] == 1
+
+
+def test_urgent_keywords():
+    scheduler = make_scheduler()
+    assert scheduler.is_urgent("Preciso disso URGENTE")
+    assert scheduler.is_urgent("o prazo vence amanhã")
+    assert not scheduler.is_urgent("prazos longos")
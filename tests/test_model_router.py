@@ -0,0 +1,112 @@
+"""
+Model Router Tests
+==================
+Ordenação dos modelos pela latência observada, rebaixamento por SLO e
+recuperação de um modelo rebaixado quando as amostras dele expiram.
+
+USO (a partir da raiz do repositório):
+    python -m pytest tests/test_model_router.py
+"""
+
+import time
+
+import pytest
+
+from backend.app.services.model_router import ModelRouter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(time, "monotonic", fake)
+    return fake
+
+
+def make_router(models=("fast", "mid", "big"), sample_max_age=300.0):
+    return ModelRouter(
+        models=list(models),
+        long_email_chars=2000,
+        latency_slo_ms={"classify": 2000.0},
+        cooldown_seconds=30.0,
+        min_samples=20,
+        sample_max_age=sample_max_age
+    )
+
+
+def record(router, model, latency_ms, count=20):
+    for _ in range(count):
+        router.record_success(model, "classify", latency_ms)
+
+
+def test_configured_order_without_samples(clock):
+    assert make_router().route("classify", 100) == ["fast", "mid", "big"]
+
+
+def test_ranks_models_with_samples_and_keeps_the_others_in_place(clock):
+    router = make_router()
+    # "fast" sem amostras suficientes; "big" observado mais rápido que "mid"
+    record(router, "fast", 100, count=5)
+    record(router, "mid", 900)
+    record(router, "big", 400)
+    assert router.route("classify", 100) == ["fast", "big", "mid"]
+
+    record(router, "fast", 1200, count=20)
+    assert router.route("classify", 100) == ["big", "mid", "fast"]
+
+
+def test_long_and_escalated_emails_prefer_largest_model(clock):
+    router = make_router()
+    assert router.route("classify", 5000)[0] == "big"
+    assert router.route("classify", 100, escalate=True)[0] == "big"
+
+
+def test_demoted_model_recovers_after_samples_expire(clock):
+    router = make_router(models=("fast", "big"))
+    for _ in range(20):
+        router.record_failure("fast", "classify", "timeout", 10_000.0)
+    assert router.route("classify", 100) == ["big", "fast"]
+
+    # Enquanto rebaixado, só "big" recebe tráfego
+    clock.now += 60
+    for _ in range(1000):
+        assert router.route("classify", 100) == ["big", "fast"]
+        router.record_success("big", "classify", 800.0)
+
+    # Os timeouts de "fast" expiram e ele volta a ser o principal
+    clock.now += 300
+    assert router.route("classify", 100) == ["fast", "big"]
+    record(router, "fast", 300.0)
+    assert router.route("classify", 100) == ["fast", "big"]
+
+
+def test_still_slow_model_is_demoted_again(clock):
+    router = make_router(models=("fast", "big"))
+    record(router, "fast", 5000.0)
+    assert router.route("classify", 100) == ["big", "fast"]
+    clock.now += 301
+    assert router.route("classify", 100) == ["fast", "big"]
+    record(router, "fast", 5000.0)
+    assert router.route("classify", 100) == ["big", "fast"]
+
+
+def test_samples_never_expire_without_max_age(clock):
+    router = make_router(models=("fast", "big"), sample_max_age=None)
+    record(router, "fast", 5000.0)
+    clock.now += 10_000
+    assert router.route("classify", 100) == ["big", "fast"]
+
+
+def test_rate_limited_model_goes_last_until_cooldown_ends(clock):
+    router = make_router(models=("fast", "big"))
+    router.record_failure("fast", "classify", "rate_limit", 50.0, retry_after=5.0)
+    assert router.route("classify", 100) == ["big", "fast"]
+    clock.now += 6
+    assert router.route("classify", 100) == ["fast", "big"]
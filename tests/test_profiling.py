@@ -0,0 +1,65 @@
+"""
+Profiling Tests
+===============
+Artefatos do profiling sob demanda (core/profiling.py): listagem, limpeza
+dos mais antigos e download restritos aos arquivos de profiling, mesmo com
+PROFILING_DIR compartilhado.
+
+USO (a partir da raiz do repositório):
+    python -m pytest tests/test_profiling.py
+"""
+
+import os
+
+import pytest
+
+from backend.app.core.config import settings
+from backend.app.core.profiling import Profiler
+
+OTHER_FILES = ["notes.txt", "dump.prof", "20261019-043514-cpu.prof", "20261019-043514-f108f16006f0-cpu.txt"]
+
+
+def artifact_name(index: int, kind: str = "cpu", extension: str = ".prof") -> str:
+    return f"20261019-0435{index:02d}-{index:012x}-{kind}{extension}"
+
+
+@pytest.fixture
+def profiler(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "PROFILING_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "PROFILING_MAX_ARTIFACTS", 3)
+    return Profiler()
+
+
+def touch(directory, name: str, mtime: float) -> None:
+    path = os.path.join(directory, name)
+    with open(path, "w") as file:
+        file.write(name)
+    os.utime(path, (mtime, mtime))
+
+
+def test_prune_keeps_newest_artifacts_and_other_files(profiler, tmp_path):
+    for index, name in enumerate(OTHER_FILES):
+        touch(tmp_path, name, 1000 + index)
+    names = [artifact_name(1), artifact_name(2, "sample", ".folded"), artifact_name(3, "memory", ".txt"),
+             artifact_name(3, "memory", ".snapshot"), artifact_name(4)]
+    for index, name in enumerate(names):
+        touch(tmp_path, name, 2000 + index)
+
+    profiler._prune()
+
+    assert sorted(os.listdir(tmp_path)) == sorted(OTHER_FILES + names[2:])
+    assert [artifact["name"] for artifact in profiler.artifacts()] == names[:1:-1]
+
+
+def test_artifact_path_only_serves_artifacts(profiler, tmp_path):
+    touch(tmp_path, "notes.txt", 1000)
+    touch(tmp_path, artifact_name(1), 1000)
+    assert profiler.artifact_path("notes.txt") is None
+    assert profiler.artifact_path("../" + artifact_name(1)) is None
+    assert profiler.artifact_path(artifact_name(2)) is None
+    assert profiler.artifact_path(artifact_name(1)) == os.path.join(str(tmp_path), artifact_name(1))
+
+
+def test_missing_directory_has_no_artifacts(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "PROFILING_DIR", str(tmp_path / "missing"))
+    assert Profiler().artifacts() == []
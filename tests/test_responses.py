@@ -0,0 +1,56 @@
+"""
+Response Negotiation Tests
+==========================
+Escolha entre JSON e MessagePack pelo header Accept (api/responses.py).
+
+USO (a partir da raiz do repositório):
+    python -m pytest tests/test_responses.py
+"""
+
+import msgpack
+import orjson
+import pytest
+from starlette.requests import Request
+
+from backend.app.api.responses import encode_response, wants_msgpack
+
+
+def make_request(accept=None):
+    headers = [] if accept is None else [(b"accept", accept.encode("latin-1"))]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+@pytest.mark.parametrize("accept,expected", [
+    (None, False),
+    ("", False),
+    ("application/json", False),
+    ("*/*", False),
+    ("application/msgpack", True),
+    ("application/x-msgpack", True),
+    ("application/vnd.msgpack", True),
+    ("Application/MsgPack", True),
+    ("application/msgpack, application/json", True),
+    ("application/json, application/msgpack;q=0.5", False),
+    ("application/msgpack;q=0.9, application/json;q=0.5", True),
+    ("application/msgpack;q=0", False),
+    ("application/msgpack;q=0, application/json", False),
+    ("application/msgpack; q=0.0, */*", False),
+    ("application/msgpack;q=0.5, */*;q=0.1", True),
+    ("application/msgpack;q=0.5, application/*", False),
+    ("application/x-msgpack;q=0, application/msgpack", True),
+    ("application/msgpack;q=abc", False),
+    ("text/html, application/msgpack-extra", False),
+])
+def test_wants_msgpack(accept, expected):
+    assert wants_msgpack(make_request(accept)) is expected
+
+
+def test_encode_response_follows_negotiation():
+    content = {"success": True, "confianca": 0.9}
+    packed = encode_response(make_request("application/msgpack"), content)
+    assert packed.media_type == "application/msgpack"
+    assert msgpack.unpackb(packed.body) == content
+
+    refused = encode_response(make_request("application/msgpack;q=0"), content)
+    assert refused.media_type == "application/json"
+    assert orjson.loads(refused.body) == content
@@ -0,0 +1,179 @@
+"""
+Result Parser Tests
+===================
+Recuperação do JSON de classificação do LLM (utils/result_parser.py): cada
+defeito corrigido, as falhas e os contadores de GET /api/metrics.
+
+USO (a partir da raiz do repositório):
+    python -m pytest tests/test_result_parser.py
+"""
+
+import pytest
+
+from backend.app.utils.result_parser import DEFECTS, ClassificationResultParser, ResultParseError
+
+CLEAN = '{"categoria": "PRODUTIVO", "confianca": 0.95, "justificativa": "Pede suporte técnico"}'
+
+# (resposta do LLM, resultado esperado, defeitos corrigidos)
+RECOVERABLE = [
+    (
+        'Claro! Aqui está a classificação:\n' + CLEAN + '\nEspero ter ajudado.',
+        {"categoria": "PRODUTIVO", "confianca": 0.95, "justificativa": "Pede suporte técnico"},
+        ["extra_text"],
+    ),
+    (
+        '```json\n' + CLEAN + '\n```',
+        {"categoria": "PRODUTIVO", "confianca": 0.95, "justificativa": "Pede suporte técnico"},
+        ["extra_text"],
+    ),
+    (
+        '{"categoria": "PRODUTIVO", "confianca": 0.9, "justificativa": "Cita {chaves} no texto"} fim',
+        {"categoria": "PRODUTIVO", "confianca": 0.9, "justificativa": "Cita {chaves} no texto"},
+        ["extra_text"],
+    ),
+    (
+        "{'categoria': 'IMPRODUTIVO', 'confianca': 0.8, 'justificativa': 'Felicitações'}",
+        {"categoria": "IMPRODUTIVO", "confianca": 0.8, "justificativa": "Felicitações"},
+        ["single_quotes"],
+    ),
+    (
+        "{'categoria': 'PRODUTIVO', 'confianca': 0.7, 'justificativa': 'Falta d'água no prédio'}",
+        {"categoria": "PRODUTIVO", "confianca": 0.7, "justificativa": "Falta d'água no prédio"},
+        ["single_quotes"],
+    ),
+    (
+        "{'categoria': 'PRODUTIVO', 'confianca': 0.7, 'justificativa': 'Cliente disse \"urgente\"'}",
+        {"categoria": "PRODUTIVO", "confianca": 0.7, "justificativa": 'Cliente disse "urgente"'},
+        ["single_quotes"],
+    ),
+    (
+        '{"categoria": "PRODUTIVO", "confianca": 0,95, "justificativa": "Pedido de status"}',
+        {"categoria": "PRODUTIVO", "confianca": 0.95, "justificativa": "Pedido de status"},
+        ["decimal_comma"],
+    ),
+    (
+        '{"categoria": "PRODUTIVO", "confianca": "0,85", "justificativa": "Pedido de status"}',
+        {"categoria": "PRODUTIVO", "confianca": 0.85, "justificativa": "Pedido de status"},
+        ["decimal_comma"],
+    ),
+    (
+        '{"categoria": "PRODUTIVO", "confianca": "0.6", "justificativa": "Valores de 1,5 mil"}',
+        {"categoria": "PRODUTIVO", "confianca": 0.6, "justificativa": "Valores de 1,5 mil"},
+        ["numeric_string"],
+    ),
+    (
+        '{"categoria": " improdutivo ", "confianca": 1, "justificativa": "Agradecimento"}',
+        {"categoria": "IMPRODUTIVO", "confianca": 1.0, "justificativa": "Agradecimento"},
+        ["category_case"],
+    ),
+    (
+        '{"categoria": "Produtivo", "confiança": 0.9, "justificativa": "Suporte"}',
+        {"categoria": "PRODUTIVO", "confianca": 0.9, "justificativa": "Suporte"},
+        ["category_case"],
+    ),
+    (
+        "Resultado: {'categoria': 'produtivo', 'confianca': 0,75, 'justificativa': 'Dúvida sobre fatura'}",
+        {"categoria": "PRODUTIVO", "confianca": 0.75, "justificativa": "Dúvida sobre fatura"},
+        ["extra_text", "single_quotes", "decimal_comma", "category_case"],
+    ),
+]
+
+FAILURES = [
+    ("Não consegui classificar este email.", "sem objeto"),
+    ('{"categoria": "PRODUTIVO", "confianca": 0.9', "incompleto"),
+    ("[1, 2, 3]", "não é um objeto"),
+    ('"PRODUTIVO"', "não é um objeto"),
+    ('{"categoria": "PRODUTIVO", "confianca": 0.9}', "ausentes"),
+    ('{"categoria": "URGENTE", "confianca": 0.9, "justificativa": "x"}', "categoria"),
+    ('{"categoria": 1, "confianca": 0.9, "justificativa": "x"}', "categoria"),
+    ('{"categoria": "PRODUTIVO", "confianca": 1.5, "justificativa": "x"}', "intervalo"),
+    ('{"categoria": "PRODUTIVO", "confianca": -0.1, "justificativa": "x"}', "intervalo"),
+    ('{"categoria": "PRODUTIVO", "confianca": "alta", "justificativa": "x"}', "confiança"),
+    ('{"categoria": "PRODUTIVO", "confianca": true, "justificativa": "x"}', "confiança"),
+    ('{"categoria": "PRODUTIVO", "confianca": null, "justificativa": "x"}', "confiança"),
+    ("{'categoria': 'PRODUTIVO', 'confianca': 0.9, 'justificativa': }", "json inválido"),
+]
+
+
+@pytest.fixture
+def parser():
+    return ClassificationResultParser()
+
+
+def test_clean_response(parser):
+    assert parser.parse(CLEAN) == {"categoria": "PRODUTIVO", "confianca": 0.95, "justificativa": "Pede suporte técnico"}
+    assert parser.snapshot()["clean"] == 1
+
+
+def test_extra_fields_preserved(parser):
+    result = parser.parse('{"categoria": "PRODUTIVO", "confianca": 0.9, "justificativa": "x", "resposta": "Olá"}')
+    assert result["resposta"] == "Olá"
+
+
+@pytest.mark.parametrize("resposta", ['42', '3.5', '["Olá", "tudo bem"]', '{"texto": "Olá"}', 'null', 'true'])
+def test_non_string_response_discarded(parser, resposta):
+    result = parser.parse(
+        '{"categoria": "PRODUTIVO", "confianca": 0.9, "justificativa": "x", "resposta": %s}' % resposta
+    )
+    assert "resposta" not in result
+    assert result["categoria"] == "PRODUTIVO"
+    assert parser.snapshot()["clean"] == 1
+
+
+@pytest.mark.parametrize("text,expected,defects", RECOVERABLE)
+def test_recovers_defect(parser, text, expected, defects):
+    assert parser.parse(text) == expected
+    stats = parser.snapshot()
+    assert stats["recovered"] == 1
+    assert {defect for defect, count in stats["defects"].items() if count} == set(defects)
+
+
+@pytest.mark.parametrize("text,message", FAILURES)
+def test_failure(parser, text, message):
+    with pytest.raises(ResultParseError) as error:
+        parser.parse(text)
+    assert message in str(error.value).lower()
+    assert parser.snapshot()["failed"] == 1
+
+
+def test_result_parse_error_is_value_error():
+    assert issubclass(ResultParseError, ValueError)
+
+
+def test_snapshot_counters_and_rates(parser):
+    parser.parse(CLEAN)
+    parser.parse(CLEAN)
+    parser.parse("```json\n" + CLEAN + "\n```")
+    parser.parse('{"categoria": "produtivo", "confianca": "0,5", "justificativa": "x"}')
+    with pytest.raises(ResultParseError):
+        parser.parse("sem json")
+
+    assert parser.snapshot() == {
+        "total": 5,
+        "clean": 2,
+        "recovered": 2,
+        "failed": 1,
+        "failure_rate": 0.2,
+        "recovery_rate": 0.4,
+        "defects": {
+            "extra_text": 1, "single_quotes": 0, "decimal_comma": 1, "numeric_string": 0, "category_case": 1
+        },
+    }
+
+
+def test_defects_of_failed_response_are_counted(parser):
+    with pytest.raises(ResultParseError):
+        parser.parse('Segue: {"categoria": "PRODUTIVO", "confianca": 2, "justificativa": "x"}')
+    stats = parser.snapshot()
+    assert stats["failed"] == 1 and stats["recovered"] == 0
+    assert stats["defects"]["extra_text"] == 1
+
+
+def test_empty_snapshot_and_reset(parser):
+    empty = parser.snapshot()
+    assert empty["total"] == 0 and empty["failure_rate"] == 0.0 and empty["recovery_rate"] == 0.0
+    assert set(empty["defects"]) == set(DEFECTS)
+
+    parser.parse("x " + CLEAN)
+    parser.reset()
+    assert parser.snapshot() == empty
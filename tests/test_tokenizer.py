@@ -0,0 +1,94 @@
+"""
+Tokenizer Tests
+===============
+Paridade do tokenizador por regex com a tokenização anterior do NLTK
+(`word_tokenize` + filtro de alfanuméricos e stop words).
+
+Os casos fixos guardam a saída do NLTK; a comparação direta com o NLTK
+sobre o corpus sintético roda quando os dados punkt estão instalados.
+
+USO (a partir da raiz do repositório):
+    python -m pytest tests/test_tokenizer.py
+"""
+
+import pytest
+
+from backend.app.utils.tokenizer import tokenize
+from backend.benchmarks.corpus import generate_corpus, generate_thread_corpus
+
+# (texto, saída de word_tokenize(texto.lower(), "portuguese") filtrada por isalnum)
+NLTK_CASES = [
+    (
+        "Preciso de ajuda com o acesso ao sistema, que está apresentando um erro.",
+        ["preciso", "de", "ajuda", "com", "o", "acesso", "ao", "sistema", "que", "está", "apresentando", "um", "erro"],
+    ),
+    (
+        "Enviei um e-mail ontem sobre a fatura e/ou o boleto de R$ 1.500,00.",
+        ["enviei", "um", "ontem", "sobre", "a", "fatura", "o", "boleto", "de", "r"],
+    ),
+    (
+        "A reunião foi remarcada para 10:30 (sala 3); confirmem até sexta-feira...",
+        ["a", "reunião", "foi", "remarcada", "para", "sala", "3", "confirmem", "até"],
+    ),
+    (
+        "Ana Lima - Analista Financeiro - Tel.: (11) 98765-4321",
+        ["ana", "lima", "analista", "financeiro", "tel", "11"],
+    ),
+    (
+        "-----Mensagem original----- De: joao@empresa.com.br",
+        ["original", "de", "joao"],
+    ),
+    (
+        'Item 1. revisar contrato 2. enviar "nova" fatura 3.',
+        ["item", "revisar", "contrato", "enviar", "nova", "fatura", "3"],
+    ),
+    (
+        "Protocolo nº 12345, conforme 'combinado' com a equipe d'água",
+        ["protocolo", "nº", "12345", "conforme", "com", "a", "equipe"],
+    ),
+    (
+        "It's done, we don't need it.",
+        ["it", "done", "we", "do", "need", "it"],
+    ),
+]
+
+
+@pytest.mark.parametrize("text,expected", NLTK_CASES)
+def test_matches_nltk_output(text, expected):
+    assert tokenize(text) == expected
+
+
+def test_removes_stop_words_in_same_pass():
+    stop_words = frozenset({"de", "com", "o", "ao", "que", "um"})
+    assert tokenize(NLTK_CASES[0][0], stop_words) == [
+        "preciso", "ajuda", "acesso", "sistema", "está", "apresentando", "erro"
+    ]
+
+
+def test_lowercases_accented_words():
+    assert tokenize("ATENÇÃO: Solicitação URGENTE") == ["atenção", "solicitação", "urgente"]
+
+
+def test_empty_text():
+    assert tokenize("") == []
+    assert tokenize(" ... -- !? ") == []
+
+
+def _nltk_tokens(text, stop_words):
+    nltk_tokenize = pytest.importorskip("nltk.tokenize")
+    try:
+        tokens = nltk_tokenize.word_tokenize(text.lower(), language="portuguese")
+    except LookupError:
+        pytest.skip("dados punkt do NLTK não instalados")
+    return [token for token in tokens if token.isalnum() and token not in stop_words]
+
+
+def test_parity_with_nltk_on_corpus():
+    from backend.app.utils.text_cleaner import TextCleaner, get_language_resources
+
+    cleaner = TextCleaner("pt")
+    stop_words = get_language_resources("pt").stop_words
+    texts = generate_corpus(500, seed=7) + generate_thread_corpus(100)
+    for text in texts:
+        cleaned = cleaner.clean(cleaner.extract_main_content(text))
+        assert tokenize(cleaned, stop_words) == _nltk_tokens(cleaned, stop_words), cleaned